@@ -9,7 +9,6 @@
 from copy import deepcopy
 
 import numpy as np
-from scipy import linalg
 
 from ..cov import Covariance, make_ad_hoc_cov
 from ..forward.forward import is_fixed_orient, _restrict_forward_to_src_sel
@@ -17,7 +16,7 @@ from ..io.proj import make_projector, Projection
 from ..minimum_norm.inverse import _get_vertno, _prepare_forward
 from ..source_space import label_src_vertno_sel
 from ..utils import (verbose, check_fname, _reg_pinv, _check_option, logger,
-                     _pl, _check_src_normal, check_version, _sym_mat_pow, warn)
+                     _pl, _check_src_normal, _sym_mat_pow, warn)
 from ..time_frequency.csd import CrossSpectralDensity
 
 from ..externals.h5io import read_hdf5, write_hdf5
@@ -112,14 +111,19 @@ def _reduce_leadfield_rank(G):
     return G
 
 
+# Number of filter weights computed at once when beamforming several
+# covariance or CSD matrices together
+_BLOCK_SIZE = 2 ** 22
+
+
 def _sym_inv_sm(x, reduce_rank, inversion, sk):
     """Symmetric inversion with single- or matrix-style inversion."""
-    if x.shape[1:] == (1, 1):
+    if x.shape[-2:] == (1, 1):
         with np.errstate(divide='ignore', invalid='ignore'):
             x_inv = 1. / x
         x_inv[~np.isfinite(x_inv)] = 1.
     else:
-        assert x.shape[1:] == (3, 3)
+        assert x.shape[-2:] == (3, 3)
         if inversion == 'matrix':
             x_inv = _sym_mat_pow(x, -1, reduce_rank=reduce_rank)
             # Reapply source covariance after inversion
@@ -127,17 +131,15 @@ def _sym_inv_sm(x, reduce_rank, inversion, sk):
             x_inv *= sk[:, np.newaxis, :]
         else:
             # Invert for each dipole separately using plain division
-            diags = np.diagonal(x, axis1=1, axis2=2)
+            diags = np.diagonal(x, axis1=-2, axis2=-1)
             assert not reduce_rank   # guaranteed earlier
             with np.errstate(divide='ignore'):
                 diags = 1. / diags
+            # Reapply source covariance after inversion
+            diags = diags * (sk * sk)
             # set the diagonal of each 3x3
             x_inv = np.zeros_like(x)
-            for k in range(x.shape[0]):
-                this = diags[k]
-                # Reapply source covariance after inversion
-                this *= (sk[k] * sk[k])
-                x_inv[k].flat[::4] = this
+            x_inv[..., np.arange(3), np.arange(3)] = diags
     return x_inv
 
 
@@ -152,8 +154,10 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
     ----------
     G : ndarray, shape (n_dipoles, n_channels)
         The leadfield.
-    Cm : ndarray, shape (n_channels, n_channels)
-        The data covariance matrix.
+    Cm : ndarray, shape ([n_matrices, ]n_channels, n_channels)
+        The data covariance matrix, or a stack of matrices (e.g., CSD
+        matrices at several frequencies) for which filters are computed
+        together, sharing the preparation of the leadfield.
     reg : float
         Regularization parameter.
     n_orient : int
@@ -175,15 +179,22 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
 
     Returns
     -------
-    W : ndarray, shape (n_dipoles, n_channels)
+    W : ndarray, shape ([n_matrices, ]n_dipoles, n_channels)
         The beamformer filter weights.
+    max_power_ori : ndarray, shape ([n_matrices, ]n_sources, 3) | None
+        The orientations of maximum power, if ``pick_ori='max-power'``.
     """
     _check_option('weight_norm', weight_norm,
                   ['unit-noise-gain-invariant', 'unit-noise-gain',
                    'nai', None])
-    assert Cm.shape == (G.shape[0],) * 2
-    s, _ = np.linalg.eigh(Cm)
-    if not (s >= -s.max() * 1e-7).all():
+    Cm = np.asarray(Cm)
+    single = Cm.ndim == 2
+    if single:
+        Cm = Cm[np.newaxis]
+    assert Cm.shape[1:] == (G.shape[0],) * 2
+    n_mat = len(Cm)
+    s = np.linalg.eigvalsh(Cm)  # eigenvalues in ascending order
+    if not (s >= -s[:, -1:] * 1e-7).all():
         # This shouldn't ever happen, but just in case
         warn('data covariance does not appear to be positive semidefinite, '
              'results will likely be incorrect')
@@ -191,6 +202,8 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
     # trade-off between spatial resolution and noise sensitivity
     # eq. 25 in Gross and Ioannides, 1999 Phys. Med. Biol. 44 2081
     Cm_inv, loading_factor, rank = _reg_pinv(Cm, reg, rank)
+    loading_factor = np.broadcast_to(loading_factor, (n_mat,))
+    rank = np.broadcast_to(rank, (n_mat,))
 
     assert orient_std.shape == (G.shape[1],)
     n_sources = G.shape[1] // n_orient
@@ -204,9 +217,6 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
     assert Gk.shape == (n_sources, n_channels, n_orient)
     sk = np.reshape(orient_std, (n_sources, n_orient))
     del G, orient_std
-    pinv_kwargs = dict()
-    if check_version('numpy', '1.17'):
-        pinv_kwargs['hermitian'] = True
 
     _check_option('reduce_rank', reduce_rank, (True, False))
 
@@ -239,6 +249,58 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
     if reduce_rank:
         Gk = _reduce_leadfield_rank(Gk)
 
+    if weight_norm == 'nai':
+        # Estimate noise level based on covariance matrix, taking the
+        # first eigenvalue that falls outside the signal subspace or the
+        # loading factor used during regularization, whichever is largest.
+        full_rank = rank > n_channels
+        if (full_rank & (loading_factor == 0)).any():
+            # Covariance matrix is full rank, no noise subspace!
+            raise RuntimeError(
+                'Cannot compute noise subspace with a full-rank '
+                'covariance matrix and no regularization. Try '
+                'manually specifying the rank of the covariance '
+                'matrix or using regularization.')
+        noise = s[np.arange(n_mat), (n_channels - rank) % n_channels]
+        # Use the loading factor as noise ceiling if there is no noise
+        # subspace
+        noise = np.where(full_rank, loading_factor,
+                         np.maximum(noise, loading_factor))
+    del s
+
+    # The matrices are processed in blocks to bound the memory used by the
+    # (n_matrices, n_sources, n_orient, n_channels) intermediate products
+    n_block = max(_BLOCK_SIZE // (n_sources * n_orient * n_channels), 1)
+    Ws, max_power_oris = list(), list()
+    for start in range(0, n_mat, n_block):
+        sl = slice(start, start + n_block)
+        W, max_power_ori = _compute_bf_block(
+            Gk, Cm_inv[sl], sk, nn, n_orient, weight_norm, pick_ori,
+            reduce_rank, inversion)
+        if weight_norm == 'nai':
+            W /= np.sqrt(noise[sl])[:, np.newaxis, np.newaxis]
+        Ws.append(W)
+        max_power_oris.append(max_power_ori)
+    W = np.concatenate(Ws)
+    if pick_ori == 'max-power':
+        max_power_ori = np.concatenate(max_power_oris)
+        if single:
+            max_power_ori = max_power_ori[0]
+    else:
+        max_power_ori = None
+    if single:
+        W = W[0]
+    logger.info('Filter computation complete')
+    return W, max_power_ori
+
+
+def _compute_bf_block(Gk, Cm_inv, sk, nn, n_orient, weight_norm, pick_ori,
+                      reduce_rank, inversion):
+    """Compute the filters for a block of inverted covariance matrices."""
+    n_sources, n_channels = Gk.shape[:2]
+    # broadcast the per-source products over the matrices
+    Cm_inv = Cm_inv[:, np.newaxis]
+
     def _compute_bf_terms(Gk, Cm_inv):
         bf_numer = np.matmul(Gk.swapaxes(-2, -1).conj(), Cm_inv)
         bf_denom = np.matmul(bf_numer, Gk)
@@ -261,18 +323,20 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
                 np.matmul(Gk.swapaxes(-2, -1).conj(), Cm_inv @ Cm_inv), Gk)
         ori_denom_inv = _sym_inv_sm(ori_denom, reduce_rank, inversion, sk)
         ori_pick = np.matmul(ori_denom_inv, ori_numer)
-        assert ori_pick.shape == (n_sources, n_orient, n_orient)
+        assert ori_pick.shape[1:] == (n_sources, n_orient, n_orient)
 
         # pick eigenvector that corresponds to maximum eigenvalue:
         eig_vals, eig_vecs = np.linalg.eig(ori_pick.real)  # not Hermitian!
         # sort eigenvectors by eigenvalues for picking:
         order = np.argsort(np.abs(eig_vals), axis=-1)
-        # eig_vals = np.take_along_axis(eig_vals, order, axis=-1)
-        max_power_ori = eig_vecs[np.arange(len(eig_vecs)), :, order[:, -1]]
-        assert max_power_ori.shape == (n_sources, n_orient)
+        eig_vecs = eig_vecs.reshape(-1, n_orient, n_orient)
+        max_power_ori = eig_vecs[np.arange(len(eig_vecs)), :,
+                                 order.reshape(-1, n_orient)[:, -1]]
+        max_power_ori.shape = order.shape
+        assert max_power_ori.shape[1:] == (n_sources, n_orient)
 
         # set the (otherwise arbitrary) sign to match the normal
-        signs = np.sign(np.sum(max_power_ori * nn, axis=1, keepdims=True))
+        signs = np.sign(np.sum(max_power_ori * nn, axis=-1, keepdims=True))
         signs[signs == 0] = 1.
         max_power_ori *= signs
 
@@ -291,8 +355,8 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
     #
 
     bf_numer, bf_denom = _compute_bf_terms(Gk, Cm_inv)
-    assert bf_denom.shape == (n_sources,) + (n_orient,) * 2
-    assert bf_numer.shape == (n_sources, n_orient, n_channels)
+    assert bf_denom.shape[1:] == (n_sources,) + (n_orient,) * 2
+    assert bf_numer.shape[1:] == (n_sources, n_orient, n_channels)
     del Gk  # lead field has been adjusted and should not be used anymore
 
     #
@@ -302,9 +366,9 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
     # Here W is W_ug, i.e.:
     # G.T @ Cm_inv / (G.T @ Cm_inv @ G)
     bf_denom_inv = _sym_inv_sm(bf_denom, reduce_rank, inversion, sk)
-    assert bf_denom_inv.shape == (n_sources, n_orient, n_orient)
+    assert bf_denom_inv.shape[1:] == (n_sources, n_orient, n_orient)
     W = np.matmul(bf_denom_inv, bf_numer)
-    assert W.shape == (n_sources, n_orient, n_channels)
+    assert W.shape[1:] == (n_sources, n_orient, n_channels)
     del bf_denom_inv, sk
 
     #
@@ -333,11 +397,11 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
         # rotation invariant:
         if weight_norm in ('unit-noise-gain', 'nai'):
             noise_norm = np.matmul(W, W.swapaxes(-2, -1).conj()).real
-            noise_norm = np.reshape(  # np.diag operation over last two axes
-                noise_norm, (n_sources, -1, 1))[:, ::n_orient + 1]
-            np.sqrt(noise_norm, out=noise_norm)
+            # np.diag operation over last two axes
+            noise_norm = np.sqrt(np.diagonal(
+                noise_norm, axis1=-2, axis2=-1))[..., np.newaxis]
             noise_norm[noise_norm == 0] = np.inf
-            assert noise_norm.shape == (n_sources, n_orient, 1)
+            assert noise_norm.shape[1:] == (n_sources, n_orient, 1)
             W /= noise_norm
         else:
             assert weight_norm == 'unit-noise-gain-invariant'
@@ -352,55 +416,29 @@ def _compute_beamformer(G, Cm, reg, n_orient, weight_norm, pick_ori,
             W = np.matmul(_sym_mat_pow(inner, -0.5), use)
             noise_norm = 1.
 
-        if weight_norm == 'nai':
-            # Estimate noise level based on covariance matrix, taking the
-            # first eigenvalue that falls outside the signal subspace or the
-            # loading factor used during regularization, whichever is largest.
-            if rank > len(Cm):
-                # Covariance matrix is full rank, no noise subspace!
-                # Use the loading factor as noise ceiling.
-                if loading_factor == 0:
-                    raise RuntimeError(
-                        'Cannot compute noise subspace with a full-rank '
-                        'covariance matrix and no regularization. Try '
-                        'manually specifying the rank of the covariance '
-                        'matrix or using regularization.')
-                noise = loading_factor
-            else:
-                noise, _ = linalg.eigh(Cm)
-                noise = noise[-rank]
-                noise = max(noise, loading_factor)
-            W /= np.sqrt(noise)
-
-    W = W.reshape(n_sources * n_orient, n_channels)
-    logger.info('Filter computation complete')
+    W = W.reshape(len(W), n_sources * n_orient, n_channels)
     return W, max_power_ori
 
 
-# TODO: Eventually we can @jit() this to make it faster
 def _compute_power(Cm, W, n_orient):
     """Use beamformer filters to compute source power.
 
     Parameters
     ----------
-    Cm : ndarray, shape (n_channels, n_channels)
-        Data covariance matrix or CSD matrix.
-    W : ndarray, shape (nvertices*norient, nchannels)
-        Beamformer weights.
+    Cm : ndarray, shape ([n_matrices, ]n_channels, n_channels)
+        Data covariance matrix or CSD matrix, or a stack of them.
+    W : ndarray, shape ([n_matrices, ]nvertices*norient, nchannels)
+        Beamformer weights, or a stack of them (one for each matrix).
 
     Returns
     -------
-    power : ndarray, shape (nvertices,)
+    power : ndarray, shape ([n_matrices, ]nvertices)
         Source power.
     """
-    n_sources = W.shape[0] // n_orient
-
-    source_power = np.zeros(n_sources)
-    for k in range(n_sources):
-        Wk = W[n_orient * k: n_orient * k + n_orient]
-        source_power[k] = np.trace(Wk @ Cm @ Wk.conj().T).real
-
-    return source_power
+    # the power of each source is trace(Wk @ Cm @ Wk.conj().T), i.e. the sum
+    # over its orientations of the diagonal of W @ Cm @ W.conj().T
+    power = np.einsum('...ij,...ij->...i', np.matmul(W, Cm), W.conj()).real
+    return power.reshape(power.shape[:-1] + (-1, n_orient)).sum(axis=-1)
 
 
 class Beamformer(dict):
@@ -15,7 +15,9 @@ from ..utils import (logger, verbose, warn, _check_one_ch_type,
 from ..forward import _subject_from_forward
 from ..minimum_norm.inverse import combine_xyz, _check_reference, _check_depth
 from ..source_estimate import _make_stc, _get_src_type
-from ..time_frequency import csd_fourier, csd_multitaper, csd_morlet
+from ..time_frequency import (CrossSpectralDensity, csd_fourier,
+                              csd_multitaper, csd_morlet)
+from ..time_frequency.csd import _vector_to_sym_mat
 from ._compute_beamformer import (_check_proj_match, _prepare_beamformer_input,
                                   _compute_beamformer, _check_src_type,
                                   Beamformer, _compute_power)
@@ -186,34 +188,21 @@ def make_dics(info, forward, csd, reg=0.05, noise_csd=None, label=None,
     del noise_csd
     ch_names = list(info['ch_names'])
 
-    logger.info('Computing DICS spatial filters...')
-    Ws = []
-    max_oris = []
-    for i, freq in enumerate(frequencies):
-        if n_freqs > 1:
-            logger.info('    computing DICS spatial filter at %sHz (%d/%d)' %
-                        (freq, i + 1, n_freqs))
+    logger.info('Computing DICS spatial filters at %d frequenc%s...'
+                % (n_freqs, 'y' if n_freqs == 1 else 'ies'))
+    # The filters of all frequencies are computed together
+    Cm = _csd_matrices(csd)
+    if real_filter:
+        Cm = Cm.real
 
-        Cm = csd.get_data(index=i)
-        if real_filter:
-            Cm = Cm.real
-
-        # Whiten the CSD
-        Cm = np.dot(whitener, np.dot(Cm, whitener.conj().T))
-
-        # compute spatial filter
-        n_orient = 3 if is_free_ori else 1
-        W, max_power_ori = _compute_beamformer(
-            G, Cm, reg, n_orient, weight_norm, pick_ori, reduce_rank,
-            rank=rank, inversion=inversion, nn=nn, orient_std=orient_std)
-        Ws.append(W)
-        max_oris.append(max_power_ori)
-
-    Ws = np.array(Ws)
-    if pick_ori == 'max-power':
-        max_oris = np.array(max_oris)
-    else:
-        max_oris = None
+    # Whiten the CSDs
+    Cm = np.matmul(np.matmul(whitener, Cm), whitener.conj().T)
+
+    # compute spatial filters
+    n_orient = 3 if is_free_ori else 1
+    Ws, max_oris = _compute_beamformer(
+        G, Cm, reg, n_orient, weight_norm, pick_ori, reduce_rank,
+        rank=rank, inversion=inversion, nn=nn, orient_std=orient_std)
 
     src_type = _get_src_type(forward['src'], vertices)
     subject = _subject_from_forward(forward)
@@ -230,6 +219,22 @@ def make_dics(info, forward, csd, reg=0.05, noise_csd=None, label=None,
     return filters
 
 
+def _csd_matrices(csd):
+    """Get the CSD matrices of all frequencies, shape (n_freqs, n, n)."""
+    return np.moveaxis(_vector_to_sym_mat(csd._data), -1, 0)
+
+
+def _concatenate_csds(csds):
+    """Concatenate the frequencies of CSDs of the same channels."""
+    frequencies = []
+    for csd in csds:
+        frequencies.extend(csd.frequencies)
+    return CrossSpectralDensity(
+        np.concatenate([csd._data for csd in csds], axis=1),
+        csds[0].ch_names, frequencies, csds[0].n_fft, tmin=csds[0].tmin,
+        tmax=csds[-1].tmax, projs=csds[0].projs)
+
+
 def _prepare_noise_csd(csd, noise_csd, real_filter):
     if noise_csd is not None:
         csd, noise_csd = equalize_channels([csd, noise_csd])
@@ -440,31 +445,23 @@ def apply_dics_csd(csd, filters, verbose=None):
     n_orient = 3 if filters['is_free_ori'] else 1
     subject = filters['subject']
     whitener = filters['whitener']
-    n_sources = filters['n_sources']
 
     # If CSD is summed over multiple frequencies, take the average frequency
     frequencies = [np.mean(dfreq) for dfreq in csd.frequencies]
     n_freqs = len(frequencies)
 
-    source_power = np.zeros((n_sources, len(csd.frequencies)))
-
     # Ensure the CSD is in the same order as the weights
     csd_picks = [csd.ch_names.index(ch) for ch in ch_names]
 
-    logger.info('Computing DICS source power...')
-    for i, freq in enumerate(frequencies):
-        if n_freqs > 1:
-            logger.info('    applying DICS spatial filter at %sHz (%d/%d)' %
-                        (freq, i + 1, n_freqs))
+    logger.info('Computing DICS source power at %d frequenc%s...'
+                % (n_freqs, 'y' if n_freqs == 1 else 'ies'))
+    Cm = _csd_matrices(csd)[:, csd_picks][:, :, csd_picks]
+    W = filters['weights'][np.arange(n_freqs)]
 
-        Cm = csd.get_data(index=i)
-        Cm = Cm[csd_picks, :][:, csd_picks]
-        W = filters['weights'][i]
+    # Whiten the CSDs
+    Cm = np.matmul(np.matmul(whitener, Cm), whitener.conj().T)
 
-        # Whiten the CSD
-        Cm = np.dot(whitener, np.dot(Cm, whitener.conj().T))
-
-        source_power[:, i] = _compute_power(Cm, W, n_orient)
+    source_power = _compute_power(Cm, W, n_orient).T
 
     logger.info('[done]')
 
@@ -697,8 +694,10 @@ def tf_dics(epochs, forward, noise_csds, tmin, tmax, tstep, win_lengths,
             else:
                 mt_bandwidth = mt_bandwidths[i_freq]
 
-        sol_single = []
-        sol_overlap = []
+        # Find the time windows, keeping track of how many of them have been
+        # computed by each time step
+        windows = []
+        n_windows = []
         for i_time in range(n_time_steps):
             win_tmin = tmin + i_time * tstep
             win_tmax = win_tmin + win_length
@@ -717,53 +716,66 @@ def tf_dics(epochs, forward, noise_csds, tmin, tmax, tstep, win_lengths,
                 # Counteracts unsafe floating point arithmetic ensuring all
                 # relevant samples will be taken into account when selecting
                 # data in time windows
-                logger.info(
-                    'Computing time-frequency DICS beamformer for time '
-                    'window %d to %d ms, in frequency range %d to %d Hz' %
-                    (win_tmin * 1e3, win_tmax * 1e3, fmin, fmax)
-                )
-
-                # Calculating data CSD in current time window
-                if mode == 'fourier':
-                    csd = csd_fourier(
-                        epochs, fmin=fmin, fmax=fmax, tmin=win_tmin,
-                        tmax=win_tmax, n_fft=n_fft, verbose=False)
-                elif mode == 'multitaper':
-                    csd = csd_multitaper(
-                        epochs, fmin=fmin, fmax=fmax, tmin=win_tmin,
-                        tmax=win_tmax, n_fft=n_fft, bandwidth=mt_bandwidth,
-                        low_bias=mt_low_bias, verbose=False)
-                elif mode == 'cwt_morlet':
-                    csd = csd_morlet(
-                        epochs, frequencies=freq_bin, tmin=win_tmin,
-                        tmax=win_tmax, n_cycles=cwt_n_cycles, decim=decim,
-                        verbose=False)
-                else:
-                    raise ValueError('Invalid mode, choose either '
-                                     "'fourier' or 'multitaper'")
-
-                csd = csd.sum()
-
-                # Scale data CSD to allow data and noise CSDs to have different
-                # length
-                csd._data /= csd.n_fft
-
-                filters = make_dics(epochs.info, forward, csd, reg=reg,
-                                    label=label, pick_ori=pick_ori,
-                                    rank=rank, inversion=inversion,
-                                    weight_norm=weight_norm, depth=depth,
-                                    normalize_fwd=normalize_fwd,
-                                    reduce_rank=reduce_rank,
-                                    real_filter=real_filter, verbose=False)
-                stc, _ = apply_dics_csd(csd, filters, verbose=False)
-
-                if noise_csds is not None:
-                    # Scale signal power by noise power
-                    noise_stc, _ = apply_dics_csd(noise_csd, filters,
-                                                  verbose=False)
-                    stc /= noise_stc
-
-                sol_single.append(stc.data[:, 0])
+                windows.append((win_tmin, win_tmax))
+            n_windows.append(len(windows))
+
+        csds = []
+        for win_tmin, win_tmax in windows:
+            logger.info(
+                'Computing time-frequency DICS beamformer for time '
+                'window %d to %d ms, in frequency range %d to %d Hz' %
+                (win_tmin * 1e3, win_tmax * 1e3, fmin, fmax)
+            )
+
+            # Calculating data CSD in current time window
+            if mode == 'fourier':
+                csd = csd_fourier(
+                    epochs, fmin=fmin, fmax=fmax, tmin=win_tmin,
+                    tmax=win_tmax, n_fft=n_fft, verbose=False)
+            elif mode == 'multitaper':
+                csd = csd_multitaper(
+                    epochs, fmin=fmin, fmax=fmax, tmin=win_tmin,
+                    tmax=win_tmax, n_fft=n_fft, bandwidth=mt_bandwidth,
+                    low_bias=mt_low_bias, verbose=False)
+            elif mode == 'cwt_morlet':
+                csd = csd_morlet(
+                    epochs, frequencies=freq_bin, tmin=win_tmin,
+                    tmax=win_tmax, n_cycles=cwt_n_cycles, decim=decim,
+                    verbose=False)
+            else:
+                raise ValueError('Invalid mode, choose either '
+                                 "'fourier' or 'multitaper'")
+
+            csd = csd.sum()
+
+            # Scale data CSD to allow data and noise CSDs to have different
+            # length
+            csd._data /= csd.n_fft
+            csds.append(csd)
+
+        # The filters of all time windows are computed and applied together,
+        # treating each window as one frequency of a single CSD
+        csd = _concatenate_csds(csds)
+        filters = make_dics(epochs.info, forward, csd, reg=reg,
+                            label=label, pick_ori=pick_ori,
+                            rank=rank, inversion=inversion,
+                            weight_norm=weight_norm, depth=depth,
+                            normalize_fwd=normalize_fwd,
+                            reduce_rank=reduce_rank,
+                            real_filter=real_filter, verbose=False)
+        stc, _ = apply_dics_csd(csd, filters, verbose=False)
+
+        if noise_csds is not None:
+            # Scale signal power by noise power
+            noise_stc, _ = apply_dics_csd(
+                _concatenate_csds([noise_csd] * len(windows)), filters,
+                verbose=False)
+            stc /= noise_stc
+
+        sol_windows = list(stc.data.T)
+        sol_overlap = []
+        for i_time in range(n_time_steps):
+            sol_single = sol_windows[:n_windows[i_time]]
 
             # Average over all time windows that contain the current time
             # point, which is the current time window along with
@@ -342,6 +342,39 @@ def test_apply_dics_csd(_load_forward, idx, inversion, weight_norm):
         assert power.data[source_ind, 1] > power.data[source_ind, 0]
 
 
+@pytest.mark.parametrize('pick_ori, weight_norm', [
+    (None, None),
+    ('max-power', 'unit-noise-gain'),
+    ('normal', 'nai'),
+])
+def test_make_dics_frequencies(_load_forward, pick_ori, weight_norm,
+                               monkeypatch):
+    """Test that filters of several frequencies are computed together."""
+    _, fwd_surf, _, _ = _load_forward
+    epochs, _, csd, _, label, _, _ = _simulate_data(fwd_surf, 100)
+    epochs.pick_types(meg='grad')
+    kwargs = dict(label=label, reg=1, pick_ori=pick_ori,
+                  weight_norm=weight_norm, rank=None)
+    filters = make_dics(epochs.info, fwd_surf, csd, **kwargs)
+    power, _ = apply_dics_csd(csd, filters)
+    # one block of sources per frequency
+    monkeypatch.setattr(
+        mne.beamformer._compute_beamformer, '_BLOCK_SIZE', 1)
+    filters_block = make_dics(epochs.info, fwd_surf, csd, **kwargs)
+    assert_allclose(filters_block['weights'], filters['weights'])
+    for fi in range(len(csd.frequencies)):
+        this_csd = csd[fi]
+        filters_freq = make_dics(epochs.info, fwd_surf, this_csd, **kwargs)
+        assert_allclose(filters_freq['weights'],
+                        filters['weights'][fi:fi + 1], rtol=1e-6,
+                        atol=1e-7 * np.abs(filters['weights']).max())
+        if pick_ori == 'max-power':
+            assert_allclose(filters_freq['max_power_ori'],
+                            filters['max_power_ori'][fi:fi + 1], atol=1e-6)
+        power_freq, _ = apply_dics_csd(this_csd, filters_freq)
+        assert_allclose(power_freq.data[:, 0], power.data[:, fi], rtol=1e-6)
+
+
 @pytest.mark.parametrize('pick_ori', [None, 'normal', 'max-power'])
 @pytest.mark.parametrize('inversion', ['single', 'matrix'])
 @idx_param
@@ -19,8 +19,6 @@
 #
 # License: BSD (3-clause)
 
-from functools import partial
-
 import numpy as np
 from scipy import linalg
 import itertools
@@ -34,9 +32,13 @@ from .io.constants import FIFF
 from .io.ctf.trans import _make_ctf_coord_trans_set
 from .forward import (_magnetic_dipole_field_vec, _create_meg_coils,
                       _concatenate_coils)
+from .forward._compute_forward import (_magnetic_dipole_fields,
+                                       _magnetic_dipole_fields_jac,
+                                       _MIN_DIST_LIMIT)
 from .cov import make_ad_hoc_cov, compute_whitener
 from .dipole import _make_guesses
 from .fixes import jit
+from .parallel import parallel_func
 from .preprocessing.maxwell import (_sss_basis, _prep_mf_coils,
                                     _regularize_out, _get_mf_picks_fix_mags)
 from .transforms import (apply_trans, invert_transform, _angle_between_quats,
@@ -50,6 +52,11 @@ from .utils import (verbose, logger, use_log_level, _check_fname, warn,
 #   high-passing of data during fits
 #   parsing cHPI coil information from acq pars, then to PSD if necessary
 
+# Maximum number of (channel x time) window elements fit at once
+_CHPI_BATCH_SIZE = 2 ** 23
+# Number of time points whose coil locations are fit at once
+_CHPI_LOCS_CHUNK = 64
+
 
 # ############################################################################
 # Reading from text or FIF file
@@ -337,55 +344,93 @@ def _get_hpi_initial_fit(info, adjust=False, verbose=None):
     return hpi_rrs.astype(float)
 
 
-def _magnetic_dipole_objective(x, B, B2, coils, whitener, too_close,
-                               return_moment=False):
-    """Project data onto right eigenvectors of whitened forward."""
-    fwd = _magnetic_dipole_field_vec(x[np.newaxis], coils, too_close)
-    out, u, s, one = _magnetic_dipole_delta(fwd, whitener, B, B2)
-    if return_moment:
-        one /= s
-        Q = np.dot(one, u.T)
-        out = (out, Q)
-    return out
+def _magnetic_dipole_delta_multi(whitened_fwd_svd, B, B2):
+    # Here we use .T to get whitener to Fortran order, which speeds things up
+    one = np.dot(whitened_fwd_svd.reshape(-1, B.shape[0]), B)
+    one.shape = whitened_fwd_svd.shape[:2] + B.shape[1:]
+    Bm2 = np.sum(one * one, axis=1)
+    return B2 - Bm2
 
 
-@jit()
-def _magnetic_dipole_delta(fwd, whitener, B, B2):
-    # Here we use .T to get whitener to Fortran order, which speeds things up
-    fwd = np.dot(fwd, whitener.T)
+def _magnetic_dipole_lsq(rrs, B, whitener, coils):
+    """Fit the moments of many magnetic dipoles at fixed positions."""
+    fwd, min_dist = _magnetic_dipole_fields(rrs, coils)
+    fwd = np.matmul(fwd, whitener.T)
     u, s, v = np.linalg.svd(fwd, full_matrices=False)
-    one = np.dot(v, B)
-    Bm2 = np.dot(one, one)
-    return B2 - Bm2, u, s, one
+    one = np.matmul(v, B[:, :, np.newaxis])
+    resid = B - np.matmul(v.transpose(0, 2, 1), one)[..., 0]
+    Q = np.matmul(u, one / s[:, :, np.newaxis])[..., 0]
+    return resid, Q, v, min_dist
 
 
-def _magnetic_dipole_delta_multi(whitened_fwd_svd, B, B2):
-    # Here we use .T to get whitener to Fortran order, which speeds things up
-    one = np.matmul(whitened_fwd_svd, B)
-    Bm2 = np.sum(one * one, axis=1)
-    return B2 - Bm2
+def _magnetic_dipole_resid_jac(rrs, Q, v, whitener, coils):
+    """Approximate the Jacobian of the whitened residuals wrt position."""
+    # Kaufman's approximation to the variable projection Jacobian
+    jac = np.matmul(_magnetic_dipole_fields_jac(rrs, Q, coils), whitener.T)
+    jac -= np.matmul(np.matmul(jac, v.transpose(0, 2, 1)), v)
+    jac *= -1
+    return jac
+
 
+def _fit_magnetic_dipoles(B_orig, x0, too_close, whitener, coils, guesses,
+                          max_iter=50):
+    """Fit many bits of data at once (x0 = pos).
 
-def _fit_magnetic_dipole(B_orig, x0, too_close, whitener, coils, guesses):
-    """Fit a single bit of data (x0 = pos)."""
-    from scipy.optimize import fmin_cobyla
-    B = np.dot(whitener, B_orig)
-    B2 = np.dot(B, B)
-    objective = partial(_magnetic_dipole_objective, B=B, B2=B2,
-                        coils=coils, whitener=whitener,
-                        too_close=too_close)
+    Each dipole position is refined using its own Levenberg-Marquardt
+    iterations and the analytic derivative of the magnetic dipole field.
+    """
+    B = np.dot(B_orig, whitener.T)
+    B2 = np.sum(B * B, axis=1)
+    x = x0.copy()
+    resid, Q, v, min_dist = _magnetic_dipole_lsq(x, B, whitener, coils)
+    res = np.sum(resid * resid, axis=1)
     if guesses is not None:
-        res0 = objective(x0)
-        res = _magnetic_dipole_delta_multi(
-            guesses['whitened_fwd_svd'], B, B2)
-        assert res.shape == (guesses['rr'].shape[0],)
-        idx = np.argmin(res)
-        if res[idx] < res0:
-            x0 = guesses['rr'][idx]
-    x = fmin_cobyla(objective, x0, (), rhobeg=1e-3, rhoend=1e-5, disp=False)
-    gof, moment = objective(x, return_moment=True)
-    gof = 1. - gof / B2
-    return x, gof, moment
+        res_guess = _magnetic_dipole_delta_multi(
+            guesses['whitened_fwd_svd'], B.T, B2).T
+        assert res_guess.shape == (len(B), guesses['rr'].shape[0])
+        idx = np.argmin(res_guess, axis=1)
+        use = res_guess[np.arange(len(B)), idx] < res
+        if use.any():
+            x[use] = guesses['rr'][idx[use]]
+            resid[use], Q[use], v[use], min_dist[use] = _magnetic_dipole_lsq(
+                x[use], B[use], whitener, coils)
+            res[use] = np.sum(resid[use] * resid[use], axis=1)
+    jac = _magnetic_dipole_resid_jac(x, Q, v, whitener, coils)
+    lam = np.full(len(x), 1e-3)
+    active = np.ones(len(x), bool)
+    diag = (Ellipsis, np.arange(3), np.arange(3))
+    for _ in range(max_iter):
+        idx = np.where(active)[0]
+        if len(idx) == 0:
+            break
+        JTJ = np.matmul(jac[idx], jac[idx].transpose(0, 2, 1))
+        JTJ[diag] *= 1. + lam[idx, np.newaxis]
+        delta = np.matmul(jac[idx], resid[idx][:, :, np.newaxis])
+        delta = -np.linalg.solve(JTJ, delta)[..., 0]
+        x_new = x[idx] + delta
+        resid_new, Q_new, v_new, min_dist_new = _magnetic_dipole_lsq(
+            x_new, B[idx], whitener, coils)
+        res_new = np.sum(resid_new * resid_new, axis=1)
+        # never step into the coils
+        better = (res_new < res[idx]) & (min_dist_new >= _MIN_DIST_LIMIT)
+        good = idx[better]
+        x[good], res[good], resid[good] = \
+            x_new[better], res_new[better], resid_new[better]
+        Q[good], min_dist[good] = Q_new[better], min_dist_new[better]
+        jac[good] = _magnetic_dipole_resid_jac(
+            x_new[better], Q_new[better], v_new[better], whitener, coils)
+        lam[good] /= 10.
+        lam[idx[~better]] *= 10.
+        step = np.linalg.norm(delta, axis=1)
+        active[idx[(better & (step < 1e-7)) | (lam[idx] > 1e10)]] = False
+    if (min_dist < _MIN_DIST_LIMIT).any():
+        msg = 'Coil too close (dist = %g mm)' % (min_dist.min() * 1000,)
+        if too_close == 'raise':
+            raise RuntimeError(msg)
+        func = warn if too_close == 'warning' else logger.info
+        func(msg)
+    gof = 1. - res / B2
+    return x, gof, Q
 
 
 @jit()
@@ -566,6 +611,54 @@ def _fit_chpi_amplitudes(raw, time_sl, hpi):
                      hpi['model'], hpi['inv_model_reord'])
 
 
+def _fit_chpi_amplitudes_batch(raw, starts, hpi):
+    """Fit cHPI amplitudes for full-length windows from one data read.
+
+    Returns
+    -------
+    sin_fit : ndarray, shape (n_windows, n_freqs, n_channels)
+        The sin amplitudes matching each cHPI frequency for each window
+        starting at ``starts``. Windows that should be skipped are all nan.
+    """
+    n_window = hpi['n_window']
+    n_freqs = len(hpi['freqs'])
+    start, stop = starts[0], starts[-1] + n_window
+    offsets = starts - start
+    picks = hpi['meg_picks']
+    if hpi['hpi_pick'] is not None:
+        picks = np.concatenate([picks, [hpi['hpi_pick']]])
+    with use_log_level(False):
+        data = raw[picks, start:stop][0]
+    # Projecting the entire block is equivalent to projecting each window
+    proj_data = np.dot(hpi['proj_op'], data[:len(hpi['meg_picks'])])
+    windows = _sliding_windows(proj_data, offsets, n_window)
+    # (n_windows, n_channels, 2 * n_freqs) sin/cos pairs for each frequency
+    X = np.matmul(windows, hpi['inv_model_reord'][:2 * n_freqs].T)
+    X = X.reshape(X.shape[:2] + (n_freqs, 2)).transpose(0, 2, 3, 1)
+    # Batched SVD across all sensors to estimate each sinusoid's phase,
+    # keeping only the predominant phase direction (as in _fast_fit)
+    _, s, vt = np.linalg.svd(X, full_matrices=False)
+    sin_fit = vt[:, :, 0] * s[:, :, :1]
+
+    # which HPI coils to use
+    if hpi['hpi_pick'] is not None:
+        ons = (np.round(data[-1]).astype(np.int64) &
+               hpi['on'][:, np.newaxis]).astype(bool)
+        ons = _sliding_windows(ons, offsets, n_window).all(axis=-1)
+        sin_fit[ons.sum(axis=-1) < 3] = np.nan
+    return sin_fit
+
+
+def _sliding_windows(data, offsets, n_window):
+    """Get (n_offsets, ..., n_window) windows of data."""
+    data = np.ascontiguousarray(data)
+    windows = np.lib.stride_tricks.as_strided(
+        data, shape=(data.shape[-1] - n_window + 1,) + data.shape[:-1] +
+        (n_window,), strides=(data.strides[-1],) + data.strides,
+        writeable=False)
+    return windows[offsets]
+
+
 @jit()
 def _fast_fit(this_data, proj, n_freqs, model, inv_model_reord):
     # first or last window
@@ -858,24 +951,36 @@ def compute_chpi_amplitudes(raw, t_step_min=0.01, t_window='auto',
         (len(sin_fits['times']),
          len(hpi['freqs']),
          len(sin_fits['proj']['data']['col_names'])))
-    for mi, midpt in enumerate(ProgressBar(fit_idxs, mesg='cHPI amplitudes')):
-        #
-        # 0. determine samples to fit.
-        #
-        time_sl = midpt - hpi['n_window'] // 2
-        time_sl = slice(max(time_sl, 0),
-                        min(time_sl + hpi['n_window'], len(raw.times)))
-
-        #
-        # 1. Fit amplitudes for each channel from each of the N sinusoids
-        #
+    starts = fit_idxs - hpi['n_window'] // 2
+    full = (starts >= 0) & (starts + hpi['n_window'] <= len(raw.times))
+    pb = ProgressBar(len(fit_idxs), mesg='cHPI amplitudes')
+    #
+    # 0. Windows that are truncated by the start or end of the data get
+    #    their own (reduced) model.
+    #
+    for mi in np.where(~full)[0]:
+        time_sl = slice(max(starts[mi], 0),
+                        min(starts[mi] + hpi['n_window'], len(raw.times)))
         sin_fits['slopes'][mi] = _fit_chpi_amplitudes(raw, time_sl, hpi)
+        pb.update_with_increment_value(1)
+    #
+    # 1. All other windows share a model, so fit them in blocks read from
+    #    one contiguous chunk of data.
+    #
+    full = np.where(full)[0]
+    n_batch = max(_CHPI_BATCH_SIZE // (len(hpi['meg_picks']) *
+                                       hpi['n_window']), 1)
+    for ii in range(0, len(full), n_batch):
+        these = full[ii:ii + n_batch]
+        sin_fits['slopes'][these] = _fit_chpi_amplitudes_batch(
+            raw, starts[these], hpi)
+        pb.update_with_increment_value(len(these))
     return sin_fits
 
 
 @verbose
 def compute_chpi_locs(info, chpi_amplitudes, t_step_max=1., too_close='raise',
-                      adjust_dig=False, verbose=None):
+                      adjust_dig=False, n_jobs=1, verbose=None):
     """Compute locations of each cHPI coils over time.
 
     Parameters
@@ -890,6 +995,9 @@ def compute_chpi_locs(info, chpi_amplitudes, t_step_max=1., too_close='raise',
         How to handle HPI positions too close to the sensors,
         can be 'raise' (default), 'warning', or 'info'.
     %(chpi_adjust_dig)s
+    %(n_jobs)s
+
+        .. versionadded:: 0.21
     %(verbose)s
 
     Returns
@@ -957,16 +1065,11 @@ def compute_chpi_locs(info, chpi_amplitudes, t_step_max=1., too_close='raise',
     guesses = dict(rr=guesses, whitened_fwd_svd=fwd)
     del fwd, R
 
-    iter_ = list(zip(sin_fits['times'], sin_fits['slopes']))
-    chpi_locs = dict(times=[], rrs=[], gofs=[], moments=[])
-    # setup last iteration structure
-    hpi_dig_dev_rrs = apply_trans(
-        invert_transform(info['dev_head_t'])['trans'],
-        _get_hpi_initial_fit(info, adjust=adjust_dig))
-    last = dict(sin_fit=None, coil_fit_time=sin_fits['times'][0] - 1,
-                coil_dev_rrs=hpi_dig_dev_rrs)
-    del hpi_dig_dev_rrs
-    for fit_time, sin_fit in ProgressBar(iter_, mesg='cHPI locations '):
+    # determine which time points need to be fit
+    fit_idx = list()
+    last = dict(sin_fit=None, coil_fit_time=sin_fits['times'][0] - 1)
+    for ti, (fit_time, sin_fit) in enumerate(zip(sin_fits['times'],
+                                                 sin_fits['slopes'])):
         # skip this window if bad
         if not np.isfinite(sin_fit).all():
             continue
@@ -982,26 +1085,42 @@ def compute_chpi_locs(info, chpi_amplitudes, t_step_max=1., too_close='raise',
                     (corrs > 0.98).sum() >= 3:
                 # don't need to refit data
                 continue
-
-        # update 'last' sin_fit *before* inplace sign mult
-        last['sin_fit'] = sin_fit.copy()
-
-        #
-        # 2. Fit magnetic dipole for each coil to obtain coil positions
-        #    in device coordinates
-        #
-        coil_fits = [_fit_magnetic_dipole(f, x0, too_close, whitener,
-                                          meg_coils, guesses)
-                     for f, x0 in zip(sin_fit, last['coil_dev_rrs'])]
-        rrs, gofs, moments = zip(*coil_fits)
-        chpi_locs['times'].append(fit_time)
-        chpi_locs['rrs'].append(rrs)
-        chpi_locs['gofs'].append(gofs)
-        chpi_locs['moments'].append(moments)
+        last['sin_fit'] = sin_fit
         last['coil_fit_time'] = fit_time
-        last['coil_dev_rrs'] = rrs
-    for key, val in chpi_locs.items():
-        chpi_locs[key] = np.array(val, float)
+        fit_idx.append(ti)
+    del last
+    fit_idx = np.array(fit_idx, int)
+
+    #
+    # 2. Fit magnetic dipole for each coil to obtain coil positions
+    #    in device coordinates, in chunks of time points (warm-started from
+    #    the previous chunk) split across jobs
+    #
+    n_coils = sin_fits['slopes'].shape[1]
+    chpi_locs = dict(times=sin_fits['times'][fit_idx],
+                     rrs=np.empty((len(fit_idx), n_coils, 3)),
+                     gofs=np.empty((len(fit_idx), n_coils)),
+                     moments=np.empty((len(fit_idx), n_coils, 3)))
+    last_rrs = apply_trans(
+        invert_transform(info['dev_head_t'])['trans'],
+        _get_hpi_initial_fit(info, adjust=adjust_dig))
+    parallel, p_fun, _ = parallel_func(_fit_magnetic_dipoles, n_jobs,
+                                       verbose=False)
+    pb = ProgressBar(len(fit_idx), mesg='cHPI locations ')
+    for start in range(0, len(fit_idx), _CHPI_LOCS_CHUNK):
+        sl = slice(start, start + _CHPI_LOCS_CHUNK)
+        B = sin_fits['slopes'][fit_idx[sl]]
+        n_fit = len(B)
+        B = B.reshape(-1, B.shape[-1])
+        x0 = np.tile(last_rrs, (n_fit, 1))
+        splits = np.array_split(np.arange(len(B)), min(n_jobs, len(B)))
+        out = parallel(p_fun(B[split], x0[split], too_close, whitener,
+                             meg_coils, guesses) for split in splits)
+        for key, val in zip(('rrs', 'gofs', 'moments'), zip(*out)):
+            val = np.concatenate(val)
+            chpi_locs[key][sl] = val.reshape((n_fit, n_coils) + val.shape[1:])
+        last_rrs = chpi_locs['rrs'][sl][-1]
+        pb.update_with_increment_value(n_fit)
     return chpi_locs
 
 
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+r"""Precompute the surface morph matrices of subjects to a common subject.
+
+The morph matrices are stored in the morph cache directory (the
+``MNE_MORPH_CACHE_DIR`` config value, or the ``--cache-dir`` option), from
+which :func:`mne.compute_source_morph`, :func:`mne.grade_to_vertices` and
+:func:`mne.morph_source_spaces` read them instead of computing them again
+(as long as ``MNE_MORPH_CACHE_DIR`` points to this directory).
+
+Examples
+--------
+.. code-block:: console
+
+    $ mne precompute_morph -s sub-01 -s sub-02 --subject-to fsaverage \
+          --src {subject}/bem/{subject}-oct-6-src.fif --spacing 5 \
+          --cache-dir ~/morph-cache
+
+"""
+
+import os
+import sys
+
+import mne
+from mne.parallel import parallel_func
+
+
+def _precompute_morph(subject, src_fname, subject_to, subjects_dir, spacing,
+                      smooth, verbose):
+    """Compute (and cache) the morph matrix of one subject."""
+    src = mne.read_source_spaces(src_fname, verbose=verbose)
+    mne.compute_source_morph(src, subject_from=subject, subject_to=subject_to,
+                             subjects_dir=subjects_dir, spacing=spacing,
+                             smooth=smooth, warn=False, verbose=verbose)
+
+
+def run():
+    """Run command."""
+    from mne.commands.utils import get_optparser, _add_verbose_flag
+    parser = get_optparser(__file__)
+
+    parser.add_option('-s', '--subject', dest='subjects',
+                      help='Subject to morph from, can be given several '
+                           'times (required)',
+                      action='append', default=None)
+    parser.add_option('--subject-to', dest='subject_to',
+                      help='Subject to morph to (default fsaverage)',
+                      default='fsaverage')
+    parser.add_option('--src', dest='src',
+                      help='Source space file name of each subject, in which '
+                           '{subject} is replaced by the subject name. '
+                           'Relative paths are relative to the subjects '
+                           'directory (default '
+                           '{subject}/bem/{subject}-oct-6-src.fif)',
+                      default=os.path.join('{subject}', 'bem',
+                                           '{subject}-oct-6-src.fif'))
+    parser.add_option('--spacing', dest='spacing',
+                      help='Icosahedral grade of the destination source '
+                           'space (default 5)',
+                      default=5, type='int')
+    parser.add_option('--smooth', dest='smooth',
+                      help='Number of smoothing iterations (default None, '
+                           'i.e. as many as needed to fill the surface)',
+                      default=None, type='int')
+    parser.add_option('-d', '--subjects-dir', dest='subjects_dir',
+                      help='Subjects directory', default=None)
+    parser.add_option('--cache-dir', dest='cache_dir',
+                      help='Directory in which to store the morph matrices '
+                           '(default MNE_MORPH_CACHE_DIR)',
+                      default=None)
+    parser.add_option('-j', '--n-jobs', dest='n_jobs',
+                      help='The number of subjects to process in parallel '
+                           '(default 1). Requires the joblib package.',
+                      default=1, type='int')
+    _add_verbose_flag(parser)
+
+    options, args = parser.parse_args()
+
+    if options.subjects is None:
+        parser.print_help()
+        sys.exit(1)
+
+    subjects_dir = mne.utils.get_subjects_dir(options.subjects_dir,
+                                              raise_error=True)
+    cache_dir = options.cache_dir
+    if cache_dir is None:
+        cache_dir = mne.get_config('MNE_MORPH_CACHE_DIR')
+        if cache_dir is None:
+            raise ValueError('The cache directory must be given with '
+                             '--cache-dir if MNE_MORPH_CACHE_DIR is not set')
+    # the environment takes precedence over the config file, and is
+    # inherited by the parallel jobs
+    os.environ['MNE_MORPH_CACHE_DIR'] = os.path.expanduser(cache_dir)
+    verbose = True if options.verbose is not None else False
+
+    src_fnames = [os.path.join(subjects_dir,
+                               options.src.format(subject=subject))
+                  for subject in options.subjects]
+    parallel, my_precompute_morph, _ = parallel_func(
+        _precompute_morph, options.n_jobs)
+    parallel(my_precompute_morph(
+        subject, src_fname, options.subject_to, subjects_dir,
+        options.spacing, options.smooth, verbose)
+        for subject, src_fname in zip(options.subjects, src_fnames))
+
+
+mne.utils.run_command_if_main()
@@ -19,7 +19,8 @@ from mne.commands import (mne_browse_raw, mne_bti2fiff, mne_clean_eog_ecg,
                           mne_compare_fiff, mne_flash_bem, mne_show_fiff,
                           mne_show_info, mne_what, mne_setup_source_space,
                           mne_setup_forward_model, mne_anonymize,
-                          mne_prepare_bem_model, mne_sys_info)
+                          mne_prepare_bem_model, mne_sys_info,
+                          mne_precompute_morph)
 from mne.datasets import testing
 from mne.io import read_raw_fif, read_info
 from mne.utils import (run_tests_if_main, requires_mne,
@@ -330,6 +331,22 @@ def test_setup_source_space(tmpdir):
             assert mne_setup_source_space.run()
 
 
+@testing.requires_testing_data
+def test_precompute_morph(tmpdir, monkeypatch):
+    """Test mne precompute_morph."""
+    check_usage(mne_precompute_morph, force_help=True)
+    cache_dir = op.join(str(tmpdir), 'cache')
+    monkeypatch.delenv('MNE_MORPH_CACHE_DIR', raising=False)
+    src = op.join('{subject}', 'bem', '{subject}-oct-6-src.fif')
+    with ArgvSetter(('-s', 'sample', '--subject-to', 'fsaverage',
+                     '--src', src, '--spacing', '3', '--smooth', '5',
+                     '-d', subjects_dir, '--cache-dir', cache_dir)):
+        mne_precompute_morph.run()
+    fnames = sorted(os.listdir(cache_dir))
+    assert len(fnames) == 2
+    assert fnames[1].startswith('sample-fsaverage-morph-mat-')
+
+
 @testing.requires_testing_data
 def test_setup_forward_model(tmpdir):
     """Test mne setup_forward_model."""
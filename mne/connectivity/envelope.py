@@ -7,9 +7,13 @@
 import numpy as np
 
 from ..filter import next_fast_len
+from ..fixes import rfft, ifft
 from ..source_estimate import _BaseSourceEstimate
 from ..utils import verbose, _check_combine, _check_option
 
+# number of orthogonalized samples to process at once
+_ORTH_BLOCK_SIZE = 2 ** 22
+
 
 @verbose
 def envelope_correlation(data, combine='mean', orthogonalize="pairwise",
@@ -25,6 +29,10 @@ def envelope_correlation(data, combine='mean', orthogonalize="pairwise",
         object (and ``stc.data`` will be used). If it's float data,
         the Hilbert transform will be applied; if it's complex data,
         it's assumed the Hilbert has already been applied.
+        The computations are done in double precision, one epoch at a
+        time, so a generator can be used to limit memory usage. For single
+        precision (float32 or complex64) data, only the returned array is
+        single precision (float32).
     combine : 'mean' | callable | None
         How to combine correlation estimates across epochs.
         Default is 'mean'. Can be None to return without combining.
@@ -64,7 +72,6 @@ def envelope_correlation(data, combine='mean', orthogonalize="pairwise",
            Neuroimage 174:57–68
     """
     _check_option('orthogonalize', orthogonalize, (False, 'pairwise'))
-    from scipy.signal import hilbert
     n_nodes = None
     if combine is not None:
         fun = _check_combine(combine, valid=('mean',))
@@ -87,44 +94,81 @@ def envelope_correlation(data, combine='mean', orthogonalize="pairwise",
             raise ValueError('n_nodes mismatch between data[0] and data[%d], '
                              'got %s and %s'
                              % (ei, n_nodes, corrs[0].shape[0]))
+        single = epoch_data.dtype in (np.float32, np.complex64)
+        if single:
+            epoch_data = epoch_data.astype(
+                np.promote_types(epoch_data.dtype, np.float64))
         # Get the complex envelope (allowing complex inputs allows people
         # to do raw.apply_hilbert if they want)
-        if epoch_data.dtype in (np.float32, np.float64):
-            n_fft = next_fast_len(n_times)
-            epoch_data = hilbert(epoch_data, N=n_fft, axis=-1)[..., :n_times]
+        if epoch_data.dtype == np.float64:
+            epoch_data = _hilbert(epoch_data)
 
-        if epoch_data.dtype not in (np.complex64, np.complex128):
+        if epoch_data.dtype != np.complex128:
             raise ValueError('data.dtype must be float or complex, got %s'
                              % (epoch_data.dtype,))
-        data_mag = np.abs(epoch_data)
-        data_conj_scaled = epoch_data.conj()
-        data_conj_scaled /= data_mag
-        # subtract means
-        data_mag_nomean = data_mag - np.mean(data_mag, axis=-1, keepdims=True)
-        # compute variances using linalg.norm (square, sum, sqrt) since mean=0
-        data_mag_std = np.linalg.norm(data_mag_nomean, axis=-1)
-        data_mag_std[data_mag_std == 0] = 1
-        corr = np.empty((n_nodes, n_nodes))
-        for li, label_data in enumerate(epoch_data):
-            if orthogonalize is False:  # the new code
-                label_data_orth = data_mag
-                label_data_orth_std = data_mag_std
-            else:
-                label_data_orth = (label_data * data_conj_scaled).imag
-                label_data_orth -= np.mean(label_data_orth, axis=-1,
-                                           keepdims=True)
-                label_data_orth_std = np.linalg.norm(label_data_orth, axis=-1)
-                label_data_orth_std[label_data_orth_std == 0] = 1
-            # correlation is dot product divided by variances
-            corr[li] = np.dot(label_data_orth, data_mag_nomean[li])
-            corr[li] /= data_mag_std[li]
-            corr[li] /= label_data_orth_std
-        if orthogonalize is not False:
-            # Make it symmetric (it isn't at this point)
-            corr = np.abs(corr)
-            corr = (corr.T + corr) / 2.
+        corr = _envelope_corr(epoch_data, orthogonalize)
+        if single:
+            corr = corr.astype(np.float32)
         corrs.append(corr)
         del corr
 
     corr = fun(corrs)
     return corr
+
+
+def _hilbert(data):
+    """Compute the analytic signal along the last axis."""
+    n_times = data.shape[-1]
+    n_fft = next_fast_len(n_times)
+    data_fft = rfft(data, n_fft, axis=-1)
+    data_fft[..., 1:(n_fft + 1) // 2] *= 2
+    analytic = np.zeros(data.shape[:-1] + (n_fft,), data_fft.dtype)
+    analytic[..., :data_fft.shape[-1]] = data_fft
+    return ifft(analytic, axis=-1)[..., :n_times]
+
+
+def _envelope_corr(data, orthogonalize):
+    """Compute the envelope correlations of one epoch of analytic signals."""
+    n_nodes, n_times = data.shape
+    data_mag = np.abs(data)
+    # subtract means
+    data_mag_nomean = data_mag - np.mean(data_mag, axis=-1, keepdims=True)
+    # compute variances using linalg.norm (square, sum, sqrt) since mean=0
+    data_mag_std = np.linalg.norm(data_mag_nomean, axis=-1)
+    data_mag_std[data_mag_std == 0] = 1
+    if orthogonalize is False:
+        corr = np.dot(data_mag_nomean, data_mag_nomean.T)
+        corr /= data_mag_std[:, np.newaxis]
+        corr /= data_mag_std
+        return corr
+
+    # The signal of node i orthogonalized with respect to node j is
+    # imag(x_i * conj(x_j) / |x_j|) = re_i * q_j + im_i * p_j with
+    # p_j + 1j * q_j = conj(x_j) / |x_j|. Its variance is computed from the
+    # centered signals, as raw moments cancel badly for nearly collinear
+    # nodes, so it is formed for blocks of nodes j.
+    data_conj_scaled = data.conj()
+    data_conj_scaled /= data_mag
+    re, im = data.real, data.imag
+    p, q = data_conj_scaled.real, data_conj_scaled.imag
+    data_mag_nomean = data_mag_nomean[:, :, np.newaxis]
+    corr = np.empty((n_nodes, n_nodes))
+    orth_std = np.empty((n_nodes, n_nodes))
+    n_block = max(_ORTH_BLOCK_SIZE // (n_nodes * n_times), 1)
+    for start in range(0, n_nodes, n_block):
+        sl = slice(start, start + n_block)
+        orth = re[:, np.newaxis] * q[np.newaxis, sl]
+        orth += im[:, np.newaxis] * p[np.newaxis, sl]
+        orth -= np.mean(orth, axis=-1, keepdims=True)
+        # correlation is dot product divided by variances
+        corr[:, sl] = np.matmul(orth, data_mag_nomean)[..., 0]
+        orth_std[:, sl] = np.einsum('ijk,ijk->ij', orth, orth)
+        del orth
+    np.sqrt(orth_std, out=orth_std)
+    orth_std[orth_std == 0] = 1
+    corr /= data_mag_std[:, np.newaxis]
+    corr /= orth_std
+    # Make it symmetric (it isn't at this point)
+    corr = np.abs(corr)
+    corr = (corr.T + corr) / 2.
+    return corr
@@ -5,6 +5,7 @@
 
 from functools import partial
 from inspect import getmembers
+from itertools import chain
 
 import numpy as np
 
@@ -15,8 +16,7 @@ from ..parallel import parallel_func
 from ..source_estimate import _BaseSourceEstimate
 from ..epochs import BaseEpochs
 from ..time_frequency.multitaper import (_mt_spectra, _compute_mt_params,
-                                         _psd_from_mt, _csd_from_mt,
-                                         _psd_from_mt_adaptive)
+                                         _psd_from_mt, _psd_from_mt_adaptive)
 from ..time_frequency.tfr import morlet, cwt
 from ..utils import logger, verbose, _time_mask, warn
 
@@ -31,6 +31,10 @@ class _AbstractConEstBase(object):
         raise NotImplementedError('start_epoch method not implemented')
 
     def accumulate(self, con_idx, csd_xy):
+        # csd_xy has shape (n_cons, n_freqs[, n_times]) for one epoch, the
+        # built-in estimators get several epochs at once, with shape
+        # (n_epochs, n_cons, n_freqs[, n_times]), after start_epoch was called
+        # for each of them
         raise NotImplementedError('accumulate method not implemented')
 
     def combine(self, other):
@@ -75,7 +79,7 @@ class _CohEstBase(_EpochMeanConEstBase):
 
     def accumulate(self, con_idx, csd_xy):
         """Accumulate CSD for some connections."""
-        self._acc[con_idx] += csd_xy
+        self._acc[con_idx] += csd_xy.sum(axis=0)
 
 
 class _CohEst(_CohEstBase):
@@ -131,7 +135,7 @@ class _PLVEst(_EpochMeanConEstBase):
 
     def accumulate(self, con_idx, csd_xy):
         """Accumulate some connections."""
-        self._acc[con_idx] += csd_xy / np.abs(csd_xy)
+        self._acc[con_idx] += (csd_xy / np.abs(csd_xy)).sum(axis=0)
 
     def compute_con(self, con_idx, n_epochs):
         """Compute final con. score for some connections."""
@@ -154,7 +158,7 @@ class _ciPLVEst(_EpochMeanConEstBase):
 
     def accumulate(self, con_idx, csd_xy):
         """Accumulate some connections."""
-        self._acc[con_idx] += csd_xy / np.abs(csd_xy)
+        self._acc[con_idx] += (csd_xy / np.abs(csd_xy)).sum(axis=0)
 
     def compute_con(self, con_idx, n_epochs):
         """Compute final con. score for some connections."""
@@ -182,7 +186,7 @@ class _PLIEst(_EpochMeanConEstBase):
 
     def accumulate(self, con_idx, csd_xy):
         """Accumulate some connections."""
-        self._acc[con_idx] += np.sign(np.imag(csd_xy))
+        self._acc[con_idx] += np.sign(np.imag(csd_xy)).sum(axis=0)
 
     def compute_con(self, con_idx, n_epochs):
         """Compute final con. score for some connections."""
@@ -224,8 +228,8 @@ class _WPLIEst(_EpochMeanConEstBase):
     def accumulate(self, con_idx, csd_xy):
         """Accumulate some connections."""
         im_csd = np.imag(csd_xy)
-        self._acc[0, con_idx] += im_csd
-        self._acc[1, con_idx] += np.abs(im_csd)
+        self._acc[0, con_idx] += im_csd.sum(axis=0)
+        self._acc[1, con_idx] += np.abs(im_csd).sum(axis=0)
 
     def compute_con(self, con_idx, n_epochs):
         """Compute final con. score for some connections."""
@@ -261,9 +265,9 @@ class _WPLIDebiasedEst(_EpochMeanConEstBase):
     def accumulate(self, con_idx, csd_xy):
         """Accumulate some connections."""
         im_csd = np.imag(csd_xy)
-        self._acc[0, con_idx] += im_csd
-        self._acc[1, con_idx] += np.abs(im_csd)
-        self._acc[2, con_idx] += im_csd ** 2
+        self._acc[0, con_idx] += im_csd.sum(axis=0)
+        self._acc[1, con_idx] += np.abs(im_csd).sum(axis=0)
+        self._acc[2, con_idx] += (im_csd ** 2).sum(axis=0)
 
     def compute_con(self, con_idx, n_epochs):
         """Compute final con. score for some connections."""
@@ -309,7 +313,7 @@ class _PPCEst(_EpochMeanConEstBase):
         this_acc = csd_xy / denom
         this_acc[z_denom] = 0.  # handle division by zero
 
-        self._acc[con_idx] += this_acc
+        self._acc[con_idx] += this_acc.sum(axis=0)
 
     def compute_con(self, con_idx, n_epochs):
         """Compute final con. score for some connections."""
@@ -330,8 +334,13 @@ def _epoch_spectral_connectivity(data, sig_idx, tmin_idx, tmax_idx, sfreq,
                                  freq_mask, mt_adaptive, idx_map, block_size,
                                  psd, accumulate_psd, con_method_types,
                                  con_methods, n_signals, n_times,
-                                 accumulate_inplace=True):
-    """Estimate connectivity for one epoch (see spectral_connectivity)."""
+                                 accumulate_inplace=True, kernel=None):
+    """Estimate connectivity for a block of epochs (see spectral_connectivity).
+
+    ``data`` is a list of epochs, each of which is a list of arrays and/or
+    source estimates. If ``kernel`` is not None, the arrays contain the
+    signals the kernel is applied to.
+    """
     n_cons = len(idx_map[0])
 
     if wavelets is not None:
@@ -350,60 +359,90 @@ def _epoch_spectral_connectivity(data, sig_idx, tmin_idx, tmax_idx, sfreq,
     if len(sig_idx) == n_signals:
         # we use all signals: use a slice for faster indexing
         sig_idx = slice(None, None)
-
-    # compute tapered spectra
-    x_t = list()
-    this_psd = list()
-    for this_data in data:
-        if mode in ('multitaper', 'fourier'):
-            if isinstance(this_data, _BaseSourceEstimate):
-                _mt_spectra_partial = partial(_mt_spectra, dpss=window_fun,
-                                              sfreq=sfreq)
-                this_x_t = this_data.transform_data(
-                    _mt_spectra_partial, idx=sig_idx, tmin_idx=tmin_idx,
-                    tmax_idx=tmax_idx)
-            else:
-                this_x_t, _ = _mt_spectra(
-                    this_data[sig_idx, tmin_idx:tmax_idx],
-                    window_fun, sfreq)
-
-            if mt_adaptive:
-                # compute PSD and adaptive weights
-                _this_psd, weights = _psd_from_mt_adaptive(
-                    this_x_t, eigvals, freq_mask, return_weights=True)
-
-                # only keep freqs of interest
-                this_x_t = this_x_t[:, :, freq_mask]
-            else:
-                # do not use adaptive weights
-                this_x_t = this_x_t[:, :, freq_mask]
-                if mode == 'multitaper':
-                    weights = np.sqrt(eigvals)[np.newaxis, :, np.newaxis]
+    data_idx = sig_idx
+    if kernel is not None:
+        # compute the spectra of all input signals and project them
+        kernel = kernel[sig_idx]
+        data_idx = slice(None, None)
+
+    # compute the weighted spectra of all epochs, shape
+    # (n_epochs, n_freqs[, n_times], n_signals, n_tapers), scaled such that
+    # the CSD of two signals is the sum over tapers of the spectra of one
+    # times the conjugate spectra of the other
+    x_w = list()
+    this_psd = 0.
+    for this_epoch in data:
+        epoch_x_w, epoch_psd = list(), list()
+        if kernel is not None and len(this_epoch) > 1:
+            this_epoch = [np.concatenate(this_epoch, axis=0)]
+        for this_data in this_epoch:
+            if mode in ('multitaper', 'fourier'):
+                if isinstance(this_data, _BaseSourceEstimate):
+                    _mt_spectra_partial = partial(
+                        _mt_spectra, dpss=window_fun, sfreq=sfreq)
+                    this_x_t = this_data.transform_data(
+                        _mt_spectra_partial, idx=sig_idx, tmin_idx=tmin_idx,
+                        tmax_idx=tmax_idx)
                 else:
-                    # hack to so we can sum over axis=-2
-                    weights = np.array([1.])[:, None, None]
-
-                if accumulate_psd:
-                    _this_psd = _psd_from_mt(this_x_t, weights)
-        else:  # mode == 'cwt_morlet'
-            if isinstance(this_data, _BaseSourceEstimate):
-                cwt_partial = partial(cwt, Ws=wavelets, use_fft=True,
-                                      mode='same')
-                this_x_t = this_data.transform_data(
-                    cwt_partial, idx=sig_idx, tmin_idx=tmin_idx,
-                    tmax_idx=tmax_idx)
-            else:
-                this_x_t = cwt(this_data[sig_idx, tmin_idx:tmax_idx],
-                               wavelets, use_fft=True, mode='same')
-            _this_psd = (this_x_t * this_x_t.conj()).real
-
-        x_t.append(this_x_t)
+                    this_x_t, _ = _mt_spectra(
+                        this_data[data_idx, tmin_idx:tmax_idx],
+                        window_fun, sfreq)
+
+                freq_use = freq_mask
+                if kernel is not None:
+                    # the adaptive weights need the spectra at all
+                    # frequencies, otherwise only project the ones we use
+                    if not mt_adaptive:
+                        this_x_t = this_x_t[:, :, freq_mask]
+                        freq_use = slice(None)
+                    this_x_t = _apply_kernel(kernel, this_x_t)
+
+                if mt_adaptive:
+                    # compute PSD and adaptive weights
+                    _this_psd, weights = _psd_from_mt_adaptive(
+                        this_x_t, eigvals, freq_mask, return_weights=True)
+
+                    # only keep freqs of interest
+                    this_x_t = this_x_t[:, :, freq_mask]
+                else:
+                    # do not use adaptive weights
+                    this_x_t = this_x_t[:, :, freq_use]
+                    if mode == 'multitaper':
+                        weights = np.sqrt(eigvals)[np.newaxis, :, np.newaxis]
+                    else:
+                        # hack to so we can sum over axis=-2
+                        weights = np.array([1.])[:, None, None]
+
+                    if accumulate_psd:
+                        _this_psd = _psd_from_mt(this_x_t, weights)
+                # fold the weights and the normalization of _csd_from_mt
+                # into the spectra
+                this_x_t = this_x_t * (weights * np.sqrt(
+                    2. / (weights * weights.conj()).real.sum(
+                        axis=-2, keepdims=True)))
+                this_x_t = np.transpose(this_x_t, (2, 0, 1))
+            else:  # mode == 'cwt_morlet'
+                if isinstance(this_data, _BaseSourceEstimate):
+                    cwt_partial = partial(cwt, Ws=wavelets, use_fft=True,
+                                          mode='same')
+                    this_x_t = this_data.transform_data(
+                        cwt_partial, idx=sig_idx, tmin_idx=tmin_idx,
+                        tmax_idx=tmax_idx)
+                else:
+                    this_x_t = cwt(this_data[data_idx, tmin_idx:tmax_idx],
+                                   wavelets, use_fft=True, mode='same')
+                if kernel is not None:
+                    this_x_t = _apply_kernel(kernel, this_x_t)
+                _this_psd = (this_x_t * this_x_t.conj()).real
+                this_x_t = np.transpose(this_x_t, (1, 2, 0))[..., np.newaxis]
+
+            epoch_x_w.append(this_x_t)
+            if accumulate_psd:
+                epoch_psd.append(_this_psd)
+        x_w.append(np.concatenate(epoch_x_w, axis=-2))
         if accumulate_psd:
-            this_psd.append(_this_psd)
-
-    x_t = np.concatenate(x_t, axis=0)
-    if accumulate_psd:
-        this_psd = np.concatenate(this_psd, axis=0)
+            this_psd = this_psd + np.concatenate(epoch_psd, axis=0)
+    x_w = np.array(x_w)
 
     # accumulate or return psd
     if accumulate_psd:
@@ -414,40 +453,64 @@ def _epoch_spectral_connectivity(data, sig_idx, tmin_idx, tmax_idx, sfreq,
     else:
         psd = None
 
-    # tell the methods that a new epoch starts
-    for method in con_methods:
-        method.start_epoch()
-
-    # accumulate connectivity scores
-    if mode in ['multitaper', 'fourier']:
-        for i in range(0, n_cons, block_size):
-            con_idx = slice(i, i + block_size)
-            if mt_adaptive:
-                csd = _csd_from_mt(x_t[idx_map[0][con_idx]],
-                                   x_t[idx_map[1][con_idx]],
-                                   weights[idx_map[0][con_idx]],
-                                   weights[idx_map[1][con_idx]])
-            else:
-                csd = _csd_from_mt(x_t[idx_map[0][con_idx]],
-                                   x_t[idx_map[1][con_idx]],
-                                   weights, weights)
-
-            for method in con_methods:
-                method.accumulate(con_idx, csd)
-    else:  # mode == 'cwt_morlet'  # reminder to add alternative TFR methods
-        for i_block, i in enumerate(range(0, n_cons, block_size)):
-            con_idx = slice(i, i + block_size)
-            # this codes can be very slow
-            csd = (x_t[idx_map[0][con_idx]] *
-                   x_t[idx_map[1][con_idx]].conjugate())
-
-            for method in con_methods:
+    # accumulate connectivity scores of all epochs at once, keeping the size
+    # of the CSD arrays bounded by block_size connections per epoch
+    x_w_h = np.ascontiguousarray(np.swapaxes(x_w, -1, -2).conj())
+    batched = [method for method in con_methods
+               if type(method) in _CON_METHOD_MAP.values()]
+    if len(batched) > 0:
+        # tell the methods that new epochs start
+        for method in batched:
+            for _ in range(len(x_w)):
+                method.start_epoch()
+        n_block = max(block_size // len(x_w), 1)
+        for i in range(0, n_cons, n_block):
+            con_idx = slice(i, i + n_block)
+            csd = _csd_from_spectra(x_w, x_w_h, idx_map, con_idx)
+            for method in batched:
                 method.accumulate(con_idx, csd)
                 # future estimator types need to be explicitly handled here
+    # other estimators get the CSD of one epoch at a time
+    others = [method for method in con_methods if method not in batched]
+    if len(others) > 0:
+        for ei in range(len(x_w)):
+            for method in others:
+                method.start_epoch()
+            for i in range(0, n_cons, block_size):
+                con_idx = slice(i, i + block_size)
+                csd = _csd_from_spectra(x_w[ei:ei + 1], x_w_h[ei:ei + 1],
+                                        idx_map, con_idx)[0]
+                for method in others:
+                    method.accumulate(con_idx, csd)
 
     return con_methods, psd
 
 
+def _csd_from_spectra(x_w, x_w_h, idx_map, con_idx):
+    """Compute the CSD of some connections from weighted spectra.
+
+    Returns an array of shape (n_epochs, n_cons, n_freqs[, n_times]).
+    """
+    idx0, idx1 = idx_map[0][con_idx], idx_map[1][con_idx]
+    rows, row_idx = np.unique(idx0, return_inverse=True)
+    cols, col_idx = np.unique(idx1, return_inverse=True)
+    if len(rows) * len(cols) <= 4 * len(idx0):
+        # the connections are clustered (e.g., all-to-all or seed-based),
+        # compute the cross-spectra with a matrix product
+        csd = np.matmul(x_w[..., rows, :], x_w_h[..., cols])
+        csd = csd[..., row_idx, col_idx]
+    else:
+        csd = np.einsum('...it,...it->...i', x_w[..., idx0, :],
+                        x_w[..., idx1, :].conj())
+    return np.moveaxis(csd, -1, 1)
+
+
+def _apply_kernel(kernel, data):
+    """Apply a linear operator to the first dimension of the data."""
+    return np.dot(kernel, data.reshape(len(data), -1)).reshape(
+        (len(kernel),) + data.shape[1:])
+
+
 def _get_n_epochs(epochs, n):
     """Generate lists with at most n epochs."""
     epochs_out = list()
@@ -552,7 +615,7 @@ def spectral_connectivity(data, method='coh', indices=None, sfreq=2 * np.pi,
                           mt_bandwidth=None, mt_adaptive=False,
                           mt_low_bias=True, cwt_freqs=None,
                           cwt_n_cycles=7, block_size=1000, n_jobs=1,
-                          verbose=None):
+                          kernel=None, verbose=None):
     """Compute frequency- and time-frequency-domain connectivity measures.
 
     The connectivity method(s) are specified using the "method" parameter.
@@ -620,9 +683,21 @@ def spectral_connectivity(data, method='coh', indices=None, sfreq=2 * np.pi,
         'cwt_morlet' mode.
     block_size : int
         How many connections to compute at once (higher numbers are faster
-        but require more memory).
+        but require more memory). Epochs are processed in batches such that
+        the spectra of about ``block_size`` signals are held in memory.
     n_jobs : int
         How many epochs to process in parallel.
+    kernel : array, shape (n_sources, n_channels) | None
+        A linear operator applied to the ``n_channels`` signals in ``data``,
+        e.g., an inverse kernel or its combination with a label extraction
+        operator. Connectivity is then computed between the ``n_sources``
+        projected signals, and ``indices`` refer to the rows of ``kernel``.
+        As the spectra are linear in the data, they are computed for the
+        input signals and projected afterwards, which is much faster than
+        computing the spectra of the projected signals. Source estimates
+        cannot be used as ``data`` in this case.
+
+        .. versionadded:: 0.21
     %(verbose)s
 
     Returns
@@ -773,58 +848,78 @@ def spectral_connectivity(data, method='coh', indices=None, sfreq=2 * np.pi,
         times_in = data.times  # input times for Epochs input type
         sfreq = data.info['sfreq']
 
+    if kernel is not None:
+        kernel = np.asarray(kernel)
+        if kernel.ndim != 2:
+            raise ValueError('kernel must be a 2D array, got %d dimensions'
+                             % (kernel.ndim,))
+
     # loop over data; it could be a generator that returns
     # (n_signals x n_times) arrays or SourceEstimates
-    epoch_idx = 0
+    data = iter(data)
+    first_epoch = next(data, None)
+    if first_epoch is None:
+        raise ValueError('data must contain at least one epoch')
+    first_block = next(_get_n_epochs([first_epoch], 1))
+    data = chain([first_epoch], data)
     logger.info('Connectivity computation...')
-    for epoch_block in _get_n_epochs(data, n_jobs):
-        if epoch_idx == 0:
-            # initialize everything times and frequencies
-            (n_cons, times, n_times, times_in, n_times_in, tmin_idx,
-             tmax_idx, n_freqs, freq_mask, freqs, freqs_bands, freq_idx_bands,
-             n_signals, indices_use) = _prepare_connectivity(
-                epoch_block=epoch_block, tmin=tmin, tmax=tmax, fmin=fmin,
-                fmax=fmax, sfreq=sfreq, indices=indices, mode=mode,
-                fskip=fskip, n_bands=n_bands,
-                cwt_freqs=cwt_freqs, faverage=faverage)
-
-            # get the window function, wavelets, etc for different modes
-            (spectral_params, mt_adaptive, n_times_spectrum,
-             n_tapers) = _assemble_spectral_params(
-                mode=mode, n_times=n_times, mt_adaptive=mt_adaptive,
-                mt_bandwidth=mt_bandwidth, sfreq=sfreq,
-                mt_low_bias=mt_low_bias, cwt_n_cycles=cwt_n_cycles,
-                cwt_freqs=cwt_freqs, freqs=freqs, freq_mask=freq_mask)
-
-            # unique signals for which we actually need to compute PSD etc.
-            sig_idx = np.unique(np.r_[indices_use[0], indices_use[1]])
-
-            # map indices to unique indices
-            idx_map = [np.searchsorted(sig_idx, ind) for ind in indices_use]
-
-            # allocate space to accumulate PSD
-            if accumulate_psd:
-                if n_times_spectrum == 0:
-                    psd_shape = (len(sig_idx), n_freqs)
-                else:
-                    psd_shape = (len(sig_idx), n_freqs, n_times_spectrum)
-                psd = np.zeros(psd_shape)
-            else:
-                psd = None
+    # initialize everything times and frequencies
+    (n_cons, times, n_times, times_in, n_times_in, tmin_idx,
+     tmax_idx, n_freqs, freq_mask, freqs, freqs_bands, freq_idx_bands,
+     n_signals, indices_use) = _prepare_connectivity(
+        epoch_block=first_block, tmin=tmin, tmax=tmax, fmin=fmin,
+        fmax=fmax, sfreq=sfreq, indices=indices, mode=mode,
+        fskip=fskip, n_bands=n_bands,
+        cwt_freqs=cwt_freqs, faverage=faverage, kernel=kernel)
+
+    # get the window function, wavelets, etc for different modes
+    (spectral_params, mt_adaptive, n_times_spectrum,
+     n_tapers) = _assemble_spectral_params(
+        mode=mode, n_times=n_times, mt_adaptive=mt_adaptive,
+        mt_bandwidth=mt_bandwidth, sfreq=sfreq,
+        mt_low_bias=mt_low_bias, cwt_n_cycles=cwt_n_cycles,
+        cwt_freqs=cwt_freqs, freqs=freqs, freq_mask=freq_mask)
+
+    # unique signals for which we actually need to compute PSD etc.
+    sig_idx = np.unique(np.r_[indices_use[0], indices_use[1]])
+
+    # map indices to unique indices
+    idx_map = [np.searchsorted(sig_idx, ind) for ind in indices_use]
+
+    # allocate space to accumulate PSD
+    if accumulate_psd:
+        if n_times_spectrum == 0:
+            psd_shape = (len(sig_idx), n_freqs)
+        else:
+            psd_shape = (len(sig_idx), n_freqs, n_times_spectrum)
+        psd = np.zeros(psd_shape)
+    else:
+        psd = None
 
-            # create instances of the connectivity estimators
-            con_methods = [mtype(n_cons, n_freqs, n_times_spectrum)
-                           for mtype in con_method_types]
+    # create instances of the connectivity estimators
+    con_methods = [mtype(n_cons, n_freqs, n_times_spectrum)
+                   for mtype in con_method_types]
 
-            sep = ', '
-            metrics_str = sep.join([meth.name for meth in con_methods])
-            logger.info('    the following metrics will be computed: %s'
-                        % metrics_str)
+    sep = ', '
+    metrics_str = sep.join([meth.name for meth in con_methods])
+    logger.info('    the following metrics will be computed: %s'
+                % metrics_str)
 
+    # process several epochs at once, holding the spectra of about
+    # block_size signals in memory for each job
+    n_epochs_batch = max(block_size // len(sig_idx), 1)
+    n_data_signals = n_signals if kernel is None else kernel.shape[1]
+    epoch_idx = 0
+    for epoch_block in _get_n_epochs(data, n_jobs * n_epochs_batch):
         # check dimensions and time scale
         for this_epoch in epoch_block:
-            _get_and_verify_data_sizes(this_epoch, n_signals, n_times_in,
+            _get_and_verify_data_sizes(this_epoch, n_data_signals, n_times_in,
                                        times_in)
+            if kernel is not None and any(
+                    isinstance(this_data, _BaseSourceEstimate)
+                    for this_data in this_epoch):
+                raise ValueError('data cannot contain source estimates when '
+                                 'kernel is used')
 
         call_params = dict(
             sig_idx=sig_idx, tmin_idx=tmin_idx,
@@ -835,25 +930,19 @@ def spectral_connectivity(data, method='coh', indices=None, sfreq=2 * np.pi,
             con_method_types=con_method_types,
             con_methods=con_methods if n_jobs == 1 else None,
             n_signals=n_signals, n_times=n_times,
-            accumulate_inplace=True if n_jobs == 1 else False)
+            accumulate_inplace=True if n_jobs == 1 else False, kernel=kernel)
         call_params.update(**spectral_params)
 
+        logger.info('    computing connectivity for epochs %d..%d'
+                    % (epoch_idx + 1, epoch_idx + len(epoch_block)))
         if n_jobs == 1:
-            # no parallel processing
-            for this_epoch in epoch_block:
-                logger.info('    computing connectivity for epoch %d'
-                            % (epoch_idx + 1))
-                # con methods and psd are updated inplace
-                _epoch_spectral_connectivity(data=this_epoch, **call_params)
-                epoch_idx += 1
+            # no parallel processing, con methods and psd are updated inplace
+            _epoch_spectral_connectivity(data=epoch_block, **call_params)
         else:
             # process epochs in parallel
-            logger.info('    computing connectivity for epochs %d..%d'
-                        % (epoch_idx + 1, epoch_idx + len(epoch_block)))
-
             out = parallel(my_epoch_spectral_connectivity(
-                           data=this_epoch, **call_params)
-                           for this_epoch in epoch_block)
+                           data=epoch_block[ii::n_jobs], **call_params)
+                           for ii in range(min(n_jobs, len(epoch_block))))
             # do the accumulation
             for this_out in out:
                 for method, parallel_method in zip(con_methods, this_out[0]):
@@ -861,7 +950,7 @@ def spectral_connectivity(data, method='coh', indices=None, sfreq=2 * np.pi,
                 if accumulate_psd:
                     psd += this_out[1]
 
-            epoch_idx += len(epoch_block)
+        epoch_idx += len(epoch_block)
 
     # normalize
     n_epochs = epoch_idx
@@ -932,12 +1021,18 @@ def spectral_connectivity(data, method='coh', indices=None, sfreq=2 * np.pi,
 
 def _prepare_connectivity(epoch_block, tmin, tmax, fmin, fmax, sfreq, indices,
                           mode, fskip, n_bands,
-                          cwt_freqs, faverage):
+                          cwt_freqs, faverage, kernel=None):
     """Check and precompute dimensions of results data."""
     first_epoch = epoch_block[0]
 
     # get the data size and time scale
     n_signals, n_times_in, times_in = _get_and_verify_data_sizes(first_epoch)
+    if kernel is not None:
+        if kernel.shape[1] != n_signals:
+            raise ValueError('kernel must have one column for each of the '
+                             '%d signals in data, got shape %s'
+                             % (n_signals, kernel.shape))
+        n_signals = len(kernel)
 
     if times_in is None:
         # we are not using Epochs or SourceEstimate(s) as input
@@ -72,3 +72,38 @@ def test_envelope_correlation():
     assert_allclose(np.diag(corr_plain_mean), 1)
     np_corr = np.array([np.corrcoef(np.abs(x)) for x in data_hilbert])
     assert_allclose(corr_plain, np_corr)
+
+
+@pytest.mark.parametrize('orthogonalize', ('pairwise', False))
+def test_envelope_correlation_single(orthogonalize):
+    """Test the envelope correlation in single precision."""
+    rng = np.random.RandomState(0)
+    data = rng.randn(2, 5, 100)
+    data[:, 1] += data[:, 0]
+    corr = envelope_correlation(data, orthogonalize=orthogonalize)
+    assert corr.dtype == np.float64
+    assert_allclose(corr, envelope_correlation(hilbert(data, axis=-1),
+                                               orthogonalize=orthogonalize))
+    corr_single = envelope_correlation(
+        (d for d in data.astype(np.float32)), orthogonalize=orthogonalize)
+    assert corr_single.dtype == np.float32
+    mask = ~np.eye(len(corr), dtype=bool)
+    assert_allclose(corr_single[mask], corr[mask], atol=1e-5)
+
+
+@pytest.mark.parametrize('dtype, eps, rtol', [
+    (np.float64, 1e-6, 1e-7),
+    (np.float32, 1e-4, 1e-3),
+])
+def test_envelope_correlation_collinear(dtype, eps, rtol):
+    """Test the envelope correlation of nearly collinear nodes."""
+    rng = np.random.RandomState(0)
+    data = rng.randn(1, 3, 1000)
+    data[:, 1] = data[:, 0] + eps * rng.randn(1000)
+    data_hilbert = hilbert(data, axis=-1)
+    corr_orig = _compute_corrs_orig(data_hilbert)
+    corr = envelope_correlation(data_hilbert.astype(np.result_type(dtype, 1j)))
+    assert corr.dtype == dtype
+    # the diagonal is the correlation with rounding errors
+    mask = ~np.eye(len(corr), dtype=bool)
+    assert_allclose(corr[mask], corr_orig[mask], rtol=rtol)
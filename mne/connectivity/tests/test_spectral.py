@@ -3,7 +3,8 @@ from numpy.testing import assert_array_almost_equal
 import pytest
 
 from mne.connectivity import spectral_connectivity
-from mne.connectivity.spectral import _CohEst, _get_n_epochs
+from mne.connectivity.spectral import (_CohEst, _get_n_epochs,
+                                       _EpochMeanConEstBase)
 
 from mne import SourceEstimate
 from mne.utils import run_tests_if_main
@@ -12,7 +13,7 @@ from mne.filter import filter_data
 
 def _stc_gen(data, sfreq, tmin, combo=False):
     """Simulate a SourceEstimate generator."""
-    vertices = [np.arange(data.shape[1]), np.empty(0)]
+    vertices = [np.arange(data.shape[1] - int(combo)), np.empty(0)]
     for d in data:
         if not combo:
             stc = SourceEstimate(data=d, vertices=vertices,
@@ -20,7 +21,7 @@ def _stc_gen(data, sfreq, tmin, combo=False):
             yield stc
         else:
             # simulate a combination of array and source estimate
-            arr = d[0]
+            arr = d[:1]
             stc = SourceEstimate(data=d[1:], vertices=vertices,
                                  tmin=tmin, tstep=1 / float(sfreq))
             yield (arr, stc)
@@ -212,4 +213,103 @@ def test_spectral_connectivity(method, mode):
     assert (out_lens[0] == 10)
 
 
+@pytest.mark.parametrize('mode, kwargs', [
+    ('multitaper', dict(mt_adaptive=True)),
+    ('fourier', dict()),
+    ('cwt_morlet', dict(cwt_freqs=np.array([10., 15.]), cwt_n_cycles=3)),
+])
+def test_spectral_connectivity_blocks(mode, kwargs):
+    """Test that batching epochs and connections does not change results."""
+    rng = np.random.RandomState(0)
+    sfreq = 50.
+    data = rng.randn(5, 4, 100)
+    data[:, 1] += data[:, 0]
+    methods = ['coh', 'imcoh', 'ppc', 'wpli2_debiased']
+    kwargs.update(method=methods, mode=mode, sfreq=sfreq, fmin=5.,
+                  fmax=20., verbose=False)
+    # one epoch and one connection at a time
+    con = spectral_connectivity(data, block_size=1, **kwargs)[0]
+    for indices in (None, ([1, 2, 3], [0, 0, 1])):
+        for block_size, n_jobs in ((2, 1), (1000, 1), (3, 2)):
+            con2 = spectral_connectivity(
+                _stc_gen(data, sfreq, 0., combo=True), indices=indices,
+                block_size=block_size, n_jobs=n_jobs, **kwargs)[0]
+            for c, c2 in zip(con, con2):
+                if indices is not None:
+                    c = c[indices]
+                assert_array_almost_equal(c, c2)
+    with pytest.raises(ValueError, match='at least one epoch'):
+        spectral_connectivity(data[:0], **kwargs)
+
+
+class _PLVEpochEst(_EpochMeanConEstBase):
+    """A user-defined PLV estimator accumulating one epoch at a time."""
+
+    name = 'PLV'
+
+    def __init__(self, n_cons, n_freqs, n_times):
+        super(_PLVEpochEst, self).__init__(n_cons, n_freqs, n_times)
+        self._acc = np.zeros(self.csd_shape, dtype=np.complex128)
+        self.n_started = 0
+
+    def start_epoch(self):
+        self.n_started += 1
+
+    def accumulate(self, con_idx, csd_xy):
+        assert csd_xy.shape[1:] == self.csd_shape[1:]
+        self._acc[con_idx] += csd_xy / np.abs(csd_xy)
+
+    def compute_con(self, con_idx, n_epochs):
+        assert self.n_started == n_epochs
+        self.con_scores = np.abs(self._acc / n_epochs)
+
+
+@pytest.mark.parametrize('mode', ('multitaper', 'cwt_morlet'))
+def test_spectral_connectivity_user_method(mode):
+    """Test connectivity with a user-defined estimator."""
+    rng = np.random.RandomState(0)
+    data = rng.randn(5, 4, 100)
+    data[:, 1] += data[:, 0]
+    kwargs = dict(mode=mode, sfreq=50., fmin=5., fmax=20., block_size=3,
+                  cwt_freqs=np.array([10., 15.]), cwt_n_cycles=3,
+                  verbose=False)
+    con = spectral_connectivity(data, method='plv', **kwargs)[0]
+    con_user = spectral_connectivity(data, method=_PLVEpochEst, **kwargs)[0]
+    assert_array_almost_equal(con, con_user)
+
+
+@pytest.mark.parametrize('mode, kwargs', [
+    ('multitaper', dict(mt_adaptive=False)),
+    ('multitaper', dict(mt_adaptive=True)),
+    ('cwt_morlet', dict(cwt_freqs=np.array([10., 15.]), cwt_n_cycles=3)),
+])
+def test_spectral_connectivity_kernel(mode, kwargs):
+    """Test connectivity of signals projected through a kernel."""
+    rng = np.random.RandomState(0)
+    sfreq = 50.
+    data = rng.randn(4, 5, 100)
+    kernel = rng.randn(7, 5)
+    kwargs.update(method=['coh', 'wpli'], mode=mode, sfreq=sfreq, fmin=5.,
+                  fmax=20., verbose=False)
+    data_proj = np.einsum('ij,ejt->eit', kernel, data)
+    for indices in (None, ([1, 6, 6], [0, 0, 2])):
+        con, freqs, _, n, _ = spectral_connectivity(
+            data_proj, indices=indices, **kwargs)
+        con2, freqs2, _, n2, _ = spectral_connectivity(
+            [(d[:2], d[2:]) for d in data], indices=indices, kernel=kernel,
+            **kwargs)
+        assert_array_almost_equal(freqs, freqs2)
+        assert n == n2
+        for c, c2 in zip(con, con2):
+            assert c.shape == c2.shape
+            assert_array_almost_equal(c, c2)
+    with pytest.raises(ValueError, match='one column for each'):
+        spectral_connectivity(data, kernel=kernel[:, 1:], **kwargs)
+    with pytest.raises(ValueError, match='2D array'):
+        spectral_connectivity(data, kernel=kernel[0], **kwargs)
+    with pytest.raises(ValueError, match='source estimates'):
+        spectral_connectivity(_stc_gen(data, sfreq, 0.), kernel=kernel,
+                              **kwargs)
+
+
 run_tests_if_main()
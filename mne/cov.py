@@ -1681,6 +1681,68 @@ def _regularized_covariance(data, reg=None, method_params=None, info=None,
     return cov
 
 
+def _regularized_covariances(data, reg=None, method_params=None, rank=None):
+    """Compute regularized covariances of epochs.
+
+    This is the same as calling _regularized_covariance for each epoch,
+    but the empirical and shrinkage covariances of full rank epochs are
+    computed all at once.
+
+    Returns
+    -------
+    covs : ndarray, shape (n_epochs, n_channels, n_channels)
+        The covariance matrices.
+    """
+    _validate_type(reg, (str, 'numeric', None))
+    data = np.asarray(data, float)
+    n_epochs, n_channels, n_times = data.shape
+    covs = np.empty((n_epochs, n_channels, n_channels))
+    full = np.zeros(n_epochs, bool)
+    if _covariance_from_sums_ok(reg, method_params, rank):
+        data_sq = np.matmul(data, data.transpose(0, 2, 1))
+        if rank is None:
+            # epochs that are not clearly full rank are reduced to their
+            # estimated rank by _regularized_covariance
+            full = _is_full_rank(data_sq)
+        else:
+            full[:] = True
+        covs[:] = _covariance_from_sums(data_sq, n_times, reg)
+        del data_sq
+    for ei in np.where(~full)[0]:
+        covs[ei] = _regularized_covariance(
+            data[ei], reg=reg, method_params=method_params, rank=rank)
+    return covs
+
+
+def _covariance_from_sums_ok(reg, method_params, rank):
+    """Check if _regularized_covariance can be computed from data sums."""
+    return method_params is None and (rank is None or rank == 'full') and \
+        (reg is None or (not isinstance(reg, str) and 0 <= reg <= 1))
+
+
+def _covariance_from_sums(data_sq, n_times, reg=None):
+    """Compute regularized covariances from sums of data outer products.
+
+    Without rank reduction, this is the unbiased estimate of
+    _compute_covariance_auto (which then scales and rotates it), so that
+    it can be accumulated over batches of data.
+    """
+    n_channels = data_sq.shape[-1]
+    covs = data_sq / (n_times - 1)
+    if reg is not None:
+        mu = np.trace(covs, axis1=-2, axis2=-1) / n_channels
+        covs *= 1. - reg
+        covs.reshape(covs.shape[:-2] + (-1,))[..., ::n_channels + 1] += \
+            reg * mu[..., np.newaxis]
+    return covs
+
+
+def _is_full_rank(covs):
+    """Check which (unregularized) covariances are clearly of full rank."""
+    evals = np.linalg.eigvalsh(covs)
+    return evals[..., 0] > 1e-10 * evals[..., -1]
+
+
 @verbose
 def compute_whitener(noise_cov, info=None, picks=None, rank=None,
                      scalings=None, return_rank=False, pca=False,
@@ -423,12 +423,25 @@ def cross_val_multiscore(estimator, X, y=None, groups=None, scoring=None,
     -------
     scores : array of float, shape (n_splits,) | shape (n_splits, n_scores)
         Array of scores of the estimator for each run of the cross validation.
+
+    Notes
+    -----
+    For :class:`~mne.decoding.SlidingEstimator` and
+    :class:`~mne.decoding.GeneralizingEstimator`, the folds and blocks of
+    (training) slices are distributed together over the ``n_jobs`` jobs,
+    and the estimator itself is run with a single job to avoid nested
+    parallelism. If ``n_jobs=1``, the ``n_jobs`` of the estimator are used
+    for this instead. Each job only receives the data of its fold and
+    slices; use :func:`mne.set_cache_dir` to share large arrays with the
+    jobs through memory mapping. The duration of each task is logged if
+    ``verbose`` is not 0.
     """
     # This code is copied from sklearn
 
     from sklearn.base import clone
     from sklearn.utils import indexable
     from sklearn.model_selection._split import check_cv
+    from .search_light import SlidingEstimator
     check_scoring = _get_check_scoring()
 
     X, y, groups = indexable(X, y, groups)
@@ -436,15 +449,88 @@ def cross_val_multiscore(estimator, X, y=None, groups=None, scoring=None,
     cv = check_cv(cv, y, classifier=is_classifier(estimator))
     cv_iter = list(cv.split(X, y, groups))
     scorer = check_scoring(estimator, scoring=scoring)
+    if (isinstance(estimator, SlidingEstimator) and
+            isinstance(X, np.ndarray) and X.ndim >= 3):
+        return _cross_val_search_light(
+            estimator, X, y, scorer, cv_iter, n_jobs, verbose, fit_params,
+            pre_dispatch)
     # We clone the estimator to make sure that all the folds are
     # independent, and that it is pickle-able.
     # Note: this parallelization is implemented using MNE Parallel
     parallel, p_func, n_jobs = parallel_func(_fit_and_score, n_jobs,
                                              pre_dispatch=pre_dispatch)
     scores = parallel(p_func(clone(estimator), X, y, scorer, train, test,
-                             0, None, fit_params)
+                             0, None, fit_params, return_times=True)
                       for train, test in cv_iter)
-    return np.array(scores)[:, 0, ...]  # flatten over joblib output.
+    if verbose:
+        for fi, (_, fit_time, score_time) in enumerate(scores):
+            logger.info('    Fold %d: fitting took %0.2f s, scoring %0.2f s'
+                        % (fi + 1, fit_time, score_time))
+    return np.array([score[0] for score in scores])
+
+
+def _cross_val_search_light(estimator, X, y, scorer, cv_iter, n_jobs,
+                            verbose, fit_params, pre_dispatch):
+    """Cross-validate a search light with folds and slices as tasks."""
+    from sklearn.base import clone
+    from ..fixes import _check_fit_params
+    from .search_light import GeneralizingEstimator
+    if n_jobs == 1:
+        # use the jobs of the estimator for the folds and slices together
+        n_jobs = estimator.n_jobs
+    parallel, p_func, n_jobs = parallel_func(
+        _fit_and_score_slices, n_jobs, pre_dispatch=pre_dispatch)
+    # split the slices such that there are at least as many tasks as jobs
+    n_slices = X.shape[-1]
+    n_blocks = min(-(-n_jobs // len(cv_iter)), n_slices)
+    blocks = [slice(idx[0], idx[-1] + 1) for idx in
+              np.array_split(np.arange(n_slices), n_blocks)]
+    estimator = clone(estimator).set_params(n_jobs=1)
+    generalize = isinstance(estimator, GeneralizingEstimator)
+    y = None if y is None else np.asarray(y)
+
+    def _iter_tasks():
+        for train, test in cv_iter:
+            this_fit_params = _check_fit_params(
+                X, fit_params if fit_params is not None else {}, train)
+            y_train = None if y is None else y[train]
+            y_test = None if y is None else y[test]
+            X_test = X[test]
+            for block in blocks:
+                yield p_func(clone(estimator), X[train][..., block], y_train,
+                             X_test if generalize else X_test[..., block],
+                             y_test, scorer, this_fit_params)
+
+    out = parallel(_iter_tasks())
+    scores = list()
+    for fi in range(len(cv_iter)):
+        fold_out = out[fi * n_blocks:(fi + 1) * n_blocks]
+        for block, (_, fit_time, score_time) in zip(blocks, fold_out):
+            if verbose:
+                logger.info('    Fold %d, slices %d-%d: fitting took '
+                            '%0.2f s, scoring %0.2f s'
+                            % (fi + 1, block.start, block.stop - 1,
+                               fit_time, score_time))
+        fold_scores = [score for score, _, _ in fold_out]
+        # a single slice gives a scalar score
+        scores.append(fold_scores[0] if n_blocks == 1 else
+                      np.concatenate([np.atleast_1d(score)
+                                      for score in fold_scores]))
+    return np.array(scores)
+
+
+def _fit_and_score_slices(estimator, X_train, y_train, X_test, y_test,
+                          scorer, fit_params):
+    """Fit a search light to training data and score it on test data."""
+    start_time = time.time()
+    if y_train is None:
+        estimator.fit(X_train, **fit_params)
+    else:
+        estimator.fit(X_train, y_train, **fit_params)
+    fit_time = time.time() - start_time
+    score = _score(estimator, X_test, y_test, scorer)
+    score_time = time.time() - start_time - fit_time
+    return score, fit_time, score_time
 
 
 def _fit_and_score(estimator, X, y, scorer, train, test, verbose,
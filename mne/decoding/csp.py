@@ -14,7 +14,9 @@ from scipy import linalg
 
 from .mixin import TransformerMixin
 from .base import BaseEstimator
-from ..cov import _regularized_covariance
+from ..cov import (_regularized_covariance, _regularized_covariances,
+                   _covariance_from_sums_ok, _covariance_from_sums,
+                   _is_full_rank)
 from ..utils import fill_doc, _check_option
 
 
@@ -179,13 +181,9 @@ class CSP(TransformerMixin, BaseEstimator):
                 weight = sum(y == this_class)
             elif self.cov_est == "epoch":
                 class_ = X[y == this_class]
-                cov = np.zeros((n_channels, n_channels))
-                for this_X in class_:
-                    cov += _regularized_covariance(
-                        this_X, reg=self.reg,
-                        method_params=self.cov_method_params,
-                        rank=self.rank)
-                cov /= len(class_)
+                cov = _regularized_covariances(
+                    class_, reg=self.reg, method_params=self.cov_method_params,
+                    rank=self.rank).mean(axis=0)
                 weight = len(class_)
 
             covs[class_idx] = cov
@@ -201,6 +199,26 @@ class CSP(TransformerMixin, BaseEstimator):
 
             sample_weights.append(weight)
 
+        eigen_vectors = self._decompose_covs(covs, sample_weights)
+        self.filters_ = eigen_vectors.T
+        self.patterns_ = linalg.pinv2(eigen_vectors)
+        self._partial = None
+
+        pick_filters = self.filters_[:self.n_components]
+        X = np.matmul(pick_filters, X)
+
+        # compute features (mean band power)
+        X = (X ** 2).mean(axis=2)
+
+        # To standardize features
+        self.mean_ = X.mean(axis=0)
+        self.std_ = X.std(axis=0)
+
+        return self
+
+    def _decompose_covs(self, covs, sample_weights):
+        """Compute the sorted CSP eigenvectors of the class covariances."""
+        n_classes = len(covs)
         if n_classes == 2:
             eigen_values, eigen_vectors = linalg.eigh(covs[0], covs.sum(0))
             # sort eigenvectors
@@ -221,7 +239,8 @@ class CSP(TransformerMixin, BaseEstimator):
                 eigen_vectors[:, ii] /= np.sqrt(tmp)
 
             # class probability
-            class_probas = [np.mean(y == _class) for _class in self._classes]
+            class_probas = np.array(sample_weights, float)
+            class_probas /= class_probas.sum()
 
             # mutual information
             mutual_info = []
@@ -237,23 +256,133 @@ class CSP(TransformerMixin, BaseEstimator):
             ix = np.argsort(mutual_info)[::-1]
 
         # sort eigenvectors
-        eigen_vectors = eigen_vectors[:, ix]
+        return eigen_vectors[:, ix]
 
-        self.filters_ = eigen_vectors.T
-        self.patterns_ = linalg.pinv2(eigen_vectors)
+    def partial_fit(self, X, y):
+        """Update the CSP decomposition with a batch of epochs.
 
-        pick_filters = self.filters_[:self.n_components]
-        X = np.asarray([np.dot(pick_filters, epoch) for epoch in X])
+        Parameters
+        ----------
+        X : ndarray, shape (n_epochs, n_channels, n_times)
+            A batch of the data on which to estimate the CSP.
+        y : array, shape (n_epochs,)
+            The class for each epoch.
 
-        # compute features (mean band power)
-        X = (X ** 2).mean(axis=2)
+        Returns
+        -------
+        self : instance of CSP
+            Returns the modified instance.
 
-        # To standardize features
-        self.mean_ = X.mean(axis=0)
-        self.std_ = X.std(axis=0)
+        Notes
+        -----
+        Calling this method on consecutive batches of epochs gives the same
+        filters, patterns and ``mean_`` as calling :meth:`fit` on all of
+        them, as the class covariances are accumulated instead of keeping
+        the epochs in memory. The filters are available once epochs of two
+        classes have been seen. As the features of previous batches cannot
+        be computed again, ``std_`` is estimated with the filters available
+        after each batch and only approximates the one of :meth:`fit`, so
+        ``log=False`` (which standardizes the features with ``std_``) is not
+        supported. Calling this method after :meth:`fit` starts over from
+        the given batch.
+
+        With ``cov_est='concat'``, ``reg`` must be None or a float,
+        ``cov_method_params`` must be None and the class covariances must
+        be of full rank (or ``rank='full'`` must be used).
+
+        .. versionadded:: 0.21
+        """
+        if not isinstance(X, np.ndarray):
+            raise ValueError("X should be of type ndarray (got %s)."
+                             % type(X))
+        self._check_Xy(X, y)
+        self._check_partial_fit_log()
+        y = np.asarray(y)
+        concat = self.cov_est == 'concat'
+        if concat and not _covariance_from_sums_ok(
+                self.reg, self.cov_method_params, self.rank):
+            raise ValueError('partial_fit with cov_est="concat" requires reg '
+                             'to be None or a float, cov_method_params to be '
+                             'None and rank to be None or "full"')
+        n_channels, n_times = X.shape[1], X.shape[2]
+        if getattr(self, '_partial', None) is None:
+            self.filters_ = None
+            self._partial = dict(classes=dict(), power=0., n_epochs=0,
+                                 features_mean=0., features_ss=0.,
+                                 n_features=0)
+        class_stats = self._partial['classes']
+        X_sq = np.matmul(X, X.transpose(0, 2, 1))
+        for this_class in np.unique(y):
+            sel = y == this_class
+            if this_class not in class_stats:
+                class_stats[this_class] = [0., 0, 0]
+            stats = class_stats[this_class]
+            if concat:
+                stats[0] = stats[0] + X_sq[sel].sum(axis=0)
+            else:
+                stats[0] = stats[0] + _regularized_covariances(
+                    X[sel], reg=self.reg, method_params=self.cov_method_params,
+                    rank=self.rank).sum(axis=0)
+            stats[1] += sel.sum()
+            stats[2] += sel.sum() * n_times
 
+        self._classes = np.array(sorted(class_stats))
+        n_classes = len(self._classes)
+        if n_classes >= 2:
+            covs = np.zeros((n_classes, n_channels, n_channels))
+            sample_weights = list()
+            for class_idx, this_class in enumerate(self._classes):
+                cov, n_epochs, n_samples = class_stats[this_class]
+                if concat:
+                    if self.rank is None and not _is_full_rank(cov):
+                        raise ValueError(
+                            'The covariance of class %s is rank deficient, '
+                            'partial_fit with cov_est="concat" requires '
+                            'rank="full"' % (this_class,))
+                    cov = _covariance_from_sums(cov, n_samples, self.reg)
+                else:
+                    cov = cov / n_epochs
+                covs[class_idx] = cov
+                if self.norm_trace:
+                    covs[class_idx] /= np.trace(cov)
+                sample_weights.append(n_epochs)
+
+            eigen_vectors = self._decompose_covs(covs, sample_weights)
+            self.filters_ = eigen_vectors.T
+            self.patterns_ = linalg.pinv2(eigen_vectors)
+        self._partial_fit_features(X_sq, n_times)
         return self
 
+    def _check_partial_fit_log(self):
+        """Check that the features are not standardized with std_."""
+        if self.transform_into == 'average_power' and self.log is False:
+            raise ValueError('partial_fit does not support log=False, as the '
+                             'standard deviation of the features can only be '
+                             'approximated from batches, use fit instead')
+
+    def _partial_fit_features(self, X_sq, n_times):
+        """Update the feature statistics with the outer products of epochs."""
+        state = self._partial
+        state['power'] = state['power'] + X_sq.sum(axis=0) / n_times
+        state['n_epochs'] += len(X_sq)
+        if getattr(self, 'filters_', None) is None:
+            return
+        pick_filters = self.filters_[:self.n_components]
+        # mean band power of the components is linear in the outer products
+        self.mean_ = np.einsum('ij,jk,ik->i', pick_filters, state['power'],
+                               pick_filters) / state['n_epochs']
+        X = np.einsum('ij,ejk,ik->ei', pick_filters, X_sq,
+                      pick_filters) / n_times
+        # combine the variances of the batches (Chan et al.)
+        n_prev, n = state['n_features'], len(X)
+        n_tot = n_prev + n
+        delta = X.mean(axis=0) - state['features_mean']
+        state['features_mean'] = state['features_mean'] + delta * n / n_tot
+        state['features_ss'] = (state['features_ss'] + X.var(axis=0) * n +
+                                delta ** 2 * n_prev * n / n_tot)
+        state['n_features'] = n_tot
+        self.std_ = np.sqrt(state['features_ss'] / state['n_features'])
+
     def transform(self, X):
         """Estimate epochs sources given the CSP filters.
 
@@ -277,7 +406,7 @@ class CSP(TransformerMixin, BaseEstimator):
                                'decomposition.')
 
         pick_filters = self.filters_[:self.n_components]
-        X = np.asarray([np.dot(pick_filters, epoch) for epoch in X])
+        X = np.matmul(pick_filters, X)
 
         # compute features (mean band power)
         if self.transform_into == 'average_power':
@@ -575,13 +704,10 @@ def _ajd_pham(X, eps=1e-6, max_iter=15):
 
     """
     # Adapted from http://github.com/alexandrebarachant/pyRiemann
-    n_epochs = X.shape[0]
-
-    # Reshape input matrix
-    A = np.concatenate(X, axis=0).T
+    n_epochs, n_times = X.shape[:2]
+    D = np.array(X, dtype=np.result_type(X, float))
 
     # Init variables
-    n_times, n_m = A.shape
     V = np.eye(n_times)
     epsilon = n_times * (n_times - 1) * eps
 
@@ -589,14 +715,11 @@ def _ajd_pham(X, eps=1e-6, max_iter=15):
         decr = 0
         for ii in range(1, n_times):
             for jj in range(ii):
-                Ii = np.arange(ii, n_m, n_times)
-                Ij = np.arange(jj, n_m, n_times)
+                c1 = D[:, ii, ii]
+                c2 = D[:, jj, jj]
 
-                c1 = A[ii, Ii]
-                c2 = A[jj, Ij]
-
-                g12 = np.mean(A[ii, Ij] / c1)
-                g21 = np.mean(A[ii, Ij] / c2)
+                g12 = np.mean(D[:, jj, ii] / c1)
+                g21 = np.mean(D[:, jj, ii] / c2)
 
                 omega21 = np.mean(c1 / c2)
                 omega12 = np.mean(c2 / c1)
@@ -615,18 +738,12 @@ def _ajd_pham(X, eps=1e-6, max_iter=15):
                 tmp = np.real(tmp + np.sqrt(tmp ** 2 - h12 * h21))
                 tau = np.array([[1, -h12 / tmp], [-h21 / tmp, 1]])
 
-                A[[ii, jj], :] = np.dot(tau, A[[ii, jj], :])
-                tmp = np.c_[A[:, Ii], A[:, Ij]]
-                tmp = np.reshape(tmp, (n_times * n_epochs, 2), order='F')
-                tmp = np.dot(tmp, tau.T)
-
-                tmp = np.reshape(tmp, (n_times, n_epochs * 2), order='F')
-                A[:, Ii] = tmp[:, :n_epochs]
-                A[:, Ij] = tmp[:, n_epochs:]
+                # apply tau to the columns and rows of all matrices at once
+                D[:, :, [ii, jj]] = np.matmul(D[:, :, [ii, jj]], tau.T)
+                D[:, [ii, jj]] = np.matmul(tau, D[:, [ii, jj]])
                 V[[ii, jj], :] = np.dot(tau, V[[ii, jj], :])
         if decr < epsilon:
             break
-    D = np.reshape(A, (n_times, -1, n_times)).transpose(1, 0, 2)
     return V, D
 
 
@@ -737,18 +854,102 @@ class SPoC(CSP):
         target -= target.mean()
         target /= target.std()
 
-        n_epochs, n_channels = X.shape[:2]
-
         # Estimate single trial covariance
-        covs = np.empty((n_epochs, n_channels, n_channels))
-        for ii, epoch in enumerate(X):
-            covs[ii] = _regularized_covariance(
-                epoch, reg=self.reg, method_params=self.cov_method_params,
-                rank=self.rank)
+        covs = _regularized_covariances(
+            X, reg=self.reg, method_params=self.cov_method_params,
+            rank=self.rank)
 
         C = covs.mean(0)
         Cz = np.mean(covs * target[:, np.newaxis, np.newaxis], axis=0)
 
+        self._fit_spoc_filters(C, Cz)
+        self._partial = None
+
+        pick_filters = self.filters_[:self.n_components]
+        X = np.matmul(pick_filters, X)
+
+        # compute features (mean band power)
+        X = (X ** 2).mean(axis=-1)
+
+        # To standardize features
+        self.mean_ = X.mean(axis=0)
+        self.std_ = X.std(axis=0)
+
+        return self
+
+    def partial_fit(self, X, y):
+        """Update the SPoC decomposition with a batch of epochs.
+
+        Parameters
+        ----------
+        X : ndarray, shape (n_epochs, n_channels, n_times)
+            A batch of the data on which to estimate the SPoC.
+        y : array, shape (n_epochs,)
+            The class for each epoch.
+
+        Returns
+        -------
+        self : instance of SPoC
+            Returns the modified instance.
+
+        Notes
+        -----
+        Calling this method on consecutive batches of epochs gives the same
+        filters, patterns and ``mean_`` as calling :meth:`fit` on all of
+        them, as the covariances and their products with the target are
+        accumulated instead of keeping the epochs in memory. The filters
+        are available once two distinct values of ``y`` have been seen. As
+        the features of previous batches cannot be computed again, ``std_``
+        is estimated with the filters available after each batch and only
+        approximates the one of :meth:`fit`, so ``log=False`` (which
+        standardizes the features with ``std_``) is not supported. Calling
+        this method after :meth:`fit` starts over from the given batch.
+
+        .. versionadded:: 0.21
+        """
+        if not isinstance(X, np.ndarray):
+            raise ValueError("X should be of type ndarray (got %s)."
+                             % type(X))
+        self._check_Xy(X, y)
+        self._check_partial_fit_log()
+        target = np.asarray(y, np.float64)
+        if getattr(self, '_partial', None) is None:
+            self.filters_ = None
+            # offset the target to avoid cancellations when normalizing it
+            self._partial = dict(offset=target.mean(), cov=0., target_cov=0.,
+                                 target=0., target_sq=0., n=0,
+                                 target_min=np.inf, target_max=-np.inf,
+                                 power=0., n_epochs=0, features_mean=0.,
+                                 features_ss=0., n_features=0)
+        state = self._partial
+        target -= state['offset']
+        covs = _regularized_covariances(
+            X, reg=self.reg, method_params=self.cov_method_params,
+            rank=self.rank)
+        state['cov'] = state['cov'] + covs.sum(axis=0)
+        state['target_cov'] = state['target_cov'] + np.tensordot(
+            target, covs, axes=1)
+        state['target'] += target.sum()
+        state['target_sq'] += (target ** 2).sum()
+        state['n'] += len(target)
+        state['target_min'] = min(state['target_min'], target.min())
+        state['target_max'] = max(state['target_max'], target.max())
+        del covs
+
+        if state['target_max'] > state['target_min']:
+            # normalize target variable
+            n = state['n']
+            target_mean = state['target'] / n
+            target_std = np.sqrt(state['target_sq'] / n - target_mean ** 2)
+            C = state['cov'] / n
+            Cz = (state['target_cov'] / n - target_mean * C) / target_std
+            self._fit_spoc_filters(C, Cz)
+        self._partial_fit_features(
+            np.matmul(X, X.transpose(0, 2, 1)), X.shape[2])
+        return self
+
+    def _fit_spoc_filters(self, C, Cz):
+        """Compute the SPoC filters and patterns from the covariances."""
         # solve eigenvalue decomposition
         evals, evecs = linalg.eigh(Cz, C)
         evals = evals.real
@@ -763,18 +964,6 @@ class SPoC(CSP):
         self.patterns_ = linalg.pinv(evecs).T  # n_channels x n_channels
         self.filters_ = evecs  # n_channels x n_channels
 
-        pick_filters = self.filters_[:self.n_components]
-        X = np.asarray([np.dot(pick_filters, epoch) for epoch in X])
-
-        # compute features (mean band power)
-        X = (X ** 2).mean(axis=-1)
-
-        # To standardize features
-        self.mean_ = X.mean(axis=0)
-        self.std_ = X.std(axis=0)
-
-        return self
-
     def transform(self, X):
         """Estimate epochs sources given the SPoC filters.
 
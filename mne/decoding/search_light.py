@@ -2,6 +2,8 @@
 #
 # License: BSD (3-clause)
 
+from copy import deepcopy
+
 import numpy as np
 
 from .mixin import TransformerMixin
@@ -40,6 +42,13 @@ class SlidingEstimator(BaseEstimator, TransformerMixin):
     ----------
     estimators_ : array-like, shape (n_tasks,)
         List of fitted scikit-learn estimators (one per task).
+
+    Notes
+    -----
+    A :class:`sklearn.linear_model.Ridge` base estimator is fitted to all
+    tasks at once in closed form. If the (final) base estimator is a linear
+    model with ``warm_start=True``, each estimator is initialized with the
+    solution of the previous task.
     """
 
     def __init__(self, base_estimator, scoring=None, n_jobs=1,
@@ -326,15 +335,98 @@ def _sl_fit(estimator, X, y, pb, **fit_params):
         The fitted estimators.
     """
     from sklearn.base import clone
+    if not fit_params:
+        estimators_ = _sl_fit_ridge(estimator, X, y)
+        if estimators_ is not None:
+            for ii in range(X.shape[-1]):
+                pb.update(ii + 1)
+            return estimators_
     estimators_ = list()
     for ii in range(X.shape[-1]):
-        est = clone(estimator)
+        if ii > 0 and _is_warm_start(estimators_[-1]):
+            # start from the solution of the previous slice
+            est = deepcopy(estimators_[-1])
+        else:
+            est = clone(estimator)
         est.fit(X[..., ii], y, **fit_params)
         estimators_.append(est)
         pb.update(ii + 1)
     return estimators_
 
 
+def _is_warm_start(estimator):
+    """Check if a fitted (linear) estimator can be warm started."""
+    final = _get_final_estimator(estimator)
+    return (getattr(final, 'warm_start', False) is True and
+            hasattr(final, 'coef_'))
+
+
+def _get_final_estimator(estimator):
+    """Get the last step of a pipeline."""
+    if hasattr(estimator, 'steps'):
+        estimator = estimator.steps[-1][1]
+    return estimator
+
+
+def _sl_fit_ridge(estimator, X, y):
+    """Fit ridge regressions to all slices at once.
+
+    Returns None if the estimator is not a ridge regression that can be
+    fitted in closed form.
+    """
+    from sklearn.base import clone
+    from sklearn.linear_model import Ridge
+    if type(estimator) is not Ridge or X.ndim != 3 or X.dtype != np.float64:
+        return None
+    params = estimator.get_params()
+    if (params['solver'] not in ('auto', 'cholesky') or
+            params.get('positive', False) or
+            params.get('normalize', False) not in (False, 'deprecated') or
+            np.ndim(params['alpha']) != 0 or not params['alpha'] > 0):
+        return None
+    n_samples, n_features, n_slices = X.shape
+    X = np.ascontiguousarray(X.transpose(2, 0, 1))
+    y = np.asarray(y, dtype=np.float64)
+    y_2d = y.reshape(n_samples, -1)
+    if params['fit_intercept']:
+        X_offset = X.mean(axis=1, keepdims=True)
+        X = X - X_offset
+        y_offset = y_2d.mean(axis=0)
+        y_2d = y_2d - y_offset
+    # the regularized normal equations of all slices, in their primal or
+    # dual form (as done by the cholesky solver of scikit-learn)
+    if n_features <= n_samples:
+        gram = np.matmul(X.transpose(0, 2, 1), X)
+        gram.reshape(n_slices, -1)[:, ::n_features + 1] += params['alpha']
+        coef = np.linalg.solve(gram, np.matmul(X.transpose(0, 2, 1), y_2d))
+    else:
+        gram = np.matmul(X, X.transpose(0, 2, 1))
+        gram.reshape(n_slices, -1)[:, ::n_samples + 1] += params['alpha']
+        coef = np.linalg.solve(gram, np.broadcast_to(
+            y_2d, (n_slices,) + y_2d.shape))
+        coef = np.matmul(X.transpose(0, 2, 1), coef)
+    del gram
+    coef = coef.transpose(0, 2, 1)  # (n_slices, n_targets, n_features)
+    if params['fit_intercept']:
+        intercept = y_offset - np.matmul(X_offset, coef.transpose(0, 2, 1))
+        intercept = intercept[:, 0]
+    else:
+        intercept = np.zeros(coef.shape[:2])
+    estimators_ = list()
+    for this_coef, this_intercept in zip(coef, intercept):
+        est = clone(estimator)
+        if y.ndim == 1:
+            this_coef, this_intercept = this_coef[0], this_intercept[0]
+        if not params['fit_intercept']:
+            this_intercept = 0.
+        est.coef_ = this_coef
+        est.intercept_ = this_intercept
+        est.n_iter_ = None
+        est.n_features_in_ = n_features
+        estimators_.append(est)
+    return estimators_
+
+
 def _sl_transform(estimators, X, method, pb):
     """Aux. function to transform SlidingEstimator in parallel.
 
@@ -439,6 +531,17 @@ class GeneralizingEstimator(SlidingEstimator):
         The number of jobs to run in parallel for both `fit` and `predict`.
         If -1, then the number of jobs is set to the number of cores.
     %(verbose)s
+
+    Notes
+    -----
+    For linear models (e.g., :class:`sklearn.linear_model.Ridge`,
+    :class:`sklearn.linear_model.LogisticRegression` or
+    :class:`sklearn.discriminant_analysis.LinearDiscriminantAnalysis`),
+    optionally preceded by :class:`~mne.decoding.Vectorizer` and
+    :class:`sklearn.preprocessing.StandardScaler` in a pipeline, the
+    predictions of all estimators on all slices are computed at once with a
+    single tensor contraction, and the accuracy, R2 and ROC AUC scores are
+    computed from them without looping over estimators and slices.
     """
 
     def __repr__(self):  # noqa: D105
@@ -606,6 +709,12 @@ def _gl_transform(estimators, X, method, pb):
         The transformed values generated by each estimator.
     """
     n_sample, n_iter = X.shape[0], X.shape[-1]
+    params = _get_linear_params(estimators, method, X)
+    if params is not None:
+        y_pred = _gl_predict_linear(X, method, *params)
+        for ii in range(len(estimators) * n_iter):
+            pb.update(ii + 1)
+        return y_pred
     for ii, est in enumerate(estimators):
         # stack generalized data for faster prediction
         X_stack = X.transpose(np.r_[0, X.ndim - 1, range(1, X.ndim - 1)])
@@ -661,6 +770,11 @@ def _gl_score(estimators, scoring, X, y, pb):
     score : array, shape (n_estimators, n_slices)
         The score for each slice of data.
     """
+    score = _gl_score_linear(estimators, scoring, X, y)
+    if score is not None:
+        for ii in range(len(estimators) * X.shape[-1]):
+            pb.update(ii + 1)
+        return score
     # FIXME: The level parallelization may be a bit high, and might be memory
     # consuming. Perhaps need to lower it down to the loop across X slices.
     score_shape = [len(estimators), X.shape[-1]]
@@ -676,6 +790,192 @@ def _gl_score(estimators, scoring, X, y, pb):
     return score
 
 
+def _get_linear_params(estimators, method, X):
+    """Get the weights and offsets of affine predictions.
+
+    Returns None unless ``method`` of all estimators is an affine function of
+    the data (followed by a class selection for classifier predictions),
+    possibly preceded by vectorization and standard scaling in a pipeline.
+    """
+    from scipy import sparse
+    from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+    from sklearn.preprocessing import StandardScaler
+    from .base import LinearModel as _LinearModel
+    from .transformer import Vectorizer
+    try:
+        from sklearn.linear_model._base import (LinearClassifierMixin,
+                                                LinearModel)
+    except ImportError:  # older sklearn
+        from sklearn.linear_model.base import (LinearClassifierMixin,
+                                               LinearModel)
+    if method not in ('predict', 'decision_function'):
+        return None
+    n_features = np.prod(X.shape[1:-1], dtype=int)
+    coefs, intercepts, classes, this_ravel = list(), list(), None, None
+    for est in estimators:
+        steps = [step[1] for step in est.steps] if hasattr(est, 'steps') \
+            else [est]
+        final = steps[-1]
+        if isinstance(final, _LinearModel):
+            final = final.model
+        klass = type(final)
+        is_clf = isinstance(final, LinearClassifierMixin)
+        if is_clf:
+            if (method == 'predict' and
+                    klass.predict is not LinearClassifierMixin.predict):
+                return None
+            if (method == 'decision_function' and
+                    klass.decision_function is not
+                    LinearClassifierMixin.decision_function and
+                    not isinstance(final, LinearDiscriminantAnalysis)):
+                return None
+        elif not (isinstance(final, LinearModel) and method == 'predict' and
+                  klass.predict is LinearModel.predict):
+            return None
+        coef = getattr(final, 'coef_', None)
+        if coef is None or sparse.issparse(coef):
+            return None
+        # scikit-learn ravels single outputs of classifiers and of
+        # regressors fitted to 1D targets
+        ravel = coef.shape[0] == 1 if is_clf else coef.ndim == 1
+        coef = np.atleast_2d(coef)
+        intercept = np.zeros(len(coef)) + final.intercept_
+        # fold the preprocessing steps into the coefficients
+        vectorized = X.ndim == 3
+        for step in steps[-2::-1]:
+            if step is None or step == 'passthrough':
+                continue
+            elif isinstance(step, Vectorizer):
+                if tuple(step.features_shape_) != X.shape[1:-1]:
+                    return None
+                vectorized = True
+            elif isinstance(step, StandardScaler):
+                # mean_ and scale_ can be set even if they are not used
+                if step.with_std and step.scale_ is not None:
+                    coef = coef / step.scale_
+                if step.with_mean and step.mean_ is not None:
+                    intercept = intercept - np.dot(coef, step.mean_)
+            else:
+                return None
+        if not vectorized or coef.shape[1] != n_features:
+            return None
+        if is_clf and method == 'predict':
+            if classes is None:
+                classes = final.classes_
+            elif not np.array_equal(classes, final.classes_):
+                return None
+        if len(coefs) and (coef.shape != coefs[0].shape or
+                           ravel != this_ravel):
+            return None
+        this_ravel = ravel
+        coefs.append(coef)
+        intercepts.append(intercept)
+    return np.array(coefs), np.array(intercepts), classes, this_ravel
+
+
+def _gl_predict_linear(X, method, coefs, intercepts, classes, ravel):
+    """Predict all slices with all affine estimators at once."""
+    n_samples, n_slices = X.shape[0], X.shape[-1]
+    n_estimators, n_outputs, n_features = coefs.shape
+    X = X.reshape(n_samples, n_features, n_slices).transpose(0, 2, 1)
+    y_pred = np.dot(X.reshape(-1, n_features),
+                    coefs.reshape(-1, n_features).T)
+    y_pred = y_pred.reshape(n_samples, n_slices, n_estimators, n_outputs)
+    y_pred = y_pred.transpose(0, 2, 1, 3)
+    y_pred += intercepts[:, np.newaxis]
+    if classes is not None:
+        if n_outputs == 1:
+            y_pred = (y_pred[..., 0] > 0).astype(int)
+        else:
+            y_pred = y_pred.argmax(axis=-1)
+        y_pred = classes[y_pred]
+    elif ravel:
+        y_pred = y_pred[..., 0]
+    return y_pred
+
+
+def _gl_score_linear(estimators, scoring, X, y):
+    """Score all slices with all affine estimators at once.
+
+    Returns None if the scoring cannot be computed from affine predictions.
+    """
+    from sklearn.base import ClassifierMixin, RegressorMixin
+    final = _get_final_estimator(estimators[0])
+    if getattr(scoring, '__name__', '') == '_passthrough_scorer' or \
+            type(scoring).__name__ == '_PassthroughScorer':
+        if type(final).score is ClassifierMixin.score:
+            name = 'accuracy_score'
+        elif type(final).score is RegressorMixin.score:
+            name = 'r2_score'
+        else:
+            return None
+        sign = 1
+    else:
+        name = getattr(getattr(scoring, '_score_func', None), '__name__', '')
+        if getattr(scoring, '_kwargs', None) != {}:
+            return None
+        sign = getattr(scoring, '_sign', 1)
+    method = dict(accuracy_score='predict', r2_score='predict',
+                  roc_auc_score='decision_function').get(name)
+    y = np.asarray(y)
+    if method is None or y.ndim != 1:
+        return None
+    params = _get_linear_params(estimators, method, X)
+    if params is None or (name == 'r2_score' and (
+            params[2] is not None or not params[3])):
+        return None
+    if name == 'r2_score':
+        ss_tot = np.sum((y - np.mean(y)) ** 2)
+        if ss_tot == 0:
+            return None
+    elif name == 'roc_auc_score' and len(np.unique(y)) != 2:
+        return None
+    # predict blocks of slices to limit memory usage
+    n_samples, n_slices = X.shape[0], X.shape[-1]
+    n_block = max(int(1e7 // (n_samples * len(estimators))), 1)
+    score = np.empty((len(estimators), n_slices))
+    for start in range(0, n_slices, n_block):
+        sl = slice(start, start + n_block)
+        y_pred = _gl_predict_linear(X[..., sl], method, *params)
+        if name == 'accuracy_score':
+            score[:, sl] = np.mean(y_pred == y[:, np.newaxis, np.newaxis],
+                                   axis=0)
+        elif name == 'r2_score':
+            y_pred -= y[:, np.newaxis, np.newaxis]
+            score[:, sl] = 1 - np.sum(y_pred * y_pred, axis=0) / ss_tot
+        else:
+            score[:, sl] = _roc_auc_scores(
+                y == np.max(y), y_pred.reshape(n_samples, -1)).reshape(
+                len(estimators), -1)
+    score *= sign
+    return score
+
+
+def _roc_auc_scores(y_true, y_score):
+    """Compute the areas under the ROC curves of all columns of y_score.
+
+    This uses the equivalence with the Mann-Whitney U statistic, i.e., the
+    sum of the ranks of the positive samples, with ties getting their
+    average rank.
+    """
+    n_samples = len(y_score)
+    n_pos = np.sum(y_true)
+    n_neg = n_samples - n_pos
+    order = np.argsort(y_score, axis=0)
+    y_score = np.take_along_axis(y_score, order, axis=0)
+    idx = np.arange(n_samples)[:, np.newaxis]
+    # first and last (sorted) index of each group of ties
+    tie = y_score[1:] == y_score[:-1]
+    first = np.where(np.concatenate([np.zeros_like(tie[:1]), tie]), 0, idx)
+    np.maximum.accumulate(first, axis=0, out=first)
+    last = np.where(np.concatenate([tie, np.zeros_like(tie[:1])]),
+                    n_samples, idx)
+    last = np.minimum.accumulate(last[::-1], axis=0)[::-1]
+    ranks = (first + last) / 2. + 1
+    rank_sum = np.sum(ranks * y_true[order], axis=0)
+    return (rank_sum - n_pos * (n_pos + 1) / 2.) / (n_pos * n_neg)
+
+
 def _fix_auc(scoring, y):
     from sklearn.preprocessing import LabelEncoder
     # This fixes sklearn's inability to compute roc_auc when y not in [0, 1]
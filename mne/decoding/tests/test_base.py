@@ -428,3 +428,52 @@ def test_cross_val_multiscore():
         manual = cross_val(reg, X, y, cv=KFold(2))
         auto = cross_val(reg, X, y, cv=2)
         assert_array_equal(manual, auto)
+
+
+@requires_sklearn
+@pytest.mark.parametrize('generalize', (False, True))
+def test_cross_val_multiscore_search_light(generalize):
+    """Test cross_val_multiscore with folds and slices run as jobs."""
+    from sklearn.model_selection import KFold
+    from sklearn.linear_model import LogisticRegression
+    from mne.decoding import GeneralizingEstimator
+    logreg = LogisticRegression(solver='liblinear', random_state=0)
+    rng = np.random.RandomState(0)
+    X = rng.rand(20, 4, 5)
+    y = np.arange(20) % 2
+    X[y == 1] += 0.2
+    cv = KFold(3, random_state=0, shuffle=True)
+    klass = GeneralizingEstimator if generalize else SlidingEstimator
+    clf = klass(logreg, scoring='roc_auc')
+    scores_manual = list()
+    for train, test in cv.split(X, y):
+        clf.fit(X[train], y[train])
+        scores_manual.append(clf.score(X[test], y[test]))
+    shape = (3, 5, 5) if generalize else (3, 5)
+    for n_jobs in (1, 2):
+        scores = cross_val_multiscore(clf, X, y, cv=cv, n_jobs=n_jobs)
+        assert scores.shape == shape
+        assert_array_equal(scores, scores_manual)
+    # the jobs of the estimator are used for the folds and slices
+    clf.set_params(n_jobs=2)
+    scores = cross_val_multiscore(clf, X, y, cv=cv)
+    assert_array_equal(scores, scores_manual)
+    assert clf.n_jobs == 2
+    # sample weights are split along the folds
+    scores = cross_val_multiscore(clf, X, y, cv=cv,
+                                  fit_params=dict(sample_weight=np.ones(20)))
+    assert_array_equal(scores, scores_manual)
+    # targets as a list
+    scores = cross_val_multiscore(clf, X, list(y), cv=cv)
+    assert_array_equal(scores, scores_manual)
+    # more jobs than folds can give blocks of a single slice
+    X = X[..., :3]
+    clf.set_params(n_jobs=4)
+    cv = KFold(2)
+    scores_manual = list()
+    for train, test in cv.split(X, y):
+        clf.fit(X[train], y[train])
+        scores_manual.append(clf.score(X[test], y[test]))
+    scores = cross_val_multiscore(clf, X, y, cv=cv)
+    assert scores.shape == ((2, 3, 3) if generalize else (2, 3))
+    assert_array_equal(scores, scores_manual)
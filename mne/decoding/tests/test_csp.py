@@ -10,7 +10,7 @@ import os.path as op
 import pytest
 import numpy as np
 from numpy.testing import (assert_array_almost_equal, assert_array_equal,
-                           assert_equal)
+                           assert_equal, assert_allclose)
 
 from mne import io, Epochs, read_events, pick_types
 from mne.decoding.csp import CSP, _ajd_pham, SPoC
@@ -220,6 +220,49 @@ def test_csp_pipeline():
     assert (pipe.get_params()["CSP__reg"] == 0.2)
 
 
+def test_csp_partial_fit():
+    """Test CSP and SPoC fitted on batches of epochs."""
+    rng = np.random.RandomState(0)
+    X = rng.randn(60, 5, 40)
+    X[:, 0] *= 3
+    batches = np.array_split(np.arange(len(X)), 4)
+    for n_classes in (2, 3):
+        y = np.arange(len(X)) % n_classes
+        for cov_est, reg in (('concat', None), ('epoch', 0.1)):
+            kwargs = dict(n_components=3, cov_est=cov_est, reg=reg)
+            csp = CSP(**kwargs).fit(X, y)
+            csp_partial = CSP(**kwargs)
+            for batch in batches:
+                assert csp_partial.partial_fit(X[batch], y[batch]) is \
+                    csp_partial
+            assert_allclose(np.abs(csp_partial.transform(X)),
+                            np.abs(csp.transform(X)), rtol=1e-6)
+            assert_allclose(csp_partial.mean_, csp.mean_, rtol=1e-6)
+            assert_allclose(csp_partial.std_, csp.std_, rtol=0.2)
+    # filters need two classes
+    csp = CSP().partial_fit(X[:10], np.zeros(10))
+    pytest.raises(RuntimeError, csp.transform, X)
+    with pytest.raises(ValueError, match='requires reg'):
+        CSP(reg='oas').partial_fit(X, y)
+    with pytest.raises(ValueError, match='log=False'):
+        CSP(log=False).partial_fit(X, y)
+    # partial_fit starts over after fit
+    csp_partial = CSP(n_components=3).fit(X[batches[0]], y[batches[0]])
+    csp_partial.partial_fit(X[batches[1]], y[batches[1]])
+    csp = CSP(n_components=3).fit(X[batches[1]], y[batches[1]])
+    assert_allclose(np.abs(csp_partial.transform(X)),
+                    np.abs(csp.transform(X)), rtol=1e-6)
+
+    y = rng.rand(len(X)) + 10
+    spoc = SPoC(n_components=3).fit(X, y)
+    spoc_partial = SPoC(n_components=3)
+    for batch in batches:
+        spoc_partial.partial_fit(X[batch], y[batch])
+    assert_allclose(np.abs(spoc_partial.filters_), np.abs(spoc.filters_),
+                    rtol=1e-6)
+    assert_allclose(spoc_partial.mean_, spoc.mean_, rtol=1e-6)
+
+
 def test_ajd():
     """Test approximate joint diagonalization."""
     # The implementation shuold obtain the same
@@ -241,6 +284,67 @@ def test_ajd():
     assert_array_almost_equal(V, V_matlab)
 
 
+def _ajd_pham_orig(X, eps=1e-6, max_iter=15):
+    """Run the original pair-by-pair implementation of Pham's AJD."""
+    n_epochs = X.shape[0]
+    A = np.concatenate(X, axis=0).T
+    n_times, n_m = A.shape
+    V = np.eye(n_times)
+    epsilon = n_times * (n_times - 1) * eps
+    for it in range(max_iter):
+        decr = 0
+        for ii in range(1, n_times):
+            for jj in range(ii):
+                Ii = np.arange(ii, n_m, n_times)
+                Ij = np.arange(jj, n_m, n_times)
+                c1 = A[ii, Ii]
+                c2 = A[jj, Ij]
+                g12 = np.mean(A[ii, Ij] / c1)
+                g21 = np.mean(A[ii, Ij] / c2)
+                omega21 = np.mean(c1 / c2)
+                omega12 = np.mean(c2 / c1)
+                omega = np.sqrt(omega12 * omega21)
+                tmp = np.sqrt(omega21 / omega12)
+                tmp1 = (tmp * g12 + g21) / (omega + 1)
+                tmp2 = (tmp * g12 - g21) / max(omega - 1, 1e-9)
+                h12 = tmp1 + tmp2
+                h21 = np.conj((tmp1 - tmp2) / tmp)
+                decr += n_epochs * (g12 * np.conj(h12) + g21 * h21) / 2.0
+                tmp = 1 + 1.j * 0.5 * np.imag(h12 * h21)
+                tmp = np.real(tmp + np.sqrt(tmp ** 2 - h12 * h21))
+                tau = np.array([[1, -h12 / tmp], [-h21 / tmp, 1]])
+                A[[ii, jj], :] = np.dot(tau, A[[ii, jj], :])
+                tmp = np.c_[A[:, Ii], A[:, Ij]]
+                tmp = np.reshape(tmp, (n_times * n_epochs, 2), order='F')
+                tmp = np.dot(tmp, tau.T)
+                tmp = np.reshape(tmp, (n_times, n_epochs * 2), order='F')
+                A[:, Ii] = tmp[:, :n_epochs]
+                A[:, Ij] = tmp[:, n_epochs:]
+                V[[ii, jj], :] = np.dot(tau, V[[ii, jj], :])
+        if decr < epsilon:
+            break
+    D = np.reshape(A, (n_times, -1, n_times)).transpose(1, 0, 2)
+    return V, D
+
+
+def test_ajd_not_diagonalizable(monkeypatch):
+    """Test AJD and multiclass CSP on not jointly diagonalizable matrices."""
+    rng = np.random.RandomState(0)
+    X = rng.randn(60, 8, 200)
+    y = np.arange(len(X)) % 3
+    X[y == 1, 0] *= 3
+    X[y == 2, 1:3] *= 2
+    covmats = np.array([np.cov(x) for x in X])
+    V, D = _ajd_pham(covmats)
+    V_orig, D_orig = _ajd_pham_orig(covmats.copy())
+    assert_allclose(V, V_orig, rtol=1e-10, atol=1e-12)
+    assert_allclose(D, D_orig, rtol=1e-10, atol=1e-12)
+    X_csp = CSP(n_components=8).fit(X, y).transform(X)
+    monkeypatch.setattr('mne.decoding.csp._ajd_pham', _ajd_pham_orig)
+    X_csp_orig = CSP(n_components=8).fit(X, y).transform(X)
+    assert_allclose(X_csp, X_csp_orig, rtol=1e-10)
+
+
 def test_spoc():
     """Test SPoC."""
     X = np.random.randn(10, 10, 20)
@@ -332,6 +332,51 @@ def test_time_delaying_fast_calc(n_jobs):
             assert_allclose(x_xt, x_xt_true, atol=1e-7, err_msg=(smin, smax))
 
 
+@pytest.mark.parametrize('smin, smax', [(-3, 5), (2, 7), (-40, -35)])
+def test_time_delaying_long(smin, smax):
+    """Test correlations accumulated over segments of multiple epochs."""
+    rng = np.random.RandomState(0)
+    X = rng.randn(3000, 2, 3) + 1.
+    y = rng.randn(3000, 2, 2)
+    x_xt, x_y, n_ch_x, X_offset, y_offset = _compute_corrs(
+        X, y, smin, smax + 1, fit_intercept=True)
+    assert n_ch_x == 3
+    assert_allclose(X_offset, X.mean(axis=(0, 1)))
+    X -= X_offset
+    y -= y_offset
+    x_xt_true = x_y_true = 0.
+    for ei in range(X.shape[1]):
+        X_del = _delay_time_series(X[:, ei], smin, smax, 1., fill_mean=False)
+        X_del = np.reshape(X_del, (X.shape[0], -1))
+        x_xt_true += np.dot(X_del.T, X_del)
+        x_y_true += np.dot(X_del.T, y[:, ei])
+    assert_allclose(x_xt, x_xt_true, rtol=1e-10, atol=1e-8)
+    assert_allclose(x_y, x_y_true, rtol=1e-10, atol=1e-8)
+
+
+@pytest.mark.parametrize('reg_type', ('ridge', 'laplacian'))
+def test_time_delaying_ridge_alphas(reg_type):
+    """Test fitting multiple regularization values at once."""
+    rng = np.random.RandomState(0)
+    X = rng.randn(500, 3)
+    y = rng.randn(500, 2)
+    alphas = [0., 0.1, 10., 1e4]
+    tdr = TimeDelayingRidge(-2, 3, 1., alphas, reg_type).fit(X, y)
+    assert tdr.coef_.shape == (4, 2, 3, 6)
+    assert tdr.intercept_.shape == (4, 2)
+    y_pred = tdr.predict(X)
+    assert y_pred.shape == (4, 500, 2)
+    for ai, alpha in enumerate(alphas):
+        tdr_one = TimeDelayingRidge(-2, 3, 1., alpha, reg_type).fit(X, y)
+        assert_allclose(tdr.coef_[ai], tdr_one.coef_, rtol=1e-7, atol=1e-10)
+        assert_allclose(tdr.intercept_[ai], tdr_one.intercept_,
+                        rtol=1e-7, atol=1e-10)
+        assert_allclose(y_pred[ai], tdr_one.predict(X), rtol=1e-7,
+                        atol=1e-10)
+    with pytest.raises(ValueError, match='1D array-like'):
+        TimeDelayingRidge(-2, 3, 1., [[1.]]).fit(X, y)
+
+
 @pytest.mark.parametrize('n_jobs', n_jobs_test)
 @requires_sklearn
 def test_receptive_field_1d(n_jobs):
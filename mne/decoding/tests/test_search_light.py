@@ -3,7 +3,7 @@
 # License: BSD (3-clause)
 
 import numpy as np
-from numpy.testing import assert_array_equal, assert_equal
+from numpy.testing import assert_array_equal, assert_equal, assert_allclose
 import pytest
 
 from mne.utils import requires_sklearn
@@ -231,7 +231,8 @@ def test_generalization_light():
     score = gl.score(X, y)
     manual_score = [[roc_auc_score(y - 1, _y_pred) for _y_pred in _y_preds]
                     for _y_preds in gl.decision_function(X).transpose(1, 2, 0)]
-    assert_array_equal(score, manual_score)
+    # scores are computed at once from the affine predictions
+    assert_allclose(score, manual_score, rtol=1e-12)
 
     # n_jobs
     gl = GeneralizingEstimator(logreg, n_jobs=2)
@@ -258,6 +259,68 @@ def test_generalization_light():
     assert_array_equal(y_preds[0], y_preds[1])
 
 
+@requires_sklearn
+def test_linear_fast_path():
+    """Test fitting and generalizing linear models at once."""
+    from sklearn.linear_model import Ridge, LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.metrics import r2_score, roc_auc_score
+    X, y = make_data()
+    y_reg = X[:, 0, :].mean(-1)
+    # closed-form ridge regressions
+    for fit_intercept, n_epochs in ((True, 50), (False, 20)):
+        sl = SlidingEstimator(Ridge(alpha=3., fit_intercept=fit_intercept))
+        sl.fit(X[:n_epochs], y_reg[:n_epochs])
+        for ii, est in enumerate(sl.estimators_):
+            ridge = Ridge(alpha=3., fit_intercept=fit_intercept).fit(
+                X[:n_epochs, :, ii], y_reg[:n_epochs])
+            assert_allclose(est.coef_, ridge.coef_, rtol=1e-10)
+            assert_allclose(est.intercept_, ridge.intercept_, atol=1e-12)
+            assert_allclose(est.predict(X[..., ii]), ridge.predict(X[..., ii]))
+    gl = GeneralizingEstimator(Ridge()).fit(X, y_reg)
+    y_pred = gl.predict(X)
+    assert_allclose(y_pred[:, 2, 5], gl.estimators_[2].predict(X[..., 5]))
+    score = gl.score(X, y_reg)
+    assert_allclose(score[3, 4], r2_score(y_reg, y_pred[:, 3, 4]))
+    # preprocessing steps are folded into the coefficients
+    y = np.arange(len(X)) % 3
+    clf = make_pipeline(StandardScaler(), LogisticRegression())
+    gl = GeneralizingEstimator(clf).fit(X, y)
+    dec = gl.decision_function(X)
+    assert dec.shape == (len(X), X.shape[-1], X.shape[-1], 3)
+    assert_allclose(dec[:, 1, 7], gl.estimators_[1].decision_function(
+        X[..., 7]))
+    y_pred = gl.predict(X)
+    assert_array_equal(y_pred[:, 6, 2], gl.estimators_[6].predict(X[..., 2]))
+    assert_allclose(gl.score(X, y), np.mean(y_pred == y[:, None, None], 0))
+    # scalers that do not center or scale the data
+    for kwargs in (dict(with_mean=False), dict(with_std=False)):
+        clf_scale = make_pipeline(StandardScaler(**kwargs),
+                                  LogisticRegression(solver='liblinear'))
+        gl = GeneralizingEstimator(clf_scale).fit(X + 1., y)
+        dec = gl.decision_function(X + 1.)
+        assert_allclose(dec[:, 4, 0], gl.estimators_[4].decision_function(
+            X[..., 0] + 1.))
+    # no intercept with 2D targets
+    sl = SlidingEstimator(Ridge(fit_intercept=False)).fit(
+        X, np.array([y_reg, -y_reg]).T)
+    assert sl.estimators_[0].intercept_ == 0.
+    # AUC with ties
+    y = np.arange(len(X)) % 2
+    X[:10] = 0.
+    gl = GeneralizingEstimator(clf, scoring='roc_auc').fit(X, y)
+    dec = gl.decision_function(X)
+    assert_allclose(gl.score(X, y), [[roc_auc_score(y, d) for d in dd]
+                                     for dd in dec.transpose(1, 2, 0)])
+    # warm starts
+    clf = LogisticRegression(warm_start=True, tol=1e-8, C=1e-3)
+    sl = SlidingEstimator(clf).fit(X, y)
+    for ii, est in enumerate(sl.estimators_):
+        cold = LogisticRegression(tol=1e-8, C=1e-3).fit(X[..., ii], y)
+        assert_allclose(est.coef_, cold.coef_, atol=1e-5)
+
+
 @requires_sklearn
 def test_cross_val_predict():
     """Test cross_val_predict with predict_proba."""
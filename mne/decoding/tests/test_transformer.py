@@ -10,7 +10,7 @@ import pytest
 from numpy.testing import (assert_array_equal, assert_array_almost_equal,
                            assert_allclose, assert_equal)
 
-from mne import io, read_events, Epochs, pick_types
+from mne import io, read_events, Epochs, pick_types, create_info
 from mne.decoding import (Scaler, FilterEstimator, PSDEstimator, Vectorizer,
                           UnsupervisedSpatialFilter, TemporalFilter)
 from mne.defaults import DEFAULTS
@@ -84,6 +84,44 @@ def test_scaler():
     pytest.raises(ValueError, scaler.fit, epochs_bad.get_data(), y)
 
 
+@requires_sklearn
+def test_partial_fit():
+    """Test partial_fit of the transformers on batches of epochs."""
+    from sklearn.decomposition import PCA, IncrementalPCA
+    rng = np.random.RandomState(0)
+    X = rng.randn(40, 4, 30) * [[1e-6], [2e-6], [1e-5], [5e-6]] + 1e-6
+    batches = np.array_split(np.arange(len(X)), 3)
+
+    # Scaler
+    info = create_info(4, 1000., 'eeg')
+    for scalings in (None, 'mean'):
+        scaler = Scaler(info, scalings)
+        for batch in batches:
+            assert scaler.partial_fit(X[batch]) is scaler
+        assert_allclose(scaler.transform(X),
+                        Scaler(info, scalings).fit_transform(X))
+    with pytest.raises(ValueError, match='not supported'):
+        Scaler(scalings='median').partial_fit(X)
+
+    # Vectorizer
+    vect = Vectorizer()
+    for batch in batches:
+        vect.partial_fit(X[batch])
+    assert_array_equal(vect.transform(X), X.reshape(len(X), -1))
+    with pytest.raises(ValueError, match='must be the same'):
+        vect.partial_fit(X[:, :2])
+
+    # UnsupervisedSpatialFilter
+    usf = UnsupervisedSpatialFilter(IncrementalPCA(2))
+    for batch in batches:
+        usf.partial_fit(X[batch])
+    X_pca = UnsupervisedSpatialFilter(PCA(2)).fit_transform(X)
+    assert_allclose(np.abs(usf.transform(X)), np.abs(X_pca),
+                    atol=1e-3 * np.abs(X_pca).max())
+    with pytest.raises(ValueError, match='partial_fit method'):
+        UnsupervisedSpatialFilter(PCA(2)).partial_fit(X)
+
+
 def test_filterestimator():
     """Test methods of FilterEstimator."""
     raw = io.read_raw_fif(raw_fname)
@@ -26,8 +26,6 @@ def _compute_corrs(X, y, smin, smax, n_jobs=1, fit_intercept=False,
         if X.ndim == 3:
             X_offset = X_offset.mean(axis=0)
             y_offset = np.mean(y_offset, axis=0)
-        X = X - X_offset
-        y = y - y_offset
     else:
         X_offset = y_offset = 0.
     if X.ndim == 2:
@@ -40,101 +38,120 @@ def _compute_corrs(X, y, smin, smax, n_jobs=1, fit_intercept=False,
     len_y, n_epcohs, n_ch_y = y.shape
     assert len_x == len_y
 
-    n_fft = next_fast_len(2 * X.shape[0] - 1)
+    # The correlations are accumulated over segments of the data, which are
+    # correlated with the data extended by the largest lag on both sides.
+    # This gives the correlations of the full data exactly, while the FFTs
+    # stay short and the memory usage does not depend on the data length.
+    n_lag = max(len_trf - 1, -smin, smax - 1)
+    n_seg = min(max(4 * (2 * n_lag + 1), 512) - 2 * n_lag, len_x)
+    n_fft = next_fast_len(n_seg + 2 * n_lag)
+    starts = np.arange(0, len_x, n_seg)
+    n_batch = max(2 ** 15 // n_fft, 1)
 
     n_jobs, cuda_dict = _setup_cuda_fft_multiply_repeated(
         n_jobs, [1.], n_fft, 'correlation calculations')
 
-    # create our Toeplitz indexer
-    ij = np.empty((len_trf, len_trf), int)
-    for ii in range(len_trf):
-        ij[ii, ii:] = np.arange(len_trf - ii)
-        x = np.arange(n_fft - 1, n_fft - len_trf + ii, -1)
-        ij[ii + 1:, ii] = x
-
-    x_xt = np.zeros([n_ch_x * len_trf] * 2)
-    x_y = np.zeros((len_trf, n_ch_x, n_ch_y), order='F')
-    n = n_epochs * (n_ch_x * (n_ch_x + 1) // 2 + n_ch_x)
+    x_xt = x_y = 0.
+    n = n_epochs * len(range(0, len(starts), n_batch))
     logger.info('Fitting %d epochs, %d channels' % (n_epochs, n_ch_x))
     pb = ProgressBar(n, mesg='Sample')
     count = 0
     pb.update(count)
     for ei in range(n_epochs):
-        this_X = X[:, ei, :]
-        # XXX maybe this is what we should parallelize over CPUs at some point
-        X_fft = cuda_dict['rfft'](this_X, n=n_fft, axis=0)
-        X_fft_conj = X_fft.conj()
-        y_fft = cuda_dict['rfft'](y[:, ei, :], n=n_fft, axis=0)
-
-        for ch0 in range(n_ch_x):
-            for oi, ch1 in enumerate(range(ch0, n_ch_x)):
-                this_result = cuda_dict['irfft'](
-                    X_fft[:, ch0] * X_fft_conj[:, ch1], n=n_fft, axis=0)
-                # Our autocorrelation structure is a Toeplitz matrix, but
-                # it's faster to create the Toeplitz ourselves than use
-                # linalg.toeplitz.
-                this_result = this_result[ij]
-                # However, we need to adjust for coeffs that are cut off,
-                # i.e. the non-zero delays should not have the same AC value
-                # as the zero-delay ones (because they actually have fewer
-                # coefficients).
-                #
-                # These adjustments also follow a Toeplitz structure, so we
-                # construct a matrix of what has been left off, compute their
-                # inner products, and remove them.
-                if edge_correction and smax > 0:
-                    tail = _toeplitz_dot(this_X[-1:-smax:-1, ch0],
-                                         this_X[-1:-smax:-1, ch1])
-                    if smin > 0:
-                        tail = tail[smin - 1:, smin - 1:]
-                    this_result[max(-smin + 1, 0):, max(-smin + 1, 0):] -= tail
-                if edge_correction and smin < 0:
-                    head = _toeplitz_dot(this_X[:-smin, ch0],
-                                         this_X[:-smin, ch1])[::-1, ::-1]
-                    if smax < 0:
-                        head = head[:smax, :smax]
-                    this_result[:-smin, :-smin] -= head
-
-                # Store the results in our output matrix
-                x_xt[ch0 * len_trf:(ch0 + 1) * len_trf,
-                     ch1 * len_trf:(ch1 + 1) * len_trf] += this_result
-                if ch0 != ch1:
-                    x_xt[ch1 * len_trf:(ch1 + 1) * len_trf,
-                         ch0 * len_trf:(ch0 + 1) * len_trf] += this_result.T
-                count += 1
-                pb.update(count)
-
-            # compute the crosscorrelations
-            cc_temp = cuda_dict['irfft'](
-                y_fft * X_fft_conj[:, slice(ch0, ch0 + 1)], n=n_fft, axis=0)
-            if smin < 0 and smax >= 0:
-                x_y[:-smin, ch0] += cc_temp[smin:]
-                x_y[len_trf - smax:, ch0] += cc_temp[:smax]
-            else:
-                x_y[:, ch0] += cc_temp[smin:smax]
+        for bi in range(0, len(starts), n_batch):
+            these_starts = starts[bi:bi + n_batch]
+            X_ext = _get_segments(X[:, ei], X_offset, these_starts, n_seg,
+                                  n_lag)
+            X_seg = X_ext[:, n_lag:n_lag + n_seg]
+            y_seg = _get_segments(y[:, ei], y_offset, these_starts, n_seg, 0)
+            # The cross-spectra of all channel pairs are summed over the
+            # segments with one matrix product per frequency
+            X_ext_fft = cuda_dict['rfft'](X_ext, n=n_fft, axis=1)
+            X_ext_fft = X_ext_fft.transpose(1, 2, 0)
+            X_seg_fft = cuda_dict['rfft'](X_seg, n=n_fft, axis=1)
+            y_seg_fft = cuda_dict['rfft'](y_seg, n=n_fft, axis=1)
+            x_xt = x_xt + np.matmul(X_ext_fft,
+                                    X_seg_fft.transpose(1, 0, 2).conj())
+            x_y = x_y + np.matmul(X_ext_fft,
+                                  y_seg_fft.transpose(1, 0, 2).conj())
+            del X_ext, X_seg, y_seg, X_ext_fft, X_seg_fft, y_seg_fft
             count += 1
             pb.update(count)
 
-    x_y = np.reshape(x_y, (n_ch_x * len_trf, n_ch_y), order='F')
+    # Entry n_lag + k is now the correlation of the first channel delayed by
+    # -k with the second one, sum_t x0[t + k] * x1[t]
+    corr = cuda_dict['irfft'](x_xt, n=n_fft, axis=0)
+    del x_xt
+    # Our autocorrelation structure is a Toeplitz matrix (for each pair of
+    # channels), but it's faster to create the Toeplitz ourselves than use
+    # linalg.toeplitz.
+    x_xt = np.empty((n_ch_x, len_trf, n_ch_x, len_trf))
+    for ii in range(len_trf):
+        x_xt[:, ii] = corr[n_lag - ii:n_lag - ii + len_trf].transpose(1, 2, 0)
+    del corr
+    # However, we need to adjust for coeffs that are cut off, i.e. the
+    # non-zero delays should not have the same AC value as the zero-delay
+    # ones (because they actually have fewer coefficients).
+    if edge_correction:
+        for ei in range(n_epochs):
+            _subtract_edges(x_xt, X[:, ei], X_offset, smin, smax)
+    x_xt.shape = (n_ch_x * len_trf,) * 2
+
+    # compute the crosscorrelations
+    corr = cuda_dict['irfft'](x_y, n=n_fft, axis=0)
+    x_y = corr[n_lag - smin - np.arange(len_trf)].transpose(1, 0, 2)
+    x_y = np.reshape(x_y, (n_ch_x * len_trf, n_ch_y))
     return x_xt, x_y, n_ch_x, X_offset, y_offset
 
 
-def _toeplitz_dot(a, b):
-    """Create upper triangular Toeplitz matrices & compute the dot product."""
-    # This is equivalent to:
-    # a = linalg.toeplitz(a)
-    # b = linalg.toeplitz(b)
-    # a[np.triu_indices(len(a), 1)] = 0
-    # b[np.triu_indices(len(a), 1)] = 0
-    # out = np.dot(a.T, b)
-    assert a.shape == b.shape and a.ndim == 1
-    out = np.outer(a, b)
-    for ii in range(1, len(a)):
-        out[ii, ii:] += out[ii - 1, ii - 1:-1]
-        out[ii + 1:, ii] += out[ii:-1, ii - 1]
+def _get_segments(x, offset, starts, n_seg, n_lag):
+    """Get segments of centered data, zero-padded and extended by n_lag."""
+    start, stop = starts[0] - n_lag, starts[-1] + n_seg + n_lag
+    data = np.zeros((stop - start,) + x.shape[1:])
+    use = slice(max(start, 0) - start, min(stop, len(x)) - start)
+    data[use] = x[max(start, 0):min(stop, len(x))]
+    data[use] -= offset
+    idx = np.arange(n_seg + 2 * n_lag) + (starts - starts[0])[:, np.newaxis]
+    return data[idx]
+
+
+def _subtract_edges(x_xt, X, offset, smin, smax):
+    """Subtract the products of the delayed samples cut off at the edges."""
+    # These adjustments follow a Toeplitz structure, so we construct a
+    # matrix of what has been left off, compute their inner products (for all
+    # channel pairs at once), and remove them.
+    if smax > 0:
+        tail = _upper_toeplitz(X[-1:-smax:-1] - offset)
+        tail = tail[:, max(smin - 1, 0):]
+        start = max(-smin + 1, 0)
+        _subtract_products(x_xt[:, start:, :, start:], tail)
+    if smin < 0:
+        head = _upper_toeplitz(X[:-smin] - offset)[:, ::-1]
+        if smax < 0:
+            head = head[:, :smax]
+        _subtract_products(x_xt[:, :-smin, :, :-smin], head)
+
+
+def _upper_toeplitz(a):
+    """Create the upper triangular Toeplitz matrices of the columns of a."""
+    # This is equivalent to (for each column of a):
+    # out = linalg.toeplitz(a)
+    # out[np.tril_indices(len(a), -1)] = 0
+    out = np.zeros((len(a),) + a.shape)
+    for ii in range(len(a)):
+        out[ii, ii:] = a[:len(a) - ii]
     return out
 
 
+def _subtract_products(x_xt, mats):
+    """Subtract mats[:, :, ch0].T @ mats[:, :, ch1] for all channel pairs."""
+    n_rows, n_cols, n_ch = mats.shape
+    mats_2d = mats.reshape(n_rows, n_cols * n_ch)
+    for ch0 in range(n_ch):
+        prod = np.dot(mats[:, :, ch0].T, mats_2d)
+        x_xt[ch0] -= prod.reshape(n_cols, n_cols, n_ch).transpose(0, 2, 1)
+
+
 def _compute_reg_neighbors(n_ch_x, n_delays, reg_type, method='direct',
                            normed=False):
     """Compute regularization parameter from neighbors."""
@@ -197,7 +214,43 @@ def _fit_corrs(x_xt, x_y, n_ch_x, reg_type, alpha, n_ch_in):
     assert x_y.shape[0] % n_ch_x == 0
     n_delays = x_y.shape[0] // n_ch_x
     reg = _compute_reg_neighbors(n_ch_x, n_delays, reg_type)
-    mat = x_xt + alpha * reg
+    if np.ndim(alpha) == 0:
+        w = _solve_corrs(x_xt + alpha * reg, x_y)
+        return w.T.reshape([n_ch_out, n_ch_in, n_delays])
+
+    # Solve for all regularization values using one generalized
+    # eigendecomposition x_xt V = (x_xt + scale * reg) V diag(lambdas) with
+    # V.T (x_xt + scale * reg) V = I, such that with beta = alpha / scale
+    # inv(x_xt + alpha * reg) = V diag(1 / (lambdas * (1 - beta) + beta)) V.T
+    scale = np.trace(x_xt) / np.trace(reg)
+    try:
+        chol = linalg.cholesky(x_xt + scale * reg, lower=True)
+    except (np.linalg.LinAlgError, ValueError):
+        lambdas = None
+    else:
+        # reduce to a standard eigenvalue problem
+        mat = linalg.solve_triangular(chol, x_xt, lower=True)
+        mat = linalg.solve_triangular(chol, mat.T, lower=True)
+        lambdas, vecs = linalg.eigh(mat, overwrite_a=True)
+        vecs = linalg.solve_triangular(chol, vecs, lower=True, trans='T')
+        proj = np.dot(vecs.T, x_y)
+        del chol, mat
+    ws = list()
+    for this_alpha in alpha:
+        if lambdas is not None:
+            beta = this_alpha / scale
+            denom = lambdas + beta - beta * lambdas
+        if lambdas is None or denom.min() <= \
+                len(denom) * np.finfo(float).eps * denom.max():
+            w = _solve_corrs(x_xt + this_alpha * reg, x_y)
+        else:
+            w = np.dot(vecs, proj / denom[:, np.newaxis])
+        ws.append(w.T.reshape([n_ch_out, n_ch_in, n_delays]))
+    return np.array(ws)
+
+
+def _solve_corrs(mat, x_y):
+    """Solve the regularized normal equations."""
     # From sklearn
     try:
         # Note: we must use overwrite_a=False in order to be able to
@@ -208,7 +261,6 @@ def _fit_corrs(x_xt, x_y, n_ch_x, reg_type, alpha, n_ch_in):
         warn('Singular matrix in solving dual problem. Using '
              'least-squares solution instead.')
         w = linalg.lstsq(mat, x_y, lapack_driver='gelsy')[0]
-    w = w.T.reshape([n_ch_out, n_ch_in, n_delays])
     return w
 
 
@@ -226,8 +278,15 @@ class TimeDelayingRidge(BaseEstimator):
         Must be >= tmin.
     sfreq : float
         The sampling frequency used to convert times into samples.
-    alpha : float
-        The ridge (or laplacian) regularization factor.
+    alpha : float | array-like
+        The ridge (or laplacian) regularization factor. Can be an array of
+        values to fit a model for each of them at once, which only
+        requires a single eigendecomposition of the correlation matrices.
+        The coefficients, intercepts and predictions then have an
+        additional first dimension for the regularization values.
+
+        .. versionchanged:: 0.21
+           Support for multiple regularization values.
     reg_type : str | list
         Can be "ridge" (default) or "laplacian".
         Can also be a 2-element list specifying how to regularize in time
@@ -257,7 +316,11 @@ class TimeDelayingRidge(BaseEstimator):
     by only implicitly doing the time delaying. For reasonable receptive
     field and input signal sizes, it should be more CPU and memory
     efficient by using frequency-domain methods (FFTs) to compute the
-    auto- and cross-correlations.
+    auto- and cross-correlations. These are accumulated over short
+    segments of the data, so that the memory usage only depends on the
+    number of features and delays, not on the duration of the data.
+    Multiple regularization values cannot be used with
+    :class:`mne.decoding.ReceptiveField`.
     """
 
     _estimator_type = "regressor"
@@ -270,7 +333,7 @@ class TimeDelayingRidge(BaseEstimator):
         self.tmin = float(tmin)
         self.tmax = float(tmax)
         self.sfreq = float(sfreq)
-        self.alpha = float(alpha)
+        self.alpha = alpha if np.ndim(alpha) else float(alpha)
         self.reg_type = reg_type
         self.fit_intercept = fit_intercept
         self.edge_correction = edge_correction
@@ -305,6 +368,12 @@ class TimeDelayingRidge(BaseEstimator):
         else:
             assert X.ndim == 2 and y.ndim == 2
             assert X.shape[0] == y.shape[0]
+        alpha = np.array(self.alpha, float)
+        if alpha.ndim > 1:
+            raise ValueError('alpha must be a float or a 1D array-like, got '
+                             'shape %s' % (alpha.shape,))
+        if alpha.ndim == 0:
+            alpha = float(alpha)
         n_jobs = check_n_jobs(self.n_jobs, allow_cuda=True)
         # These are split into two functions because it's possible that we
         # might want to allow people to do them separately (e.g., to test
@@ -313,10 +382,10 @@ class TimeDelayingRidge(BaseEstimator):
             X, y, self._smin, self._smax, n_jobs, self.fit_intercept,
             self.edge_correction)
         self.coef_ = _fit_corrs(self.cov_, x_y_, n_ch_x,
-                                self.reg_type, self.alpha, n_ch_x)
+                                self.reg_type, alpha, n_ch_x)
         # This is the sklearn formula from LinearModel (will be 0. for no fit)
         if self.fit_intercept:
-            self.intercept_ = y_offset - np.dot(X_offset, self.coef_.sum(-1).T)
+            self.intercept_ = y_offset - np.dot(self.coef_.sum(-1), X_offset)
         else:
             self.intercept_ = 0.
         return self
@@ -332,23 +401,29 @@ class TimeDelayingRidge(BaseEstimator):
         Returns
         -------
         X : ndarray
-            The predicted response.
+            The predicted response, with shape
+            ``([n_alphas, ]n_samples[, n_epochs], n_outputs)``.
         """
         if X.ndim == 2:
             X = X[:, np.newaxis, :]
             singleton = True
         else:
             singleton = False
-        out = np.zeros(X.shape[:2] + (self.coef_.shape[0],))
+        # outputs of all regularization values are predicted together
+        coef = self.coef_.reshape((-1,) + self.coef_.shape[-2:])
+        out = np.zeros(X.shape[:2] + (coef.shape[0],))
         smin = self._smin
         offset = max(smin, 0)
         for ei in range(X.shape[1]):
-            for oi in range(self.coef_.shape[0]):
-                for fi in range(self.coef_.shape[1]):
-                    temp = np.convolve(X[:, ei, fi], self.coef_[oi, fi])
+            for oi in range(coef.shape[0]):
+                for fi in range(coef.shape[1]):
+                    temp = np.convolve(X[:, ei, fi], coef[oi, fi])
                     temp = temp[max(-smin, 0):][:len(out) - offset]
                     out[offset:len(temp) + offset, ei, oi] += temp
-        out += self.intercept_
+        out += np.reshape(self.intercept_, -1)
         if singleton:
             out = out[:, 0, :]
+        if self.coef_.ndim == 4:
+            out = out.reshape(out.shape[:-1] + self.coef_.shape[:2])
+            out = np.moveaxis(out, -2, 0)
         return out
@@ -151,6 +151,44 @@ class Scaler(TransformerMixin, BaseEstimator):
         _sklearn_reshape_apply(self._scaler.fit, False, epochs_data, y=y)
         return self
 
+    def partial_fit(self, epochs_data, y=None):
+        """Update the channel standardization with a batch of epochs.
+
+        Parameters
+        ----------
+        epochs_data : array, shape (n_epochs, n_channels, n_times)
+            A batch of the data to concatenate channels.
+        y : array, shape (n_epochs,)
+            The label for each epoch.
+
+        Returns
+        -------
+        self : instance of Scaler
+            The modified instance.
+
+        Notes
+        -----
+        Calling this method on consecutive batches of epochs gives the
+        same scaling as calling :meth:`fit` on all of them, without
+        requiring them to be in memory at once. This is not possible for
+        ``scalings='median'``.
+
+        .. versionadded:: 0.21
+        """
+        _validate_type(epochs_data, np.ndarray, 'epochs_data')
+        if epochs_data.ndim == 2:
+            epochs_data = epochs_data[..., np.newaxis]
+        assert epochs_data.ndim == 3, epochs_data.shape
+        if isinstance(self._scaler, _ConstantScaler):
+            func = self._scaler.fit  # does not depend on the data
+        elif hasattr(self._scaler, 'partial_fit'):
+            func = self._scaler.partial_fit
+        else:
+            raise ValueError('partial_fit is not supported for scalings=%r'
+                             % (self.scalings,))
+        _sklearn_reshape_apply(func, False, epochs_data, y=y)
+        return self
+
     def transform(self, epochs_data):
         """Standardize data across channels.
 
@@ -266,6 +304,37 @@ class Vectorizer(TransformerMixin):
         self.features_shape_ = X.shape[1:]
         return self
 
+    def partial_fit(self, X, y=None):
+        """Store or check the shape of the features of a batch of X.
+
+        Parameters
+        ----------
+        X : array-like
+            A batch of the data to fit. Can be, for example a list, or an
+            array of at least 2d. The first dimension must be of length
+            n_samples, where samples are the independent samples used by the
+            estimator (e.g. n_epochs for epoched data).
+        y : None | array, shape (n_samples,)
+            Used for scikit-learn compatibility.
+
+        Returns
+        -------
+        self : instance of Vectorizer
+            Return the modified instance.
+
+        Notes
+        -----
+        .. versionadded:: 0.21
+        """
+        X = np.asarray(X)
+        if not hasattr(self, 'features_shape_'):
+            return self.fit(X)
+        if X.shape[1:] != self.features_shape_:
+            raise ValueError("Shape of X must be the same in each call to "
+                             "partial_fit, got %s and %s"
+                             % (X.shape[1:], self.features_shape_))
+        return self
+
     def transform(self, X):
         """Convert given array into two dimensions.
 
@@ -396,6 +465,30 @@ class PSDEstimator(TransformerMixin):
 
         return self
 
+    def partial_fit(self, epochs_data, y):
+        """Compute power spectral density (PSD) using a multi-taper method.
+
+        As the PSD does not depend on fitted statistics, this is the same
+        as :meth:`fit`.
+
+        Parameters
+        ----------
+        epochs_data : array, shape (n_epochs, n_channels, n_times)
+            A batch of the data.
+        y : array, shape (n_epochs,)
+            The label for each epoch.
+
+        Returns
+        -------
+        self : instance of PSDEstimator
+            The modified instance.
+
+        Notes
+        -----
+        .. versionadded:: 0.21
+        """
+        return self.fit(epochs_data, y)
+
     def transform(self, epochs_data):
         """Compute power spectral density (PSD) using a multi-taper method.
 
@@ -537,6 +630,30 @@ class FilterEstimator(TransformerMixin):
 
         return self
 
+    def partial_fit(self, epochs_data, y):
+        """Filter data.
+
+        As the filter does not depend on the data, this is the same as
+        :meth:`fit`.
+
+        Parameters
+        ----------
+        epochs_data : array, shape (n_epochs, n_channels, n_times)
+            A batch of the data.
+        y : array, shape (n_epochs,)
+            The label for each epoch.
+
+        Returns
+        -------
+        self : instance of FilterEstimator
+            The modified instance.
+
+        Notes
+        -----
+        .. versionadded:: 0.21
+        """
+        return self.fit(epochs_data, y)
+
     def transform(self, epochs_data):
         """Filter data.
 
@@ -603,6 +720,41 @@ class UnsupervisedSpatialFilter(TransformerMixin, BaseEstimator):
         self : instance of UnsupervisedSpatialFilter
             Return the modified instance.
         """
+        self.estimator.fit(self._get_fit_data(X))
+        return self
+
+    def partial_fit(self, X, y=None):
+        """Update the spatial filters with a batch of epochs.
+
+        Parameters
+        ----------
+        X : array, shape (n_epochs, n_channels, n_times)
+            A batch of the data to be filtered.
+        y : None | array, shape (n_samples,)
+            Used for scikit-learn compatibility.
+
+        Returns
+        -------
+        self : instance of UnsupervisedSpatialFilter
+            Return the modified instance.
+
+        Notes
+        -----
+        This requires the estimator to have a ``partial_fit`` method, e.g.
+        :class:`sklearn.decomposition.IncrementalPCA`. With
+        ``average=True``, the estimator is updated with the average of the
+        batch.
+
+        .. versionadded:: 0.21
+        """
+        if not hasattr(self.estimator, 'partial_fit'):
+            raise ValueError('estimator must have a partial_fit method, got '
+                             '%s' % (type(self.estimator).__name__,))
+        self.estimator.partial_fit(self._get_fit_data(X))
+        return self
+
+    def _get_fit_data(self, X):
+        """Get the samples the estimator is fitted on."""
         if self.average:
             X = np.mean(X, axis=0).T
         else:
@@ -610,8 +762,7 @@ class UnsupervisedSpatialFilter(TransformerMixin, BaseEstimator):
             # trial as time samples
             X = np.transpose(X, (1, 0, 2)).reshape((n_channels, n_epochs *
                                                     n_times)).T
-        self.estimator.fit(X)
-        return self
+        return X
 
     def fit_transform(self, X, y=None):
         """Transform the data to its filtered components after fitting.
@@ -804,16 +804,56 @@ def _fit_Q(fwd_data, whitener, B, B2, B_orig, rd, ori=None):
     return Q, gof, B_residual_noproj, ncomp
 
 
+_GUESS_BLOCK_SIZE = 2 ** 22  # number of guess components x time points
+
+
+def _fit_guesses(guess_fwd_svd, B, B2):
+    """Find the best-fitting guess of each time point.
+
+    The data of all time points are projected at once on the stacked
+    singular vectors of the forwards of all guesses.
+    """
+    sing = np.array([fwd_svd[1] for fwd_svd in guess_fwd_svd])
+    vv = np.array([fwd_svd[2] for fwd_svd in guess_fwd_svd])
+    n_guess = len(vv)
+    # like in _dipole_gof, drop the third component if it is too small
+    vv[sing[:, 2] / np.where(sing[:, 0] > 0, sing[:, 0], 1.) <= 0.2, 2] = 0.
+    vv = vv.reshape(3 * n_guess, -1)
+    n_block = max(_GUESS_BLOCK_SIZE // len(vv), 1)
+    idx = np.empty(B.shape[1], int)
+    for start in range(0, B.shape[1], n_block):
+        sl = slice(start, start + n_block)
+        one = np.dot(vv, B[:, sl]).reshape(n_guess, 3, -1)
+        with np.errstate(invalid='ignore', divide='ignore'):  # zero fields
+            gof = np.sum(one * one, axis=1) / B2[sl]
+        idx[sl] = np.argmin(1. - gof, axis=0)
+    return idx
+
+
 def _fit_dipoles(fun, min_dist_to_inner_skull, data, times, guess_rrs,
-                 guess_data, fwd_data, whitener, ori, n_jobs, rank):
+                 guess_data, fwd_data, whitener, ori, n_jobs, rank,
+                 method='cobyla'):
     """Fit a single dipole to the given whitened, projected data."""
-    from scipy.optimize import fmin_cobyla
+    if fun is _fit_dipole:
+        # Find a good starting point (find_best_guess in C) of all time points
+        B = np.dot(whitener, data)
+        B2 = np.sum(B * B, axis=0)
+        x0s = guess_rrs[_fit_guesses(guess_data['fwd_svd'], B, B2)]
+        guess_data = None  # not needed anymore
+        refine = method == 'cobyla'
+        if not refine:
+            x0s[B2 > 0] = _fit_dipoles_simplex(
+                min_dist_to_inner_skull, B[:, B2 > 0], B2[B2 > 0],
+                x0s[B2 > 0], fwd_data, whitener)
+        del B, B2
+    else:
+        x0s = np.repeat(guess_rrs[:1], len(times), axis=0)
+        refine = False
     parallel, p_fun, _ = parallel_func(fun, n_jobs)
     # parallel over time points
-    res = parallel(p_fun(min_dist_to_inner_skull, B, t, guess_rrs,
-                         guess_data, fwd_data, whitener,
-                         fmin_cobyla, ori, rank)
-                   for B, t in zip(data.T, times))
+    res = parallel(p_fun(min_dist_to_inner_skull, B, t, x0, guess_data,
+                         fwd_data, whitener, refine, ori, rank)
+                   for B, t, x0 in zip(data.T, times, x0s))
     pos = np.array([r[0] for r in res])
     amp = np.array([r[1] for r in res])
     ori = np.array([r[2] for r in res])
@@ -830,10 +870,8 @@ def _fit_dipoles(fun, min_dist_to_inner_skull, data, times, guess_rrs,
     return pos, amp, ori, gof, conf, khi2, nfree, residual_noproj
 
 
-'''Simplex code in case we ever want/need it for testing
-
 def _make_tetra_simplex():
-    """Make the initial tetrahedron"""
+    """Make the initial tetrahedron."""
     #
     # For this definition of a regular tetrahedron, see
     #
@@ -850,77 +888,107 @@ def _make_tetra_simplex():
     return simplex
 
 
-def try_(p, y, psum, ndim, fun, ihi, neval, fac):
-    """Helper to try a value"""
-    ptry = np.empty(ndim)
-    fac1 = (1.0 - fac) / ndim
-    fac2 = fac1 - fac
-    ptry = psum * fac1 - p[ihi] * fac2
-    ytry = fun(ptry)
-    neval += 1
-    if ytry < y[ihi]:
-        y[ihi] = ytry
-        psum[:] += ptry - p[ihi]
-        p[ihi] = ptry
-    return ytry, neval
-
-
-def _simplex_minimize(p, ftol, stol, fun, max_eval=1000):
-    """Minimization with the simplex algorithm
-
-    Modified from Numerical recipes"""
-    y = np.array([fun(s) for s in p])
-    ndim = p.shape[1]
-    assert p.shape[0] == ndim + 1
+def _fit_dipoles_simplex(min_dist_to_inner_skull, B, B2, x0s, fwd_data,
+                         whitener, ftol=1e-4, stol=2e-4, max_eval=1000):
+    """Refine the dipole locations of all time points with the simplex method.
+
+    This is the simplex minimization of MNE-C (modified from Numerical
+    Recipes), run for all time points together so that the fields of the
+    trial locations of all of them are computed at once. Locations that
+    violate the inner skull (or sphere) constraint get an infinite cost.
+    """
+    inner_skull = fwd_data['inner_skull']
+    n_ch, n_times = B.shape
+
+    def fun(rds, tidx):
+        """Calculate the residual sum of squares of many dipoles."""
+        if 'rr' in inner_skull:  # bem
+            dist = _compute_nearest(inner_skull['rr'], rds,
+                                    return_dists=True)[1]
+            dist[_points_outside_surface(rds, inner_skull, 1)] *= -1
+            dist -= min_dist_to_inner_skull
+        else:  # sphere
+            dist = inner_skull['R'] - min_dist_to_inner_skull - \
+                np.linalg.norm(rds - inner_skull['r0'], axis=1)
+        cost = np.full(len(rds), np.inf)
+        good = dist >= 0
+        if good.any():
+            fwd = _dipole_forwards(fwd_data, whitener, rds[good])[0]
+            sing, vv = np.linalg.svd(fwd.reshape(-1, 3, n_ch),
+                                     full_matrices=False)[1:]
+            one = np.einsum('ijk,ki->ij', vv, B[:, tidx[good]])
+            one[sing[:, 2] / np.where(sing[:, 0] > 0, sing[:, 0], 1.) <=
+                0.2, 2] = 0.
+            cost[good] = 1. - np.sum(one * one, axis=1) / B2[tidx[good]]
+        return cost
+
+    def try_(idx, ihi, fac):
+        """Try a value."""
+        fac1 = (1.0 - fac) / ndim
+        fac2 = fac1 - fac
+        ptry = psum[idx] * fac1 - p[idx, ihi] * fac2
+        ytry = fun(ptry, idx)
+        neval[idx] += 1
+        better = ytry < y[idx, ihi]
+        idx, ihi = idx[better], ihi[better]
+        y[idx, ihi] = ytry[better]
+        psum[idx] += ptry[better] - p[idx, ihi]
+        p[idx, ihi] = ptry[better]
+        return ytry
+
+    ndim = 3
     mpts = ndim + 1
-    neval = 0
-    psum = p.sum(axis=0)
-
-    loop = 1
-    while(True):
-        ilo = 1
-        if y[1] > y[2]:
-            ihi = 1
-            inhi = 2
-        else:
-            ihi = 2
-            inhi = 1
-        for i in range(mpts):
-            if y[i] < y[ilo]:
-                ilo = i
-            if y[i] > y[ihi]:
-                inhi = ihi
-                ihi = i
-            elif y[i] > y[inhi]:
-                if i != ihi:
-                    inhi = i
-
-        rtol = 2 * np.abs(y[ihi] - y[ilo]) / (np.abs(y[ihi]) + np.abs(y[ilo]))
-        if rtol < ftol:
-            break
-        if neval >= max_eval:
-            raise RuntimeError('Maximum number of evaluations exceeded.')
+    p = _make_tetra_simplex()[np.newaxis] + x0s[:, np.newaxis]
+    tidx = np.repeat(np.arange(n_times), mpts)
+    y = fun(p.reshape(-1, ndim), tidx).reshape(n_times, mpts)
+    neval = np.zeros(n_times, int)
+    loop = np.ones(n_times, int)
+    psum = p.sum(axis=1)
+    active = np.arange(n_times)
+    n_max = 0
+    while len(active) > 0:
+        order = np.argsort(y[active], axis=1, kind='stable')
+        ilo, inhi, ihi = order[:, 0], order[:, -2], order[:, -1]
+        y_lo, y_hi = y[active, ilo], y[active, ihi]
+        with np.errstate(invalid='ignore'):  # infinite costs
+            rtol = 2 * np.abs(y_hi - y_lo) / (np.abs(y_hi) + np.abs(y_lo))
+        done = (rtol < ftol) | (y_hi == y_lo)
         if stol > 0:  # Has the simplex collapsed?
-            dsum = np.sqrt(np.sum((p[ilo] - p[ihi]) ** 2))
-            if loop > 5 and dsum < stol:
-                break
+            dsum = np.linalg.norm(p[active, ilo] - p[active, ihi], axis=1)
+            done |= (loop[active] > 5) & (dsum < stol)
+        maxed = ~done & (neval[active] >= max_eval)
+        n_max += maxed.sum()
+        keep = ~(done | maxed)
+        active, ilo, inhi, ihi = active[keep], ilo[keep], inhi[keep], \
+            ihi[keep]
+        if len(active) == 0:
+            break
 
-        ytry, neval = try_(p, y, psum, ndim, fun, ihi, neval, -1.)
-        if ytry <= y[ilo]:
-            ytry, neval = try_(p, y, psum, ndim, fun, ihi, neval, 2.)
-        elif ytry >= y[inhi]:
-            ysave = y[ihi]
-            ytry, neval = try_(p, y, psum, ndim, fun, ihi, neval, 0.5)
-            if ytry >= ysave:
-                for i in range(mpts):
-                    if i != ilo:
-                        psum[:] = 0.5 * (p[i] + p[ilo])
-                        p[i] = psum
-                        y[i] = fun(psum)
-                neval += ndim
-                psum = p.sum(axis=0)
-        loop += 1
-'''
+        ytry = try_(active, ihi, -1.)
+        expand = ytry <= y[active, ilo]
+        if expand.any():
+            try_(active[expand], ihi[expand], 2.)
+        contract = ~expand & (ytry >= y[active, inhi])
+        if contract.any():
+            idx, ilo_c, ihi_c = active[contract], ilo[contract], \
+                ihi[contract]
+            ysave = y[idx, ihi_c]
+            ytry = try_(idx, ihi_c, 0.5)
+            shrink = ytry >= ysave
+            if shrink.any():
+                idx, ilo_c = idx[shrink], ilo_c[shrink]
+                p[idx] = 0.5 * (p[idx] + p[idx, ilo_c][:, np.newaxis])
+                others = np.arange(mpts) != ilo_c[:, np.newaxis]
+                rows = np.repeat(idx, ndim)
+                cols = np.where(others)[1]
+                y[rows, cols] = fun(p[rows, cols], rows)
+                neval[idx] += ndim
+                psum[idx] = p[idx].sum(axis=1)
+        loop[active] += 1
+    if n_max > 0:
+        warn('Maximum number of evaluations exceeded for %d time point%s'
+             % (n_max, _pl(n_max)))
+    return p[np.arange(n_times), np.argmin(y, axis=1)]
 
 
 def _fit_confidence(rd, Q, ori, whitener, fwd_data):
@@ -943,24 +1011,21 @@ def _fit_confidence(rd, Q, ori, whitener, fwd_data):
     # and the y axis perpendical with these forming a right-handed system.
     direction[1] = np.cross(direction[2], direction[0])
     assert np.allclose(np.dot(direction, direction.T), np.eye(3))
-    # Get spatial deltas in dipole coordinate directions
-    deltas = (-1e-4, 1e-4)
+    # Get spatial deltas in dipole coordinate directions, computing the
+    # forwards of all shifted locations (and of rd itself) at once
+    deltas = np.array([-1e-4, 1e-4])
+    rds = rd + deltas[:, np.newaxis, np.newaxis] * direction
+    fwds = _dipole_forwards(fwd_data, whitener, np.concatenate(
+        [rd[np.newaxis], rds.reshape(-1, 3)]))[0]
+    fwds = fwds.reshape(-1, 3, fwds.shape[1])
+    this_fwd = fwds[0]
+    fwds = np.dot(Q, fwds[1:]).reshape(len(deltas), 3, -1)
     J = np.empty((whitener.shape[0], 6))
-    for ii in range(3):
-        fwds = []
-        for delta in deltas:
-            this_r = rd[np.newaxis] + delta * direction[ii]
-            fwds.append(
-                np.dot(Q, _dipole_forwards(fwd_data, whitener, this_r)[0]))
-        J[:, ii] = np.diff(fwds, axis=0)[0] / np.diff(deltas)[0]
+    J[:, :3] = (np.diff(fwds, axis=0)[0] / np.diff(deltas)[0]).T
     # Get current (Q) deltas in the dipole directions
     deltas = np.array([-0.01, 0.01]) * np.linalg.norm(Q)
-    this_fwd = _dipole_forwards(fwd_data, whitener, rd[np.newaxis])[0]
-    for ii in range(3):
-        fwds = []
-        for delta in deltas:
-            fwds.append(np.dot(Q + delta * direction[ii], this_fwd))
-        J[:, ii + 3] = np.diff(fwds, axis=0)[0] / np.diff(deltas)[0]
+    fwds = np.dot(Q + deltas[:, np.newaxis, np.newaxis] * direction, this_fwd)
+    J[:, 3:] = (np.diff(fwds, axis=0)[0] / np.diff(deltas)[0]).T
     # J is already whitened, so we don't need to do np.dot(whitener, J).
     # However, the units in the Jacobian are potentially quite different,
     # so we need to do some normalization during inversion, then revert.
@@ -1004,9 +1069,10 @@ def _sphere_constraint(rd, r0, R_adj):
     return R_adj - np.sqrt(np.sum((rd - r0) ** 2))
 
 
-def _fit_dipole(min_dist_to_inner_skull, B_orig, t, guess_rrs,
-                guess_data, fwd_data, whitener, fmin_cobyla, ori, rank):
+def _fit_dipole(min_dist_to_inner_skull, B_orig, t, x0, guess_data,
+                fwd_data, whitener, refine, ori, rank):
     """Fit a single bit of data."""
+    from scipy.optimize import fmin_cobyla
     B = np.dot(whitener, B_orig)
 
     # make constraint function to keep the solver within the inner skull
@@ -1020,30 +1086,25 @@ def _fit_dipole(min_dist_to_inner_skull, B_orig, t, guess_rrs,
             _sphere_constraint, r0=fwd_data['inner_skull']['r0'],
             R_adj=fwd_data['inner_skull']['R'] - min_dist_to_inner_skull)
 
-    # Find a good starting point (find_best_guess in C)
     B2 = np.dot(B, B)
     if B2 == 0:
         warn('Zero field found for time %s' % t)
         return np.zeros(3), 0, np.zeros(3), 0, B
 
-    idx = np.argmin([_fit_eval(guess_rrs[[fi], :], B, B2, fwd_svd)
-                     for fi, fwd_svd in enumerate(guess_data['fwd_svd'])])
-    x0 = guess_rrs[idx]
-    lwork = _svd_lwork((3, B.shape[0]))
-    fun = partial(_fit_eval, B=B, B2=B2, fwd_data=fwd_data, whitener=whitener,
-                  lwork=lwork)
-
-    # Tested minimizers:
-    #    Simplex, BFGS, CG, COBYLA, L-BFGS-B, Powell, SLSQP, TNC
-    # Several were similar, but COBYLA won for having a handy constraint
-    # function we can use to ensure we stay inside the inner skull /
-    # smallest sphere
-    rd_final = fmin_cobyla(fun, x0, (constraint,), consargs=(),
-                           rhobeg=5e-2, rhoend=5e-5, disp=False)
-
-    # simplex = _make_tetra_simplex() + x0
-    # _simplex_minimize(simplex, 1e-4, 2e-4, fun)
-    # rd_final = simplex[0]
+    if refine:  # otherwise x0 is already refined (by the simplex method)
+        lwork = _svd_lwork((3, B.shape[0]))
+        fun = partial(_fit_eval, B=B, B2=B2, fwd_data=fwd_data,
+                      whitener=whitener, lwork=lwork)
+
+        # Tested minimizers:
+        #    Simplex, BFGS, CG, COBYLA, L-BFGS-B, Powell, SLSQP, TNC
+        # Several were similar, but COBYLA won for having a handy constraint
+        # function we can use to ensure we stay inside the inner skull /
+        # smallest sphere
+        rd_final = fmin_cobyla(fun, x0, (constraint,), consargs=(),
+                               rhobeg=5e-2, rhoend=5e-5, disp=False)
+    else:
+        rd_final = x0
 
     # Compute the dipole moment at the final point
     Q, gof, residual_noproj, n_comp = _fit_Q(
@@ -1067,9 +1128,8 @@ def _fit_dipole(min_dist_to_inner_skull, B_orig, t, guess_rrs,
     return rd_final, amp, ori, gof, conf, khi2, nfree, residual_noproj
 
 
-def _fit_dipole_fixed(min_dist_to_inner_skull, B_orig, t, guess_rrs,
-                      guess_data, fwd_data, whitener,
-                      fmin_cobyla, ori, rank):
+def _fit_dipole_fixed(min_dist_to_inner_skull, B_orig, t, x0, guess_data,
+                      fwd_data, whitener, refine, ori, rank):
     """Fit a data using a fixed position."""
     B = np.dot(whitener, B_orig)
     B2 = np.dot(B, B)
@@ -1085,7 +1145,7 @@ def _fit_dipole_fixed(min_dist_to_inner_skull, B_orig, t, guess_rrs,
         ori = Q / norm
     else:
         amp = np.dot(Q, ori)
-    rd_final = guess_rrs[0]
+    rd_final = x0
     # This will be slow, and we don't use it anyway, so omit it for now:
     # conf = _fit_confidence(rd_final, Q, ori, whitener, fwd_data)
     conf = khi2 = nfree = None
@@ -1095,7 +1155,7 @@ def _fit_dipole_fixed(min_dist_to_inner_skull, B_orig, t, guess_rrs,
 
 @verbose
 def fit_dipole(evoked, cov, bem, trans=None, min_dist=5., n_jobs=1,
-               pos=None, ori=None, rank=None, verbose=None):
+               pos=None, ori=None, rank=None, method='cobyla', verbose=None):
     """Fit a dipole.
 
     Parameters
@@ -1135,6 +1195,17 @@ def fit_dipole(evoked, cov, bem, trans=None, min_dist=5., n_jobs=1,
     %(rank_None)s
 
         .. versionadded:: 0.20
+    method : str
+        The method used to refine the location of the dipole of each time
+        point, starting from the best-fitting point of a grid of guesses.
+        Can be ``'cobyla'`` (default) to use
+        :func:`scipy.optimize.fmin_cobyla`, with the inner skull (or sphere)
+        as a constraint, for one time point at a time, or ``'simplex'`` to
+        use the simplex method (like MNE-C) for all time points together,
+        which is much faster when fitting many time points. Not used if
+        ``pos`` is provided.
+
+        .. versionadded:: 0.21
     %(verbose)s
 
     Returns
@@ -1170,6 +1241,7 @@ def fit_dipole(evoked, cov, bem, trans=None, min_dist=5., n_jobs=1,
         raise ValueError('min_dist should be positive. Got %s' % min_dist)
     if ori is not None and pos is None:
         raise ValueError('pos must be provided if ori is not None')
+    _check_option('method', method, ('cobyla', 'simplex'))
 
     data = evoked.data
     if not np.isfinite(data).all():
@@ -1366,7 +1438,7 @@ def fit_dipole(evoked, cov, bem, trans=None, min_dist=5., n_jobs=1,
     fun = _fit_dipole_fixed if fixed_position else _fit_dipole
     out = _fit_dipoles(
         fun, min_dist_to_inner_skull, data, times, guess_src['rr'],
-        guess_data, fwd_data, whitener, ori, n_jobs, rank)
+        guess_data, fwd_data, whitener, ori, n_jobs, rank, method)
     assert len(out) == 8
     if fixed_position and ori is not None:
         # DipoleFixed
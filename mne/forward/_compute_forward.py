@@ -526,6 +526,9 @@ def _do_inf_pots(mri_rr, bem_rr, mri_Q, sol):
 # #############################################################################
 # SPHERE COMPUTATION
 
+_SPHERE_CHUNK = 100000  # number of dipole-integration point pairs at once
+
+
 def _sphere_pot_or_field(rr, mri_rr, mri_Q, coils, sphere, bem_rr,
                          n_jobs, coil_type):
     """Do potential or field for spherical model."""
@@ -549,44 +552,44 @@ def _sphere_field(rrs, coils, sphere):
     return _do_sphere_field(rrs, rmags, cosmags, ws, bins, sphere['r0'])
 
 
-@jit()
 def _do_sphere_field(rrs, rmags, cosmags, ws, bins, r0):
     n_coils = bins[-1] + 1
     # Shift to the sphere model coordinates
     rrs = rrs - r0
     B = np.zeros((3 * len(rrs), n_coils))
-    for ri in range(len(rrs)):
-        rr = rrs[ri]
-        # Check for a dipole at the origin
-        if np.sqrt(np.dot(rr, rr)) <= 1e-10:
-            continue
-        this_poss = rmags - r0
+    # Check for dipoles at the origin
+    use = np.where(np.sqrt(np.sum(rrs * rrs, axis=1)) > 1e-10)[0]
+    # The quantities below have shape (n_points, n_dipoles)
+    this_poss = rmags - r0
+    r = np.sqrt(np.sum(this_poss * this_poss, axis=1))[:, np.newaxis]
+    re = np.sum(this_poss * cosmags, axis=1)[:, np.newaxis]
+    # first point of each coil (the points are sorted by coil)
+    starts = np.searchsorted(bins, np.arange(n_coils))
+    # process the dipoles in chunks to save memory
+    n_chunk = max(_SPHERE_CHUNK // len(rmags), 1)
+    for start in range(0, len(use), n_chunk):
+        idx = use[start:start + n_chunk]
+        rr = rrs[idx]
 
         # Vector from dipole to the field point
-        a_vec = this_poss - rr
-        a = np.sqrt(np.sum(a_vec * a_vec, axis=1))
-        r = np.sqrt(np.sum(this_poss * this_poss, axis=1))
-        rr0 = np.sum(this_poss * rr, axis=1)
+        a_vec = this_poss[:, np.newaxis] - rr
+        a = np.sqrt(np.sum(a_vec * a_vec, axis=2))
+        rr0 = np.dot(this_poss, rr.T)
         ar = (r * r) - rr0
         ar0 = ar / a
         F = a * (r * a + ar)
         gr = (a * a) / r + ar0 + 2.0 * (a + r)
         g0 = a + 2 * r + ar0
         # Compute the dot products needed
-        re = np.sum(this_poss * cosmags, axis=1)
-        r0e = np.sum(rr * cosmags, axis=1)
+        r0e = np.dot(cosmags, rr.T)
         g = (g0 * r0e - gr * re) / (F * F)
         good = (a > 0) | (r > 0) | ((a * r) + 1 > 1e-5)
-        rr_ = rr.reshape(1, 3)
-        v1 = np.empty((cosmags.shape[0], 3))
-        _jit_cross(v1, rr_, cosmags)
-        v2 = np.empty((cosmags.shape[0], 3))
-        _jit_cross(v2, rr_, this_poss)
-        xx = ((good * ws).reshape(-1, 1) *
-              (v1 / F.reshape(-1, 1) + v2 * g.reshape(-1, 1)))
-        for jj in range(3):
-            zz = bincount(bins, xx[:, jj], n_coils)
-            B[3 * ri + jj, :] = zz
+        # rr x cosmags / F + rr x this_poss * g
+        xx = np.cross(rr, cosmags[:, np.newaxis] / F[:, :, np.newaxis] +
+                      this_poss[:, np.newaxis] * g[:, :, np.newaxis])
+        xx *= (good * ws[:, np.newaxis])[:, :, np.newaxis]
+        zz = np.add.reduceat(xx, starts, axis=0)
+        B.reshape(len(rrs), 3, n_coils)[idx] = zz.transpose(1, 2, 0)
     B *= _MAG_FACTOR
     return B
 
@@ -601,39 +604,45 @@ def _eeg_spherepot_coil(rrs, coils, sphere):
     rrs = rrs - sphere['r0']
 
     B = np.zeros((3 * len(rrs), n_coils))
-    for ri, rr in enumerate(rrs):
-        # Only process dipoles inside the innermost sphere
-        if np.sqrt(np.dot(rr, rr)) >= sphere['layers'][0]['rad']:
-            continue
+    # Only process dipoles inside the innermost sphere
+    inside = np.where(np.sqrt(np.sum(rrs * rrs, axis=1)) <
+                      sphere['layers'][0]['rad'])[0]
+    # Go over all electrodes
+    this_pos = rmags - sphere['r0']
+
+    # Scale location onto the surface of the sphere (not used)
+    # if sphere['scale_pos']:
+    #     pos_len = (sphere['layers'][-1]['rad'] /
+    #                np.sqrt(np.sum(this_pos * this_pos, axis=1)))
+    #     this_pos *= pos_len
+    r2 = np.sum(this_pos * this_pos, axis=1)
+    r = np.sqrt(r2)
+    # sums over the points of each electrode
+    summer = np.zeros((len(rmags), n_coils))
+    summer[np.arange(len(rmags)), bins] = ws
+    # process the dipoles in chunks to save memory
+    n_chunk = max(_SPHERE_CHUNK // len(rmags), 1)
+    for start in range(0, len(inside), n_chunk):
+        idx = inside[start:start + n_chunk]
         # fwd_eeg_spherepot_vec
-        vval_one = np.zeros((len(rmags), 3))
+        vval_one = np.zeros((len(idx), len(rmags), 3))
 
         # Make a weighted sum over the equivalence parameters
         for eq in range(sphere['nfit']):
             # Scale the dipole position
-            rd = sphere['mu'][eq] * rr
-            rd2 = np.sum(rd * rd)
+            rd = sphere['mu'][eq] * rrs[idx]
+            rd2 = np.sum(rd * rd, axis=1)
             rd2_inv = 1.0 / rd2
-            # Go over all electrodes
-            this_pos = rmags - sphere['r0']
-
-            # Scale location onto the surface of the sphere (not used)
-            # if sphere['scale_pos']:
-            #     pos_len = (sphere['layers'][-1]['rad'] /
-            #                np.sqrt(np.sum(this_pos * this_pos, axis=1)))
-            #     this_pos *= pos_len
 
             # Vector from dipole to the field point
-            a_vec = this_pos - rd
+            a_vec = this_pos - rd[:, np.newaxis]
 
             # Compute the dot products needed
-            a = np.sqrt(np.sum(a_vec * a_vec, axis=1))
+            a = np.sqrt(np.sum(a_vec * a_vec, axis=2))
             a3 = 2.0 / (a * a * a)
-            r2 = np.sum(this_pos * this_pos, axis=1)
-            r = np.sqrt(r2)
-            rrd = np.sum(this_pos * rd, axis=1)
+            rrd = np.dot(rd, this_pos.T)
             ra = r2 - rrd
-            rda = rrd - rd2
+            rda = rrd - rd2[:, np.newaxis]
 
             # The main ingredients
             F = a * (r * a + ra)
@@ -642,16 +651,16 @@ def _eeg_spherepot_coil(rrs, coils, sphere):
 
             # Mix them together and scale by lambda/(rd*rd)
             m1 = (c1 - c2 * rrd)
-            m2 = c2 * rd2
+            m2 = c2 * rd2[:, np.newaxis]
 
-            vval_one += (sphere['lambda'][eq] * rd2_inv *
-                         (m1[:, np.newaxis] * rd +
-                          m2[:, np.newaxis] * this_pos))
+            vval_one += ((sphere['lambda'][eq] * rd2_inv)[:, np.newaxis,
+                                                          np.newaxis] *
+                         (m1[:, :, np.newaxis] * rd[:, np.newaxis] +
+                          m2[:, :, np.newaxis] * this_pos))
 
-            # compute total result
-            xx = vval_one * ws[:, np.newaxis]
-            zz = np.array([bincount(bins, x, bins[-1] + 1) for x in xx.T])
-            B[3 * ri:3 * ri + 3, :] = zz
+        # compute total result
+        zz = np.dot(vval_one.transpose(0, 2, 1), summer)
+        B.reshape(len(rrs), 3, n_coils)[idx] = zz
     # finishing by scaling by 1/(4*M_PI)
     B *= 0.25 / np.pi
     return B
@@ -679,6 +688,57 @@ def _magnetic_dipole_field_vec(rrs, coils, too_close='raise'):
     return fwd
 
 
+def _magnetic_dipole_geom(rrs, coils):
+    rmags, cosmags, ws, bins = _triage_coils(coils)
+    starts = np.concatenate([[0], np.where(np.diff(bins))[0] + 1])
+    diff = rmags[np.newaxis] - rrs[:, np.newaxis]  # (n_pos, n_pts, 3)
+    dist2 = np.einsum('pni,pni->pn', diff, diff)
+    t = np.einsum('pni,ni->pn', diff, cosmags)
+    w_d5 = ws / (dist2 * dist2 * np.sqrt(dist2))
+    return cosmags, starts, diff, dist2, t, w_d5
+
+
+def _magnetic_dipole_fields(rrs, coils):
+    """Compute magnetic dipole fields for many positions at once.
+
+    Returns
+    -------
+    fwd : ndarray, shape (n_pos, 3, n_coils)
+        The fields for each moment direction.
+    min_dist : ndarray, shape (n_pos,)
+        The minimum distance from each position to the coils.
+    """
+    cosmags, starts, diff, dist2, t, w_d5 = _magnetic_dipole_geom(rrs, coils)
+    sum_ = 3 * diff * t[..., np.newaxis]
+    sum_ -= dist2[..., np.newaxis] * cosmags
+    sum_ *= w_d5[..., np.newaxis]
+    fwd = np.add.reduceat(sum_, starts, axis=1).transpose(0, 2, 1)
+    fwd *= _MAG_FACTOR
+    return fwd, np.sqrt(dist2.min(axis=1))
+
+
+def _magnetic_dipole_fields_jac(rrs, moments, coils):
+    """Compute the derivative of magnetic dipole fields wrt position.
+
+    Returns
+    -------
+    jac : ndarray, shape (n_pos, 3, n_coils)
+        The derivative ``d(fwd.T @ moment) / d rr`` for each position.
+    """
+    cosmags, starts, diff, dist2, t, w_d5 = _magnetic_dipole_geom(rrs, coils)
+    # d/dr = -d/d(diff) of w * (3 (diff . m) t - dist2 (c . m)) / dist ** 5
+    dm = np.einsum('pni,pi->pn', diff, moments)
+    cm = np.dot(cosmags, moments.T).T
+    h = (3 * dm * t - dist2 * cm) * w_d5
+    d_sum = (5 * h / dist2)[..., np.newaxis] * diff
+    d_sum -= (3 * dm * w_d5)[..., np.newaxis] * cosmags
+    d_sum += (2 * cm * w_d5)[..., np.newaxis] * diff
+    d_sum -= (3 * t * w_d5)[..., np.newaxis] * moments[:, np.newaxis]
+    jac = np.add.reduceat(d_sum, starts, axis=1).transpose(0, 2, 1)
+    jac *= _MAG_FACTOR
+    return jac
+
+
 @jit()
 def _compute_mdfv(rrs, rmags, cosmags, ws, bins, too_close):
     """Compute an MEG forward solution for a set of magnetic dipoles."""
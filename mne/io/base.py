@@ -1326,6 +1326,19 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
         or all forms of SSS). It is recommended not to concatenate and
         then save raw files for this reason.
         """
+        self._save(fname, picks, tmin, tmax, buffer_size_sec,
+                   drop_small_buffer, proj, fmt, overwrite, split_size,
+                   split_naming)
+
+    def _save(self, fname, picks, tmin, tmax, buffer_size_sec,
+              drop_small_buffer, proj, fmt, overwrite, split_size,
+              split_naming, transform=None):
+        """Save raw data, optionally transforming each buffer on the fly.
+
+        ``transform(data)`` is applied to each buffer of shape
+        ``(n_picks, n_times)`` (after the projection, if any) and returns the
+        data to write.
+        """
         fname = op.realpath(fname)
         check_fname(fname, 'raw', ('raw.fif', 'raw_sss.fif', 'raw_tsss.fif',
                                    'raw.fif.gz', 'raw_sss.fif.gz',
@@ -1385,7 +1398,8 @@ class BaseRaw(ProjMixin, ContainsMixin, UpdateChannelsMixin, SetChannelsMixin,
                 "of '{}'.".format(split_naming))
         _write_raw(fname, self, info, picks, fmt, data_type, reset_range,
                    start, stop, buffer_size, projector, drop_small_buffer,
-                   split_size, split_naming, part_idx, None, overwrite)
+                   split_size, split_naming, part_idx, None, overwrite,
+                   transform)
 
     def _tmin_tmax_to_start_stop(self, tmin, tmax):
         start = int(np.floor(tmin * self.info['sfreq']))
@@ -1825,7 +1839,8 @@ class _RawShell(object):
 # Writing
 def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
                stop, buffer_size, projector, drop_small_buffer,
-               split_size, split_naming, part_idx, prev_fname, overwrite):
+               split_size, split_naming, part_idx, prev_fname, overwrite,
+               transform=None):
     """Write raw file with splitting."""
     # we've done something wrong if we hit this
     n_times_max = len(raw.times)
@@ -1913,6 +1928,8 @@ def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
 
         if projector is not None:
             data = np.dot(projector, data)
+        if transform is not None:
+            data = transform(data)
 
         if ((drop_small_buffer and (first > start) and
              (len(times) < buffer_size))):
@@ -1945,7 +1962,7 @@ def _write_raw(fname, raw, info, picks, fmt, data_type, reset_range, start,
                 fname, raw, info, picks, fmt,
                 data_type, reset_range, first + buffer_size, stop, buffer_size,
                 projector, drop_small_buffer, split_size, split_naming,
-                part_idx + 1, use_fname, overwrite)
+                part_idx + 1, use_fname, overwrite, transform)
 
             start_block(fid, FIFF.FIFFB_REF)
             write_int(fid, FIFF.FIFF_REF_ROLE, FIFF.FIFFV_ROLE_NEXT_FILE)
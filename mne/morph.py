@@ -5,23 +5,24 @@
 # License: BSD (3-clause)
 
 import os.path as op
+import itertools
 import warnings
-import copy
 import numpy as np
 from scipy import sparse
 
 from .fixes import _get_img_fdata
 from .parallel import parallel_func
 from .source_estimate import (
-    VolSourceEstimate, _BaseSurfaceSourceEstimate,
-    _BaseVolSourceEstimate, _BaseSourceEstimate, _get_ico_tris)
+    _BaseSurfaceSourceEstimate, _BaseVolSourceEstimate, _BaseSourceEstimate,
+    _get_ico_tris)
 from .source_space import SourceSpaces, _ensure_src
-from .surface import read_morph_map, mesh_edges, read_surface, _compute_nearest
+from .surface import (read_morph_map, mesh_edges, read_surface,
+                      _compute_nearest, _get_morph_cache_fname)
 from .transforms import _angle_between_quats, rot_to_quat
 from .utils import (logger, verbose, check_version, get_subjects_dir,
                     warn as warn_, fill_doc, _check_option, _validate_type,
                     BunchConst, wrapped_stdout, _check_fname, warn,
-                    _ensure_int)
+                    _ensure_int, _read_array_cache, _write_array_cache)
 from .externals.h5io import read_hdf5, write_hdf5
 
 
@@ -30,7 +31,8 @@ def compute_source_morph(src, subject_from=None, subject_to='fsaverage',
                          subjects_dir=None, zooms='auto',
                          niter_affine=(100, 100, 10), niter_sdr=(5, 5, 3),
                          spacing=5, smooth=None, warn=True, xhemi=False,
-                         sparse=False, src_to=None, verbose=False):
+                         sparse=False, src_to=None, precompute=False,
+                         verbose=False):
     """Create a SourceMorph from one subject to another.
 
     Method is based on spherical morphing by FreeSurfer for surface
@@ -112,6 +114,13 @@ def compute_source_morph(src, subject_from=None, subject_to='fsaverage',
         - For mixed (surface + volume) morphing, this is required.
 
         .. versionadded:: 0.20
+    precompute : bool
+        If True, compute the sparse matrix representation of the volumetric
+        morph (if any), see :meth:`mne.SourceMorph.compute_vol_morph_mat`.
+        This takes some time, but makes applying the morph much faster.
+        Default is False.
+
+        .. versionadded:: 0.21
     %(verbose)s
 
     Returns
@@ -252,6 +261,8 @@ def compute_source_morph(src, subject_from=None, subject_to='fsaverage',
                         niter_affine, niter_sdr, spacing, smooth, xhemi,
                         morph_mat, vertices_to, shape, affine,
                         pre_affine, sdr_morph, src_data)
+    if precompute:
+        morph.compute_vol_morph_mat()
     logger.info('[done]')
     return morph
 
@@ -277,10 +288,12 @@ def _compute_sparse_morph(vertices_from, subject_from, subject_to,
     return vertices, morph_mat
 
 
+_MORPH_BLOCK_SIZE = 2 ** 24  # number of MRI voxels to interpolate at once
 _SOURCE_MORPH_ATTRIBUTES = [  # used in writing
     'subject_from', 'subject_to', 'kind', 'zooms', 'niter_affine', 'niter_sdr',
     'spacing', 'smooth', 'xhemi', 'morph_mat', 'vertices_to',
-    'shape', 'affine', 'pre_affine', 'sdr_morph', 'src_data', 'verbose']
+    'shape', 'affine', 'pre_affine', 'sdr_morph', 'src_data',
+    'vol_morph_mat', 'verbose']
 
 
 @fill_doc
@@ -335,6 +348,11 @@ class SourceMorph(object):
         the symmetric diffeomorphic registration (SDR) morph.
     src_data : dict
         Additional source data necessary to perform morphing.
+    vol_morph_mat : scipy.sparse.csr_matrix | None
+        The sparse volumetric morphing matrix, if it has been computed
+        with :meth:`compute_vol_morph_mat`.
+
+        .. versionadded:: 0.21
     %(verbose)s
 
     Notes
@@ -349,7 +367,8 @@ class SourceMorph(object):
     def __init__(self, subject_from, subject_to, kind, zooms,
                  niter_affine, niter_sdr, spacing, smooth, xhemi,
                  morph_mat, vertices_to, shape,
-                 affine, pre_affine, sdr_morph, src_data, verbose=None):
+                 affine, pre_affine, sdr_morph, src_data,
+                 vol_morph_mat=None, verbose=None):
         # universal
         self.subject_from = subject_from
         self.subject_to = subject_to
@@ -369,6 +388,7 @@ class SourceMorph(object):
         self.affine = affine
         self.sdr_morph = sdr_morph
         self.pre_affine = pre_affine
+        self.vol_morph_mat = vol_morph_mat
         # used by both
         self.src_data = src_data
         self.verbose = verbose
@@ -389,7 +409,7 @@ class SourceMorph(object):
         logger.info('Computing nonzero vertices after morph ...')
         n_vertices = sum(len(v) for v in self._vol_vertices_from)
         ones = np.ones((n_vertices, 1))
-        return [np.where(self._morph_one_vol(ones))[0]]
+        return [np.where(self._morph_vols(ones)[:, 0])[0]]
 
     @verbose
     def apply(self, stc_from, output='stc', mri_resolution=False,
@@ -398,8 +418,15 @@ class SourceMorph(object):
 
         Parameters
         ----------
-        stc_from : VolSourceEstimate | VolVectorSourceEstimate | SourceEstimate | VectorSourceEstimate
-            The source estimate to morph.
+        stc_from : VolSourceEstimate | VolVectorSourceEstimate | SourceEstimate | VectorSourceEstimate | list | generator
+            The source estimate to morph. Can also be a list or generator
+            of source estimates (e.g., as returned by
+            :func:`mne.minimum_norm.apply_inverse_epochs`) of the same class,
+            which are morphed together, which is much faster than morphing
+            them one at a time.
+
+            .. versionchanged:: 0.21
+               Support for lists and generators of source estimates.
         output : str
             Can be 'stc' (default) or possibly 'nifti1', or 'nifti2'
             when working with a volume source space defined on a regular
@@ -415,12 +442,32 @@ class SourceMorph(object):
 
         Returns
         -------
-        stc_to : VolSourceEstimate | SourceEstimate | VectorSourceEstimate | Nifti1Image | Nifti2Image
-            The morphed source estimates.
+        stc_to : VolSourceEstimate | SourceEstimate | VectorSourceEstimate | Nifti1Image | Nifti2Image | list
+            The morphed source estimates. A list if ``stc_from`` is a list
+            or a generator.
         """  # noqa: E501
         _validate_type(output, str, 'output')
-        _validate_type(stc_from, _BaseSourceEstimate, 'stc_from',
-                       'source estimate')
+        single = isinstance(stc_from, _BaseSourceEstimate)
+        if single:
+            stcs = [stc_from]
+        else:
+            if not hasattr(stc_from, '__iter__') or isinstance(
+                    stc_from, (str, np.ndarray)):
+                _validate_type(stc_from, _BaseSourceEstimate, 'stc_from',
+                               'source estimate, list, or generator')
+            stcs = list(stc_from)
+            for si, stc in enumerate(stcs):
+                _validate_type(stc, _BaseSourceEstimate, 'stc_from[%d]' % si,
+                               'source estimate')
+                if stc.__class__ != stcs[0].__class__:
+                    raise TypeError(
+                        'All source estimates must be of the same class, '
+                        'got %s for stc_from[0] and %s for stc_from[%d]'
+                        % (stcs[0].__class__.__name__,
+                           stc.__class__.__name__, si))
+            if len(stcs) == 0:
+                return list()
+        stc_from = stcs[0]
         if isinstance(stc_from, _BaseSurfaceSourceEstimate):
             allowed_kinds = ('stc',)
             extra = 'when stc is a surface source estimate'
@@ -428,62 +475,153 @@ class SourceMorph(object):
             allowed_kinds = ('stc', 'nifti1', 'nifti2')
             extra = ''
         _check_option('output', output, allowed_kinds, extra)
-        stc = copy.deepcopy(stc_from)
 
         mri_space = mri_resolution if mri_space is None else mri_space
-        if stc.subject is None:
-            stc.subject = self.subject_from
-        if self.subject_from is None:
-            self.subject_from = stc.subject
-        if stc.subject != self.subject_from:
-            raise ValueError('stc_from.subject and '
-                             'morph.subject_from must match. (%s != %s)' %
-                             (stc.subject, self.subject_from))
-        out = _apply_morph_data(self, stc)
+        # the morphed data are new arrays, so the source estimates do not
+        # need to be copied
+        for stc in stcs:
+            subject = self.subject_from if stc.subject is None else stc.subject
+            if self.subject_from is None:
+                self.subject_from = subject
+            if subject != self.subject_from:
+                raise ValueError('stc_from.subject and '
+                                 'morph.subject_from must match. (%s != %s)' %
+                                 (subject, self.subject_from))
+        out = _apply_morph_data(self, stcs)
         if output != 'stc':  # convert to volume
-            out = _morphed_stc_as_volume(
-                self, out, mri_resolution=mri_resolution, mri_space=mri_space,
-                output=output)
-        return out
-
-    def _morph_one_vol(self, one):
-        # prepare data to be morphed
-        # here we use mri_resolution=True, mri_space=True because
-        # we will slice afterward
+            out = [_morphed_stc_as_volume(
+                self, stc, mri_resolution=mri_resolution,
+                mri_space=mri_space, output=output) for stc in out]
+        return out[0] if single else out
+
+    def _get_vol_interp_mat(self):
+        """Get the sparse matrix interpolating the source data to the MRI."""
+        if self.src_data['interpolator'] is None:
+            raise RuntimeError(
+                'Cannot morph with mri_resolution when add_interpolator=False '
+                'was used with setup_volume_source_space')
+        vertices = np.concatenate(self._vol_vertices_from)
+        # like in _interpolate_data, the last sub-volume wins for vertices
+        # used in several ones
+        _, first = np.unique(vertices[::-1], return_index=True)
+        cols = len(vertices) - 1 - first
+        n_grid = np.prod(self.src_data['src_shape'])
+        scatter = sparse.csr_matrix(
+            (np.ones(len(cols)), (vertices[cols], cols)),
+            shape=(n_grid, len(vertices)))
+        return sparse.csr_matrix(self.src_data['interpolator'] * scatter)
+
+    def _get_vol_morph_steps(self):
+        """Get the steps of the volumetric morph after interpolation to MRI.
+
+        Each step resamples a volume with linear interpolation.
+        """
         from dipy.align.reslice import reslice
         from nibabel.processing import resample_from_to
         from nibabel.spatialimages import SpatialImage
-        assert isinstance(one, np.ndarray)
-        assert one.shape[1] == 1
-        stc_one = VolSourceEstimate(
-            one, self._vol_vertices_from, 0., 1., self.subject_from)
-        img_to = _interpolate_data(stc_one, self, mri_resolution=True,
-                                   mri_space=True, output='nifti1')
-        img_to = _get_img_fdata(img_to)
-        assert img_to.ndim == 4 and img_to.shape[-1] == 1
-        img_to = img_to[:, :, :, 0]
-
-        # reslice to match morph
-        img_to, img_to_affine = reslice(
-            img_to, self.affine, _get_zooms_orig(self), self.zooms)
-
-        # morph data
-        img_to = self.pre_affine.transform(img_to)
-        if self.sdr_morph is not None:
-            img_to = self.sdr_morph.transform(img_to)
 
-        # subselect the correct cube if src_to is provided
-        if self.src_data['to_vox_map'] is not None:
+        def _reslice(img):  # reslice to match morph
+            return reslice(
+                img, self.affine, _get_zooms_orig(self), self.zooms)[0]
+
+        def _subselect(img):  # subselect the correct cube from src_to
             # order=0 (nearest) should be fine since it's just subselecting
-            img_to = SpatialImage(img_to, self.affine)
-            img_to = resample_from_to(img_to, self.src_data['to_vox_map'], 1)
-            img_to = _get_img_fdata(img_to)
+            img = SpatialImage(img, self.affine)
+            img = resample_from_to(img, self.src_data['to_vox_map'], 1)
+            return _get_img_fdata(img)
+
+        steps = [_reslice, self.pre_affine.transform]
+        if self.sdr_morph is not None:
+            steps.append(self.sdr_morph.transform)
+        if self.src_data['to_vox_map'] is not None:
+            steps.append(_subselect)
+        return steps
+
+    def _morph_vols(self, vols, vertices=None):
+        """Morph the columns of the volume source data.
+
+        The data are interpolated to the MRI for blocks of columns at once
+        with a single sparse product, and then warped one column at a time.
+        """
+        assert isinstance(vols, np.ndarray) and vols.ndim == 2
+        interp = self._get_vol_interp_mat()
+        steps = self._get_vol_morph_steps()
+        shape = self.src_data['src_shape_full'][::-1]  # SAR->RAS
+        n_block = max(_MORPH_BLOCK_SIZE // interp.shape[0], 1)
+        out = None
+        for start in range(0, vols.shape[1], n_block):
+            # here we use the MRI resolution and space because
+            # we will slice afterward
+            imgs_from = _csr_dot(
+                interp, np.ascontiguousarray(vols[:, start:start + n_block]),
+                np.zeros((interp.shape[0], min(n_block,
+                                               vols.shape[1] - start))))
+            for k, img_to in enumerate(imgs_from.T, start):
+                img_to = img_to.reshape(shape, order='F')
+                for step in steps:
+                    img_to = step(img_to)
+
+                # reshape to nvoxel x nvol:
+                # in the MNE definition of volume source spaces,
+                # x varies fastest, then y, then z, so we need order='F' here
+                img_to = img_to.reshape(-1, order='F')
+                if vertices is not None:
+                    img_to = img_to[vertices]
+                if out is None:
+                    out = np.empty((len(img_to), vols.shape[1]))
+                out[:, k] = img_to
+        return out
 
-        # reshape to nvoxel x nvol:
-        # in the MNE definition of volume source spaces,
-        # x varies fastest, then y, then z, so we need order='F' here
-        img_to = img_to.reshape(-1, order='F')
-        return img_to
+    @verbose
+    def compute_vol_morph_mat(self, verbose=None):
+        """Compute the sparse matrix representation of the volumetric morph.
+
+        Parameters
+        ----------
+        %(verbose_meth)s
+
+        Returns
+        -------
+        morph : instance of SourceMorph
+            The instance (modified in-place).
+
+        Notes
+        -----
+        The interpolation of the source data to the MRI, the reslicing, the
+        affine and SDR warps, and the subselection of the destination source
+        space are combined into a single sparse matrix, stored in
+        ``vol_morph_mat``. Once it has been computed, applying the morph is a
+        single sparse matrix product, which is much faster than warping the
+        volume of each time point, and does not require dipy. It is saved
+        and loaded along with the morph.
+
+        This does nothing for surface morphs, or if the matrix has already
+        been computed.
+
+        .. versionadded:: 0.21
+        """
+        if self.affine is None or self.vol_morph_mat is not None:
+            return self
+        logger.info('Computing sparse volumetric morph matrix ...')
+        # the matrix of each step, from the MRI to the destination
+        shape = self.src_data['src_shape_full'][::-1]  # SAR->RAS
+        step_mats = list()
+        for step in self._get_vol_morph_steps():
+            step_mat, shape = _compute_resample_mat(step, shape)
+            step_mats.append(step_mat)
+        vol_verts = np.concatenate(
+            self.vertices_to[0 if self.kind == 'volume' else 2:])
+        # multiply from the destination vertices, to keep the products sparse
+        vol_morph_mat = step_mats.pop()[vol_verts]
+        for step_mat in step_mats[::-1]:
+            vol_morph_mat = vol_morph_mat * step_mat
+        vol_morph_mat = sparse.csr_matrix(
+            vol_morph_mat * self._get_vol_interp_mat())
+        vol_morph_mat.eliminate_zeros()
+        logger.info('    %d/%d nonzero values' % (
+            vol_morph_mat.nnz, np.prod(vol_morph_mat.shape)))
+        self.vol_morph_mat = vol_morph_mat
+        return self
 
     def __repr__(self):  # noqa: D105
         s = u"%s" % self.kind
@@ -518,7 +656,8 @@ class SourceMorph(object):
 
         out_dict = {k: getattr(self, k) for k in _SOURCE_MORPH_ATTRIBUTES}
         for key in ('pre_affine', 'sdr_morph'):  # classes
-            if out_dict[key] is not None:
+            if out_dict[key] is not None and \
+                    not isinstance(out_dict[key], dict):
                 out_dict[key] = out_dict[key].__dict__
         write_hdf5(fname, out_dict, overwrite=overwrite)
 
@@ -583,12 +722,16 @@ def read_source_morph(fname):
         The loaded morph.
     """
     vals = read_hdf5(fname)
-    if vals['pre_affine'] is not None:  # reconstruct
+    # dipy is not needed to apply a precomputed volumetric morph matrix, in
+    # which case the warps are left as dicts when it is not installed
+    reconstruct = vals.get('vol_morph_mat', None) is None or \
+        check_version('dipy', '0.10.1')
+    if vals['pre_affine'] is not None and reconstruct:
         from dipy.align.imaffine import AffineMap
         affine = vals['pre_affine']
         vals['pre_affine'] = AffineMap(None)
         vals['pre_affine'].__dict__ = affine
-    if vals['sdr_morph'] is not None:
+    if vals['sdr_morph'] is not None and reconstruct:
         from dipy.align.imwarp import DiffeomorphicMap
         morph = vals['sdr_morph']
         vals['sdr_morph'] = DiffeomorphicMap(None, [])
@@ -965,6 +1108,20 @@ def _compute_morph_matrix(subject_from, subject_to, vertices_from, vertices_to,
     """Compute morph matrix."""
     logger.info('Computing morph matrix...')
     subjects_dir = get_subjects_dir(subjects_dir, raise_error=True)
+    shape = (sum(len(v) for v in vertices_to),
+             sum(len(v) for v in vertices_from))
+    cache_fname = _get_morph_cache_fname(
+        'morph-mat', subject_from, subject_to, subjects_dir,
+        vertices_from=[np.asarray(v, np.int64) for v in vertices_from],
+        vertices_to=[np.asarray(v, np.int64) for v in vertices_to],
+        smooth=smooth, xhemi=bool(xhemi))
+    cached = _read_array_cache(cache_fname, 'morph')
+    if cached is not None:
+        morpher = sparse.csr_matrix(
+            (cached['data'], cached['indices'], cached['indptr']),
+            shape=shape)
+        logger.info('[done]')
+        return morpher
 
     tris = _get_subject_sphere_tris(subject_from, subjects_dir)
     maps = read_morph_map(subject_from, subject_to, subjects_dir, xhemi)
@@ -978,8 +1135,6 @@ def _compute_morph_matrix(subject_from, subject_to, vertices_from, vertices_to,
             tris[hemi_from], vertices_to[hemi_to], vertices_from[hemi_from],
             smooth, maps[hemi_from], warn))
 
-    shape = (sum(len(v) for v in vertices_to),
-             sum(len(v) for v in vertices_from))
     data = [m.data for m in morpher]
     indices = [m.indices.copy() for m in morpher]
     indptr = [m.indptr.copy() for m in morpher]
@@ -994,6 +1149,8 @@ def _compute_morph_matrix(subject_from, subject_to, vertices_from, vertices_to,
     # this is equivalent to morpher = sparse_block_diag(morpher).tocsr(),
     # but works for xhemi mode
     morpher = sparse.csr_matrix((data, indices, indptr), shape=shape)
+    _write_array_cache(cache_fname, 'morph', data=morpher.data,
+                       indices=morpher.indices, indptr=morpher.indptr)
     logger.info('[done]')
     return morpher
 
@@ -1048,7 +1205,6 @@ def grade_to_vertices(subject, grade, subjects_dir=None, n_jobs=1,
 
     spheres_to = [op.join(subjects_dir, subject, 'surf',
                           xh + '.sphere.reg') for xh in ['lh', 'rh']]
-    lhs, rhs = [read_surface(s)[0] for s in spheres_to]
 
     if grade is not None:  # fill a subset of vertices
         if isinstance(grade, list):
@@ -1058,7 +1214,13 @@ def grade_to_vertices(subject, grade, subjects_dir=None, n_jobs=1,
             vertices = grade
         else:
             grade = _ensure_int(grade)
+            cache_fname = _get_morph_cache_fname(
+                'grade', subject, subject, subjects_dir, grade=grade)
+            cached = _read_array_cache(cache_fname, 'morph')
+            if cached is not None:
+                return [cached['lh'], cached['rh']]
             # find which vertices to use in "to mesh"
+            lhs, rhs = [read_surface(s)[0] for s in spheres_to]
             ico = _get_ico_tris(grade, return_surf=True)
             lhs /= np.sqrt(np.sum(lhs ** 2, axis=1))[:, None]
             rhs /= np.sqrt(np.sum(rhs ** 2, axis=1))[:, None]
@@ -1080,7 +1242,10 @@ def grade_to_vertices(subject, grade, subjects_dir=None, n_jobs=1,
                         'yields repeated vertices, use a lower grade or a '
                         'list of vertices from an existing source space'
                         % (grade, subject, len(verts)))
+            _write_array_cache(cache_fname, 'morph', lh=vertices[0],
+                               rh=vertices[1])
     else:  # potentially fill the surface
+        lhs, rhs = [read_surface(s)[0] for s in spheres_to]
         vertices = [np.arange(lhs.shape[0]), np.arange(rhs.shape[0])]
 
     return vertices
@@ -1270,6 +1435,46 @@ def _get_subject_sphere_tris(subject, subjects_dir):
 
 ###############################################################################
 # Apply morph to source estimate
+def _compute_resample_mat(func, shape):
+    """Compute the sparse matrix of a linear resampling of a volume.
+
+    ``func`` must resample a volume with (tri)linear interpolation, so that
+    each output voxel depends on at most one voxel of each of the 8 subgrids
+    made of every other voxel. The subgrids are resampled along with the
+    coordinates of their voxels, which identify the input voxel of each
+    output voxel.
+    """
+    shape = tuple(shape)
+    rows, cols, data = list(), list(), list()
+    for offset in itertools.product(range(2), repeat=3):
+        sl = tuple(slice(o, None, 2) for o in offset)
+        vol = np.zeros(shape)
+        vol[sl] = 1.
+        out = func(vol)
+        out_shape = out.shape
+        weights = out.ravel(order='F')
+        n_out = len(weights)
+        this_rows = np.flatnonzero(weights)
+        weights = weights[this_rows]
+        # x varies fastest, then y, then z
+        this_cols = np.zeros(len(this_rows), np.int64)
+        for axis in (2, 1, 0):
+            vol = np.zeros(shape)
+            vol[sl] = np.arange(offset[axis], shape[axis], 2).reshape(
+                [-1 if ai == axis else 1 for ai in range(3)])
+            coord = func(vol).ravel(order='F')[this_rows] / weights
+            coord = np.clip(np.rint(coord).astype(np.int64), 0,
+                            shape[axis] - 1)
+            this_cols = this_cols * shape[axis] + coord
+        rows.append(this_rows)
+        cols.append(this_cols)
+        data.append(weights)
+    mat = sparse.csr_matrix(
+        (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_out, np.prod(shape)))
+    return mat, out_shape
+
+
 def _get_zooms_orig(morph):
     """Compute src zooms from morph zooms, morph shape and src shape."""
     # zooms_to = zooms_from / shape_to * shape_from for each spatial dimension
@@ -1288,11 +1493,17 @@ def _check_vertices_match(v1, v2, name):
             'compute_source_morph.%s' % (len(v1), len(v2), name, v1, v2, ext))
 
 
-def _apply_morph_data(morph, stc_from):
-    """Morph a source estimate from one subject to another."""
-    if stc_from.subject is not None and stc_from.subject != morph.subject_from:
-        raise ValueError('stc.subject (%s) != morph.subject_from (%s)'
-                         % (stc_from.subject, morph.subject_from))
+def _apply_morph_data(morph, stcs_from):
+    """Morph source estimates from one subject to another.
+
+    The data of all source estimates (which must be of the same class) are
+    stacked along the time axis to be morphed together.
+    """
+    stc_from = stcs_from[0]
+    for stc in stcs_from:
+        if stc.subject is not None and stc.subject != morph.subject_from:
+            raise ValueError('stc.subject (%s) != morph.subject_from (%s)'
+                             % (stc.subject, morph.subject_from))
     _check_option('morph.kind', morph.kind, ('surface', 'volume', 'mixed'))
     if morph.kind == 'surface':
         _validate_type(stc_from, _BaseSurfaceSourceEstimate, 'stc_from',
@@ -1318,16 +1529,21 @@ def _apply_morph_data(morph, stc_from):
         vertices_to = vertices_to[0 if do_surf else 2:None if do_vol else 2]
     to_vol_stop = sum(len(v) for v in vertices_to)
 
-    data_from = np.reshape(stc_from.data, (stc_from.data.shape[0], -1))
-    n_times = data_from.shape[1]  # oris treated as times
-    data = np.empty((to_vol_stop, n_times), stc_from.data.dtype)
+    # oris and stcs treated as times
+    data_from = [np.reshape(stc.data, (stc.data.shape[0], -1))
+                 for stc in stcs_from]
+    n_times = np.cumsum([0] + [d.shape[1] for d in data_from])
+    data_from = np.concatenate(data_from, axis=1)
+    data = np.empty((to_vol_stop, n_times[-1]), data_from.dtype)
     to_used = np.zeros(data.shape[0], bool)
     from_used = np.zeros(data_from.shape[0], bool)
     if do_vol:
-        stc_from_vertices = stc_from.vertices[vol_src_offset:]
         vertices_from = morph._vol_vertices_from
-        for ii, (v1, v2) in enumerate(zip(vertices_from, stc_from_vertices)):
-            _check_vertices_match(v1, v2, 'volume[%d]' % (ii,))
+        for stc in stcs_from:
+            stc_from_vertices = stc.vertices[vol_src_offset:]
+            for ii, (v1, v2) in enumerate(zip(vertices_from,
+                                              stc_from_vertices)):
+                _check_vertices_match(v1, v2, 'volume[%d]' % (ii,))
         vol_verts = np.concatenate(
             morph.vertices_to[0 if morph.kind == 'volume' else 2:])
         from_sl = slice(from_surf_stop, from_vol_stop)
@@ -1336,16 +1552,16 @@ def _apply_morph_data(morph, stc_from):
         to_sl = slice(to_surf_stop, to_vol_stop)
         assert not to_used[to_sl].any()
         to_used[to_sl] = True
-        # Loop over time points to save memory
-        for k in range(n_times):
-            this_data = data_from[from_sl, k:k + 1]
-            this_img_to = morph._morph_one_vol(this_data)
-            data[to_sl, k] = this_img_to[vol_verts]
+        if morph.vol_morph_mat is None:
+            data[to_sl] = morph._morph_vols(data_from[from_sl], vol_verts)
+        else:
+            data[to_sl] = morph.vol_morph_mat * data_from[from_sl]
     if do_surf:
-        for hemi, v1, v2 in zip(('left', 'right'),
-                                morph.src_data['vertices_from'],
-                                stc_from.vertices[:2]):
-            _check_vertices_match(v1, v2, '%s hemisphere' % (hemi,))
+        for stc in stcs_from:
+            for hemi, v1, v2 in zip(('left', 'right'),
+                                    morph.src_data['vertices_from'],
+                                    stc.vertices[:2]):
+                _check_vertices_match(v1, v2, '%s hemisphere' % (hemi,))
         from_sl = slice(0, from_surf_stop)
         assert not from_used[from_sl].any()
         from_used[from_sl] = True
@@ -1355,8 +1571,10 @@ def _apply_morph_data(morph, stc_from):
         data[to_sl] = morph.morph_mat * data_from[from_sl]
     assert to_used.all()
     assert from_used.all()
-    data.shape = (data.shape[0],) + stc_from.data.shape[1:]
-    klass = stc_from.__class__
-    stc_to = klass(data, vertices_to, stc_from.tmin, stc_from.tstep,
-                   morph.subject_to)
-    return stc_to
+    stcs_to = list()
+    for stc, start, stop in zip(stcs_from, n_times[:-1], n_times[1:]):
+        this_data = data[:, start:stop].reshape(
+            (data.shape[0],) + stc.data.shape[1:])
+        stcs_to.append(stc.__class__(this_data, vertices_to, stc.tmin,
+                                     stc.tstep, morph.subject_to))
+    return stcs_to
@@ -3,8 +3,11 @@
 #
 # License: Simplified BSD
 import math
+
 import numpy as np
 
+from ..fixes import rfft, irfft
+
 
 def _compute_normalized_phase(data):
     """Compute normalized phase angles.
@@ -19,8 +22,21 @@ def _compute_normalized_phase(data):
     phase_angles : ndarray, shape (n_epochs, n_sources, n_times)
         The normalized phase angles.
     """
-    from scipy.signal import hilbert
-    return (np.angle(hilbert(data)) + np.pi) / (2 * np.pi)
+    # The analytic signal (as in scipy.signal.hilbert) is data + 1j * h,
+    # where h is the Hilbert transform of the data, which we get with real
+    # FFTs along the last axis for all epochs and sources at once
+    n_times = data.shape[-1]
+    spectrum = rfft(data, axis=-1)
+    spectrum[..., 0] = 0.
+    if n_times % 2 == 0:
+        spectrum[..., -1] = 0.
+    spectrum *= -1j
+    hilbert = irfft(spectrum, n_times, axis=-1)
+    del spectrum
+    phase_angles = np.arctan2(hilbert, data, out=hilbert)
+    phase_angles += np.pi
+    phase_angles /= 2 * np.pi
+    return phase_angles
 
 
 def ctps(data, is_raw=True):
@@ -64,15 +80,8 @@ def ctps(data, is_raw=True):
     else:
         phase_angles = data  # phase angles can be computed externally
 
-    # initialize array for results
-    ks_dynamics = np.zeros_like(phase_angles[0])
-    pk_dynamics = np.zeros_like(phase_angles[0])
-
-    # calculate Kuiper's statistic for each source
-    for ii, source in enumerate(np.transpose(phase_angles, [1, 0, 2])):
-        ks, pk = kuiper(source)
-        pk_dynamics[ii, :] = pk
-        ks_dynamics[ii, :] = ks
+    # calculate Kuiper's statistic for all sources at once
+    ks_dynamics, pk_dynamics = kuiper(phase_angles)
 
     return ks_dynamics, pk_dynamics, phase_angles if is_raw else None
 
@@ -82,8 +91,8 @@ def kuiper(data, dtype=np.float64):  # noqa: D401
 
     Parameters
     ----------
-    data : ndarray, shape (n_sources,) | (n_sources, n_times)
-           Empirical distribution.
+    data : ndarray, shape (n_trials,) | (n_trials, ...)
+           Empirical distribution, tested along the first axis.
     dtype : str | obj
         The data type to be used.
 
@@ -94,21 +103,18 @@ def kuiper(data, dtype=np.float64):  # noqa: D401
     pk : ndarray
         Normalized probability of Kuiper's statistic [0, 1].
     """
-    # if data not numpy array, implicitly convert and make to use copied data
-    # ! sort data array along first axis !
-    data = np.sort(data, axis=0).astype(dtype)
-    shape = data.shape
-    n_dim = len(shape)
-    n_trials = shape[0]
+    # work on a contiguous copy with the trials along the last axis, which
+    # is much faster to sort than along the first axis
+    data = np.ascontiguousarray(np.moveaxis(np.asarray(data), 0, -1),
+                                dtype=dtype)
+    data.sort(axis=-1)
+    n_trials = data.shape[-1]
 
     # create uniform cdf
     j1 = (np.arange(n_trials, dtype=dtype) + 1.) / float(n_trials)
     j2 = np.arange(n_trials, dtype=dtype) / float(n_trials)
-    if n_dim > 1:  # single phase vector (n_trials)
-        j1 = j1[:, np.newaxis]
-        j2 = j2[:, np.newaxis]
-    d1 = (j1 - data).max(axis=0)
-    d2 = (data - j2).max(axis=0)
+    d1 = (j1 - data).max(axis=-1)
+    d2 = (data - j2).max(axis=-1)
     n_eff = n_trials
 
     d = d1 + d2  # Kuiper's statistic [n_time_slices]
@@ -121,8 +127,8 @@ def _prob_kuiper(d, n_eff, dtype='f8'):
 
     Parameters
     ----------
-    d : float
-        The kuiper distance value.
+    d : float | ndarray
+        The kuiper distance value(s).
     n_eff : int
         The effective number of elements.
     dtype : str | obj
@@ -130,8 +136,9 @@ def _prob_kuiper(d, n_eff, dtype='f8'):
 
     Returns
     -------
-    pk_norm : float
-        The normalized Kuiper value such that 0 < ``pk_norm`` < 1.
+    pk_norm : ndarray
+        The normalized Kuiper value such that 0 < ``pk_norm`` < 1, with the
+        shape of ``d`` (or shape ``(1,)`` if ``d`` is a scalar).
 
     References
     ----------
@@ -142,14 +149,14 @@ def _prob_kuiper(d, n_eff, dtype='f8'):
     van Wetenschappen, ser Vol 63 pp 38-47
     """
     from scipy.special import logsumexp
-    n_time_slices = np.size(d)  # single value or vector
+    d = np.atleast_1d(d)
     n_points = 100
 
     en = math.sqrt(n_eff)
     k_lambda = (en + 0.155 + 0.24 / en) * d  # see [1]
     l2 = k_lambda ** 2.0
     j2 = (np.arange(n_points) + 1) ** 2
-    j2 = j2.repeat(n_time_slices).reshape(n_points, n_time_slices)
+    j2 = j2.reshape((n_points,) + (1,) * d.ndim)
     fact = 4. * j2 * l2 - 1.
 
     # compute normalized pK value in range [0,1]
@@ -9,6 +9,7 @@
 from inspect import isfunction
 from collections import namedtuple
 from copy import deepcopy
+from functools import partial
 from numbers import Integral
 from time import time
 
@@ -22,7 +23,7 @@ from scipy import linalg
 from .ecg import (qrs_detector, _get_ecg_channel_index, _make_ecg,
                   create_ecg_epochs)
 from .eog import _find_eog_events, _get_eog_channel_index
-from .infomax_ import infomax
+from .infomax_ import infomax, _infomax
 
 from ..cov import compute_whitener
 from .. import Covariance, Evoked
@@ -40,6 +41,7 @@ from ..io.base import BaseRaw
 from ..io.eeglab.eeglab import _get_info, _check_load_mat
 
 from ..epochs import BaseEpochs
+from ..annotations import _annotations_starts_stops
 from ..viz import (plot_ica_components, plot_ica_scores,
                    plot_ica_sources, plot_ica_overlay)
 from ..viz.ica import plot_ica_properties
@@ -428,7 +430,7 @@ class ICA(ContainsMixin):
     @verbose
     def fit(self, inst, picks=None, start=None, stop=None, decim=None,
             reject=None, flat=None, tstep=2.0, reject_by_annotation=True,
-            verbose=None):
+            chunk_duration=None, verbose=None):
         """Run the ICA decomposition on raw data.
 
         Caveat! If supplying a noise covariance keep track of the projections
@@ -481,6 +483,17 @@ class ICA(ContainsMixin):
             Defaults to True.
 
             .. versionadded:: 0.14.0
+        chunk_duration : float | None
+            If not None, fit without holding all of the data in memory: the
+            data are read in chunks of (approximately) this many seconds,
+            the PCA is computed from a covariance accumulated in one pass over
+            the chunks, and Infomax is run on the whitened chunks, which are
+            read again for each iteration. Memory usage then scales with
+            ``chunk_duration`` instead of with the length of the recording.
+            Only supported for ``method='infomax'``. Defaults to None, which
+            loads all data at once.
+
+            .. versionadded:: 0.21
         %(verbose_meth)s
 
         Returns
@@ -493,6 +506,15 @@ class ICA(ContainsMixin):
                               with_ref_meg=self.allow_ref_meg)
         _check_for_unsupported_ica_channels(
             picks, inst.info, allow_ref_meg=self.allow_ref_meg)
+        _validate_type(chunk_duration, (None, 'numeric'), 'chunk_duration')
+        if chunk_duration is not None:
+            if chunk_duration <= 0:
+                raise ValueError('chunk_duration must be positive, got %s'
+                                 % (chunk_duration,))
+            if self.method != 'infomax':
+                raise ValueError('chunk_duration is only supported for '
+                                 'method="infomax", got method="%s"'
+                                 % (self.method,))
 
         # Actually start fitting
         t_start = time()
@@ -522,7 +544,10 @@ class ICA(ContainsMixin):
             self.info['comps'] = []
         self.ch_names = self.info['ch_names']
 
-        if isinstance(inst, BaseRaw):
+        if chunk_duration is not None:
+            self._fit_chunked(inst, picks, start, stop, decim, reject, flat,
+                              tstep, reject_by_annotation, chunk_duration)
+        elif isinstance(inst, BaseRaw):
             self._fit_raw(inst, picks, start, stop, decim, reject, flat,
                           tstep, reject_by_annotation, verbose)
         else:
@@ -530,7 +555,8 @@ class ICA(ContainsMixin):
             self._fit_epochs(inst, picks, decim, verbose)
 
         # sort ICA components by explained variance
-        var = _ica_explained_variance(self, inst)
+        var = _ica_explained_variance(self, inst,
+                                      chunk_duration=chunk_duration)
         var_ord = var.argsort()[::-1]
         _sort_components(self, var_ord, copy=False)
         t_stop = time()
@@ -598,6 +624,95 @@ class ICA(ContainsMixin):
 
         return self
 
+    def _fit_chunked(self, inst, picks, start, stop, decim, reject, flat,
+                     tstep, reject_by_annotation, chunk_duration):
+        """Fit one chunk of data at a time."""
+        iter_chunks = partial(
+            _iter_fit_chunks, inst, picks, start, stop, decim, reject, flat,
+            tstep, reject_by_annotation, self.info, chunk_duration)
+        # One pass to get the channel means and covariance (shifted by the
+        # means of the first chunk for numerical stability)
+        n_samples, shift, sums, prods, drop_inds = 0, None, 0., 0., list()
+        for data, this_drop_inds in iter_chunks():
+            drop_inds.extend(this_drop_inds)
+            if data.shape[1] == 0:
+                continue
+            if shift is None:
+                shift = np.mean(data, axis=1)
+            data -= shift[:, np.newaxis]
+            n_samples += data.shape[1]
+            sums += np.sum(data, axis=1)
+            prods += np.dot(data, data.T)
+        if (reject is not None) or (flat is not None):
+            self.reject_ = reject
+            self.drop_inds_ = drop_inds
+        if n_samples < 2:
+            raise RuntimeError('No clean segment found. Please consider '
+                               'updating your rejection thresholds.')
+        self.n_samples_ = n_samples
+        mean = shift + sums / n_samples
+        cov = (prods - np.outer(sums, sums) / n_samples) / (n_samples - 1)
+        del sums, prods
+
+        # Pre-whitening, using the same per-channel-type standard deviation
+        # as _pre_whiten would compute on the full data
+        if self.noise_cov is None:
+            var = np.diag(cov) * ((n_samples - 1.) / n_samples)
+            self.pre_whitener_ = np.empty([len(picks), 1])
+            for this_picks in _pre_whiten_picks(self.info):
+                self.pre_whitener_[this_picks] = np.sqrt(np.mean(
+                    var[this_picks] +
+                    (mean[this_picks] - mean[this_picks].mean()) ** 2))
+            mean /= self.pre_whitener_[:, 0]
+            cov /= self.pre_whitener_ * self.pre_whitener_.T
+        else:
+            self.pre_whitener_, _ = compute_whitener(
+                self.noise_cov, inst.info, picks)
+            mean = np.dot(self.pre_whitener_, mean)
+            cov = np.dot(np.dot(self.pre_whitener_, cov),
+                         self.pre_whitener_.T)
+
+        # PCA from the covariance
+        eigval, eigvec = linalg.eigh(cov)
+        order = np.argsort(eigval)[::-1]
+        eigval = np.maximum(eigval[order], 0.)
+        components = eigvec[:, order].T
+        # flip eigenvectors' sign to enforce deterministic output
+        max_abs = np.argmax(np.abs(components), axis=1)
+        components *= np.sign(
+            components[np.arange(len(components)), max_abs])[:, np.newaxis]
+        n_pca = self.max_pca_components
+        self._set_pca(mean, components[:n_pca], eigval[:n_pca],
+                      eigval[:n_pca] / eigval.sum())
+
+        # ICA on the whitened chunks
+        sel = slice(0, self.n_components_)
+        norm = np.sqrt(self.pca_explained_variance_[sel])[:, np.newaxis]
+        rng = check_random_state(self.random_state)
+
+        def get_chunks():
+            for data, _ in iter_chunks(random_state=rng):
+                if data.shape[1] == 0:
+                    continue
+                data, _ = self._pre_whiten(data, inst.info, picks)
+                data -= self.pca_mean_[:, np.newaxis]
+                yield (np.dot(self.pca_components_[sel], data) / norm).T
+
+        fit_params = self.fit_params.copy()
+        if fit_params.get('block') is None:
+            # make sure each chunk has several blocks
+            fit_params['block'] = min(
+                int(math.floor(math.sqrt(n_samples / 3.0))),
+                max(int(chunk_duration * self.info['sfreq'] /
+                        (decim or 1)) // 3, 1))
+        self.unmixing_matrix_, self.n_iter_ = _infomax(
+            get_chunks, n_samples, self.n_components_,
+            random_state=rng, return_n_iter=True, **fit_params)
+        assert self.unmixing_matrix_.shape == (self.n_components_,) * 2
+        self.unmixing_matrix_ /= norm.T  # whitening
+        self._update_mixing_matrix()
+        self.current_fit = 'raw' if isinstance(inst, BaseRaw) else 'epochs'
+
     def _pre_whiten(self, data, info, picks):
         """Aux function."""
         has_pre_whitener = hasattr(self, 'pre_whitener_')
@@ -606,27 +721,8 @@ class ICA(ContainsMixin):
             # Scale (z-score) the data by channel type
             info = pick_info(info, picks)
             pre_whitener = np.empty([len(data), 1])
-            for ch_type in _DATA_CH_TYPES_SPLIT + ('eog', "ref_meg"):
-                if _contains_ch_type(info, ch_type):
-                    if ch_type == 'seeg':
-                        this_picks = pick_types(info, meg=False, seeg=True)
-                    elif ch_type == 'ecog':
-                        this_picks = pick_types(info, meg=False, ecog=True)
-                    elif ch_type == 'eeg':
-                        this_picks = pick_types(info, meg=False, eeg=True)
-                    elif ch_type in ('mag', 'grad'):
-                        this_picks = pick_types(info, meg=ch_type)
-                    elif ch_type == 'eog':
-                        this_picks = pick_types(info, meg=False, eog=True)
-                    elif ch_type in ('hbo', 'hbr'):
-                        this_picks = pick_types(info, meg=False, fnirs=ch_type)
-                    elif ch_type == 'ref_meg':
-                        this_picks = pick_types(info, meg=False, ref_meg=True)
-                    else:
-                        raise RuntimeError('Should not be reached.'
-                                           'Unsupported channel {}'
-                                           .format(ch_type))
-                    pre_whitener[this_picks] = np.std(data[this_picks])
+            for this_picks in _pre_whiten_picks(info):
+                pre_whitener[this_picks] = np.std(data[this_picks])
             data /= pre_whitener
         elif not has_pre_whitener and self.noise_cov is not None:
             pre_whitener, _ = compute_whitener(self.noise_cov, info, picks)
@@ -649,34 +745,9 @@ class ICA(ContainsMixin):
         data = pca.fit_transform(data.T)
         assert data.shape == (n_samples, max_pca_components or n_channels)
 
-        if isinstance(self.n_components, float):
-            self.n_components_ = np.sum(
-                pca.explained_variance_ratio_.cumsum() <= self.n_components)
-            if self.n_components_ < 1:
-                raise RuntimeError('One PCA component captures most of the '
-                                   'explained variance, your threshold resu'
-                                   'lts in 0 components. You should select '
-                                   'a higher value.')
-            msg = 'Selecting by explained variance'
-        else:
-            if self.n_components is not None:  # normal n case
-                self.n_components_ = _ensure_int(self.n_components)
-                msg = 'Selecting by number'
-            else:  # None case
-                self.n_components_ = len(pca.components_)
-                msg = 'Selecting all PCA components'
-        logger.info('%s: %s components' % (msg, self.n_components_))
-
-        # the things to store for PCA
-        self.pca_mean_ = pca.mean_
-        self.pca_components_ = pca.components_
-        self.pca_explained_variance_ = pca.explained_variance_
+        self._set_pca(pca.mean_, pca.components_, pca.explained_variance_,
+                      pca.explained_variance_ratio_)
         del pca
-        # update number of components
-        self._update_ica_names()
-        if self.n_pca_components is not None:
-            if self.n_pca_components > len(self.pca_components_):
-                self.n_pca_components = len(self.pca_components_)
 
         # take care of ICA
         sel = slice(0, self.n_components_)
@@ -710,6 +781,37 @@ class ICA(ContainsMixin):
         self._update_mixing_matrix()
         self.current_fit = fit_type
 
+    def _set_pca(self, mean, components, explained_variance,
+                 explained_variance_ratio):
+        """Store the PCA and select the number of ICA components."""
+        if isinstance(self.n_components, float):
+            self.n_components_ = np.sum(
+                explained_variance_ratio.cumsum() <= self.n_components)
+            if self.n_components_ < 1:
+                raise RuntimeError('One PCA component captures most of the '
+                                   'explained variance, your threshold resu'
+                                   'lts in 0 components. You should select '
+                                   'a higher value.')
+            msg = 'Selecting by explained variance'
+        else:
+            if self.n_components is not None:  # normal n case
+                self.n_components_ = _ensure_int(self.n_components)
+                msg = 'Selecting by number'
+            else:  # None case
+                self.n_components_ = len(components)
+                msg = 'Selecting all PCA components'
+        logger.info('%s: %s components' % (msg, self.n_components_))
+
+        # the things to store for PCA
+        self.pca_mean_ = mean
+        self.pca_components_ = components
+        self.pca_explained_variance_ = explained_variance
+        # update number of components
+        self._update_ica_names()
+        if self.n_pca_components is not None:
+            if self.n_pca_components > len(self.pca_components_):
+                self.n_pca_components = len(self.pca_components_)
+
     def _update_mixing_matrix(self):
         self.mixing_matrix_ = linalg.pinv(self.unmixing_matrix_)
 
@@ -728,12 +830,34 @@ class ICA(ContainsMixin):
         sources = np.dot(self.unmixing_matrix_, pca_data)
         return sources
 
-    def _transform_raw(self, raw, start, stop, reject_by_annotation=False):
-        """Transform raw data."""
+    def _get_sources_op(self):
+        """Get the linear operator that computes the sources.
+
+        The sources are ``np.dot(op, data) + offset[:, None]``, with the
+        pre-whitening and PCA mean folded into ``op`` and ``offset``.
+        """
+        op = np.dot(self.unmixing_matrix_,
+                    self.pca_components_[:self.n_components_])
+        offset = np.zeros(self.n_components_)
+        if self.pca_mean_ is not None:
+            offset -= np.dot(op, self.pca_mean_)
+        if self.noise_cov is None:  # standardization
+            op /= self.pre_whitener_.T
+        else:
+            op = np.dot(op, self.pre_whitener_)
+        return op, offset
+
+    def _transform_data(self, data):
+        """Compute sources from non-whitened data."""
+        op, offset = self._get_sources_op()
+        sources = np.dot(op, data)
+        sources += offset[:, np.newaxis]
+        return sources
+
+    def _get_raw_picks(self, raw):
+        """Get the picks of the fitted channels in raw."""
         if not hasattr(self, 'mixing_matrix_'):
             raise RuntimeError('No fit available. Please fit ICA.')
-        start, stop = _check_start_stop(raw, start, stop)
-
         picks = pick_types(raw.info, include=self.ch_names, exclude='bads',
                            meg=False, ref_meg=False)
         if len(picks) != len(self.ch_names):
@@ -742,13 +866,17 @@ class ICA(ContainsMixin):
                                'provide Raw compatible with '
                                'ica.ch_names' % (len(self.ch_names),
                                                  len(picks)))
+        return picks
 
+    def _transform_raw(self, raw, start, stop, reject_by_annotation=False):
+        """Transform raw data."""
+        picks = self._get_raw_picks(raw)
+        start, stop = _check_start_stop(raw, start, stop)
         if reject_by_annotation:
             data = raw.get_data(picks, start, stop, 'omit')
         else:
             data = raw[picks, start:stop][0]
-        data, _ = self._pre_whiten(data, raw.info, picks)
-        return self._transform(data)
+        return self._transform_data(data)
 
     def _transform_epochs(self, epochs, concatenate):
         """Aux method."""
@@ -766,8 +894,7 @@ class ICA(ContainsMixin):
                                                  len(picks)))
 
         data = np.hstack(epochs.get_data()[:, picks])
-        data, _ = self._pre_whiten(data, epochs.info, picks)
-        sources = self._transform(data)
+        sources = self._transform_data(data)
 
         if not concatenate:
             # Put the data back in 3D
@@ -790,10 +917,7 @@ class ICA(ContainsMixin):
                                'ica.ch_names' % (len(self.ch_names),
                                                  len(picks)))
 
-        data, _ = self._pre_whiten(evoked.data[picks], evoked.info, picks)
-        sources = self._transform(data)
-
-        return sources
+        return self._transform_data(evoked.data[picks])
 
     def get_components(self):
         """Get ICA topomap for components as numpy arrays.
@@ -852,6 +976,62 @@ class ICA(ContainsMixin):
                              'type')
         return sources
 
+    def iter_sources(self, raw, start=None, stop=None, chunk_duration=10.):
+        """Iterate over the sources of raw data in chunks.
+
+        Unlike :meth:`get_sources`, this reads only one chunk of data at a
+        time, so it can be used on long recordings that are not preloaded.
+
+        Parameters
+        ----------
+        raw : instance of Raw
+            The data to compute the sources from. Does not need to be
+            preloaded.
+        start : int | float | None
+            First sample to include. If float, data will be interpreted as
+            time in seconds. If None, data will be used from the first sample.
+        stop : int | float | None
+            Last sample to not include. If float, data will be interpreted as
+            time in seconds. If None, data will be used to the last sample.
+        chunk_duration : float
+            The duration of each chunk in seconds. Defaults to 10.
+
+        Yields
+        ------
+        sources : ndarray, shape (n_components, n_times)
+            The ICA sources for one chunk.
+        times : ndarray, shape (n_times,)
+            The times of the chunk.
+
+        Notes
+        -----
+        .. versionadded:: 0.21
+        """
+        _validate_type(raw, BaseRaw, 'raw', 'Raw')
+        _check_compensation_grade(self.info, raw.info, 'ICA', 'Raw',
+                                  ch_names=self.ch_names)
+        picks = self._get_raw_picks(raw)
+        start, stop = _check_start_stop(raw, start, stop)
+        start = 0 if start is None else start
+        stop = len(raw.times) if stop is None else stop
+        chunk_duration = float(chunk_duration)
+        if chunk_duration <= 0:
+            raise ValueError('chunk_duration must be positive, got %s'
+                             % (chunk_duration,))
+        n_chunk = max(int(round(chunk_duration * raw.info['sfreq'])), 1)
+        op, offset = self._get_sources_op()
+        return self._iter_sources(raw, picks, start, stop, n_chunk, op,
+                                  offset)
+
+    @staticmethod
+    def _iter_sources(raw, picks, start, stop, n_chunk, op, offset):
+        for chunk_start in range(start, stop, n_chunk):
+            data, times = raw[picks, chunk_start:min(chunk_start + n_chunk,
+                                                     stop)]
+            sources = np.dot(op, data)
+            sources += offset[:, np.newaxis]
+            yield sources, times
+
     def _sources_as_raw(self, raw, add_channels, start, stop):
         """Aux method."""
         # merge copied instance and picked data with sources
@@ -997,22 +1177,8 @@ class ICA(ContainsMixin):
         scores : ndarray
             Scores for each source as returned from score_func.
         """
-        if isinstance(inst, BaseRaw):
-            _check_compensation_grade(self.info, inst.info, 'ICA', 'Raw',
-                                      ch_names=self.ch_names)
-            sources = self._transform_raw(inst, start, stop,
-                                          reject_by_annotation)
-        elif isinstance(inst, BaseEpochs):
-            _check_compensation_grade(self.info, inst.info, 'ICA', 'Epochs',
-                                      ch_names=self.ch_names)
-            sources = self._transform_epochs(inst, concatenate=True)
-        elif isinstance(inst, Evoked):
-            _check_compensation_grade(self.info, inst.info, 'ICA', 'Evoked',
-                                      ch_names=self.ch_names)
-            sources = self._transform_evoked(inst)
-        else:
-            raise ValueError('Data input must be of Raw, Epochs or Evoked '
-                             'type')
+        sources = self._transform_inst(inst, start, stop,
+                                       reject_by_annotation)
 
         if target is not None:  # we can have univariate metrics without target
             target = self._check_target(target, inst, start, stop,
@@ -1032,6 +1198,26 @@ class ICA(ContainsMixin):
 
         return scores
 
+    def _transform_inst(self, inst, start, stop, reject_by_annotation):
+        """Compute the concatenated sources of an instance for scoring."""
+        if isinstance(inst, BaseRaw):
+            _check_compensation_grade(self.info, inst.info, 'ICA', 'Raw',
+                                      ch_names=self.ch_names)
+            sources = self._transform_raw(inst, start, stop,
+                                          reject_by_annotation)
+        elif isinstance(inst, BaseEpochs):
+            _check_compensation_grade(self.info, inst.info, 'ICA', 'Epochs',
+                                      ch_names=self.ch_names)
+            sources = self._transform_epochs(inst, concatenate=True)
+        elif isinstance(inst, Evoked):
+            _check_compensation_grade(self.info, inst.info, 'ICA', 'Evoked',
+                                      ch_names=self.ch_names)
+            sources = self._transform_evoked(inst)
+        else:
+            raise ValueError('Data input must be of Raw, Epochs or Evoked '
+                             'type')
+        return sources
+
     def _check_target(self, target, inst, start, stop,
                       reject_by_annotation=False):
         """Aux Method."""
@@ -1070,10 +1256,22 @@ class ICA(ContainsMixin):
         See find_bads_ecg, find_bads, eog, and find_bads_ref for details.
         """
         scores, idx = [], []
+        # compute (and filter) the sources only once for all targets
+        sources = self._transform_inst(inst, start, stop,
+                                       reject_by_annotation)
         # some magic we need inevitably ...
         # get targets before equalizing
         targets = [self._check_target(
             ch, inst, start, stop, reject_by_annotation) for ch in chs]
+        for target in targets:
+            if sources.shape[-1] != target.shape[-1]:
+                raise ValueError('Sources and target do not have the same '
+                                 'number of time slices.')
+        targets = np.array([np.ravel(target) for target in targets])
+        if isinstance(inst, BaseRaw):
+            sources, targets = _band_pass_filter(inst, sources, targets,
+                                                 l_freq, h_freq)
+        all_scores = np.atleast_2d(_pearsonr(sources, targets))
         # assign names, if targets are arrays instead of strings
         target_names = []
         for ch in chs:
@@ -1085,11 +1283,8 @@ class ICA(ContainsMixin):
             else:
                 target_names.append(ch)
 
-        for ii, (ch, target) in enumerate(zip(target_names, targets)):
-            scores += [self.score_sources(
-                inst, target=target, score_func='pearsonr', start=start,
-                stop=stop, l_freq=l_freq, h_freq=h_freq,
-                reject_by_annotation=reject_by_annotation)]
+        for ii, ch in enumerate(target_names):
+            scores += [all_scores[ii]]
             # pick last scores
             if measure == "zscore":
                 this_idx = _find_outliers(scores[-1], threshold=threshold)
@@ -1531,6 +1726,68 @@ class ICA(ContainsMixin):
                                   ch_names=self.ch_names)
         return meth(**kwargs)
 
+    @verbose
+    def apply_and_save(self, raw, fname, include=None, exclude=None,
+                       n_pca_components=None, tmin=0, tmax=None,
+                       buffer_size_sec=None, fmt='single', overwrite=False,
+                       split_size='2GB', verbose=None):
+        """Remove selected components from raw data and save the result.
+
+        Unlike :meth:`apply`, the data do not need to be preloaded: they are
+        read, cleaned and written one buffer at a time, so that long
+        recordings can be cleaned without holding them in memory. The
+        channels not used for the ICA are written unchanged.
+
+        Parameters
+        ----------
+        raw : instance of Raw
+            The data to clean. It is not modified.
+        fname : str
+            File name of the cleaned data, see :meth:`mne.io.Raw.save`.
+        include : array_like of int
+            The indices referring to columns in the ummixing matrix. The
+            components to be kept.
+        exclude : array_like of int
+            The indices referring to columns in the ummixing matrix. The
+            components to be zeroed out.
+        n_pca_components : int | float | None
+            The number of PCA components to be kept, either absolute (int)
+            or percentage of the explained variance (float). If None (default),
+            all PCA components will be used.
+        %(raw_tmin)s
+        %(raw_tmax)s
+        buffer_size_sec : float | None
+            Size of data chunks in seconds. If None (default), the buffer
+            size of the original file is used.
+        fmt : 'single' | 'double' | 'int' | 'short'
+            Format to use to save raw data, see :meth:`mne.io.Raw.save`.
+        overwrite : bool
+            If True, the destination file (if it exists) will be overwritten.
+            If False (default), an error will be raised if the file exists.
+        split_size : str | int
+            The maximum size of each file, see :meth:`mne.io.Raw.save`.
+        %(verbose_meth)s
+
+        Notes
+        -----
+        .. versionadded:: 0.21
+        """
+        _validate_type(raw, BaseRaw, 'raw', 'Raw')
+        _check_compensation_grade(self.info, raw.info, 'ICA', 'Raw',
+                                  ch_names=self.ch_names)
+        picks = self._get_raw_picks(raw)
+        if n_pca_components is not None:
+            self.n_pca_components = n_pca_components
+        proj_mat, offset = self._get_cleaning_matrix(include, exclude)
+        offset = offset[:, np.newaxis]
+
+        def clean(data):
+            data[picks] = np.dot(proj_mat, data[picks]) + offset
+            return data
+
+        raw._save(fname, None, tmin, tmax, buffer_size_sec, False, False,
+                  fmt, overwrite, split_size, 'neuromag', transform=clean)
+
     def _check_exclude(self, exclude):
         if exclude is None:
             return list(set(self.exclude))
@@ -1551,8 +1808,6 @@ class ICA(ContainsMixin):
                            exclude='bads', ref_meg=False)
 
         data = raw[picks, start:stop][0]
-        data, _ = self._pre_whiten(data, raw.info, picks)
-
         data = self._pick_sources(data, include, exclude)
 
         raw[picks, start:stop] = data
@@ -1578,7 +1833,6 @@ class ICA(ContainsMixin):
             self.n_pca_components = n_pca_components
 
         data = np.hstack(epochs.get_data()[:, picks])
-        data, _ = self._pre_whiten(data, epochs.info, picks)
         data = self._pick_sources(data, include=include, exclude=exclude)
 
         # restore epochs, channels, tsl order
@@ -1605,9 +1859,7 @@ class ICA(ContainsMixin):
         if n_pca_components is not None:
             self.n_pca_components = n_pca_components
 
-        data = evoked.data[picks]
-        data, _ = self._pre_whiten(data, evoked.info, picks)
-        data = self._pick_sources(data, include=include,
+        data = self._pick_sources(evoked.data[picks], include=include,
                                   exclude=exclude)
 
         # restore evoked
@@ -1616,10 +1868,22 @@ class ICA(ContainsMixin):
         return evoked
 
     def _pick_sources(self, data, include, exclude):
-        """Aux function."""
+        """Remove the excluded components from (non-whitened) data."""
+        proj_mat, offset = self._get_cleaning_matrix(include, exclude)
+        data = np.dot(proj_mat, data)
+        data += offset[:, np.newaxis]
+        return data
+
+    def _get_cleaning_matrix(self, include, exclude):
+        """Get the linear operator that removes the excluded components.
+
+        The cleaned data are ``np.dot(proj_mat, data) + offset[:, None]``,
+        with the pre-whitening and PCA mean folded into ``proj_mat`` and
+        ``offset``, so that the data do not need to be pre-whitened.
+        """
         exclude = self._check_exclude(exclude)
         _n_pca_comp = self._check_n_pca_components(self.n_pca_components)
-        n_ch, _ = data.shape
+        n_ch = self.pca_components_.shape[1]
 
         if not(self.n_components_ <= _n_pca_comp <= self.max_pca_components):
             raise ValueError('n_pca_components must be >= '
@@ -1628,10 +1892,6 @@ class ICA(ContainsMixin):
         logger.info('Transforming to ICA space (%i components)'
                     % self.n_components_)
 
-        # Apply first PCA
-        if self.pca_mean_ is not None:
-            data -= self.pca_mean_[:, None]
-
         sel_keep = np.arange(self.n_components_)
         if include not in (None, []):
             sel_keep = np.unique(include)
@@ -1664,19 +1924,25 @@ class ICA(ContainsMixin):
         sel_keep = np.concatenate(
             (sel_keep, np.arange(self.n_components_, _n_pca_comp)))
         proj_mat = np.dot(mixing[:, sel_keep], unmixing[sel_keep, :])
-        data = np.dot(proj_mat, data)
         assert proj_mat.shape == (n_ch,) * 2
 
+        # the mean is removed before and restored after the projection
+        offset = np.zeros(n_ch)
         if self.pca_mean_ is not None:
-            data += self.pca_mean_[:, None]
+            offset += self.pca_mean_ - np.dot(proj_mat, self.pca_mean_)
 
-        # restore scaling
-        if self.noise_cov is None:  # revert standardization
-            data *= self.pre_whitener_
+        # pre-whiten before and restore the scaling after the projection
+        if self.noise_cov is None:  # standardization
+            proj_mat *= self.pre_whitener_
+            proj_mat /= self.pre_whitener_.T
+            offset *= self.pre_whitener_[:, 0]
         else:
-            data = np.dot(linalg.pinv(self.pre_whitener_, cond=1e-14), data)
+            unwhitener = linalg.pinv(self.pre_whitener_, cond=1e-14)
+            proj_mat = np.dot(np.dot(unwhitener, proj_mat),
+                              self.pre_whitener_)
+            offset = np.dot(unwhitener, offset)
 
-        return data
+        return proj_mat, offset
 
     @verbose
     def save(self, fname, verbose=None):
@@ -1915,6 +2181,106 @@ class ICA(ContainsMixin):
         return _n_pca_comp
 
 
+def _pre_whiten_picks(info):
+    """Get the channels that are standardized together."""
+    out = list()
+    for ch_type in _DATA_CH_TYPES_SPLIT + ('eog', "ref_meg"):
+        if _contains_ch_type(info, ch_type):
+            if ch_type == 'seeg':
+                this_picks = pick_types(info, meg=False, seeg=True)
+            elif ch_type == 'ecog':
+                this_picks = pick_types(info, meg=False, ecog=True)
+            elif ch_type == 'eeg':
+                this_picks = pick_types(info, meg=False, eeg=True)
+            elif ch_type in ('mag', 'grad'):
+                this_picks = pick_types(info, meg=ch_type)
+            elif ch_type == 'eog':
+                this_picks = pick_types(info, meg=False, eog=True)
+            elif ch_type in ('hbo', 'hbr'):
+                this_picks = pick_types(info, meg=False, fnirs=ch_type)
+            elif ch_type == 'ref_meg':
+                this_picks = pick_types(info, meg=False, ref_meg=True)
+            else:
+                raise RuntimeError('Should not be reached.'
+                                   'Unsupported channel {}'
+                                   .format(ch_type))
+            out.append(this_picks)
+    return out
+
+
+def _iter_fit_chunks(inst, picks, start, stop, decim, reject, flat, tstep,
+                     reject_by_annotation, info, chunk_duration,
+                     random_state=None):
+    """Yield chunks of data to fit, with the rejected segments of each.
+
+    If ``random_state`` is not None, the chunks are returned in random order.
+    Chunks of raw data are empty if all of their segments are rejected.
+    """
+    rng = None if random_state is None else check_random_state(random_state)
+    decim = 1 if decim is None else decim
+    if isinstance(inst, BaseRaw):
+        start, stop = _check_start_stop(inst, start, stop)
+        start = 0 if start is None else start
+        stop = len(inst.times) if stop is None else min(stop, len(inst.times))
+        # The segments of samples that are not omitted, which are
+        # concatenated like get_data(reject_by_annotation='omit') does
+        if reject_by_annotation:
+            seg_starts, seg_stops = _annotations_starts_stops(
+                inst, ['BAD'], invert=True)
+            seg_starts = np.clip(seg_starts, start, stop)
+            seg_stops = np.clip(seg_stops, start, stop)
+            keep = seg_stops > seg_starts
+            seg_starts, seg_stops = seg_starts[keep], seg_stops[keep]
+        else:
+            seg_starts, seg_stops = np.array([start]), np.array([stop])
+        seg_offsets = np.concatenate([[0], np.cumsum(seg_stops - seg_starts)])
+        # Make the chunks of the concatenated samples line up with
+        # decimation and rejection segments
+        n_step = decim
+        do_reject = (reject is not None) or (flat is not None)
+        if do_reject:
+            n_step *= int(math.ceil(
+                int(math.ceil(tstep * inst.info['sfreq'])) / float(decim)))
+        n_chunk = max(int(round(chunk_duration * inst.info['sfreq'] /
+                                n_step)), 1) * n_step
+        firsts = np.arange(0, seg_offsets[-1], n_chunk)
+        order = np.arange(len(firsts))
+        if rng is not None:
+            order = rng.permutation(order)
+        for first in firsts[order]:
+            last = min(first + n_chunk, seg_offsets[-1])
+            data = list()
+            for si in range(np.searchsorted(seg_offsets, first, 'right') - 1,
+                            np.searchsorted(seg_offsets, last, 'left')):
+                data.append(inst.get_data(
+                    picks, seg_starts[si] + max(first - seg_offsets[si], 0),
+                    seg_starts[si] + min(last, seg_offsets[si + 1]) -
+                    seg_offsets[si]))
+            data = np.concatenate(data, axis=1)[:, ::decim]
+            drop_inds = list()
+            if do_reject:
+                data, drop_inds = _reject_data_segments(
+                    data, reject, flat, decim, info, tstep, allow_empty=True)
+                drop_inds = [(first // decim + first_, first // decim + last_)
+                             for first_, last_ in drop_inds]
+            yield data, drop_inds
+    else:
+        assert isinstance(inst, BaseEpochs)
+        if inst.events.size == 0:
+            raise RuntimeError('Tried to fit ICA with epochs, but none were '
+                               'found: epochs.events is "{}".'
+                               .format(inst.events))
+        n_chunk = max(int(round(chunk_duration * inst.info['sfreq'] /
+                                len(inst.times))), 1)
+        firsts = np.arange(0, len(inst.events), n_chunk)
+        if rng is not None:
+            firsts = firsts[rng.permutation(len(firsts))]
+        for first in firsts:
+            data = inst.get_data(item=slice(first, first + n_chunk))
+            if len(data):
+                yield np.hstack(data[:, picks, ::decim]), list()
+
+
 def _check_start_stop(raw, start, stop):
     """Aux function."""
     out = list()
@@ -2025,8 +2391,26 @@ def _get_target_ch(container, target):
     return picks
 
 
+def _pearsonr(sources, targets):
+    """Compute the Pearson correlation of each source with each target.
+
+    Returns an array of shape ``(n_targets, n_sources)``, or ``(n_sources,)``
+    for a single target.
+    """
+    sources = sources - sources.mean(axis=-1, keepdims=True)
+    targets = np.atleast_2d(targets)
+    targets = targets - targets.mean(axis=-1, keepdims=True)
+    # normalize first, like scipy.stats.pearsonr, to avoid overflow
+    sources /= np.linalg.norm(sources, axis=-1, keepdims=True)
+    targets /= np.linalg.norm(targets, axis=-1, keepdims=True)
+    scores = np.clip(np.dot(targets, sources.T), -1., 1.)
+    return scores[0] if len(scores) == 1 else scores
+
+
 def _find_sources(sources, target, score_func):
     """Aux function."""
+    if score_func == 'pearsonr' and target is not None:
+        return _pearsonr(sources, np.ravel(target))
     if isinstance(score_func, str):
         score_func = get_score_funcs().get(score_func, score_func)
 
@@ -2039,7 +2423,7 @@ def _find_sources(sources, target, score_func):
     return scores
 
 
-def _ica_explained_variance(ica, inst, normalize=False):
+def _ica_explained_variance(ica, inst, normalize=False, chunk_duration=None):
     """Check variance accounted for by each component in supplied data.
 
     Parameters
@@ -2050,6 +2434,9 @@ def _ica_explained_variance(ica, inst, normalize=False):
         Data to explain with ICA. Instance of Raw, Epochs or Evoked.
     normalize : bool
         Whether to normalize the variance.
+    chunk_duration : float | None
+        If not None, compute the sources in chunks of this many seconds
+        instead of all at once.
 
     Returns
     -------
@@ -2063,6 +2450,23 @@ def _ica_explained_variance(ica, inst, normalize=False):
         raise TypeError('second argument must an instance of either Raw, '
                         'Epochs or Evoked.')
 
+    if chunk_duration is not None and not isinstance(inst, Evoked):
+        picks = pick_types(inst.info, include=ica.ch_names, exclude='bads',
+                           meg=False, ref_meg=False)
+        n_chan, n_samp, sum_sq = ica.n_components_, 0, 0.
+        for data, _ in _iter_fit_chunks(inst, picks, None, None, None, None,
+                                        None, None, False, ica.info,
+                                        chunk_duration):
+            data, _ = ica._pre_whiten(data, inst.info, picks)
+            source_data = ica._transform(data)
+            n_samp += source_data.shape[1]
+            sum_sq += np.sum(source_data ** 2, axis=1)
+        var = np.sum(ica.mixing_matrix_ ** 2, axis=0) * sum_sq / (
+            n_chan * n_samp - 1)
+        if normalize:
+            var /= var.sum()
+        return var
+
     source_data = _get_inst_data(ica.get_sources(inst))
 
     # if epochs - reshape to channels x timesamples
@@ -2385,15 +2789,18 @@ def _detect_artifacts(ica, raw, start_find, stop_find, ecg_ch, ecg_score_func,
 def _band_pass_filter(inst, sources, target, l_freq, h_freq, verbose=None):
     """Optionally band-pass filter the data."""
     if l_freq is not None and h_freq is not None:
-        logger.info('... filtering ICA sources')
+        logger.info('... filtering ICA sources and target')
         # use FIR here, steeper is better
         kw = dict(phase='zero-double', filter_length='10s', fir_window='hann',
                   l_trans_bandwidth=0.5, h_trans_bandwidth=0.5,
                   fir_design='firwin2')
-        sources = filter_data(sources, inst.info['sfreq'], l_freq, h_freq,
-                              **kw)
-        logger.info('... filtering target')
-        target = filter_data(target, inst.info['sfreq'], l_freq, h_freq, **kw)
+        # filter everything in a single call
+        target_shape = np.shape(target)
+        data = np.concatenate([sources, np.reshape(target, (-1, len(
+            sources[0])))])
+        data = filter_data(data, inst.info['sfreq'], l_freq, h_freq, **kw)
+        sources, target = data[:len(sources)], data[len(sources):]
+        target = target.reshape(target_shape)
     elif l_freq is not None or h_freq is not None:
         raise ValueError('Must specify both pass bands')
     return sources, target
@@ -8,7 +8,9 @@ import math
 
 import numpy as np
 
-from ..utils import logger, verbose, check_random_state, random_permutation
+from ..fixes import jit, has_numba
+from ..utils import (logger, verbose, check_random_state, random_permutation,
+                     _check_option)
 
 
 @verbose
@@ -16,7 +18,7 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
             anneal_deg=60., anneal_step=0.9, extended=True, n_subgauss=1,
             kurt_size=6000, ext_blocks=1, max_iter=200, random_state=None,
             blowup=1e4, blowup_fac=0.5, n_small_angle=20, use_bias=True,
-            verbose=None, return_n_iter=False):
+            dtype='float64', verbose=None, return_n_iter=False):
     """Run (extended) Infomax ICA decomposition on raw data.
 
     Parameters
@@ -24,7 +26,8 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
     data : np.ndarray, shape (n_samples, n_features)
         The whitened data to unmix.
     weights : np.ndarray, shape (n_features, n_features)
-        The initialized unmixing matrix.
+        The initialized unmixing matrix, e.g. the unmixing matrix of a
+        previous fit to warm start from. It is not modified in place.
         Defaults to None, which means the identity matrix is used.
     l_rate : float
         This quantity indicates the relative size of the change in weights.
@@ -79,6 +82,13 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
     use_bias : bool
         This quantity indicates if the bias should be computed.
         Defaults to True.
+    dtype : str
+        The floating point precision used for the updates, can be
+        ``'float64'`` (default) or ``'float32'``. Single precision roughly
+        halves the computation time, but the weight changes then cannot get
+        much below 1e-10, so ``w_change`` should be increased accordingly.
+
+        .. versionadded:: 0.21
     %(verbose)s
     return_n_iter : bool
         Whether to return the number of iterations performed. Defaults to
@@ -100,7 +110,90 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
            analysis using an extended infomax algorithm for mixed subgaussian
            and supergaussian sources. Neural Computation, 11(2), 417-441, 1999.
     """
-    from scipy.stats import kurtosis
+    n_samples, n_features = data.shape
+    _check_option('dtype', dtype, ('float64', 'float32'))
+    data = np.asarray(data, dtype=dtype)
+    return _infomax(lambda: (data,), n_samples, n_features, weights=weights,
+                    l_rate=l_rate, block=block, w_change=w_change,
+                    anneal_deg=anneal_deg, anneal_step=anneal_step,
+                    extended=extended, n_subgauss=n_subgauss,
+                    kurt_size=kurt_size, ext_blocks=ext_blocks,
+                    max_iter=max_iter, random_state=random_state,
+                    blowup=blowup, blowup_fac=blowup_fac,
+                    n_small_angle=n_small_angle, use_bias=use_bias,
+                    dtype=dtype, verbose=verbose, return_n_iter=return_n_iter)
+
+
+def _logistic_nonlinearity(u, y):
+    """Compute the logistic nonlinearity in place.
+
+    Writes ``2 * logistic(u) - 1 == tanh(u / 2)`` to ``y`` and returns the
+    bias gradient.
+    """
+    np.multiply(u, 0.5, out=y)
+    np.tanh(y, out=y)
+    bias_grad = y.sum(axis=0)
+    bias_grad *= -1
+    return bias_grad
+
+
+if has_numba:  # pragma: no cover
+    @jit()
+    def _extended_nonlinearity(u, signs, y):
+        n_times, n_features = u.shape
+        bias_grad = np.zeros(n_features, u.dtype)
+        for ti in range(n_times):
+            for fi in range(n_features):
+                val = np.tanh(u[ti, fi])
+                bias_grad[fi] -= 2 * val
+                y[ti, fi] = u[ti, fi] + signs[fi] * val
+        return bias_grad
+else:
+    def _extended_nonlinearity(u, signs, y):
+        """Compute the extended Infomax nonlinearity in place.
+
+        Writes ``u + signs * tanh(u)`` to ``y`` and returns the bias
+        gradient.
+        """
+        np.tanh(u, out=y)
+        bias_grad = y.sum(axis=0)
+        bias_grad *= -2
+        y *= signs
+        y += u
+        return bias_grad
+
+
+def _kurtosis(x):
+    """Compute the Fisher kurtosis along the first axis, overwriting x."""
+    x -= x.mean(axis=0)
+    x *= x
+    m2 = x.mean(axis=0, dtype=np.float64)
+    x *= x
+    m4 = x.mean(axis=0, dtype=np.float64)
+    # like scipy.stats.kurtosis, constant signals get a kurtosis of -3
+    kurt = np.zeros_like(m4)
+    np.divide(m4, m2 * m2, out=kurt, where=m2 > 0)
+    kurt -= 3.
+    return kurt
+
+
+def _infomax(get_chunks, n_samples, n_features, weights=None, l_rate=None,
+             block=None, w_change=1e-12, anneal_deg=60., anneal_step=0.9,
+             extended=True, n_subgauss=1, kurt_size=6000, ext_blocks=1,
+             max_iter=200, random_state=None, blowup=1e4, blowup_fac=0.5,
+             n_small_angle=20, use_bias=True, dtype='float64', verbose=None,
+             return_n_iter=False):
+    """Run Infomax on data provided in chunks.
+
+    ``get_chunks()`` must return an iterable over arrays of shape
+    ``(n_samples_chunk, n_features)``, which together make up one pass over
+    the ``n_samples`` samples. Each pass is one iteration, with each chunk
+    shuffled and split into blocks independently. The samples of a chunk
+    that do not fill a block are carried over to the first block of the
+    next chunk, so chunks shorter than ``block`` are used as well.
+    """
+    _check_option('dtype', dtype, ('float64', 'float32'))
+    dtype = np.dtype(dtype)
     rng = check_random_state(random_state)
 
     # define some default parameters
@@ -115,8 +208,6 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
     signcount_threshold = 25
     signcount_step = 2
 
-    # check data shape
-    n_samples, n_features = data.shape
     n_features_square = n_features ** 2
 
     # check input parameters
@@ -126,22 +217,20 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
 
     if block is None:
         block = int(math.floor(math.sqrt(n_samples / 3.0)))
+    block = int(block)
+    if not 0 < block <= n_samples:
+        raise ValueError('block must be positive and at most the number of '
+                         'samples (%d), got %d' % (n_samples, block))
 
     logger.info('Computing%sInfomax ICA' % ' Extended ' if extended else ' ')
 
-    # collect parameters
-    nblock = n_samples // block
-    lastt = (nblock - 1) * block + 1
-
     # initialize training
     if weights is None:
-        weights = np.identity(n_features, dtype=np.float64)
+        weights = np.identity(n_features, dtype=dtype)
     else:
-        weights = weights.T
+        weights = np.array(weights.T, dtype=dtype, order='C')
 
-    BI = block * np.identity(n_features, dtype=np.float64)
-    bias = np.zeros((n_features, 1), dtype=np.float64)
-    onesrow = np.ones((1, block), dtype=np.float64)
+    bias = np.zeros(n_features, dtype=dtype)
     startweights = weights.copy()
     oldweights = startweights.copy()
     step = 0
@@ -151,14 +240,23 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
     signcount = 0
     initial_ext_blocks = ext_blocks   # save the initial value in case of reset
 
+    # buffers reused across all block updates
+    x_block = np.empty((block, n_features), dtype)
+    u = np.empty((block, n_features), dtype)
+    y = np.empty((block, n_features), dtype)
+    grad = np.empty((n_features, n_features), dtype)
+    dweights = np.empty((n_features, n_features), dtype)
+
     # for extended Infomax
     if extended:
-        signs = np.ones(n_features)
+        signs = np.ones(n_features, dtype)
 
         for k in range(n_subgauss):
             signs[k] = -1
 
         kurt_size = min(kurt_size, n_samples)
+        x_kurt = np.empty((kurt_size, n_features), dtype)
+        kurt_act = np.empty((kurt_size, n_features), dtype)
         old_kurt = np.zeros(n_features, dtype=np.float64)
         oldsigns = np.zeros(n_features)
 
@@ -166,78 +264,91 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
     olddelta, oldchange = 1., 0.
     while step < max_iter:
 
-        # shuffle data at each step
-        permute = random_permutation(n_samples, rng)
-
-        # ICA training block
-        # loop across block samples
-        for t in range(0, lastt, block):
-            u = np.dot(data[permute[t:t + block], :], weights)
-            u += np.dot(bias, onesrow).T
-
-            if extended:
-                # extended ICA update
-                y = np.tanh(u)
-                weights += l_rate * np.dot(weights,
-                                           BI -
-                                           signs[None, :] * np.dot(u.T, y) -
-                                           np.dot(u.T, u))
-                if use_bias:
-                    bias += l_rate * np.reshape(np.sum(y, axis=0,
-                                                dtype=np.float64) * -2.0,
-                                                (n_features, 1))
-
-            else:
-                # logistic ICA weights update
-                y = 1.0 / (1.0 + np.exp(-u))
-                weights += l_rate * np.dot(weights,
-                                           BI + np.dot(u.T, (1.0 - 2.0 * y)))
-
+        # samples left over from the previous chunk
+        x_left = np.empty((0, n_features), dtype)
+        for data in get_chunks():
+            data = np.asarray(data, dtype=dtype)
+            # shuffle data at each step
+            n_chunk = len(data)
+            permute = random_permutation(n_chunk, rng)
+            n_left = len(x_left)
+            n_blocks = (n_left + n_chunk) // block
+
+            # ICA training block
+            # loop across block samples
+            for t in range(-n_left, n_blocks * block - n_left, block):
+                if t < 0:
+                    x_block[:n_left] = x_left
+                    np.take(data, permute[:t + block], axis=0,
+                            out=x_block[n_left:])
+                else:
+                    np.take(data, permute[t:t + block], axis=0,
+                            out=x_block, mode='clip')
+                np.dot(x_block, weights, out=u)
+                u += bias
+
+                # the natural gradient is weights @ (BI - u.T @ y), with y
+                # from the nonlinearity: u + signs * tanh(u) for extended,
+                # 2 * logistic(u) - 1 for logistic ICA
+                if extended:
+                    bias_grad = _extended_nonlinearity(u, signs, y)
+                else:
+                    bias_grad = _logistic_nonlinearity(u, y)
+                np.dot(u.T, y, out=grad)
+                grad *= -1
+                grad.flat[::n_features + 1] += block
+                np.dot(weights, grad, out=dweights)
+                dweights *= l_rate
+                weights += dweights
                 if use_bias:
-                    bias += l_rate * np.reshape(np.sum((1.0 - 2.0 * y), axis=0,
-                                                dtype=np.float64),
-                                                (n_features, 1))
-
-            # check change limit
-            max_weight_val = np.max(np.abs(weights))
-            if max_weight_val > max_weight:
-                wts_blowup = True
-
-            blockno += 1
+                    bias_grad *= l_rate
+                    bias += bias_grad
+
+                # check change limit
+                max_weight_val = np.max(np.abs(weights))
+                if max_weight_val > max_weight:
+                    wts_blowup = True
+
+                blockno += 1
+                if wts_blowup:
+                    break
+
+                # ICA kurtosis estimation
+                if extended:
+                    if ext_blocks > 0 and blockno % ext_blocks == 0:
+                        if kurt_size < n_chunk:
+                            rp = np.floor(rng.uniform(0, 1, kurt_size) *
+                                          (n_chunk - 1))
+                            np.take(data, rp.astype(int), axis=0,
+                                    out=x_kurt, mode='clip')
+                            np.dot(x_kurt, weights, out=kurt_act)
+                            kurt = _kurtosis(kurt_act)
+                        else:
+                            kurt = _kurtosis(np.dot(data, weights))
+
+                        if extmomentum != 0:
+                            kurt = (extmomentum * old_kurt +
+                                    (1.0 - extmomentum) * kurt)
+                            old_kurt = kurt
+
+                        # estimate weighted signs
+                        signs = np.sign(kurt + signsbias).astype(dtype)
+
+                        ndiff = (signs - oldsigns != 0).sum()
+                        if ndiff == 0:
+                            signcount += 1
+                        else:
+                            signcount = 0
+                        oldsigns = signs
+
+                        if signcount >= signcount_threshold:
+                            ext_blocks = np.fix(ext_blocks * signcount_step)
+                            signcount = 0
             if wts_blowup:
                 break
-
-            # ICA kurtosis estimation
-            if extended:
-                if ext_blocks > 0 and blockno % ext_blocks == 0:
-                    if kurt_size < n_samples:
-                        rp = np.floor(rng.uniform(0, 1, kurt_size) *
-                                      (n_samples - 1))
-                        tpartact = np.dot(data[rp.astype(int), :], weights).T
-                    else:
-                        tpartact = np.dot(data, weights).T
-
-                    # estimate kurtosis
-                    kurt = kurtosis(tpartact, axis=1, fisher=True)
-
-                    if extmomentum != 0:
-                        kurt = (extmomentum * old_kurt +
-                                (1.0 - extmomentum) * kurt)
-                        old_kurt = kurt
-
-                    # estimate weighted signs
-                    signs = np.sign(kurt + signsbias)
-
-                    ndiff = (signs - oldsigns != 0).sum()
-                    if ndiff == 0:
-                        signcount += 1
-                    else:
-                        signcount = 0
-                    oldsigns = signs
-
-                    if signcount >= signcount_threshold:
-                        ext_blocks = np.fix(ext_blocks * signcount_step)
-                        signcount = 0
+            x_left = np.concatenate(
+                [x_left[:max(n_left - n_blocks * block, 0)],
+                 data[permute[max(n_blocks * block - n_left, 0):]]])
 
         # here we continue after the for loop over the ICA training blocks
         # if weights in bounds:
@@ -245,11 +356,13 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
             oldwtchange = weights - oldweights
             step += 1
             angledelta = 0.0
-            delta = oldwtchange.reshape(1, n_features_square)
+            delta = oldwtchange.reshape(1, n_features_square).astype(
+                np.float64)
             change = np.sum(delta * delta, dtype=np.float64)
             if step > 2:
-                angledelta = math.acos(np.sum(delta * olddelta) /
-                                       math.sqrt(change * oldchange))
+                angledelta = math.acos(np.clip(
+                    np.sum(delta * olddelta) / math.sqrt(change * oldchange),
+                    -1, 1))
                 angledelta *= degconst
 
             if verbose:
@@ -290,13 +403,13 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
             weights = startweights.copy()
             oldweights = startweights.copy()
             olddelta = np.zeros((1, n_features_square), dtype=np.float64)
-            bias = np.zeros((n_features, 1), dtype=np.float64)
+            bias = np.zeros(n_features, dtype=dtype)
 
             ext_blocks = initial_ext_blocks
 
             # for extended Infomax
             if extended:
-                signs = np.ones(n_features)
+                signs = np.ones(n_features, dtype)
                 for k in range(n_subgauss):
                     signs[k] = -1
                 oldsigns = np.zeros(n_features)
@@ -310,7 +423,8 @@ def infomax(data, weights=None, l_rate=None, block=None, w_change=1e-12,
                                  'might not be invertible!')
 
     # prepare return values
+    weights = weights.T.astype(np.float64)
     if return_n_iter:
-        return weights.T, step
+        return weights, step
     else:
-        return weights.T
+        return weights
@@ -6,7 +6,7 @@
 
 # License: BSD (3-clause)
 
-from collections import Counter
+from collections import Counter, OrderedDict
 from functools import partial
 from math import factorial
 from os import path as op
@@ -32,8 +32,9 @@ from ..io import (_loc_to_coil_trans, _coil_trans_to_loc, BaseRaw, RawArray,
                   Projection)
 from ..io.pick import pick_types, pick_info
 from ..utils import (verbose, logger, _clean_names, warn, _time_mask, _pl,
-                     _check_option, _ensure_int, _validate_type, use_log_level)
-from ..fixes import _get_args, _safe_svd, einsum, bincount, orth
+                     _check_option, _ensure_int, _validate_type, use_log_level,
+                     get_config, object_hash)
+from ..fixes import _get_args, _safe_svd, einsum, orth
 from ..channels.channels import _get_T1T2_mag_inds, fix_mag_coil_types
 
 
@@ -50,7 +51,7 @@ def maxwell_filter(raw, origin='auto', int_order=8, ext_order=3,
                    regularize='in', ignore_ref=False, bad_condition='error',
                    head_pos=None, st_fixed=True, st_only=False, mag_scale=100.,
                    skip_by_annotation=('edge', 'bad_acq_skip'),
-                   extended_proj=(), verbose=None):
+                   extended_proj=(), head_pos_tol=None, verbose=None):
     """Maxwell filter data using multipole moments.
 
     Parameters
@@ -96,6 +97,7 @@ def maxwell_filter(raw, origin='auto', int_order=8, ext_order=3,
 
         .. versionadded:: 0.17
     %(maxwell_extended)s
+    %(maxwell_pos_tol)s
     %(verbose)s
 
     Returns
@@ -219,7 +221,8 @@ def maxwell_filter(raw, origin='auto', int_order=8, ext_order=3,
         regularize=regularize, ignore_ref=ignore_ref,
         bad_condition=bad_condition, head_pos=head_pos, st_fixed=st_fixed,
         st_only=st_only, mag_scale=mag_scale,
-        skip_by_annotation=skip_by_annotation, extended_proj=extended_proj)
+        skip_by_annotation=skip_by_annotation, extended_proj=extended_proj,
+        head_pos_tol=head_pos_tol)
     raw_sss = _run_maxwell_filter(raw, **params)
     # Update info
     _update_sss_info(raw_sss, **params['update_kwargs'])
@@ -236,7 +239,7 @@ def _prep_maxwell_filter(
         head_pos=None, st_fixed=True, st_only=False,
         mag_scale=100.,
         skip_by_annotation=('edge', 'bad_acq_skip'), extended_proj=(),
-        reconstruct='in', verbose=None):
+        reconstruct='in', head_pos_tol=None, verbose=None):
     # There are an absurd number of different possible notations for spherical
     # coordinates, which confounds the notation for spherical harmonics.  Here,
     # we purposefully stay away from shorthand notation in both and use
@@ -272,6 +275,7 @@ def _prep_maxwell_filter(
         raise ValueError('st_duration must not be None if st_only is True')
     head_pos = _check_pos(head_pos, head_frame, raw, st_fixed,
                           raw.info['sfreq'])
+    head_pos_tol = _check_head_pos_tol(head_pos_tol)
     _check_info(raw.info, sss=not st_only, tsss=st_duration is not None,
                 calibration=not st_only and calibration is not None,
                 ctc=not st_only and cross_talk is not None)
@@ -410,13 +414,18 @@ def _prep_maxwell_filter(
             np.zeros(3)])
     else:
         this_pos_quat = None
+    # Movement compensation can request thousands of nearly identical
+    # positions, so cache the decompositions
+    cache = _get_decomp_cache(
+        exp, all_coils, calibration, regularize, ignore_ref, coil_scale,
+        mag_or_fine, mag_scale, head_pos_tol)
     _get_this_decomp_trans = partial(
         _get_decomp, all_coils=all_coils,
         cal=calibration, regularize=regularize,
         exp=exp, ignore_ref=ignore_ref, coil_scale=coil_scale,
         grad_picks=grad_picks, mag_picks=mag_picks, good_mask=good_mask,
         mag_or_fine=mag_or_fine, bad_condition=bad_condition,
-        mag_scale=mag_scale)
+        mag_scale=mag_scale, cache=cache)
     update_kwargs.update(
         nchan=good_mask.sum(), st_only=st_only, recon_trans=recon_trans)
     params = dict(
@@ -436,11 +445,9 @@ def _run_maxwell_filter(
         grad_picks, head_pos, info, _get_this_decomp_trans, S_recon,
         update_kwargs,
         reconstruct='in', copy=True):
-    # Eventually find_bad_channels_maxwell could be sped up by moving this
-    # outside the loop (e.g., in the prep function) but regularization depends
-    # on which channels are being used, so easier just to include it here.
-    # The time it takes to recompute S and pS themselves is roughly on par
-    # with the np.dot with the data, so not a huge gain to be made there.
+    # Regularization depends on which channels are being used, so the
+    # decomposition is obtained here (find_bad_channels_maxwell only uses
+    # this function when doing movement compensation, see _static_sss_resid)
     S_decomp, S_decomp_full, pS_decomp, reg_moments, n_use_in = \
         _get_this_decomp_trans(info['dev_head_t'], t=0.)
     update_kwargs.update(reg_moments=reg_moments.copy())
@@ -856,10 +863,131 @@ def _check_pos(pos, head_frame, raw, st_fixed, sfreq):
     return pos
 
 
+class _DecompCache(object):
+    """LRU cache of SSS decompositions keyed by (quantized) head position.
+
+    Parameters
+    ----------
+    setup_hash : int
+        Hash of everything other than the head position and the good
+        channels that the decomposition depends on.
+    head_pos_tol : tuple of float | None
+        Translation (m) and rotation (deg) bin sizes used to quantize
+        head positions. None means only identical positions are reused.
+    max_size : int
+        Maximum number of decompositions to keep.
+    entries : OrderedDict | None
+        The storage to use. Can be shared between caches (keys include
+        ``setup_hash``). None (default) creates a new one.
+    """
+
+    def __init__(self, setup_hash, head_pos_tol=None, max_size=32,
+                 entries=None):
+        self.setup_hash = setup_hash
+        self.head_pos_tol = head_pos_tol
+        self.max_size = max_size
+        self._entries = OrderedDict() if entries is None else entries
+
+    def quantize(self, trans, good_mask):
+        """Get the cache key and the (possibly quantized) transform."""
+        if isinstance(trans, Transform):
+            trans = trans['trans']
+        if trans is None:
+            pos_key = None
+        elif self.head_pos_tol is None:
+            pos_key = trans.tobytes()
+        else:
+            trans_tol, rot_tol = self.head_pos_tol
+            quat_tol = np.sin(np.deg2rad(rot_tol) / 2.)
+            t_idx = np.round(trans[:3, 3] / trans_tol).astype(np.int64)
+            q_idx = np.round(rot_to_quat(trans[:3, :3]) /
+                             quat_tol).astype(np.int64)
+            pos_key = tuple(t_idx) + tuple(q_idx)
+            # Use the bin center so that the result does not depend on the
+            # order in which positions are encountered
+            quat = q_idx * quat_tol
+            norm = np.linalg.norm(quat)
+            if norm > 1.:
+                quat /= norm
+            trans = np.eye(4)
+            trans[:3, :3] = quat_to_rot(quat)
+            trans[:3, 3] = t_idx * trans_tol
+        key = (self.setup_hash, self.head_pos_tol, good_mask.tobytes(),
+               pos_key)
+        return key, trans
+
+    def get(self, key):
+        """Get an entry (or None), marking it as most recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        """Add an entry, evicting the least recently used ones."""
+        if self.max_size <= 0:
+            return
+        for arr in entry:
+            if isinstance(arr, np.ndarray):
+                arr.setflags(write=False)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Decompositions shared across calls when MNE_MAXWELL_CACHE_SIZE is set
+_shared_decomp_entries = OrderedDict()
+
+
+def _check_head_pos_tol(head_pos_tol):
+    """Check the head position tolerances."""
+    _validate_type(head_pos_tol, (tuple, list, None), 'head_pos_tol')
+    if head_pos_tol is not None:
+        head_pos_tol = tuple(float(tol) for tol in head_pos_tol)
+        if len(head_pos_tol) != 2 or not all(
+                tol > 0 for tol in head_pos_tol):
+            raise ValueError('head_pos_tol must be None or a tuple of two '
+                             'positive floats (translation in m, rotation in '
+                             'degrees), got %s' % (head_pos_tol,))
+    return head_pos_tol
+
+
+def _get_decomp_cache(exp, all_coils, cal, regularize, ignore_ref,
+                      coil_scale, mag_or_fine, mag_scale, head_pos_tol):
+    """Get the decomposition cache to use for this set of parameters."""
+    cal_hash = None if cal is None else (
+        cal['grad_imbalances'], cal['mag_cals'],
+        [coils[:5] for coils in cal['grad_coilsets']])
+    setup_hash = object_hash(dict(
+        exp=exp, all_coils=all_coils[:5], cal=cal_hash,
+        regularize=regularize, ignore_ref=ignore_ref, coil_scale=coil_scale,
+        mag_or_fine=mag_or_fine, mag_scale=mag_scale,
+        head_pos_tol=head_pos_tol))
+    max_size = int(get_config('MNE_MAXWELL_CACHE_SIZE', '0'))
+    if max_size <= 0:  # only reuse within a single call
+        return _DecompCache(setup_hash, head_pos_tol)
+    # Reuse across calls (e.g., other recordings of the same subject)
+    return _DecompCache(setup_hash, head_pos_tol, max_size,
+                        _shared_decomp_entries)
+
+
 def _get_decomp(trans, all_coils, cal, regularize, exp, ignore_ref,
                 coil_scale, grad_picks, mag_picks, good_mask, mag_or_fine,
-                bad_condition, t, mag_scale):
+                bad_condition, t, mag_scale, cache=None):
     """Get a decomposition matrix and pseudoinverse matrices."""
+    if cache is not None:
+        key, trans = cache.quantize(trans, good_mask)
+        entry = cache.get(key)
+        if entry is not None:
+            logger.debug('        Reusing cached SSS decomposition')
+            out, cond, n_in, n_out = entry[:5], entry[5], entry[6], entry[7]
+            _log_reg_moments(regularize, out[3], out[4], n_in, n_out, t)
+            _check_cond(cond, bad_condition)
+            return out
     #
     # Fine calibration processing (point-like magnetometers and calib. coeffs)
     #
@@ -905,6 +1033,8 @@ def _get_decomp(trans, all_coils, cal, regularize, exp, ignore_ref,
     #
     # Regularization
     #
+    n_in = _get_n_moments(exp['int_order'])
+    n_out = S_decomp.shape[1] - n_in
     S_decomp, reg_moments, n_use_in = _regularize(
         regularize, exp, S_decomp, mag_or_fine, extended_remove, t=t)
     S_decomp_full = S_decomp_full.take(reg_moments, axis=1)
@@ -914,6 +1044,20 @@ def _get_decomp(trans, all_coils, cal, regularize, exp, ignore_ref,
     #
     pS_decomp, sing = _col_norm_pinv(S_decomp.copy())
     cond = sing[0] / sing[-1]
+    _check_cond(cond, bad_condition)
+
+    # Build in our data scaling here
+    pS_decomp *= coil_scale[good_mask].T
+    S_decomp /= coil_scale[good_mask]
+    S_decomp_full /= coil_scale
+    out = (S_decomp, S_decomp_full, pS_decomp, reg_moments, n_use_in)
+    if cache is not None:
+        cache.put(key, out + (cond, n_in, n_out))
+    return out
+
+
+def _check_cond(cond, bad_condition):
+    """Check the condition number of the decomposition."""
     if bad_condition != 'ignore' and cond >= 1000.:
         msg = 'Matrix is badly conditioned: %0.0f >= 1000' % cond
         if bad_condition == 'error':
@@ -923,12 +1067,6 @@ def _get_decomp(trans, all_coils, cal, regularize, exp, ignore_ref,
         else:  # condition == 'info'
             logger.info(msg)
 
-    # Build in our data scaling here
-    pS_decomp *= coil_scale[good_mask].T
-    S_decomp /= coil_scale[good_mask]
-    S_decomp_full /= coil_scale
-    return S_decomp, S_decomp_full, pS_decomp, reg_moments, n_use_in
-
 
 def _get_s_decomp(exp, all_coils, trans, coil_scale, cal, ignore_ref,
                   grad_picks, mag_picks, mag_scale):
@@ -957,7 +1095,6 @@ def _regularize(regularize, exp, S_decomp, mag_or_fine, extended_remove, t,
     int_order, ext_order = exp['int_order'], exp['ext_order']
     n_in = _get_n_moments(int_order)
     n_out = S_decomp.shape[1] - n_in
-    t_str = '%8.3f' % t
     if regularize is not None:  # regularize='in'
         in_removes, out_removes = _regularize_in(
             int_order, ext_order, S_decomp, mag_or_fine, extended_remove)
@@ -969,15 +1106,20 @@ def _regularize(regularize, exp, S_decomp, mag_or_fine, extended_remove, t,
     reg_out_moments = np.setdiff1d(np.arange(n_in, S_decomp.shape[1]),
                                    out_removes)
     n_use_in = len(reg_in_moments)
-    n_use_out = len(reg_out_moments)
     reg_moments = np.concatenate((reg_in_moments, reg_out_moments))
+    _log_reg_moments(regularize, reg_moments, n_use_in, n_in, n_out, t)
     S_decomp = S_decomp.take(reg_moments, axis=1)
+    return S_decomp, reg_moments, n_use_in
+
+
+def _log_reg_moments(regularize, reg_moments, n_use_in, n_in, n_out, t):
+    """Log the number of harmonic components used."""
+    n_use_out = len(reg_moments) - n_use_in
     if regularize is not None or n_use_out != n_out:
-        logger.info('        Using %s/%s harmonic components for %s  '
+        logger.info('        Using %s/%s harmonic components for %8.3f  '
                     '(%s/%s in, %s/%s out)'
-                    % (n_use_in + n_use_out, n_in + n_out, t_str,
+                    % (n_use_in + n_use_out, n_in + n_out, t,
                        n_use_in, n_in, n_use_out, n_out))
-    return S_decomp, reg_moments, n_use_in
 
 
 @verbose
@@ -1207,7 +1349,7 @@ def _sss_basis_basic(exp, coils, mag_scale=100., method='standard'):
     return S_tot
 
 
-def _sss_basis(exp, all_coils):
+def _sss_basis(exp, all_coils, dtype=np.float64):
     """Compute SSS basis for given conditions.
 
     Parameters
@@ -1227,6 +1369,9 @@ def _sss_basis(exp, all_coils):
         position, normals, weights, number of integration points and channel
         type. All coil geometry must be in the same coordinate frame
         as ``origin`` (``head`` or ``meg``).
+    dtype : dtype
+        The output dtype. Computations are always done in double precision,
+        but ``np.float32`` can be used to halve the output size.
 
     Returns
     -------
@@ -1260,142 +1405,119 @@ def _sss_basis(exp, all_coils):
     cos_az[z_only] = 1.
     sin_az = rmags[:, 1] / r_xy  # sin(phi)
     sin_az[z_only] = 0.
-    # Appropriate vector spherical harmonics terms
-    #  JNE 2012-02-08: modified alm -> 2*alm, blm -> -2*blm
-    r_nn2 = r_n.copy()
-    r_nn1 = 1.0 / (r_n * r_n)
-    S_tot = np.empty((n_coils, n_in + n_out), np.float64)
-    S_in = S_tot[:, :n_in]
-    S_out = S_tot[:, n_in:]
-    for degree in range(max_order + 1):
-        if degree <= ext_order:
-            r_nn1 *= r_n  # r^(l-1)
-        if degree <= int_order:
-            r_nn2 *= r_n  # r^(l+2)
-
-        # mu_0*sqrt((2l+1)/4pi (l-m)!/(l+m)!)
-        mult = 2e-7 * np.sqrt((2 * degree + 1) * np.pi)
-
-        if degree > 0:
-            idx = _deg_ord_idx(degree, 0)
-            # alpha
-            if degree <= int_order:
-                b_r = mult * (degree + 1) * L[degree][0] / r_nn2
-                b_pol = -mult * L[degree][1] / r_nn2
-                S_in[:, idx] = _integrate_points(
-                    cos_az, sin_az, cos_pol, sin_pol, b_r, 0., b_pol,
-                    cosmags, bins, n_coils)
-            # beta
-            if degree <= ext_order:
-                b_r = -mult * degree * L[degree][0] * r_nn1
-                b_pol = -mult * L[degree][1] * r_nn1
-                S_out[:, idx] = _integrate_points(
-                    cos_az, sin_az, cos_pol, sin_pol, b_r, 0., b_pol,
-                    cosmags, bins, n_coils)
-        for order in range(1, degree + 1):
-            ord_phi = order * phi
-            sin_order = np.sin(ord_phi)
-            cos_order = np.cos(ord_phi)
-            mult /= np.sqrt((degree - order + 1) * (degree + order))
-            factor = mult * np.sqrt(2)  # equivalence fix (MF uses 2.)
-
-            # Real
-            idx = _deg_ord_idx(degree, order)
-            r_fact = factor * L[degree][order] * cos_order
-            az_fact = factor * order * sin_order * L[degree][order]
-            pol_fact = -factor * (L[degree][order + 1] -
-                                  (degree + order) * (degree - order + 1) *
-                                  L[degree][order - 1]) * cos_order
-            # alpha
-            if degree <= int_order:
-                b_r = (degree + 1) * r_fact / r_nn2
-                b_az = az_fact / (sin_pol_nz * r_nn2)
-                b_az[z_only] = 0.
-                b_pol = pol_fact / (2 * r_nn2)
-                S_in[:, idx] = _integrate_points(
-                    cos_az, sin_az, cos_pol, sin_pol, b_r, b_az, b_pol,
-                    cosmags, bins, n_coils)
-            # beta
-            if degree <= ext_order:
-                b_r = -degree * r_fact * r_nn1
-                b_az = az_fact * r_nn1 / sin_pol_nz
-                b_az[z_only] = 0.
-                b_pol = pol_fact * r_nn1 / 2.
-                S_out[:, idx] = _integrate_points(
-                    cos_az, sin_az, cos_pol, sin_pol, b_r, b_az, b_pol,
-                    cosmags, bins, n_coils)
-
-            # Imaginary
-            idx = _deg_ord_idx(degree, -order)
-            r_fact = factor * L[degree][order] * sin_order
-            az_fact = factor * order * cos_order * L[degree][order]
-            pol_fact = factor * (L[degree][order + 1] -
-                                 (degree + order) * (degree - order + 1) *
-                                 L[degree][order - 1]) * sin_order
-            # alpha
-            if degree <= int_order:
-                b_r = -(degree + 1) * r_fact / r_nn2
-                b_az = az_fact / (sin_pol_nz * r_nn2)
-                b_az[z_only] = 0.
-                b_pol = pol_fact / (2 * r_nn2)
-                S_in[:, idx] = _integrate_points(
-                    cos_az, sin_az, cos_pol, sin_pol, b_r, b_az, b_pol,
-                    cosmags, bins, n_coils)
-            # beta
-            if degree <= ext_order:
-                b_r = degree * r_fact * r_nn1
-                b_az = az_fact * r_nn1 / sin_pol_nz
-                b_az[z_only] = 0.
-                b_pol = pol_fact * r_nn1 / 2.
-                S_out[:, idx] = _integrate_points(
-                    cos_az, sin_az, cos_pol, sin_pol, b_r, b_az, b_pol,
-                    cosmags, bins, n_coils)
+    # Project the unit vectors of the spherical coordinate system onto the
+    # (weighted) integration point normals, so that the dot product of the
+    # field with the normals becomes a weighted sum of b_r, b_az, and b_pol
+    p_r = (cosmags[:, 0] * sin_pol * cos_az +
+           cosmags[:, 1] * sin_pol * sin_az + cosmags[:, 2] * cos_pol)
+    p_pol = (cosmags[:, 0] * cos_pol * cos_az +
+             cosmags[:, 1] * cos_pol * sin_az - cosmags[:, 2] * sin_pol)
+    p_az = (cosmags[:, 1] * cos_az - cosmags[:, 0] * sin_az) / sin_pol_nz
+    p_az[z_only] = 0.
+    # cos(m * phi) for m >= 0 followed by sin(m * phi) for m >= 0
+    ord_phi = np.arange(max_order + 1)[:, np.newaxis] * phi
+    trig = np.concatenate([np.cos(ord_phi), np.sin(ord_phi)])
+    del ord_phi
+    # Radial dependence for each degree: r ** -(l + 2) and r ** (l - 1)
+    radial_in = r_n ** -(np.arange(int_order + 1)[:, np.newaxis] + 2.)
+    radial_out = r_n ** (np.arange(ext_order + 1)[:, np.newaxis] - 1.)
+
+    # Per-moment constants. Real (m >= 0) moments use cos(m * phi) in
+    # the radial and polar terms and sin(m * phi) in the azimuthal term,
+    # imaginary (m < 0) moments the other way around.
+    degrees, orders = _get_degrees_orders(max_order)
+    abs_orders = np.abs(orders)
+    has_m = abs_orders > 0
+    is_imag = orders < 0
+    trig_r_idx = abs_orders + is_imag * (max_order + 1)
+    trig_az_idx = abs_orders + ~is_imag * (max_order + 1)
+    # mu_0*sqrt((2l+1)/4pi (l-m)!/(l+m)!) (times sqrt(2) for m != 0,
+    # which is the MF equivalence fix; MF uses 2.)
+    factor = np.array([
+        2e-7 * np.sqrt((2 * degree + 1) * np.pi *
+                       factorial(degree - order) / factorial(degree + order))
+        for degree, order in zip(degrees, abs_orders)])
+    factor[has_m] *= np.sqrt(2)
+    sign = np.where(is_imag, -1., 1.)
+    pol_mult = (-factor * sign * np.where(has_m, 0.5, 1.))[:, np.newaxis]
+    az_mult = (factor * abs_orders)[:, np.newaxis]
+    pol_lower = ((degrees + abs_orders) *
+                 (degrees - abs_orders + 1))[has_m, np.newaxis]
+    expansions = list()
+    for this_order, radial, r_mult in (
+            (int_order, radial_in, degrees + 1.),  # alpha (internal)
+            (ext_order, radial_out, -degrees)):  # beta (external)
+        n_use = _get_n_moments(this_order)
+        expansions.append((
+            n_use, radial, degrees[:n_use],
+            (factor * sign * r_mult)[:n_use, np.newaxis],
+            pol_mult[:n_use], az_mult[:n_use]))
+
+    # Process blocks of whole coils at once, keeping the temporary
+    # (n_moments, n_points) arrays small enough to stay in cache (the points
+    # of each coil are contiguous, see _prep_mf_coils)
+    S_tot = np.empty((n_coils, n_in + n_out), dtype)
+    coil_starts = np.searchsorted(bins, np.arange(n_coils + 1))
+    block_coils = max(int(512 * n_coils // max(len(bins), 1)), 1)
+    for c_start in range(0, n_coils, block_coils):
+        c_stop = min(c_start + block_coils, n_coils)
+        sl = slice(coil_starts[c_start], coil_starts[c_stop])
+        starts = coil_starts[c_start:c_stop] - coil_starts[c_start]
+        L_m = L[degrees, abs_orders, sl]
+        L_pol = L[degrees, abs_orders + 1, sl]
+        L_pol[has_m] -= pol_lower * L[degrees[has_m], abs_orders[has_m] - 1,
+                                      sl]
+        trig_r = trig[trig_r_idx, sl]
+        G_r = L_m * trig_r
+        G_r *= p_r[sl]
+        G_pol = L_pol * trig_r
+        G_pol *= p_pol[sl]
+        G_az = L_m * trig[trig_az_idx, sl]
+        G_az *= p_az[sl]
+        del L_m, L_pol, trig_r
+        col = 0
+        for n_use, radial, use_degrees, r_mult, pol_mult, az_mult in \
+                expansions:
+            vals = r_mult * G_r[:n_use]
+            vals += pol_mult * G_pol[:n_use]
+            vals += az_mult * G_az[:n_use]
+            vals *= radial[use_degrees, sl]
+            S_tot[c_start:c_stop, col:col + n_use] = \
+                np.add.reduceat(vals, starts, axis=1).T
+            col += n_use
     return S_tot
 
 
-def _integrate_points(cos_az, sin_az, cos_pol, sin_pol, b_r, b_az, b_pol,
-                      cosmags, bins, n_coils):
-    """Integrate points in spherical coords."""
-    grads = _sp_to_cart(cos_az, sin_az, cos_pol, sin_pol, b_r, b_az, b_pol).T
-    grads = (grads * cosmags).sum(axis=1)
-    return bincount(bins, grads, n_coils)
-
-
 def _tabular_legendre(r, nind):
-    """Compute associated Legendre polynomials."""
+    """Compute associated Legendre polynomials.
+
+    Returns an array of shape (nind + 1, nind + 2, n_points) with the
+    (unnormalized) associated Legendre polynomial of each degree and order
+    (zero for order > degree).
+    """
     r_n = np.sqrt(np.sum(r * r, axis=1))
     x = r[:, 2] / r_n  # cos(theta)
-    L = list()
-    for degree in range(nind + 1):
-        L.append(np.zeros((degree + 2, len(r))))
-    L[0][0] = 1.
+    L = np.zeros((nind + 1, nind + 2, len(r)))
+    L[0, 0] = 1.
     pnn = np.ones(x.shape)
     fact = 1.
     sx2 = np.sqrt((1. - x) * (1. + x))
     for degree in range(nind + 1):
-        L[degree][degree] = pnn
+        L[degree, degree] = pnn
         pnn *= (-fact * sx2)
         fact += 2.
         if degree < nind:
-            L[degree + 1][degree] = x * (2 * degree + 1) * L[degree][degree]
+            L[degree + 1, degree] = x * (2 * degree + 1) * L[degree, degree]
         if degree >= 2:
-            for order in range(degree - 1):
-                L[degree][order] = (x * (2 * degree - 1) *
-                                    L[degree - 1][order] -
-                                    (degree + order - 1) *
-                                    L[degree - 2][order]) / (degree - order)
+            # upward recurrence in degree, all orders at once
+            order = np.arange(degree - 1)[:, np.newaxis]
+            L[degree, :degree - 1] = (
+                x * (2 * degree - 1) * L[degree - 1, :degree - 1] -
+                (degree + order - 1) * L[degree - 2, :degree - 1]) / \
+                (degree - order)
     return L
 
 
-def _sp_to_cart(cos_az, sin_az, cos_pol, sin_pol, b_r, b_az, b_pol):
-    """Convert spherical coords to cartesian."""
-    out = np.empty((3,) + sin_pol.shape)
-    out[0] = sin_pol * cos_az * b_r + cos_pol * cos_az * b_pol - sin_az * b_az
-    out[1] = sin_pol * sin_az * b_r + cos_pol * sin_az * b_pol + cos_az * b_az
-    out[2] = cos_pol * b_r - sin_pol * b_pol
-    return out
-
-
 def _get_degrees_orders(order):
     """Get the set of degrees used in our basis functions."""
     degrees = np.zeros(_get_n_moments(order), int)
@@ -1934,6 +2056,131 @@ def _trans_sss_basis(exp, all_coils, trans=None, coil_scale=100.):
     return S_tot
 
 
+def _find_bads_batch(raw, params, batch, limit, noisy_chs, scores_noisy,
+                     thresh_noisy):
+    """Find noisy channels in a batch of segments with the same good chs."""
+    meg_picks = params['meg_picks']
+    static = params['head_pos'][0] is None
+    # Excluding a channel is a rank-one downdate of the least-squares fit
+    # as long as the regularized moments stay the same, but cross-talk and
+    # eSSS mix all channels, so we recompute the fit in those cases
+    can_downdate = (static and params['ctc'] is None and
+                    len(params['update_kwargs']['extended_proj']) == 0)
+    # The first pass uses the same channels for all segments (if there is
+    # more than one segment, there is no movement compensation), so compute
+    # all of the residuals with a single reconstruction
+    if len(batch) > 1:
+        data = np.concatenate([seg['orig_data'][meg_picks]
+                               for seg in batch], axis=1)
+        resid, batch_decomp = _static_sss_resid(
+            params, data, batch[0]['good_mask'])
+        splits = np.cumsum([seg['orig_data'].shape[1] for seg in batch])[:-1]
+        resids = np.split(resid, splits, axis=1)
+        del data, resid
+    else:
+        resids, batch_decomp = [None], None
+    for seg, resid in zip(batch, resids):
+        decomp = batch_decomp
+        si, these_picks = seg['si'], list(seg['these_picks'])
+        chunk_noisy = list()
+        for _ in range(100):  # iteratively exclude the worst ones
+            assert set(raw.info['bads']) & set(chunk_noisy) == set()
+            good_mask = np.in1d(meg_picks, these_picks)
+            if resid is None:
+                if static:
+                    resid, decomp = _static_sss_resid(
+                        params, seg['orig_data'][meg_picks], good_mask)
+                else:
+                    resid = _get_sss_resid(raw, params, seg, good_mask)
+            # p2p
+            range_ = np.ptp(resid, axis=-1)
+            cs_picks = np.searchsorted(meg_picks, these_picks)
+            range_ *= params['coil_scale'][cs_picks, 0]
+            mean, std = np.mean(range_), np.std(range_)
+            # z score
+            z = (range_ - mean) / std
+            idx = np.argmax(z)
+            max_ = z[idx]
+
+            # We may want to return this later if `return_scores=True`.
+            scores_noisy[these_picks, si] = z
+            thresh_noisy[these_picks] = limit
+
+            if max_ < limit:
+                break
+
+            name = raw.ch_names[these_picks[idx]]
+            logger.debug('            Bad:       %s %0.1f'
+                         % (name, max_))
+            these_picks.pop(idx)
+            chunk_noisy.append(name)
+            if can_downdate:
+                resid, decomp = _downdate_sss_resid(
+                    params, resid, decomp, idx,
+                    np.in1d(meg_picks, these_picks))
+            else:
+                resid = None
+        noisy_chs.update(chunk_noisy)
+
+
+def _downdate_sss_resid(params, resid, decomp, idx, good_mask):
+    """Update the residual after excluding one channel from the fit."""
+    params['good_mask'][:] = good_mask
+    with use_log_level(False):
+        new_decomp = params['_get_this_decomp_trans'](
+            params['info']['dev_head_t'], t=0.)
+    if not np.array_equal(new_decomp[3], decomp[3]):
+        return None, None  # regularization changed, need to recompute
+    # Leave-one-out update of a least-squares fit: the residual of the other
+    # channels changes by the column of the hat matrix for the excluded one
+    S_good, pS_decomp = decomp[0], decomp[2]
+    hat_col = np.dot(S_good, pS_decomp[:, idx])
+    resid_idx = resid[idx]
+    resid = np.delete(resid, idx, axis=0)
+    hat_col = np.delete(hat_col, idx) / (1. - hat_col[idx])
+    resid += hat_col[:, np.newaxis] * resid_idx
+    return resid, new_decomp
+
+
+def _get_sss_resid(raw, params, seg, good_mask):
+    """Get the residual of the SSS reconstruction of the good channels."""
+    orig_data = seg['orig_data']
+    params['good_mask'][:] = good_mask
+    chunk_raw = RawArray(
+        orig_data, params['info'], first_samp=raw.first_samp + seg['start'],
+        copy='data', verbose=False)
+    params['st_duration'] = int(round(
+        chunk_raw.times[-1] * raw.info['sfreq']))
+    with use_log_level(False):
+        _run_maxwell_filter(
+            chunk_raw, reconstruct='orig', copy=False, **params)
+    these_picks = params['meg_picks'][good_mask]
+    return orig_data[these_picks] - chunk_raw._data[these_picks]
+
+
+def _static_sss_resid(params, data, good_mask):
+    """Get the SSS reconstruction residual without movement compensation.
+
+    This is equivalent to ``_run_maxwell_filter(..., reconstruct='orig')``
+    when there is a single head position.
+    """
+    # the decomposition function uses params['good_mask'] inplace
+    params['good_mask'][:] = good_mask
+    with use_log_level(False):
+        decomp = params['_get_this_decomp_trans'](
+            params['info']['dev_head_t'], t=0.)
+    S_decomp, S_decomp_full, pS_decomp = decomp[:3]
+    good_data = data[good_mask]
+    ctc = params['ctc']
+    if ctc is not None:
+        ctc = ctc[good_mask][:, good_mask]
+        mm = np.dot(pS_decomp, ctc.dot(good_data))
+    else:
+        mm = np.dot(pS_decomp, good_data)
+    good_data -= np.dot(S_decomp_full[good_mask], mm)
+    return good_data, decomp
+
+
 # intentionally omitted: st_duration, st_correlation, destination, st_fixed,
 # st_only
 @verbose
@@ -1943,7 +2190,7 @@ def find_bad_channels_maxwell(
         cross_talk=None, coord_frame='head', regularize='in', ignore_ref=False,
         bad_condition='error', head_pos=None, mag_scale=100.,
         skip_by_annotation=('edge', 'bad_acq_skip'), h_freq=40.0,
-        extended_proj=(), verbose=None):
+        extended_proj=(), head_pos_tol=None, verbose=None):
     r"""Find bad channels using Maxwell filtering.
 
     Parameters
@@ -1988,6 +2235,7 @@ def find_bad_channels_maxwell(
         should provide similar results to MaxFilter. If you do not wish to
         apply a filter, set this to ``None``.
     %(maxwell_extended)s
+    %(maxwell_pos_tol)s
     %(verbose)s
 
     Returns
@@ -2114,9 +2362,11 @@ def find_bad_channels_maxwell(
         calibration=calibration, cross_talk=cross_talk,
         coord_frame=coord_frame, regularize=regularize,
         ignore_ref=ignore_ref, bad_condition=bad_condition, head_pos=head_pos,
-        mag_scale=mag_scale, extended_proj=extended_proj)
+        mag_scale=mag_scale, extended_proj=extended_proj,
+        head_pos_tol=head_pos_tol)
     del origin, int_order, ext_order, calibration, cross_talk, coord_frame
     del regularize, ignore_ref, bad_condition, head_pos, mag_scale
+    del head_pos_tol
     good_meg_picks = params['meg_picks'][params['good_mask']]
     assert len(params['meg_picks']) == len(params['coil_scale'])
     assert len(params['good_mask']) == len(params['meg_picks'])
@@ -2147,21 +2397,24 @@ def find_bad_channels_maxwell(
     thresh_flat = np.full((len(ch_names), 1), np.nan)
     thresh_noisy = np.full_like(thresh_flat, fill_value=np.nan)
 
+    # Without movement compensation, the SSS reconstruction only depends on
+    # the set of good channels, so consecutive segments with the same good
+    # channels are reconstructed together (and decompositions are reused
+    # from the cache, see _get_decomp)
+    static = params['head_pos'][0] is None
+    batch = list()
+    batch_samples = 0
+    max_batch_samples = max(int(round(60 * raw.info['sfreq'])), step)
     for si, (start, stop) in enumerate(zip(starts, stops)):
-        n_iter = 0
         orig_data = raw.get_data(None, start, stop, verbose=False)
-        chunk_raw = RawArray(
-            orig_data, params['info'],
-            first_samp=raw.first_samp + start, copy='data', verbose=False)
-
-        t = chunk_raw.times[[0, -1]] + start / raw.info['sfreq']
+        t = raw.times[[start, stop - 1]]
         logger.info('        Interval %3d: %8.3f - %8.3f'
                     % ((si + 1,) + tuple(t[[0, -1]])))
 
         # Flat pass: SD < 0.01 fT/cm or 0.01 fT for at 30 ms (or 20 samples)
         n = stop - start
         flat_stop = n - (n % flat_step)
-        data = chunk_raw.get_data(good_meg_picks, 0, flat_stop)
+        data = orig_data[good_meg_picks, :flat_stop]
         data.shape = (data.shape[0], -1, flat_step)
         delta = np.std(data, axis=-1).min(-1)  # min std across segments
 
@@ -2177,51 +2430,30 @@ def find_bad_channels_maxwell(
         flat_chs.update(chunk_flats)
         all_flats |= set(chunk_flats)
         chunk_flats = sorted(all_flats)
+        if len(chunk_flats):
+            logger.info('            Flat (%2d): %s'
+                        % (len(chunk_flats), ' '.join(chunk_flats)))
         these_picks = [pick for pick in good_meg_picks
                        if raw.ch_names[pick] not in chunk_flats]
-        # Bad pass
-        chunk_noisy = list()
-        params['st_duration'] = int(round(
-            chunk_raw.times[-1] * raw.info['sfreq']))
-        for n_iter in range(1, 101):  # iteratively exclude the worst ones
-            assert set(raw.info['bads']) & set(chunk_noisy) == set()
-            params['good_mask'][:] = [
-                chunk_raw.ch_names[pick] not in
-                raw.info['bads'] + chunk_noisy + chunk_flats
-                for pick in params['meg_picks']]
-            chunk_raw._data[:] = orig_data
-            delta = chunk_raw.get_data(these_picks)
-            with use_log_level(False):
-                _run_maxwell_filter(
-                    chunk_raw, reconstruct='orig', copy=False, **params)
-
-            if n_iter == 1 and len(chunk_flats):
-                logger.info('            Flat (%2d): %s'
-                            % (len(chunk_flats), ' '.join(chunk_flats)))
-            delta -= chunk_raw.get_data(these_picks)
-            # p2p
-            range_ = np.ptp(delta, axis=-1)
-            cs_picks = np.searchsorted(params['meg_picks'], these_picks)
-            range_ *= params['coil_scale'][cs_picks, 0]
-            mean, std = np.mean(range_), np.std(range_)
-            # z score
-            z = (range_ - mean) / std
-            idx = np.argmax(z)
-            max_ = z[idx]
-
-            # We may want to return this later if `return_scores=True`.
-            scores_noisy[these_picks, si] = z
-            thresh_noisy[these_picks] = limit
-
-            if max_ < limit:
-                break
-
-            name = raw.ch_names[these_picks[idx]]
-            logger.debug('            Bad:       %s %0.1f'
-                         % (name, max_))
-            these_picks.pop(idx)
-            chunk_noisy.append(name)
-        noisy_chs.update(chunk_noisy)
+        seg = dict(si=si, start=start, orig_data=orig_data,
+                   these_picks=these_picks,
+                   good_mask=np.in1d(params['meg_picks'], these_picks))
+        if static:
+            if len(batch) and (
+                    batch_samples + n > max_batch_samples or
+                    not np.array_equal(seg['good_mask'],
+                                       batch[0]['good_mask'])):
+                _find_bads_batch(raw, params, batch, limit, noisy_chs,
+                                 scores_noisy, thresh_noisy)
+                batch, batch_samples = list(), 0
+            batch.append(seg)
+            batch_samples += n
+        else:
+            _find_bads_batch(raw, params, [seg], limit, noisy_chs,
+                             scores_noisy, thresh_noisy)
+    if len(batch):
+        _find_bads_batch(raw, params, batch, limit, noisy_chs, scores_noisy,
+                         thresh_noisy)
     noisy_chs = sorted((b for b, c in noisy_chs.items() if c >= min_count),
                        key=lambda x: raw.ch_names.index(x))
     flat_chs = sorted((f for f, c in flat_chs.items() if c >= min_count),
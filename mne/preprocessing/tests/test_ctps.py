@@ -3,11 +3,12 @@
 # License: BSD 3 clause
 
 import numpy as np
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_allclose
 import pytest
+from scipy.signal import hilbert
 
 from mne.time_frequency import morlet
-from mne.preprocessing.ctps_ import (ctps, _prob_kuiper,
+from mne.preprocessing.ctps_ import (ctps, kuiper, _prob_kuiper,
                                      _compute_normalized_phase)
 
 ###############################################################################
@@ -82,3 +83,23 @@ def test_ctps():
     assert_array_equal(_prob_kuiper(np.array([1.0, 1.0]), 400),
                        _prob_kuiper(np.array([1.0, 1.0]), 400))
     assert (_prob_kuiper(0.1, 400) < 0.1)
+
+
+@pytest.mark.parametrize('n_times', (600, 601))
+def test_ctps_vectorized(n_times):
+    """Test that ctps matches the per-source computations."""
+    data = get_data(40, 5)[..., :n_times]
+    phase = _compute_normalized_phase(data)
+    # circular distance to the phase of scipy's analytic signal, where the
+    # phase is well defined
+    analytic = hilbert(data)
+    phase_hilbert = (np.angle(analytic) + np.pi) / (2 * np.pi)
+    mask = np.abs(analytic) > 1e-6 * np.abs(analytic).max()
+    diff = np.abs(phase - phase_hilbert)[mask]
+    assert_allclose(np.minimum(diff, 1 - diff), 0., atol=1e-10)
+    ks_dyn, pk_dyn, _ = ctps(phase, is_raw=False)
+    for ii in range(data.shape[1]):
+        ks, pk = kuiper(phase[:, ii])
+        assert_allclose(ks_dyn[ii], ks, rtol=1e-12)
+        assert_allclose(pk_dyn[ii], pk, rtol=1e-12)
+        assert_allclose(pk, _prob_kuiper(ks, 40), rtol=1e-12)
@@ -16,7 +16,8 @@ from scipy import stats, linalg
 import matplotlib.pyplot as plt
 
 from mne import (Epochs, read_events, pick_types, create_info, EpochsArray,
-                 EvokedArray, Annotations, pick_channels_regexp)
+                 EvokedArray, Annotations, pick_channels_regexp,
+                 make_ad_hoc_cov)
 from mne.cov import read_cov
 from mne.preprocessing import (ICA, ica_find_ecg_events, ica_find_eog_events,
                                read_ica)
@@ -31,6 +32,7 @@ from mne.utils import (catch_logging, _TempDir, requires_sklearn,
                        run_tests_if_main)
 from mne.datasets import testing
 from mne.event import make_fixed_length_events
+from mne.filter import filter_data
 
 data_dir = op.join(op.dirname(__file__), '..', '..', 'io', 'tests', 'data')
 raw_fname = op.join(data_dir, 'test_raw.fif')
@@ -149,6 +151,160 @@ def test_ica_simple(method):
     assert amari_distance < 0.1
 
 
+@pytest.mark.parametrize("extended", (False, True))
+def test_ica_chunked(extended, tmpdir):
+    """Test fitting ICA one chunk at a time."""
+    rng = np.random.RandomState(0)
+    n_channels, sfreq = 5, 100.
+    n_samples = int(60 * sfreq)
+    S = rng.laplace(size=(n_channels, n_samples))
+    if extended:
+        S[0] = rng.uniform(-1, 1, n_samples)  # a sub-Gaussian source
+    A = rng.randn(n_channels, n_channels)
+    data = 1e-6 * (np.dot(A, S) + 10.)
+    data[:, 1000:1010] += 1e-3  # an artifact to reject
+    info = create_info(n_channels, sfreq, 'eeg')
+    fname = op.join(str(tmpdir), 'test_raw.fif')
+    RawArray(data, info).save(fname)
+    raw = read_raw_fif(fname)
+    kwargs = dict(reject=dict(eeg=1e-4), decim=2, tstep=1.)
+    fit_params = dict(extended=extended)
+    ica = ICA(method='infomax', random_state=0, fit_params=fit_params)
+    ica.fit(raw, **kwargs)
+    ica_chunk = ICA(method='infomax', random_state=0, fit_params=fit_params)
+    ica_chunk.fit(raw, chunk_duration=7., **kwargs)
+    assert not raw.preload
+    _assert_ica_attributes(ica_chunk)
+    # the PCA should be the same
+    assert ica_chunk.n_samples_ == ica.n_samples_ < n_samples // 2
+    assert ica_chunk.drop_inds_ == ica.drop_inds_ == [(500, 550)]
+    assert_allclose(ica_chunk.pre_whitener_, ica.pre_whitener_, rtol=1e-7)
+    for key in ('pca_mean_', 'pca_explained_variance_'):
+        assert_allclose(getattr(ica_chunk, key), getattr(ica, key),
+                        rtol=1e-7, err_msg=key)
+    assert_allclose(np.abs(ica_chunk.pca_components_),
+                    np.abs(ica.pca_components_), atol=1e-7)
+    # and ICA should recover the sources
+    for this_ica in (ica, ica_chunk):
+        transform = np.dot(np.dot(this_ica.unmixing_matrix_,
+                                  this_ica.pca_components_) /
+                           this_ica.pre_whitener_.T, A)
+        amari_distance = np.mean(np.sum(np.abs(transform), axis=1) /
+                                 np.max(np.abs(transform), axis=1) - 1.)
+        assert amari_distance < 0.1
+    # Epochs
+    epochs = Epochs(raw, make_fixed_length_events(raw, duration=1.),
+                    tmin=0, tmax=1. - 1. / sfreq, baseline=None,
+                    reject=dict(eeg=1e-4), preload=False)
+    ica.fit(epochs)
+    ica_chunk.fit(epochs, chunk_duration=5.)
+    assert not epochs.preload
+    assert ica_chunk.n_samples_ == ica.n_samples_ == 59 * 100
+    assert_allclose(ica_chunk.pca_explained_variance_,
+                    ica.pca_explained_variance_, rtol=1e-7)
+    # bad segments that shift the decimation, chunks shorter than the
+    # blocks and chunks that are entirely rejected
+    raw.set_annotations(Annotations([3.03, 20.005], [0.13, 0.071], 'bad'))
+    kwargs['decim'] = 3
+    ica.fit(raw, **kwargs)
+    ica_chunk.fit(raw, chunk_duration=0.5, **kwargs)
+    assert ica_chunk.n_samples_ == ica.n_samples_
+    assert ica_chunk.drop_inds_ == ica.drop_inds_ == [(306, 340)]
+    assert_allclose(ica_chunk.pca_explained_variance_,
+                    ica.pca_explained_variance_, rtol=1e-7)
+    with pytest.raises(ValueError, match='only supported for method'):
+        ICA(method='fastica').fit(raw, chunk_duration=7.)
+    with pytest.raises(ValueError, match='must be positive'):
+        ica.fit(raw, chunk_duration=0.)
+
+
+@requires_sklearn
+@pytest.mark.parametrize('noise_cov', (False, True))
+def test_ica_apply_streaming(noise_cov, tmpdir):
+    """Test cleaning and getting sources of non-preloaded raw data."""
+    rng = np.random.RandomState(0)
+    n_channels, sfreq = 6, 100.
+    n_samples = int(30 * sfreq)
+    data = 1e-12 * (np.dot(rng.randn(n_channels, n_channels),
+                           rng.laplace(size=(n_channels, n_samples))) + 10.)
+    data = np.concatenate([data, rng.randn(1, n_samples)])
+    info = create_info(n_channels + 1, sfreq, ['mag'] * n_channels + ['misc'])
+    info['bads'] = [info['ch_names'][0]]
+    fname = op.join(str(tmpdir), 'test_raw.fif')
+    RawArray(data, info).save(fname)
+    raw = read_raw_fif(fname)
+    raw_preload = read_raw_fif(fname, preload=True)
+    noise_cov = make_ad_hoc_cov(info) if noise_cov else None
+    ica = ICA(n_components=3, max_pca_components=4, noise_cov=noise_cov,
+              method='fastica', random_state=0)
+    ica.fit(raw_preload)
+    # the precomposed operators match the step-by-step transforms
+    whitened, _ = ica._pre_whiten(raw_preload.get_data(ica.ch_names),
+                                  info, None)
+    sources = ica.get_sources(raw_preload).get_data()
+    assert_allclose(sources, ica._transform(whitened), atol=1e-10)
+    # sources in chunks
+    chunks = list(ica.iter_sources(raw, start=10, stop=2010,
+                                   chunk_duration=3.33))
+    assert len(chunks) == 7
+    assert_allclose(np.concatenate([c[0] for c in chunks], axis=1),
+                    sources[:, 10:2010], atol=1e-10)
+    assert_allclose(np.concatenate([c[1] for c in chunks]),
+                    raw.times[10:2010])
+    # cleaning without preloading
+    for kwargs in (dict(exclude=[0]), dict(include=[1, 2]),
+                   dict(exclude=[0], n_pca_components=3)):
+        clean_fname = op.join(str(tmpdir), 'clean_raw.fif')
+        ica.apply_and_save(raw, clean_fname, buffer_size_sec=2.5,
+                           overwrite=True, **kwargs)
+        assert not raw.preload
+        raw_clean = read_raw_fif(clean_fname, preload=True)
+        raw_apply = ica.apply(raw_preload.copy(), **kwargs)
+        assert_allclose(raw_clean.get_data(), raw_apply.get_data(),
+                        rtol=1e-6, atol=1e-18)
+        assert_array_equal(raw_clean.get_data(['0', '6']),
+                           raw_preload.get_data(['0', '6']))
+    with pytest.raises(TypeError, match='must be an instance of Raw'):
+        ica.apply_and_save(raw_apply.get_data(), clean_fname)
+    with pytest.raises(ValueError, match='must be positive'):
+        next(ica.iter_sources(raw, chunk_duration=0.))
+
+
+@requires_sklearn
+def test_ica_scoring_batched():
+    """Test scoring sources against several targets at once."""
+    rng = np.random.RandomState(0)
+    n_channels, sfreq = 6, 100.
+    n_samples = int(60 * sfreq)
+    sources = rng.laplace(size=(n_channels, n_samples))
+    data = 1e-6 * np.dot(rng.randn(n_channels, n_channels), sources)
+    eog = 1e-6 * (sources[[1, 3]] + 0.1 * rng.randn(2, n_samples))
+    info = create_info(n_channels + 2, sfreq, ['eeg'] * n_channels +
+                       ['eog'] * 2)
+    raw = RawArray(np.concatenate([data, eog]), info)
+    ica = ICA(n_components=n_channels, method='fastica', random_state=0)
+    ica.fit(raw, picks='eeg')
+    idx, scores = ica.find_bads_eog(raw, threshold=2., l_freq=1,
+                                    h_freq=10)
+    assert len(scores) == 2
+    sources = ica.get_sources(raw).get_data()
+    kw = dict(phase='zero-double', filter_length='10s', fir_window='hann',
+              l_trans_bandwidth=0.5, h_trans_bandwidth=0.5,
+              fir_design='firwin2')
+    sources = filter_data(sources, sfreq, 1, 10, **kw)
+    for ii in range(2):
+        target = filter_data(eog[ii], sfreq, 1, 10, **kw)
+        want = [stats.pearsonr(source, target)[0] for source in sources]
+        assert_allclose(scores[ii], want, rtol=1e-10)
+        assert_allclose(ica.score_sources(raw, target=str(n_channels + ii),
+                                          l_freq=1, h_freq=10), want,
+                        rtol=1e-10)
+    # each EOG channel picks the matching component
+    assert len(idx) == 2
+    assert set(idx) == {np.argmax(np.abs(scores[0])),
+                        np.argmax(np.abs(scores[1]))}
+
+
 @requires_sklearn
 @pytest.mark.parametrize("method", ["infomax", "fastica", "picard"])
 def test_ica_n_iter_(method):
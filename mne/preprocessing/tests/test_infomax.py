@@ -7,12 +7,13 @@
 import pytest
 
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import (assert_almost_equal, assert_allclose,
+                           assert_array_equal)
 
 from scipy import stats
 from scipy import linalg
 
-from mne.preprocessing.infomax_ import infomax
+from mne.preprocessing.infomax_ import infomax, _infomax
 from mne.utils import requires_sklearn, run_tests_if_main, check_version
 
 
@@ -131,6 +132,33 @@ def test_infomax_weights_ini():
     assert_almost_equal(w2, weights)
 
 
+@requires_sklearn
+@pytest.mark.parametrize('extended', (True, False))
+def test_infomax_dtype_warm_start(extended):
+    """Test infomax in single precision and warm started."""
+    rng = np.random.RandomState(0)
+    n_samples = 2000
+    s = np.c_[rng.laplace(size=n_samples),
+              np.sign(np.sin(np.linspace(0, 200, n_samples)))].T
+    center_and_norm(s)
+    m = np.dot([[1., 0.5], [0.3, 1.]], s)
+    center_and_norm(m)
+    X = _get_pca(rng).fit_transform(m.T)
+    w64 = infomax(X, extended=extended, random_state=0)
+    w32 = infomax(X, extended=extended, random_state=0, dtype='float32',
+                  w_change=1e-8)
+    assert w32.dtype == np.float64
+    assert_allclose(w32, w64, rtol=0.05)
+    # warm starting from the solution should stay there
+    w64_orig = w64.copy()
+    w_warm = infomax(X, weights=w64, extended=extended, random_state=1,
+                     l_rate=1e-4, max_iter=2)
+    assert_array_equal(w64, w64_orig)  # not modified in place
+    assert_allclose(w_warm, w64, rtol=0.05)
+    with pytest.raises(ValueError, match='Invalid value for the .dtype'):
+        infomax(X, dtype='float16')
+
+
 @requires_sklearn
 def test_non_square_infomax():
     """Test non-square infomax."""
@@ -195,6 +223,26 @@ def test_infomax_n_iter(return_n_iter):
         assert isinstance(r, np.ndarray)
 
 
+def test_infomax_chunks():
+    """Test Infomax on chunks shorter than the blocks."""
+    rng = np.random.RandomState(0)
+    S = rng.laplace(size=(3000, 3))
+    A = rng.randn(3, 3)
+    X = np.dot(S, A.T)
+    X -= X.mean(axis=0)
+    _, s, vt = linalg.svd(X, full_matrices=False)
+    whitener = vt.T / s * np.sqrt(len(X))
+    chunks = np.array_split(np.dot(X, whitener), 100)
+    # the samples that do not fill a block are carried over to the next chunk
+    unmixing = _infomax(lambda: chunks, len(X), 3, block=50, random_state=0)
+    transform = np.dot(np.dot(unmixing, whitener.T), A)
+    amari_distance = np.mean(np.sum(np.abs(transform), axis=1) /
+                             np.max(np.abs(transform), axis=1) - 1.)
+    assert amari_distance < 0.1
+    with pytest.raises(ValueError, match='block must be positive'):
+        infomax(X, block=len(X) + 1)
+
+
 def _get_pca(rng=None):
     if not check_version('sklearn', '0.18'):
         from sklearn.decomposition import RandomizedPCA
@@ -26,8 +26,10 @@ from mne.io.constants import FIFF
 from mne.preprocessing.maxwell import (
     maxwell_filter, _get_n_moments, _sss_basis_basic, _sh_complex_to_real,
     _sh_real_to_complex, _sh_negate, _bases_complex_to_real, _trans_sss_basis,
-    _bases_real_to_complex, _prep_mf_coils, find_bad_channels_maxwell)
+    _bases_real_to_complex, _prep_mf_coils, find_bad_channels_maxwell,
+    _sss_basis, _tabular_legendre)
 from mne.rank import _get_rank_sss, _compute_rank_int
+from mne.transforms import rot_to_quat
 from mne.utils import (assert_meg_snr, run_tests_if_main, catch_logging,
                        object_diff, buggy_mkl_svd, use_log_level)
 
@@ -315,6 +317,85 @@ def test_other_systems():
     assert '80/80 in, 12/15 out' in log.getvalue()  # homogeneous fields
 
 
+def test_head_pos_tol(monkeypatch):
+    """Test reuse of decompositions for nearby head positions."""
+    from mne.preprocessing import maxwell
+    raw = read_crop(fname_ctf_raw)
+    raw.apply_gradient_compensation(0)
+    dev_head_t = raw.info['dev_head_t']['trans']
+    rng = np.random.RandomState(0)
+    t = raw._first_time + np.arange(0, raw.times[-1], 0.05)
+    head_pos = np.zeros((len(t), 10))
+    head_pos[:, 0] = t
+    head_pos[:, 1:4] = rot_to_quat(dev_head_t[:3, :3])
+    head_pos[:, 4:7] = dev_head_t[:3, 3] + rng.randn(len(t), 3) * 1e-5
+    kwargs = dict(origin=(0., 0., 0.04), head_pos=head_pos)
+    picks = pick_types(raw.info, meg=True)
+    raw_sss = maxwell_filter(raw, **kwargs)
+    with catch_logging() as log:
+        raw_sss_tol = maxwell_filter(raw, head_pos_tol=(1e-4, 0.1),
+                                     verbose='debug', **kwargs)
+    n_reused = log.getvalue().count('Reusing cached SSS decomposition')
+    assert n_reused >= len(head_pos) // 2
+    data, data_tol = raw_sss[picks][0], raw_sss_tol[picks][0]
+    assert np.linalg.norm(data - data_tol) < 1e-2 * np.linalg.norm(data)
+    # large tolerances use a single decomposition for all positions
+    with catch_logging() as log:
+        raw_sss_big = maxwell_filter(raw, head_pos_tol=(0.1, 10.),
+                                     verbose='debug', **kwargs)
+    assert log.getvalue().count('Reusing cached') == len(head_pos)
+    with pytest.raises(ValueError, match='positive floats'):
+        maxwell_filter(raw, head_pos_tol=(1e-3, 0.), **kwargs)
+    # decompositions can be shared across calls
+    maxwell._shared_decomp_entries.clear()
+    monkeypatch.setenv('MNE_MAXWELL_CACHE_SIZE', '2')
+    maxwell_filter(raw, head_pos_tol=(0.1, 10.), **kwargs)
+    assert len(maxwell._shared_decomp_entries) == 1
+    with catch_logging() as log:
+        raw_sss_2 = maxwell_filter(raw, head_pos_tol=(0.1, 10.),
+                                   verbose='debug', **kwargs)
+    assert log.getvalue().count('Reusing cached') == len(head_pos) + 1
+    maxwell_filter(raw, **kwargs)
+    assert len(maxwell._shared_decomp_entries) == 2
+    maxwell._shared_decomp_entries.clear()
+    assert_allclose(raw_sss_2[picks][0], raw_sss_big[picks][0])
+
+
+@pytest.mark.parametrize('regularize', ('in', None))
+def test_find_bad_channels_maxwell_static(regularize):
+    """Test the static bad channel engine against the movecomp one."""
+    raw = read_crop(fname_ctf_raw)
+    raw.apply_gradient_compensation(0)
+    meg_picks = pick_types(raw.info, meg=True, ref_meg=False)
+    rng = np.random.RandomState(0)
+    n_times = int(round(20 * raw.info['sfreq']))
+    data = np.zeros((len(raw.ch_names), n_times))
+    data[meg_picks] = np.dot(rng.randn(len(meg_picks), 5),
+                             rng.randn(5, n_times)) * 1e-15
+    data[meg_picks] += rng.randn(len(meg_picks), n_times) * 1e-15
+    data[meg_picks[10]] += rng.randn(n_times) * 5e-12  # noisy
+    data[meg_picks[20], :n_times // 2] += rng.randn(n_times // 2) * 5e-12
+    data[meg_picks[30]] = 0.  # flat
+    raw = mne.io.RawArray(data, raw.info)
+    raw.info['bads'] = [raw.ch_names[meg_picks[40]]]
+    dev_head_t = raw.info['dev_head_t']['trans']
+    head_pos = np.concatenate([
+        [0.], rot_to_quat(dev_head_t[:3, :3]), dev_head_t[:3, 3],
+        [0., 0., 0.]])[np.newaxis]
+    kwargs = dict(origin=(0., 0., 0.04), ignore_ref=True, h_freq=None,
+                  duration=2., min_count=2, regularize=regularize,
+                  return_scores=True)
+    noisy, flat, scores = find_bad_channels_maxwell(raw, **kwargs)
+    assert noisy == [raw.ch_names[meg_picks[ii]] for ii in (10, 20)]
+    assert flat == [raw.ch_names[meg_picks[30]]]
+    noisy_mc, flat_mc, scores_mc = find_bad_channels_maxwell(
+        raw, head_pos=head_pos, **kwargs)
+    assert noisy == noisy_mc
+    assert flat == flat_mc
+    for key in ('scores_flat', 'scores_noisy', 'limits_noisy'):
+        assert_allclose(scores[key], scores_mc[key], rtol=1e-6, atol=1e-5)
+
+
 def test_spherical_conversions():
     """Test spherical harmonic conversions."""
     # Test our real<->complex conversion functions
@@ -394,6 +475,43 @@ def test_multipolar_bases():
         assert_allclose(S_tot, S_tot_fast * flips, atol=1e-16)
 
 
+@pytest.mark.parametrize('system', ('ctf', 'bti'))
+def test_sss_basis_vectorized(system):
+    """Test the vectorized SSS basis against the readable implementation."""
+    from scipy.special import lpmv
+    if system == 'ctf':
+        info = read_info(fname_ctf_raw)
+    else:
+        bti_dir = op.join(io_dir, 'bti', 'tests', 'data')
+        info = read_raw_bti(op.join(bti_dir, 'test_pdf_linux'),
+                            op.join(bti_dir, 'test_config_linux'),
+                            op.join(bti_dir, 'test_hs_linux')).info
+    info = pick_info(info, pick_types(info, meg=True, ref_meg=False))
+    coils = _prep_meg_channels(info, accurate=True, do_es=True)[0]
+    all_coils = _prep_mf_coils(info)
+    for this_int, this_ext in ((8, 3), (3, 6), (2, 0)):
+        exp = dict(origin=(0., 0.01, 0.04), int_order=this_int,
+                   ext_order=this_ext)
+        S_tot = _sss_basis_basic(exp, coils)
+        S_tot_fast = _trans_sss_basis(exp, all_coils, info['dev_head_t'])
+        flips = 1 - 2 * (np.sign(S_tot_fast[2]) != np.sign(S_tot[2]))
+        assert_allclose(S_tot, S_tot_fast * flips,
+                        atol=1e-6 * np.abs(S_tot).max())
+    S_tot = _sss_basis(exp, all_coils)
+    S_tot_32 = _sss_basis(exp, all_coils, dtype=np.float32)
+    assert S_tot_32.dtype == np.float32
+    assert_allclose(S_tot_32, S_tot, rtol=1e-5, atol=1e-5 * S_tot.max())
+    # Legendre table
+    rr = all_coils[0][:100]
+    L = _tabular_legendre(rr, 5)
+    x = rr[:, 2] / np.linalg.norm(rr, axis=1)
+    for degree in range(6):
+        for order in range(degree + 1):
+            assert_allclose(L[degree, order], lpmv(order, degree, x),
+                            rtol=1e-10, atol=1e-12)
+        assert_array_equal(L[degree, degree + 1:], 0.)
+
+
 @testing.requires_testing_data
 def test_basic():
     """Test Maxwell filter basic version."""
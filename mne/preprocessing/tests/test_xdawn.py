@@ -266,6 +266,30 @@ def test_XdawnTransformer():
     pytest.raises(ValueError, xdt.inverse_transform, 42)
 
 
+def test_xdawn_partial_fit():
+    """Test _XdawnTransformer fitted on batches of epochs."""
+    epochs, _ = _simulate_erplike_mixed_data(n_epochs=60)
+    X, y = epochs.get_data(), epochs.events[:, 2]
+    batches = np.array_split(np.arange(len(X)), 3)
+    for reg, signal_cov in ((None, None), (0.1, None), (None, np.eye(10))):
+        xdt = _XdawnTransformer(reg=reg, signal_cov=signal_cov).fit(X, y)
+        xdt_partial = _XdawnTransformer(reg=reg, signal_cov=signal_cov)
+        for batch in batches:
+            assert xdt_partial.partial_fit(X[batch], y[batch]) is xdt_partial
+        assert_array_equal(xdt_partial.classes_, xdt.classes_)
+        assert_allclose(xdt_partial.filters_, xdt.filters_, rtol=1e-6)
+        assert_allclose(xdt_partial.patterns_, xdt.patterns_, rtol=1e-6)
+    with pytest.raises(ValueError, match='requires reg'):
+        _XdawnTransformer(reg='oas').partial_fit(X, y)
+    # partial_fit starts over after fit
+    xdt_partial.fit(X[batches[0]], y[batches[0]])
+    xdt_partial.partial_fit(X[batches[1]], y[batches[1]])
+    xdt = _XdawnTransformer(signal_cov=np.eye(10)).fit(X[batches[1]],
+                                                       y[batches[1]])
+    assert_allclose(xdt_partial.filters_, xdt.filters_, rtol=1e-6)
+    assert not hasattr(Xdawn(), 'partial_fit')
+
+
 def _simulate_erplike_mixed_data(n_epochs=100, n_channels=10):
     rng = np.random.RandomState(42)
     tmin, tmax = 0., 1.
@@ -8,7 +8,8 @@ import numpy as np
 from scipy import linalg
 
 from .. import EvokedArray, Evoked
-from ..cov import Covariance, _regularized_covariance
+from ..cov import (Covariance, _regularized_covariance,
+                   _covariance_from_sums_ok, _covariance_from_sums)
 from ..decoding import TransformerMixin, BaseEstimator
 from ..epochs import BaseEpochs
 from ..io import BaseRaw
@@ -157,13 +158,6 @@ def _fit_xdawn(epochs_data, y, n_components, reg=None, signal_cov=None,
     if signal_cov is None:
         signal_cov = _regularized_covariance(
             np.hstack(epochs_data), reg, method_params, info, rank='full')
-    elif isinstance(signal_cov, Covariance):
-        signal_cov = signal_cov.data
-    if not isinstance(signal_cov, np.ndarray) or (
-            not np.array_equal(signal_cov.shape,
-                               np.tile(epochs_data.shape[1], 2))):
-        raise ValueError('signal_cov must be None, a covariance instance, '
-                         'or an array of shape (n_chans, n_chans)')
 
     # Get prototype events
     if events is not None:
@@ -176,6 +170,24 @@ def _fit_xdawn(epochs_data, y, n_components, reg=None, signal_cov=None,
             evokeds.append(np.mean(epochs_data[y == c, :, :], axis=0))
             toeplitzs.append(1.)
 
+    filters, patterns = _fit_xdawn_filters(
+        evokeds, toeplitzs, signal_cov, n_components, reg, method_params,
+        info)
+    evokeds = np.array(evokeds)
+    return filters, patterns, evokeds
+
+
+def _fit_xdawn_filters(evokeds, toeplitzs, signal_cov, n_components,
+                       reg=None, method_params=None, info=None):
+    """Fit Xdawn filters and patterns from the prototype responses."""
+    n_channels = len(evokeds[0])
+    if isinstance(signal_cov, Covariance):
+        signal_cov = signal_cov.data
+    if not isinstance(signal_cov, np.ndarray) or (
+            not np.array_equal(signal_cov.shape, np.tile(n_channels, 2))):
+        raise ValueError('signal_cov must be None, a covariance instance, '
+                         'or an array of shape (n_chans, n_chans)')
+
     filters = list()
     patterns = list()
     for evo, toeplitz in zip(evokeds, toeplitzs):
@@ -198,49 +210,11 @@ def _fit_xdawn(epochs_data, y, n_components, reg=None, signal_cov=None,
 
     filters = np.concatenate(filters, axis=0)
     patterns = np.concatenate(patterns, axis=0)
-    evokeds = np.array(evokeds)
-    return filters, patterns, evokeds
-
-
-class _XdawnTransformer(BaseEstimator, TransformerMixin):
-    """Implementation of the Xdawn Algorithm compatible with scikit-learn.
+    return filters, patterns
 
-    Xdawn is a spatial filtering method designed to improve the signal
-    to signal + noise ratio (SSNR) of the event related responses. Xdawn was
-    originally designed for P300 evoked potential by enhancing the target
-    response with respect to the non-target response. This implementation is a
-    generalization to any type of event related response.
 
-    .. note:: _XdawnTransformer does not correct for epochs overlap. To correct
-              overlaps see ``Xdawn``.
-
-    Parameters
-    ----------
-    n_components : int (default 2)
-        The number of components to decompose the signals.
-    reg : float | str | None (default None)
-        If not None (same as ``'empirical'``, default), allow
-        regularization for covariance estimation.
-        If float, shrinkage is used (0 <= shrinkage <= 1).
-        For str options, ``reg`` will be passed to ``method`` to
-        :func:`mne.compute_covariance`.
-    signal_cov : None | Covariance | array, shape (n_channels, n_channels)
-        The signal covariance used for whitening of the data.
-        if None, the covariance is estimated from the epochs signal.
-    method_params : dict | None
-        Parameters to pass to :func:`mne.compute_covariance`.
-
-        .. versionadded:: 0.16
-
-    Attributes
-    ----------
-    classes_ : array, shape (n_classes)
-        The event indices of the classes.
-    filters_ : array, shape (n_channels, n_channels)
-        The Xdawn components used to decompose the data for each event type.
-    patterns_ : array, shape (n_channels, n_channels)
-        The Xdawn patterns used to restore the signals for each event type.
-    """
+class _XdawnBase(BaseEstimator, TransformerMixin):
+    """Base class for _XdawnTransformer and Xdawn."""
 
     def __init__(self, n_components=2, reg=None, signal_cov=None,
                  method_params=None):
@@ -272,6 +246,7 @@ class _XdawnTransformer(BaseEstimator, TransformerMixin):
         self.filters_, self.patterns_, _ = _fit_xdawn(
             X, y, n_components=self.n_components, reg=self.reg,
             signal_cov=self.signal_cov, method_params=self.method_params)
+        self._partial = None
         return self
 
     def transform(self, X):
@@ -341,7 +316,107 @@ class _XdawnTransformer(BaseEstimator, TransformerMixin):
         return X, y
 
 
-class Xdawn(_XdawnTransformer):
+class _XdawnTransformer(_XdawnBase):
+    """Implementation of the Xdawn Algorithm compatible with scikit-learn.
+
+    Xdawn is a spatial filtering method designed to improve the signal
+    to signal + noise ratio (SSNR) of the event related responses. Xdawn was
+    originally designed for P300 evoked potential by enhancing the target
+    response with respect to the non-target response. This implementation is a
+    generalization to any type of event related response.
+
+    .. note:: _XdawnTransformer does not correct for epochs overlap. To correct
+              overlaps see ``Xdawn``.
+
+    Parameters
+    ----------
+    n_components : int (default 2)
+        The number of components to decompose the signals.
+    reg : float | str | None (default None)
+        If not None (same as ``'empirical'``, default), allow
+        regularization for covariance estimation.
+        If float, shrinkage is used (0 <= shrinkage <= 1).
+        For str options, ``reg`` will be passed to ``method`` to
+        :func:`mne.compute_covariance`.
+    signal_cov : None | Covariance | array, shape (n_channels, n_channels)
+        The signal covariance used for whitening of the data.
+        if None, the covariance is estimated from the epochs signal.
+    method_params : dict | None
+        Parameters to pass to :func:`mne.compute_covariance`.
+
+        .. versionadded:: 0.16
+
+    Attributes
+    ----------
+    classes_ : array, shape (n_classes)
+        The event indices of the classes.
+    filters_ : array, shape (n_channels, n_channels)
+        The Xdawn components used to decompose the data for each event type.
+    patterns_ : array, shape (n_channels, n_channels)
+        The Xdawn patterns used to restore the signals for each event type.
+    """
+
+    def partial_fit(self, X, y=None):
+        """Update Xdawn spatial filters with a batch of epochs.
+
+        Parameters
+        ----------
+        X : array, shape (n_epochs, n_channels, n_samples)
+            A batch of the target data.
+        y : array, shape (n_epochs,) | None
+            The target labels. If None, Xdawn fit on the average evoked.
+
+        Returns
+        -------
+        self : Xdawn instance
+            The Xdawn instance.
+
+        Notes
+        -----
+        Calling this method on consecutive batches of epochs gives the same
+        filters and patterns as calling :meth:`fit` on all of them, as the
+        class sums of the epochs and the signal covariance are accumulated
+        instead of keeping the epochs in memory. Unless ``signal_cov`` is
+        given, this requires ``reg`` to be None or a float and
+        ``method_params`` to be None. Calling this method after :meth:`fit`
+        starts over from the given batch.
+
+        .. versionadded:: 0.21
+        """
+        X, y = self._check_Xy(X, y)
+        if self.signal_cov is None and not _covariance_from_sums_ok(
+                self.reg, self.method_params, 'full'):
+            raise ValueError('partial_fit requires reg to be None or a float '
+                             'and method_params to be None unless signal_cov '
+                             'is given')
+        if getattr(self, '_partial', None) is None:
+            self._partial = dict(classes=dict(), X_sq=0., n_samples=0)
+        state = self._partial
+        if self.signal_cov is None:
+            X_2d = np.hstack(X)
+            state['X_sq'] = state['X_sq'] + np.dot(X_2d, X_2d.T)
+            state['n_samples'] += X_2d.shape[1]
+            del X_2d
+        for this_class in np.unique(y):
+            sel = y == this_class
+            stats = state['classes'].setdefault(this_class, [0., 0])
+            stats[0] = stats[0] + X[sel].sum(axis=0)
+            stats[1] += sel.sum()
+
+        self.classes_ = np.array(sorted(state['classes']))
+        signal_cov = self.signal_cov
+        if signal_cov is None:
+            signal_cov = _covariance_from_sums(
+                state['X_sq'], state['n_samples'], self.reg)
+        evokeds = [X_sum / n_epochs for X_sum, n_epochs in
+                   (state['classes'][c] for c in self.classes_)]
+        self.filters_, self.patterns_ = _fit_xdawn_filters(
+            evokeds, [1.] * len(evokeds), signal_cov, self.n_components,
+            self.reg, self.method_params)
+        return self
+
+
+class Xdawn(_XdawnBase):
     """Implementation of the Xdawn Algorithm.
 
     Xdawn [1]_ [2]_ is a spatial filtering method designed to improve the
@@ -645,5 +720,5 @@ class Xdawn(_XdawnTransformer):
 
     def inverse_transform(self):
         """Not implemented, see Xdawn.apply() instead."""
-        # Exists because of _XdawnTransformer
+        # Exists because of _XdawnBase
         raise NotImplementedError('See Xdawn.apply()')
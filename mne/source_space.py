@@ -30,11 +30,13 @@ from .surface import (read_surface, _create_surf_spacing, _get_ico_surface,
                       _tessellate_sphere_surf, _get_surf_neighbors,
                       _normalize_vectors, _triangle_neighbors, mesh_dist,
                       complete_surface_info, _compute_nearest, fast_cross_3d,
-                      _CheckInside)
+                      _CheckInside, _get_morph_cache_fname)
 from .utils import (get_subjects_dir, check_fname, logger, verbose,
                     _ensure_int, check_version, _get_call_line, warn,
                     _check_fname, _check_path_like, has_nibabel, _check_sphere,
-                    _validate_type, _check_option, _is_numeric, _pl, _suggest)
+                    _validate_type, _check_option, _is_numeric, _pl, _suggest,
+                    get_config, object_hash, _read_array_cache,
+                    _write_array_cache)
 from .parallel import parallel_func, check_n_jobs
 from .transforms import (invert_transform, apply_trans, _print_coord_trans,
                          combine_transforms, _get_trans,
@@ -2516,6 +2518,12 @@ def add_source_space_distances(src, dist_limit=np.inf, n_jobs=1, verbose=None):
     We recommend computing distances once per source space and then saving
     the source space to disk, as the computed distances will automatically be
     stored along with the source space data for future use.
+
+    If the ``MNE_DIST_CACHE_DIR`` config value is set (see
+    :func:`mne.set_config`), the distances of each source space are also
+    stored in this directory, under a hash of its surface, its vertices and
+    ``dist_limit``, and read from there when computing them again for the
+    same source space (e.g., from another script).
     """
     from scipy.sparse.csgraph import dijkstra
     n_jobs = check_n_jobs(n_jobs)
@@ -2555,28 +2563,38 @@ def add_source_space_distances(src, dist_limit=np.inf, n_jobs=1, verbose=None):
             for key in ('dist', 'dist_limit'):
                 s[key] = None
         else:
-            d = parallel(p_fun(adjacency, s['vertno'], r, dist_limit)
-                         for r in np.array_split(np.arange(len(s['vertno'])),
-                                                 n_jobs))
-            # deal with indexing so we can add patch info
-            min_idx = np.array([dd[1] for dd in d])
-            min_dist = np.array([dd[2] for dd in d])
-            midx = np.argmin(min_dist, axis=0)
-            range_idx = np.arange(len(s['rr']))
-            min_dist = min_dist[midx, range_idx]
-            min_idx = min_idx[midx, range_idx]
-            min_dists.append(min_dist)
-            min_idxs.append(min_idx)
-            # convert to sparse representation
-            d = np.concatenate([dd[0] for dd in d]).ravel()  # already float32
-            idx = d > 0
-            d = d[idx]
-            i, j = np.meshgrid(s['vertno'], s['vertno'])
-            i = i.ravel()[idx]
-            j = j.ravel()[idx]
+            cache_fname = _get_dist_cache_fname(s, dist_limit)
+            cached = _read_array_cache(cache_fname, 'distances')
+            if cached is None:
+                d = parallel(
+                    p_fun(adjacency, s['vertno'], r, dist_limit)
+                    for r in np.array_split(np.arange(len(s['vertno'])),
+                                            n_jobs))
+                # deal with indexing so we can add patch info
+                min_idx = np.array([dd[3] for dd in d])
+                min_dist = np.array([dd[4] for dd in d])
+                midx = np.argmin(min_dist, axis=0)
+                range_idx = np.arange(len(s['rr']))
+                min_dist = min_dist[midx, range_idx]
+                min_idx = min_idx[midx, range_idx]
+                # assemble the rows of the sparse representation
+                indptr = np.zeros(s['np'] + 1, np.int64)
+                indptr[s['vertno'] + 1] = np.concatenate([dd[2] for dd in d])
+                np.cumsum(indptr, out=indptr)
+                cached = dict(
+                    data=np.concatenate([dd[0] for dd in d]),  # float32
+                    indices=s['vertno'].astype(np.int32)[
+                        np.concatenate([dd[1] for dd in d])],
+                    indptr=indptr, min_idx=min_idx, min_dist=min_dist)
+                del d
+                _write_array_cache(cache_fname, 'distances', **cached)
+            min_dists.append(cached['min_dist'])
+            min_idxs.append(cached['min_idx'])
             s['dist'] = sparse.csr_matrix(
-                (d, (i, j)), shape=(s['np'], s['np']), dtype=np.float32)
+                (cached['data'], cached['indices'], cached['indptr']),
+                shape=(s['np'], s['np']), dtype=np.float32)
             s['dist_limit'] = np.array([dist_limit], np.float32)
+            del cached
 
     # Let's see if our distance was sufficient to allow for patch info
     if not any(np.any(np.isinf(md)) for md in min_dists):
@@ -2590,15 +2608,32 @@ def add_source_space_distances(src, dist_limit=np.inf, n_jobs=1, verbose=None):
     return src
 
 
+def _get_dist_cache_fname(s, dist_limit):
+    """Get the file name of cached source space distances (if configured)."""
+    cache_dir = get_config('MNE_DIST_CACHE_DIR', None)
+    if cache_dir is None:
+        return None
+    key = object_hash(dict(rr=s['rr'], tris=s['tris'], vertno=s['vertno'],
+                           dist_limit=dist_limit))
+    subject = s.get('subject_his_id', None) or 'unknown'
+    return op.join(op.expanduser(cache_dir),
+                   '%s-dist-%032x.npz' % (subject, key))
+
+
 def _do_src_distances(con, vertno, run_inds, limit):
-    """Compute source space distances in chunks."""
+    """Compute source space distances in chunks.
+
+    The distances are returned as the data, the column indices (into vertno)
+    and the number of nonzero values of the rows of a sparse matrix.
+    """
     from scipy.sparse.csgraph import dijkstra
     func = partial(dijkstra, limit=limit)
     chunk_size = 20  # save memory by chunking (only a little slower)
     lims = np.r_[np.arange(0, len(run_inds), chunk_size), len(run_inds)]
     n_chunks = len(lims) - 1
     # eventually we want this in float32, so save memory by only storing 32-bit
-    d = np.empty((len(run_inds), len(vertno)), np.float32)
+    data, indices = list(), list()
+    counts = np.zeros(len(run_inds), np.int64)
     min_dist = np.empty((n_chunks, con.shape[0]))
     min_idx = np.empty((n_chunks, con.shape[0]), np.int32)
     range_idx = np.arange(con.shape[0])
@@ -2608,12 +2643,19 @@ def _do_src_distances(con, vertno, run_inds, limit):
         midx = np.argmin(out, axis=0)
         min_idx[li] = idx[midx]
         min_dist[li] = out[midx, range_idx]
-        d[l1:l2] = out[:, vertno]
+        d = out[:, vertno].astype(np.float32)
+        del out
+        # scipy will give us np.inf for uncalc. distances
+        mask = (d > 0) & (d != np.inf)
+        counts[l1:l2] = mask.sum(axis=1)
+        data.append(d[mask])
+        indices.append(np.nonzero(mask)[1].astype(np.int32))
     midx = np.argmin(min_dist, axis=0)
     min_dist = min_dist[midx, range_idx]
     min_idx = min_idx[midx, range_idx]
-    d[d == np.inf] = 0  # scipy will give us np.inf for uncalc. distances
-    return d, min_idx, min_dist
+    data = np.concatenate(data) if data else np.zeros(0, np.float32)
+    indices = np.concatenate(indices) if indices else np.zeros(0, np.int32)
+    return data, indices, counts, min_idx, min_dist
 
 
 def get_volume_labels_from_aseg(mgz_fname, return_colors=False,
@@ -2762,6 +2804,13 @@ def _get_vertex_map_nn(fro_src, subject_from, subject_to, hemi, subjects_dir,
     # nearest-neighbor mode should be used)
     logger.info('Mapping %s %s -> %s (nearest neighbor)...'
                 % (hemi, subject_from, subject_to))
+    cache_fname = _get_morph_cache_fname(
+        'nn-%s' % hemi, subject_from, subject_to, subjects_dir,
+        n_vertices=int(fro_src['np']),
+        vertno=np.asarray(fro_src['vertno'], np.int64))
+    cached = _read_array_cache(cache_fname, 'morph')
+    if cached is not None:
+        return cached['best']
     regs = [op.join(subjects_dir, s, 'surf', '%s.sphere.reg' % hemi)
             for s in (subject_from, subject_to)]
     reg_fro, reg_to = [read_surface(r, return_dict=True)[-1] for r in regs]
@@ -2792,6 +2841,7 @@ def _get_vertex_map_nn(fro_src, subject_from, subject_to, hemi, subjects_dir,
                         'double occupation.' % (was, one))
         best[v] = one
         morph_inuse[one] = True
+    _write_array_cache(cache_fname, 'morph', best=best)
     return best
 
 
@@ -33,7 +33,7 @@ from .transforms import (transform_surface_to, _pol_to_cart, _cart_to_sph,
                          _get_trans, apply_trans, Transform)
 from .utils import (logger, verbose, get_subjects_dir, warn, _check_fname,
                     _check_option, _ensure_int, _TempDir, run_subprocess,
-                    _check_freesurfer_home)
+                    _check_freesurfer_home, get_config, object_hash)
 from .fixes import (_serialize_volume_info, _get_read_geometry, einsum, jit,
                     prange, bincount)
 
@@ -1233,7 +1233,7 @@ def decimate_surface(points, triangles, n_triangles, method='quadric',
 
 @verbose
 def read_morph_map(subject_from, subject_to, subjects_dir=None, xhemi=False,
-                   verbose=None):
+                   n_jobs=1, verbose=None):
     """Read morph map.
 
     Morph maps can be generated with mne_make_morph_maps. If one isn't
@@ -1252,6 +1252,10 @@ def read_morph_map(subject_from, subject_to, subjects_dir=None, xhemi=False,
         Morph across hemisphere. Currently only implemented for
         ``subject_to == subject_from``. See notes of
         :func:`mne.compute_source_morph`.
+    %(n_jobs)s
+        Only used when the morph map has to be generated.
+
+        .. versionadded:: 0.21
     %(verbose)s
 
     Returns
@@ -1293,13 +1297,14 @@ def read_morph_map(subject_from, subject_to, subjects_dir=None, xhemi=False,
     logger.info('Morph map "%s" does not exist, creating it and saving it to '
                 'disk' % fname)
     logger.info(log_msg % (subject_from, subject_to))
-    mmap_1 = _make_morph_map(subject_from, subject_to, subjects_dir, xhemi)
+    mmap_1 = _make_morph_map(subject_from, subject_to, subjects_dir, xhemi,
+                             n_jobs)
     if subject_to == subject_from:
         mmap_2 = None
     else:
         logger.info(log_msg % (subject_to, subject_from))
         mmap_2 = _make_morph_map(subject_to, subject_from, subjects_dir,
-                                 xhemi)
+                                 xhemi, n_jobs)
     _write_morph_map(fname, subject_from, subject_to, mmap_1, mmap_2)
     return mmap_1
 
@@ -1369,6 +1374,37 @@ def _write_morph_map(fname, subject_from, subject_to, mmap_1, mmap_2):
     end_file(fid)
 
 
+def _get_morph_cache_fname(kind, subject_from, subject_to, subjects_dir,
+                           **params):
+    """Get the file name of a cached morph result.
+
+    Results are stored in the ``MNE_MORPH_CACHE_DIR`` directory, in files
+    named after a hash of all the parameters they depend on, including the
+    size and modification time of the spherical surfaces of both subjects.
+    None is returned if no cache directory is configured.
+    """
+    cache_dir = get_config('MNE_MORPH_CACHE_DIR', None)
+    if cache_dir is None:
+        return None
+    cache_dir = op.expanduser(cache_dir)
+    stamps = list()
+    for subject in (subject_from, subject_to):
+        for surf in ('sphere.reg', 'sphere.left_right'):
+            for hemi in ('lh', 'rh'):
+                fname = op.join(subjects_dir, subject, 'surf',
+                                '%s.%s' % (hemi, surf))
+                try:
+                    stat = os.stat(fname)
+                except OSError:
+                    stamps.append(None)
+                else:
+                    stamps.append((stat.st_size, stat.st_mtime))
+    key = object_hash(dict(kind=kind, subject_from=subject_from,
+                           subject_to=subject_to, stamps=stamps, **params))
+    return op.join(cache_dir, '%s-%s-%s-%032x.npz'
+                   % (subject_from, subject_to, kind, key))
+
+
 @jit()
 def _get_tri_dist(p, q, p0, q0, a, b, c, dist):  # pragma: no cover
     """Get the distance to a triangle edge."""
@@ -1400,16 +1436,16 @@ def _get_tri_supp_geom(surf):
                 a=a, b=b, c=c, mat=mat, nn=nn)
 
 
-def _make_morph_map(subject_from, subject_to, subjects_dir, xhemi):
+def _make_morph_map(subject_from, subject_to, subjects_dir, xhemi,
+                    n_jobs=1):
     """Construct morph map from one subject to another.
 
     Note that this is close, but not exactly like the C version.
     For example, parts are more accurate due to double precision,
     so expect some small morph-map differences!
 
-    Note: This seems easily parallelizable, but the overhead
-    of pickling all the data structures makes it less efficient
-    than just running on a single core :(
+    The points of each hemisphere are processed in chunks, which are
+    distributed over ``n_jobs`` jobs.
     """
     subjects_dir = get_subjects_dir(subjects_dir)
     if xhemi:
@@ -1420,12 +1456,12 @@ def _make_morph_map(subject_from, subject_to, subjects_dir, xhemi):
         hemis = (('lh', 'lh'), ('rh', 'rh'))
 
     return [_make_morph_map_hemi(subject_from, subject_to, subjects_dir,
-                                 reg % hemi_from, reg % hemi_to)
+                                 reg % hemi_from, reg % hemi_to, n_jobs)
             for hemi_from, hemi_to in hemis]
 
 
 def _make_morph_map_hemi(subject_from, subject_to, subjects_dir, reg_from,
-                         reg_to):
+                         reg_to, n_jobs=1):
     """Construct morph map for one hemisphere."""
     # add speedy short-circuit for self-maps
     if subject_from == subject_to and reg_from == reg_to:
@@ -1451,15 +1487,19 @@ def _make_morph_map_hemi(subject_from, subject_to, subjects_dir, reg_from,
     assert from_pt_lens[-1] == len(from_pt_tris)
 
     # find triangle in which point lies and assoc. weights
-    tri_inds = []
-    weights = []
     tri_geom = _get_tri_supp_geom(dict(rr=from_rr, tris=from_tri))
-    weights, tri_inds = _find_nearest_tri_pts(
-        to_rr, from_pt_tris, from_pt_lens, run_all=False, reproject=False,
-        **tri_geom)
+    n_chunks = max(int(np.ceil(len(to_rr) / _NEAREST_TRI_CHUNK)), n_jobs)
+    bounds = np.linspace(0, len(to_rr), n_chunks + 1).astype(int)
+    parallel, p_fun, _ = parallel_func(_find_nearest_tri_pts_vec, n_jobs)
+    out = parallel(p_fun(
+        to_rr[start:stop],
+        from_pt_tris[from_pt_lens[start]:from_pt_lens[stop]],
+        from_pt_lens[start:stop + 1] - from_pt_lens[start], **tri_geom)
+        for start, stop in zip(bounds[:-1], bounds[1:]))
+    weights = np.concatenate([o[0] for o in out])
+    tri_inds = np.concatenate([o[1] for o in out])
 
     nn_idx = from_tri[tri_inds]
-    weights = np.array(weights)
 
     row_ind = np.repeat(np.arange(len(to_rr)), 3)
     this_map = csr_matrix((weights.ravel(), (row_ind, nn_idx.ravel())),
@@ -1467,6 +1507,93 @@ def _make_morph_map_hemi(subject_from, subject_to, subjects_dir, reg_from,
     return this_map
 
 
+def _first_in_groups(groups):
+    """Get a mask of the first element of each run of equal values."""
+    mask = np.ones(len(groups), bool)
+    mask[1:] = groups[1:] != groups[:-1]
+    return mask
+
+
+# Number of points processed at once by _find_nearest_tri_pts_vec
+_NEAREST_TRI_CHUNK = 50000
+
+
+def _find_nearest_tri_pts_vec(rrs, pt_triss, pt_lens,
+                              a, b, c, nn, r1, r12, r13, r1213, mat):
+    """Find nearest point mapping to a set of triangles (vectorized).
+
+    This is equivalent to ``_find_nearest_tri_pts`` with ``run_all=False``
+    and ``reproject=False``, but processes all point-triangle pairs at once.
+    """
+    n_pts = len(rrs)
+    weights = np.empty((n_pts, 3))
+    tri_idx = np.empty(n_pts, np.int64)
+    lens = np.diff(pt_lens)
+    empty = lens == 0
+    if empty.any():  # use all triangles
+        weights[empty], tri_idx[empty] = _find_nearest_tri_pts(
+            rrs[empty], np.empty(0, np.int64),
+            np.zeros(empty.sum() + 1, np.int64), a, b, c, nn, r1, r12, r13,
+            r1213, mat, run_all=False, reproject=False)
+    if empty.all():
+        return weights, tri_idx
+    # one entry per point-triangle pair, sorted by point
+    pt_pairs = np.repeat(np.arange(n_pts), lens)
+    tri_pairs = pt_triss[pt_lens[0]:pt_lens[-1]]
+    drs = rrs[pt_pairs] - r1[tri_pairs]
+    pqs = einsum('ijk,ik->ij', mat[tri_pairs],
+                 einsum('ijk,ik->ij', r1213[tri_pairs], drs))
+    dists = einsum('ij,ij->i', drs, nn[tri_pairs])
+    del drs
+    pp, qq = pqs.T
+    inside = (pp >= 0) & (qq >= 0) & (pp <= 1) & (qq <= 1) & (pp + qq < 1)
+    found = np.zeros(n_pts, bool)
+    found[pt_pairs[inside]] = True
+
+    # points inside triangles: the one at the smallest distance (first one
+    # in case of ties, as the sort is stable)
+    use = np.where(inside)[0]
+    use = use[np.lexsort((np.abs(dists[use]), pt_pairs[use]))]
+    use = use[_first_in_groups(pt_pairs[use])]
+    pts = pt_pairs[use]
+    tri_idx[pts] = tri_pairs[use]
+    weights[pts] = np.array([1 - pp[use] - qq[use], pp[use], qq[use]]).T
+
+    # other points: nearest location on the edges of the triangles
+    use = np.where(~found[pt_pairs] & ~empty[pt_pairs])[0]
+    if len(use):
+        aa, bb, cc = a[tri_pairs[use]], b[tri_pairs[use]], c[tri_pairs[use]]
+        this_pp, this_qq, this_dist = pp[use], qq[use], dists[use]
+        #   Side 1 -> 2
+        p0 = np.clip(this_pp + 0.5 * (this_qq * cc) / aa, 0., 1.)
+        q0 = np.zeros_like(p0)
+        #   Side 2 -> 3
+        t1 = (0.5 * ((2.0 * aa - cc) * (1.0 - this_pp) +
+                     (2.0 * bb - cc) * this_qq) / (aa + bb - cc))
+        t1 = np.clip(t1, 0., 1.)
+        p1 = 1.0 - t1
+        q1 = t1
+        #   Side 1 -> 3
+        q2 = np.clip(this_qq + 0.5 * (this_pp * cc) / bb, 0., 1.)
+        p2 = np.zeros_like(q2)
+        edge_p = np.concatenate([p0, p1, p2])
+        edge_q = np.concatenate([q0, q1, q2])
+        edge_dist = np.concatenate([
+            _get_tri_dist(this_pp, this_qq, p, q, aa, bb, cc, this_dist)
+            for p, q in ((p0, q0), (p1, q1), (p2, q2))])
+        # the smallest distance, first by side and then by triangle in case
+        # of ties
+        edge_pts = np.tile(pt_pairs[use], 3)
+        order = np.lexsort((np.abs(edge_dist), edge_pts))
+        order = order[_first_in_groups(edge_pts[order])]
+        pts = edge_pts[order]
+        tri_idx[pts] = np.tile(tri_pairs[use], 3)[order]
+        weights[pts] = np.array(
+            [1 - edge_p[order] - edge_q[order], edge_p[order],
+             edge_q[order]]).T
+    return weights, tri_idx
+
+
 @jit(parallel=True)
 def _find_nearest_tri_pts(rrs, pt_triss, pt_lens,
                           a, b, c, nn, r1, r12, r13, r1213, mat,
@@ -11,17 +11,21 @@ from scipy.spatial.distance import cdist
 import pytest
 
 from mne import pick_types, pick_info
-from mne.forward._compute_forward import _MAG_FACTOR
+from mne.forward import _create_meg_coils, _concatenate_coils
+from mne.forward._compute_forward import (_MAG_FACTOR,
+                                          _magnetic_dipole_field_vec)
 from mne.io import (read_raw_fif, read_raw_artemis123, read_raw_ctf, read_info,
                     RawArray)
 from mne.io.constants import FIFF
+from mne import chpi
 from mne.chpi import (compute_chpi_amplitudes, compute_chpi_locs,
                       compute_head_pos, _setup_ext_proj,
                       _chpi_locs_to_times_dig, _compute_good_distances,
                       extract_chpi_locs_ctf, head_pos_to_trans_rot_t,
                       read_head_pos, write_head_pos, filter_chpi,
-                      _get_hpi_info, _get_hpi_initial_fit)
-from mne.transforms import rot_to_quat, _angle_between_quats
+                      _get_hpi_info, _get_hpi_initial_fit,
+                      _setup_hpi_amplitude_fitting, _fit_chpi_amplitudes)
+from mne.transforms import rot_to_quat, _angle_between_quats, apply_trans
 from mne.simulation import add_chpi
 from mne.utils import run_tests_if_main, catch_logging, assert_meg_snr, verbose
 from mne.datasets import testing
@@ -427,6 +431,87 @@ def test_simulate_calculate_head_pos_chpi():
                   vel_atol=4e-3)  # 4 mm/s
 
 
+def test_chpi_amplitudes_batched(monkeypatch):
+    """Test that batched cHPI amplitude fits match per-window fits."""
+    info = read_info(raw_fname)
+    ncoil = len(info['hpi_results'][0]['order'])
+    info['hpi_subsystem'] = {
+        'event_channel': 'STI201', 'ncoil': ncoil,
+        'hpi_coils': [{'event_bits': np.array([bit, 0, bit, bit], np.int32)}
+                      for bit in (256, 512, 1024, 2048)]}
+    for fi, freq in enumerate(83 + np.arange(ncoil) * 20):
+        info['hpi_meas'][0]['hpi_coils'][fi]['coil_freq'] = freq
+    picks = pick_types(info, meg=True, stim=True, eeg=False, exclude=[])
+    info['sfreq'] = 1000.
+    info['lowpass'] = 330.
+    info = pick_info(info, picks)
+    info['chs'][info['ch_names'].index('STI 001')]['ch_name'] = 'STI201'
+    info._update_redundant()
+    info['projs'] = []
+    rng = np.random.RandomState(0)
+    raw = RawArray(rng.randn(len(picks), 3000) * 1e-13, info)
+    add_chpi(raw)
+    # only two coils on, so these windows must be skipped
+    raw._data[info['ch_names'].index('STI201'), 1000:1500] = 256 + 512
+    # make sure we use multiple batches, and a non-integer step
+    monkeypatch.setattr(chpi, '_CHPI_BATCH_SIZE', 100000)
+    t_step = 0.0103
+    amps = compute_chpi_amplitudes(raw, t_step_min=t_step)
+    hpi = _setup_hpi_amplitude_fitting(raw.info, 'auto')
+    fit_idxs = raw.time_as_index(np.arange(
+        hpi['t_window'] / 2., raw.times[-1] + 1. / info['sfreq'], t_step),
+        use_rounding=True)
+    assert amps['slopes'].shape == (len(fit_idxs), ncoil, len(hpi['proj_op']))
+    want = np.full(amps['slopes'].shape, np.nan)
+    for mi, midpt in enumerate(fit_idxs):
+        start = midpt - hpi['n_window'] // 2
+        time_sl = slice(max(start, 0),
+                        min(start + hpi['n_window'], len(raw.times)))
+        sin_fit = _fit_chpi_amplitudes(raw, time_sl, hpi)
+        if sin_fit is not None:
+            want[mi] = sin_fit
+    skipped = np.isnan(want).all(axis=(1, 2))
+    assert 0 < skipped.sum() < len(skipped)
+    assert_allclose(amps['slopes'], want, rtol=1e-10, atol=1e-25)
+
+
+def test_chpi_locs_batched():
+    """Test batched magnetic dipole fitting of cHPI amplitudes."""
+    info = read_info(raw_fname)
+    info = pick_info(info, pick_types(info, meg=True))
+    info['projs'] = []
+    proj, _, _ = _setup_ext_proj(info, ext_order=1)
+    coils = _concatenate_coils(_create_meg_coils(info['chs'], 'accurate'))
+    rng = np.random.RandomState(0)
+    n_times, n_coils = 70, 4  # more than one chunk
+    dev_head_t = info['dev_head_t']['trans']
+    rrs = apply_trans(np.linalg.inv(dev_head_t), _get_hpi_initial_fit(info))
+    # move the coils by up to 1 cm and rotate their moments
+    rrs = rrs + np.linspace(0, 0.01, n_times)[:, np.newaxis, np.newaxis] * \
+        np.array([0.5, -0.5, 1.])
+    moments = rng.randn(n_times, n_coils, 3) * 1e-4
+    slopes = np.array([
+        [np.dot(m, _magnetic_dipole_field_vec(r[np.newaxis], coils))
+         for r, m in zip(these_rrs, these_moments)]
+        for these_rrs, these_moments in zip(rrs, moments)])
+    ext = proj['data']['data']
+    slopes -= np.dot(np.dot(slopes, ext.T), ext)  # remove external fields
+    slopes += 1e-15 * rng.randn(*slopes.shape)
+    chpi_amplitudes = dict(times=np.arange(n_times) * 0.01, slopes=slopes,
+                           proj=proj)
+    chpi_locs = compute_chpi_locs(info, chpi_amplitudes, t_step_max=0.)
+    assert chpi_locs['rrs'].shape == (n_times, n_coils, 3)
+    assert_allclose(chpi_locs['times'], chpi_amplitudes['times'])
+    assert_allclose(chpi_locs['rrs'], rrs, atol=1e-5)
+    assert_array_less(0.99, chpi_locs['gofs'])
+    # should not depend on how the problems are split
+    chpi_locs_2 = compute_chpi_locs(info, chpi_amplitudes, t_step_max=0.,
+                                    n_jobs=2)
+    for key in ('rrs', 'gofs', 'moments'):
+        assert_allclose(chpi_locs_2[key], chpi_locs[key],
+                        rtol=1e-6, atol=1e-12)
+
+
 def _calculate_chpi_coil_locs(raw, verbose):
     """Wrap to facilitate change diff."""
     chpi_amplitudes = compute_chpi_amplitudes(raw, verbose=verbose)
@@ -15,7 +15,7 @@ from scipy import linalg
 from mne.cov import (regularize, whiten_evoked,
                      _auto_low_rank_model,
                      prepare_noise_cov, compute_whitener,
-                     _regularized_covariance)
+                     _regularized_covariance, _regularized_covariances)
 
 from mne import (read_cov, write_cov, Epochs, merge_events,
                  find_events, compute_raw_covariance,
@@ -479,6 +479,21 @@ def test_regularized_covariance():
     assert_allclose(data, evoked.data, atol=1e-20)
 
 
+@requires_sklearn
+@pytest.mark.parametrize('rank', (None, 'full'))
+@pytest.mark.parametrize('reg', (None, 0.1, 'diagonal_fixed'))
+def test_regularized_covariances(reg, rank):
+    """Test regularized covariances of epochs."""
+    rng = np.random.RandomState(0)
+    data = rng.randn(4, 5, 100)
+    data[1, 4] = data[1, 3]  # rank deficient epoch
+    covs = _regularized_covariances(data, reg=reg, rank=rank)
+    assert covs.shape == (4, 5, 5)
+    for this_data, cov in zip(data, covs):
+        assert_allclose(cov, _regularized_covariance(
+            this_data, reg=reg, rank=rank), rtol=1e-10, atol=1e-12)
+
+
 @requires_sklearn
 def test_auto_low_rank():
     """Test probabilistic low rank estimators."""
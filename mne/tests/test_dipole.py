@@ -12,7 +12,7 @@ from mne import (read_dipole, read_forward_solution,
                  transform_surface_to, make_sphere_model, pick_types,
                  pick_info, EvokedArray, read_source_spaces, make_ad_hoc_cov,
                  make_forward_solution, Dipole, DipoleFixed, Epochs,
-                 make_fixed_length_events, Evoked)
+                 make_fixed_length_events, Evoked, make_forward_dipole)
 from mne.dipole import get_phantom_dipoles, _BDIP_ERROR_KEYS
 from mne.simulation import simulate_evoked
 from mne.datasets import testing
@@ -48,6 +48,8 @@ fname_xfit_dip_txt = op.join(data_path, 'dip', 'fixed_auto.dip')
 fname_xfit_seq_txt = op.join(data_path, 'dip', 'sequential.dip')
 fname_ctf = op.join(data_path, 'CTF', 'testdata_ctf_short.ds')
 subjects_dir = op.join(data_path, 'subjects')
+fname_evo_io = op.join(op.dirname(__file__), '..', 'io', 'tests', 'data',
+                       'test-ave.fif.gz')
 
 
 def _compare_dipoles(orig, new):
@@ -313,7 +315,8 @@ def _compute_depth(dip, fname_bem, fname_trans, subject, subjects_dir):
 
 
 @testing.requires_testing_data
-def test_accuracy():
+@pytest.mark.parametrize('method', ('cobyla', 'simplex'))
+def test_accuracy(method):
     """Test dipole fitting to sub-mm accuracy."""
     evoked = read_evokeds(fname_evo)[0].crop(0., 0.,)
     evoked.pick_types(meg=True, eeg=False)
@@ -336,7 +339,7 @@ def test_accuracy():
         sim = simulate_evoked(fwd, stc, evoked.info, cov=None, nave=np.inf)
 
         cov = make_ad_hoc_cov(evoked.info)
-        dip = fit_dipole(sim, cov, bem, min_dist=0.001)[0]
+        dip = fit_dipole(sim, cov, bem, min_dist=0.001, method=method)[0]
 
         ds = []
         for vi in range(n_vertices):
@@ -356,6 +359,34 @@ def test_accuracy():
         assert ((np.percentile(ds, [50, 90]) < [0.0005, perc_90]).all())
 
 
+def test_dipole_fitting_simplex():
+    """Test dipole fitting with the simplex method in a sphere model."""
+    evoked = read_evokeds(fname_evo_io, 0, baseline=(None, 0))
+    evoked.pick_types(meg=True, eeg=False)
+    r0 = np.array([0., 0., 0.04])
+    sphere = make_sphere_model(r0, 0.09)
+    rng = np.random.RandomState(0)
+    n_dipoles = 4
+    pos = r0 + rng.uniform(-0.04, 0.04, (n_dipoles, 3))
+    # tangential orientations, which MEG can see
+    ori = np.cross(pos - r0, rng.randn(n_dipoles, 3))
+    ori /= np.linalg.norm(ori, axis=1, keepdims=True)
+    times = np.arange(n_dipoles) / evoked.info['sfreq']
+    dip_true = Dipole(times, pos, np.full(n_dipoles, 50e-9), ori,
+                      np.full(n_dipoles, 100.))
+    fwd, stc = make_forward_dipole(dip_true, sphere, evoked.info)
+    sim = simulate_evoked(fwd, stc, evoked.info, cov=None, nave=np.inf)
+    cov = make_ad_hoc_cov(evoked.info)
+    dips = [fit_dipole(sim, cov, sphere, method=method)[0]
+            for method in ('cobyla', 'simplex')]
+    for dip in dips:
+        assert_allclose(dip.pos, pos, atol=1e-3)
+        assert (dip.gof > 99.).all()
+    assert_allclose(dips[1].pos, dips[0].pos, atol=5e-4)
+    with pytest.raises(ValueError, match='Invalid value for the .method.'):
+        fit_dipole(sim, cov, sphere, method='foo')
+
+
 @testing.requires_testing_data
 def test_dipole_fixed(tmpdir):
     """Test reading a fixed-position dipole (from Xfit)."""
@@ -2,6 +2,7 @@
 # Author: Tommy Clausner <Tommy.Clausner@gmail.com>
 #
 # License: BSD (3-clause)
+import os
 import os.path as op
 
 import pytest
@@ -203,6 +204,61 @@ def test_surface_source_morph_round_trip(smooth, lower, upper, n_warn):
     assert_power_preserved(stc, stc_back)
 
 
+@testing.requires_testing_data
+def test_surface_source_morph_cache(tmpdir, monkeypatch):
+    """Test caching of surface morph matrices."""
+    stc = mne.read_source_estimate(fname_smorph)
+    kwargs = dict(spacing=3, smooth=5, warn=False, subjects_dir=subjects_dir)
+    morph = compute_source_morph(stc, 'sample', 'fsaverage', **kwargs)
+    cache_dir = op.join(str(tmpdir), 'cache')
+    monkeypatch.setenv('MNE_MORPH_CACHE_DIR', cache_dir)
+    morph_new = compute_source_morph(stc, 'sample', 'fsaverage', **kwargs)
+    # the morph matrix and the destination vertices are cached
+    fnames = sorted(os.listdir(cache_dir))
+    assert len(fnames) == 2
+    assert fnames[0].startswith('fsaverage-fsaverage-grade-')
+    assert fnames[1].startswith('sample-fsaverage-morph-mat-')
+    morph_cached = compute_source_morph(stc, 'sample', 'fsaverage', **kwargs)
+    assert sorted(os.listdir(cache_dir)) == fnames
+    for this_morph in (morph_new, morph_cached):
+        assert_allclose(this_morph.morph_mat.toarray(),
+                        morph.morph_mat.toarray())
+        for v1, v2 in zip(this_morph.vertices_to, morph.vertices_to):
+            assert_array_equal(v1, v2)
+    assert_array_equal(
+        morph_cached.morph_mat.indices, morph_new.morph_mat.indices)
+    # other parameters get their own entries
+    compute_source_morph(stc, 'sample', 'fsaverage', spacing=3, smooth=3,
+                         warn=False, subjects_dir=subjects_dir)
+    assert len(os.listdir(cache_dir)) == 3
+    vertices = grade_to_vertices('fsaverage', 3, subjects_dir)
+    for v1, v2 in zip(vertices, morph.vertices_to):
+        assert_array_equal(v1, v2)
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_compute_resample_mat():
+    """Test computing the sparse matrix of a linear resampling."""
+    from scipy import ndimage
+    from mne.morph import _compute_resample_mat
+    rng = np.random.RandomState(0)
+    shape = (10, 11, 9)
+    grid = np.mgrid[:8, :9, :10].astype(float)
+    coords = 1.1 * grid + np.sin(grid / 2.)  # a nonlinear warp
+    funcs = (lambda vol: ndimage.affine_transform(
+        vol, np.diag([2.1, 1.3, 0.7]), offset=(1, -1, 0.5),
+        output_shape=(4, 7, 13), order=1),
+        lambda vol: ndimage.map_coordinates(vol, coords, order=1))
+    for func in funcs:
+        mat, out_shape = _compute_resample_mat(func, shape)
+        vol = rng.randn(*shape)
+        want = func(vol)
+        assert out_shape == want.shape
+        assert mat.shape == (want.size, vol.size)
+        assert_allclose(mat * vol.ravel(order='F'), want.ravel(order='F'),
+                        atol=1e-12)
+
+
 def assert_power_preserved(orig, new, limits=(1., 1.05)):
     """Assert that the power is preserved during a round-trip morph."""
     __tracebackhide__ = True
@@ -256,6 +312,22 @@ def test_surface_vector_source_morph(tmpdir):
     # check wrong subject correction
     stc_surf.subject = None
     assert isinstance(source_morph_surf.apply(stc_surf), SourceEstimate)
+    assert stc_surf.subject is None  # the input is not modified
+
+    # lists and generators are morphed together
+    stcs_surf = [stc_surf, stc_surf.copy().crop(0.095)]
+    for stcs in (stcs_surf, (s for s in stcs_surf)):
+        stcs_morphed = source_morph_surf.apply(stcs)
+        assert isinstance(stcs_morphed, list)
+        assert len(stcs_morphed) == 2
+        for stc, stc_morphed in zip(stcs_surf, stcs_morphed):
+            assert isinstance(stc_morphed, SourceEstimate)
+            assert_allclose(stc_morphed.data,
+                            source_morph_surf.apply(stc).data)
+            assert stc_morphed.tmin == stc.tmin
+    assert source_morph_surf.apply([]) == []
+    with pytest.raises(TypeError, match='must be of the same class'):
+        source_morph_surf.apply([stc_surf, stc_vec])
 
     # degenerate
     stc_vol = read_source_estimate(fname_vol_w, 'sample')
@@ -358,6 +430,26 @@ def test_volume_source_morph(tmpdir):
     assert isinstance(source_morph_vol.apply(stc_vol_vec, output='nifti2'),
                       nib.Nifti2Image)
 
+    # check precomputed sparse morph matrix
+    assert source_morph_vol.vol_morph_mat is None
+    source_morph_vol_mat = read_source_morph(tmpdir.join('vol-morph.h5'))
+    assert source_morph_vol_mat.vol_morph_mat is None
+    assert source_morph_vol_mat.compute_vol_morph_mat() is \
+        source_morph_vol_mat
+    n_verts = sum(len(v) for v in stc_vol.vertices)
+    assert source_morph_vol_mat.vol_morph_mat.shape == (
+        len(stc_vol_morphed.vertices[0]), n_verts)
+    stc_vol_morphed_mat = source_morph_vol_mat.apply(stc_vol)
+    assert_allclose(stc_vol_morphed_mat.data, stc_vol_morphed.data,
+                    rtol=1e-5, atol=1e-5 * np.abs(stc_vol_morphed.data).max())
+    source_morph_vol_mat.save(tmpdir.join('vol-mat'))
+    source_morph_vol_mat_r = read_source_morph(
+        tmpdir.join('vol-mat-morph.h5'))
+    assert_allclose(source_morph_vol_mat_r.vol_morph_mat.toarray(),
+                    source_morph_vol_mat.vol_morph_mat.toarray())
+    assert_allclose(source_morph_vol_mat_r.apply(stc_vol).data,
+                    stc_vol_morphed_mat.data)
+
     # check for subject_from mismatch
     source_morph_vol_r.subject_from = '42'
     with pytest.raises(ValueError, match='subject_from must match'):
@@ -790,6 +882,13 @@ def test_mixed_source_morph(_mixed_morph_srcs, vector):
         stc_fs.volume().as_volume(src_fs, mri_resolution=False))
     assert img.astype(bool).sum() == n_want  # correct number of voxels
 
+    # Morph a list and compare to morphing one at a time
+    stc_2 = stc.copy()
+    stc_2.data *= 2
+    stcs_fs = morph.apply([stc, stc_2])
+    assert_allclose(stcs_fs[0].data, stc_fs.data)
+    assert_allclose(stcs_fs[1].data, morph.apply(stc_2).data)
+
     # Morph separate parts and compare to morphing the entire one
     stc_fs_surf = morph.apply(stc.surface())
     stc_fs_vol = morph.apply(stc.volume())
@@ -4,6 +4,7 @@
 #
 # License: BSD (3-clause)
 
+import os
 import os.path as op
 from shutil import copytree
 
@@ -193,6 +194,37 @@ def test_add_source_space_distances(tmpdir):
         assert_allclose(np.zeros_like(d.data), d.data, rtol=0, atol=1e-9)
 
 
+@testing.requires_testing_data
+def test_add_source_space_distances_cache(tmpdir, monkeypatch):
+    """Test caching of source space distances."""
+    cache_dir = op.join(str(tmpdir), 'cache')
+    monkeypatch.setenv('MNE_DIST_CACHE_DIR', cache_dir)
+    srcs = list()
+    for _ in range(3):
+        src = read_source_spaces(fname)
+        for s in src:
+            s['vertno'] = s['vertno'][:19].copy()
+        srcs.append(src)
+    add_source_space_distances(srcs[0], dist_limit=0.007)
+    fnames = sorted(os.listdir(cache_dir))
+    assert len(fnames) == 2  # one per hemisphere
+    assert all(fname.startswith('sample-dist-') for fname in fnames)
+    add_source_space_distances(srcs[1], dist_limit=0.007)
+    assert sorted(os.listdir(cache_dir)) == fnames
+    for s0, s1 in zip(srcs[0], srcs[1]):
+        assert_array_equal(s0['dist'].toarray(), s1['dist'].toarray())
+        assert s1['dist'].dtype == np.float32
+        assert_array_equal(s0['dist_limit'], s1['dist_limit'])
+    # other limits and vertices get their own entries
+    add_source_space_distances(srcs[2], dist_limit=0.005)
+    assert len(os.listdir(cache_dir)) == 4
+    for s0, s2 in zip(srcs[0], srcs[2]):
+        d = s0['dist'].copy()
+        d.data[d.data > 0.005] = 0
+        d.eliminate_zeros()
+        assert_allclose(s2['dist'].toarray(), d.toarray())
+
+
 @testing.requires_testing_data
 @requires_mne
 def test_discrete_source_space(tmpdir):
@@ -13,7 +13,10 @@ from mne import (read_surface, write_surface, decimate_surface, pick_types,
                  dig_mri_distances)
 from mne.surface import (read_morph_map, _compute_nearest, _tessellate_sphere,
                          fast_cross_3d, get_head_surf, read_curvature,
-                         get_meg_helmet_surf, _normal_orth)
+                         get_meg_helmet_surf, _normal_orth,
+                         _get_ico_surface, _get_tri_supp_geom,
+                         _triangle_neighbors, _find_nearest_tri_pts,
+                         _find_nearest_tri_pts_vec)
 from mne.utils import (_TempDir, requires_vtk, catch_logging,
                        run_tests_if_main, object_diff, requires_freesurfer)
 from mne.io import read_info
@@ -153,6 +156,32 @@ def test_make_morph_maps():
         assert (mm - sparse.eye(mm.shape[0], mm.shape[0])).sum() == 0
 
 
+@pytest.mark.parametrize('n_pts', (1, 500))
+def test_find_nearest_tri_pts_vec(n_pts):
+    """Test vectorized projection of points to candidate triangles."""
+    rng = np.random.RandomState(0)
+    surf = _get_ico_surface(3)
+    geom = _get_tri_supp_geom(surf)
+    rrs = rng.randn(n_pts, 3)
+    rrs *= rng.uniform(0.9, 1.1, (n_pts, 1)) / np.linalg.norm(
+        rrs, axis=1, keepdims=True)
+    # candidate triangles: the ones around the nearest vertex (as for morph
+    # maps) or random ones, for which most points are off the triangles
+    pt_tris = _triangle_neighbors(surf['tris'], len(surf['rr']))
+    pt_tris = [pt_tris[idx] if ii % 2 else
+               rng.randint(0, len(surf['tris']), rng.randint(1, 8))
+               for ii, idx in enumerate(_compute_nearest(surf['rr'], rrs))]
+    pt_lens = np.cumsum([0] + [len(tris) for tris in pt_tris])
+    pt_tris = np.concatenate(pt_tris).astype(np.int64)
+    weights, tri_idx = _find_nearest_tri_pts(
+        rrs, pt_tris, pt_lens, run_all=False, reproject=False, **geom)
+    weights_vec, tri_idx_vec = _find_nearest_tri_pts_vec(
+        rrs, pt_tris, pt_lens, **geom)
+    assert_array_equal(tri_idx_vec, tri_idx)
+    assert_allclose(weights_vec, weights, rtol=1e-12, atol=1e-12)
+    assert_allclose(weights.sum(axis=1), 1.)
+
+
 @testing.requires_testing_data
 def test_io_surface():
     """Test reading and writing of Freesurfer surface mesh files."""
@@ -15,7 +15,7 @@ from ..io.pick import pick_channels, _picks_to_idx
 from ..utils import logger, verbose, warn, copy_function_doc_to_method_doc
 from ..viz.misc import plot_csd
 from ..time_frequency.multitaper import (_compute_mt_params, _mt_spectra,
-                                         _csd_from_mt, _psd_from_mt_adaptive)
+                                         _psd_from_mt_adaptive)
 from ..parallel import parallel_func
 from ..externals.h5io import read_hdf5, write_hdf5
 
@@ -1090,12 +1090,18 @@ def _prepare_csd_array(X, sfreq, t0, tmin, tmax, fmin=None, fmax=None):
     return X, times, tmin, tmax, fmin, fmax
 
 
+# Maximal number of elements of the spectra or CSD matrices that are computed
+# at once
+_BLOCK_SIZE = 2 ** 22
+
+
 @verbose
 def _execute_csd_function(X, times, frequencies, csd_function, params, n_fft,
                           ch_names=None, projs=None, n_jobs=1, verbose=None):
     """Estimate cross-spectral density with a given function.
 
-    This function will apply the given CSD function in parallel across epochs.
+    This function will apply the given CSD function in parallel across blocks
+    of epochs.
 
     Parameters
     ----------
@@ -1126,7 +1132,7 @@ def _execute_csd_function(X, times, frequencies, csd_function, params, n_fft,
     csd : instance of CrossSpectralDensity
         The computed cross-spectral density.
     """
-    n_epochs, n_channels, _ = X.shape
+    n_epochs, n_channels, n_times = X.shape
 
     logger.info('Computing cross-spectral density from epochs...')
 
@@ -1136,23 +1142,27 @@ def _execute_csd_function(X, times, frequencies, csd_function, params, n_fft,
 
     # Prepare the function that does the actual CSD computation for parallel
     # execution.
-    parallel, my_csd, _ = parallel_func(csd_function, n_jobs, verbose=verbose)
-
-    # Compute CSD for each trial
-    n_blocks = int(np.ceil(n_epochs / float(n_jobs)))
-    for i in range(n_blocks):
-        epoch_block = X[i * n_jobs:(i + 1) * n_jobs]
-        if n_jobs > 1:
-            logger.info('    Computing CSD matrices for epochs %d..%d'
-                        % (i * n_jobs + 1, (i + 1) * n_jobs))
-        else:
-            logger.info('    Computing CSD matrix for epoch %d' % (i + 1))
-
-        csds = parallel(my_csd(this_epoch, *params)
-                        for this_epoch in epoch_block)
+    parallel, my_csd, n_jobs = parallel_func(csd_function, n_jobs,
+                                             verbose=verbose)
+
+    # The spectra of blocks of epochs are computed at once, limiting their
+    # size to about as many elements as _BLOCK_SIZE and giving each job at
+    # least one block
+    n_block = _BLOCK_SIZE // (n_channels * n_times * n_freqs)
+    n_block = int(max(min(n_block, np.ceil(n_epochs / float(n_jobs))), 1))
+    starts = np.arange(0, n_epochs, n_block)
+    for i in range(0, len(starts), n_jobs):
+        these_starts = starts[i:i + n_jobs]
+        logger.info('    Computing CSD matrices for epochs %d..%d'
+                    % (these_starts[0] + 1,
+                       min(these_starts[-1] + n_block, n_epochs)))
+        csds = parallel(my_csd(X[start:start + n_block], *params)
+                        for start in these_starts)
 
         # Add CSD matrices in-place
-        csds_mean += np.sum(csds, axis=0)
+        for csd in csds:
+            csds_mean += csd
+        del csds
 
     csds_mean /= n_epochs
     logger.info('[done]')
@@ -1165,14 +1175,42 @@ def _execute_csd_function(X, times, frequencies, csd_function, params, n_fft,
                                 n_fft=n_fft, projs=projs)
 
 
+def _csd_from_spectra(x_w):
+    """Sum the upper triangle of the CSD over epochs and samples.
+
+    Parameters
+    ----------
+    x_w : ndarray, shape (n_epochs, n_channels, n_samples, n_freqs)
+        The spectra, for example for each taper or time sample, with their
+        weights and normalization already applied.
+
+    Returns
+    -------
+    csd : ndarray, shape ((n_channels**2 + n_channels) / 2, n_freqs)
+        For each frequency, the upper triangle of the CSD matrix.
+    """
+    n_epochs, n_channels, n_samples, n_freqs = x_w.shape
+    x_w = np.transpose(x_w, (3, 1, 0, 2)).reshape(n_freqs, n_channels, -1)
+    triu = np.triu_indices(n_channels)
+    csd = np.empty((len(triu[0]), n_freqs), np.complex128)
+    # Compute the CSD matrices of several frequencies at once with a batched
+    # matrix product, keeping only their upper triangle
+    step = max(_BLOCK_SIZE // n_channels ** 2, 1)
+    for start in range(0, n_freqs, step):
+        this_x_w = x_w[start:start + step]
+        this_csd = np.matmul(this_x_w, this_x_w.conj().transpose(0, 2, 1))
+        csd[:, start:start + step] = this_csd[:, triu[0], triu[1]].T
+    return csd
+
+
 def _csd_fourier(X, sfreq, n_times, freq_mask, n_fft):
     """Compute cross spectral density (CSD) using short-time fourier transform.
 
-    Computes the CSD for a single epoch of data.
+    Computes the CSD summed over a block of epochs.
 
     Parameters
     ----------
-    X : ndarray, shape (n_channels, n_times)
+    X : ndarray, shape (n_epochs, n_channels, n_times)
         The time series data consisting of n_channels time-series of length
         n_times.
     sfreq : float
@@ -1184,24 +1222,14 @@ def _csd_fourier(X, sfreq, n_times, freq_mask, n_fft):
     n_fft : int
         Length of the FFT.
     """
-    x_mt, _ = _mt_spectra(X, np.hanning(n_times), sfreq, n_fft)
-
-    # Hack so we can sum over axis=-2
-    weights = np.array([1.])[:, np.newaxis, np.newaxis, np.newaxis]
-
+    n_epochs, n_channels = X.shape[:2]
+    x_mt, _ = _mt_spectra(X.reshape(-1, n_times), np.hanning(n_times), sfreq,
+                          n_fft)
     x_mt = x_mt[:, :, freq_mask]
 
-    # Calculating CSD
-    # Tiling x_mt so that we can easily use _csd_from_mt()
-    x_mt = x_mt[:, np.newaxis, :, :]
-    x_mt = np.tile(x_mt, [1, x_mt.shape[0], 1, 1])
-    y_mt = np.transpose(x_mt, axes=[1, 0, 2, 3])
-    weights_y = np.transpose(weights, axes=[1, 0, 2, 3])
-    csds = _csd_from_mt(x_mt, y_mt, weights, weights_y)
-
-    # FIXME: don't compute full matrix in the first place
-    csds = np.array([_sym_mat_to_vector(csds[:, :, i])
-                     for i in range(csds.shape[-1])]).T
+    # Calculating CSD, with the normalization of _csd_from_mt
+    x_mt *= np.sqrt(2.)
+    csds = _csd_from_spectra(x_mt.reshape(n_epochs, n_channels, 1, -1))
 
     # Scaling by number of samples and compensating for loss of power
     # due to windowing (see section 11.5.2 in Bendat & Piersol).
@@ -1218,11 +1246,11 @@ def _csd_multitaper(X, sfreq, n_times, window_fun, eigvals, freq_mask, n_fft,
                     adaptive):
     """Compute cross spectral density (CSD) using multitaper module.
 
-    Computes the CSD for a single epoch of data.
+    Computes the CSD summed over a block of epochs.
 
     Parameters
     ----------
-    X : ndarray, shape (n_channels, n_times)
+    X : ndarray, shape (n_epochs, n_channels, n_times)
         The time series data consisting of n_channels time-series of length
         n_times.
     sfreq : float
@@ -1241,32 +1269,25 @@ def _csd_multitaper(X, sfreq, n_times, window_fun, eigvals, freq_mask, n_fft,
     adaptive : bool
         Use adaptive weights to combine the tapered spectra into PSD.
     """
-    x_mt, _ = _mt_spectra(X, window_fun, sfreq, n_fft)
+    n_epochs, n_channels = X.shape[:2]
+    x_mt, _ = _mt_spectra(X.reshape(-1, n_times), window_fun, sfreq, n_fft)
 
     if adaptive:
         # Compute adaptive weights
         _, weights = _psd_from_mt_adaptive(x_mt, eigvals, freq_mask,
                                            return_weights=True)
-        # Tiling weights so that we can easily use _csd_from_mt()
-        weights = weights[:, np.newaxis, :, :]
-        weights = np.tile(weights, [1, x_mt.shape[0], 1, 1])
     else:
         # Do not use adaptive weights
-        weights = np.sqrt(eigvals)[np.newaxis, np.newaxis, :, np.newaxis]
+        weights = np.sqrt(eigvals)[np.newaxis, :, np.newaxis]
 
     x_mt = x_mt[:, :, freq_mask]
 
-    # Calculating CSD
-    # Tiling x_mt so that we can easily use _csd_from_mt()
-    x_mt = x_mt[:, np.newaxis, :, :]
-    x_mt = np.tile(x_mt, [1, x_mt.shape[0], 1, 1])
-    y_mt = np.transpose(x_mt, axes=[1, 0, 2, 3])
-    weights_y = np.transpose(weights, axes=[1, 0, 2, 3])
-    csds = _csd_from_mt(x_mt, y_mt, weights, weights_y)
-
-    # FIXME: don't compute full matrix in the first place
-    csds = np.array([_sym_mat_to_vector(csds[:, :, i])
-                     for i in range(csds.shape[-1])]).T
+    # Calculating CSD, folding the weights and the normalization of
+    # _csd_from_mt into the spectra
+    x_mt *= weights * np.sqrt(
+        2. / (weights * weights.conj()).real.sum(axis=-2, keepdims=True))
+    csds = _csd_from_spectra(x_mt.reshape((n_epochs, n_channels) +
+                                          x_mt.shape[1:]))
 
     # Scaling by sampling frequency for compatibility with Matlab
     csds /= sfreq
@@ -1277,11 +1298,11 @@ def _csd_multitaper(X, sfreq, n_times, window_fun, eigvals, freq_mask, n_fft,
 def _csd_morlet(data, sfreq, wavelets, tslice=None, use_fft=True, decim=1):
     """Compute cross spectral density (CSD) using the given Morlet wavelets.
 
-    Computes the CSD for a single epoch of data.
+    Computes the CSD summed over a block of epochs.
 
     Parameters
     ----------
-    data : ndarray, shape (n_channels, n_times)
+    data : ndarray, shape (n_epochs, n_channels, n_times)
         The time series data consisting of n_channels time-series of length
         n_times.
     sfreq : float
@@ -1313,8 +1334,11 @@ def _csd_morlet(data, sfreq, wavelets, tslice=None, use_fft=True, decim=1):
     --------
     _vector_to_sym_mat : For converting the CSD to a full matrix.
     """
+    n_epochs, n_channels, n_times = data.shape
+
     # Compute PSD
-    psds = cwt(data, wavelets, use_fft=use_fft, decim=decim)
+    psds = cwt(data.reshape(-1, n_times), wavelets, use_fft=use_fft,
+               decim=decim)
 
     if tslice is not None:
         tstart = None if tslice.start is None else tslice.start // decim
@@ -1323,12 +1347,11 @@ def _csd_morlet(data, sfreq, wavelets, tslice=None, use_fft=True, decim=1):
         tslice = slice(tstart, tstop, tstep)
         psds = psds[:, :, tslice]
 
-    psds_conj = np.conj(psds)
-
-    # Compute the spectral density between all pairs of series
-    n_channels = data.shape[0]
-    csds = np.vstack([np.mean(psds[[i]] * psds_conj[i:], axis=2)
-                      for i in range(n_channels)])
+    # Compute the spectral density between all pairs of series, averaged
+    # over time
+    psds = psds.reshape((n_epochs, n_channels) + psds.shape[1:])
+    csds = _csd_from_spectra(np.swapaxes(psds, 2, 3))
+    csds /= psds.shape[-1]
 
     # Scaling by sampling frequency for compatibility with Matlab
     csds /= sfreq
@@ -496,6 +496,26 @@ def test_csd_multitaper():
             assert abs(signal_power_per_sample - mt_power_per_sample) < 0.001
 
 
+@pytest.mark.parametrize('csd_function, kwargs', [
+    (csd_array_fourier, dict(fmin=5, fmax=40)),
+    (csd_array_multitaper, dict(fmin=5, fmax=40, adaptive=True)),
+    (csd_array_morlet, dict(frequencies=[20, 30], tmin=0.2, tmax=0.6)),
+])
+def test_csd_blocks(csd_function, kwargs, monkeypatch):
+    """Test that computing the CSD on blocks of epochs does not matter."""
+    rng = np.random.RandomState(0)
+    X = rng.randn(5, 4, 200)
+    csd = csd_function(X, 250., **kwargs)
+    csd_jobs = csd_function(X, 250., n_jobs=2, **kwargs)
+    assert_allclose(csd_jobs._data, csd._data, rtol=1e-10)
+    # one epoch and frequency at a time
+    monkeypatch.setattr(mne.time_frequency.csd, '_BLOCK_SIZE', 1)
+    csd_single = csd_function(X, 250., **kwargs)
+    assert_allclose(csd_single._data, csd._data, rtol=1e-10)
+    assert_allclose(csd_single.get_data(index=0).diagonal().imag, 0.,
+                    atol=1e-20)
+
+
 def test_csd_morlet():
     """Test computing cross-spectral density using Morlet wavelets."""
     epochs = _generate_coherence_data()
@@ -106,13 +106,16 @@ known_config_types = (
     'MNE_DATASETS_PHANTOM_4DBTI_PATH',
     'MNE_DATASETS_LIMO_PATH',
     'MNE_DATASETS_REFMEG_NOISE_PATH',
+    'MNE_DIST_CACHE_DIR',
     'MNE_FORCE_SERIAL',
     'MNE_KIT2FIFF_STIM_CHANNELS',
     'MNE_KIT2FIFF_STIM_CHANNEL_CODING',
     'MNE_KIT2FIFF_STIM_CHANNEL_SLOPE',
     'MNE_KIT2FIFF_STIM_CHANNEL_THRESHOLD',
     'MNE_LOGGING_LEVEL',
+    'MNE_MAXWELL_CACHE_SIZE',
     'MNE_MEMMAP_MIN_SIZE',
+    'MNE_MORPH_CACHE_DIR',
     'MNE_SKIP_FTP_TESTS',
     'MNE_SKIP_NETWORK_TESTS',
     'MNE_SKIP_TESTING_DATASET_TESTS',
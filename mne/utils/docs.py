@@ -540,6 +540,21 @@ extended_proj : list
 
     .. versionadded:: 0.21
 """
+docdict['maxwell_pos_tol'] = """
+head_pos_tol : tuple of float | None
+    Tolerances ``(translation, rotation)`` in meters and degrees used to
+    reuse SSS decompositions during movement compensation. Head positions
+    are binned using these tolerances and a single decomposition (computed
+    at the bin center) is used for all positions within a bin, which can
+    greatly reduce computation time when the head moves little.
+    None (default) only reuses decompositions for identical positions.
+    To additionally reuse decompositions across calls (e.g., for other
+    recordings of the same subject with the same bad channels), set the
+    ``MNE_MAXWELL_CACHE_SIZE`` config value to the maximum number of
+    decompositions to keep in memory.
+
+    .. versionadded:: 0.21
+"""
 
 # Rank
 docdict['rank'] = """
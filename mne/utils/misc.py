@@ -317,3 +317,37 @@ def _file_like(obj):
     # but this might be more robust to file-like objects not properly
     # inheriting from these classes:
     return all(callable(getattr(obj, name, None)) for name in ('read', 'seek'))
+
+
+def _read_array_cache(fname, kind):
+    """Read the arrays of a cached result (or None if not cached)."""
+    if fname is None or not os.path.isfile(fname):
+        return None
+    try:
+        with np.load(fname) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+    except Exception as exp:
+        warn('Could not read %s cache file "%s" (error: %s)'
+             % (kind, fname, exp))
+        return None
+    logger.info('    Read cached %s %s' % (kind, os.path.basename(fname)))
+    return arrays
+
+
+def _write_array_cache(fname, kind, **arrays):
+    """Write the arrays of a result to the cache."""
+    if fname is None:
+        return
+    # write to a temporary file first so that concurrent jobs never read a
+    # partially written file
+    tmp_fname = '%s.%d.tmp' % (fname, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(fname), exist_ok=True)
+        with open(tmp_fname, 'wb') as fid:
+            np.savez(fid, **arrays)
+        os.replace(tmp_fname, fname)
+    except Exception as exp:
+        warn('Could not write %s cache file "%s" (error: %s)'
+             % (kind, fname, exp))
+        if os.path.isfile(tmp_fname):
+            os.remove(tmp_fname)
@@ -182,7 +182,7 @@ def _reg_pinv(x, reg=0, rank='full', rcond=1e-15):
     else:
         cmp = ret = rank
     mask = mask < np.asarray(cmp)[..., np.newaxis]
-    mask &= s > 0
+    mask = mask & (s > 0)
 
     # Invert only non-zero singular values
     s_inv = np.zeros(s.shape)
@@ -201,7 +201,8 @@ def _gen_events(n_epochs):
     return events
 
 
-def _reject_data_segments(data, reject, flat, decim, info, tstep):
+def _reject_data_segments(data, reject, flat, decim, info, tstep,
+                          allow_empty=False):
     """Reject data segments using peak-to-peak amplitude."""
     from ..epochs import _is_good
     from ..io.pick import channel_indices_by_type
@@ -228,7 +229,7 @@ def _reject_data_segments(data, reject, flat, decim, info, tstep):
             logger.info("Artifact detected in [%d, %d]" % (first, last))
             drop_inds.append((first, last))
     data = data_clean[:, :this_stop]
-    if not data.any():
+    if not allow_empty and not data.any():
         raise RuntimeError('No clean segment found. Please '
                            'consider updating your rejection '
                            'thresholds.')